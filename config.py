@@ -1,12 +1,10 @@
 import os
 import sys
 import yaml
-import wx
 
 from logbook import CRITICAL, DEBUG, ERROR, FingersCrossedHandler, INFO, Logger, NestedSetup, NullHandler, \
     StreamHandler, TimedRotatingFileHandler, WARNING
 import hashlib
-from eos.const import FittingSlot
 
 from cryptography.fernet import Fernet
 from collections import namedtuple
@@ -67,22 +65,6 @@ LOGLEVEL_MAP = {
 CATALOG = 'lang'
 
 
-slotColourMapDark = {
-    FittingSlot.LOW: wx.Colour(44, 36, 19),  # yellow = low slots 24/13
-    FittingSlot.MED: wx.Colour(28, 39, 51),  # blue   = mid slots 8.1/9.5
-    FittingSlot.HIGH: wx.Colour(53, 31, 34),  # red    = high slots 6.5/11.5
-    FittingSlot.RIG: '',
-    FittingSlot.SUBSYSTEM: ''}
-errColorDark = wx.Colour(70, 20, 20)
-slotColourMap = {
-    FittingSlot.LOW: wx.Colour(250, 235, 204),  # yellow = low slots
-    FittingSlot.MED: wx.Colour(188, 215, 241),  # blue   = mid slots
-    FittingSlot.HIGH: wx.Colour(235, 204, 209),  # red    = high slots
-    FittingSlot.RIG: '',
-    FittingSlot.SUBSYSTEM: ''}
-errColor = wx.Colour(204, 51, 51)
-
-
 def getClientSecret():
     return clientHash
 
@@ -202,8 +184,10 @@ def defPaths(customSavePath=None):
     # DON'T MODIFY ANYTHING BELOW
     import eos.config
 
-    # Caching modifiers, disable all gamedata caching, its unneeded.
-    eos.config.gamedataCache = False
+    # Caching modifiers, disable all gamedata caching by default, its unneeded.
+    # Can be turned on and sized via configforced to profile long sessions
+    eos.config.gamedataCache = getattr(configforced, "gamedataCache", False)
+    eos.config.gamedataCacheLimit = getattr(configforced, "gamedataCacheLimit", eos.config.gamedataCacheLimit)
     # saveddata db location modifier, shouldn't ever need to touch this
     eos.config.saveddata_connectionstring = "sqlite:///" + saveDB + "?check_same_thread=False"
     eos.config.gamedata_connectionstring = "sqlite:///" + gameDB + "?check_same_thread=False"
@@ -19,6 +19,7 @@
 #======================================================================
 
 
+import contextlib
 import functools
 import itertools
 import json
@@ -26,6 +27,7 @@ import os
 import re
 import sqlite3
 import sys
+import time
 
 import sqlalchemy.orm
 from sqlalchemy import or_, and_
@@ -39,6 +41,91 @@ JSON_DIR = os.path.join(ROOT_DIR, 'staticdata')
 if ROOT_DIR not in sys.path:
     sys.path.insert(0, ROOT_DIR)
 GAMEDATA_SCHEMA_VERSION = 4
+# Amount of rows sent to DB per bulk insert statement
+INSERT_BATCH_SIZE = 10000
+
+
+class _JsonStream:
+    """Reads JSON values one by one from file, keeping only small part of it in memory."""
+
+    decoder = json.JSONDecoder()
+    whitespace = ' \t\r\n'
+    terminators = ',:]}' + whitespace
+
+    def __init__(self, f, chunkSize):
+        self.f = f
+        self.chunkSize = chunkSize
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def more(self):
+        chunk = self.f.read(self.chunkSize)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Skip whitespace and return next character without consuming it, None on EOF."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in self.whitespace:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.more():
+                return None
+
+    def take(self):
+        char = self.peek()
+        self.pos += 1
+        return char
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self.more():
+                    raise
+                continue
+            # Values within containers are always followed by a separator or
+            # whitespace; anything else means value (e.g. a number) has been cut
+            if (end == len(self.buf) or self.buf[end] not in self.terminators) and not self.eof and self.more():
+                continue
+            self.pos = end
+            return value
+
+
+def _iterJson(path, chunkSize=1024 * 1024):
+    """
+    Iterate over top-level container of JSON file without loading whole file:
+    yields (key, value) pairs for objects and values for arrays.
+    """
+    with open(path, encoding='utf-8') as f:
+        stream = _JsonStream(f, chunkSize)
+        opening = stream.take()
+        if opening not in ('{', '['):
+            raise ValueError('Unexpected top-level JSON value in {}'.format(path))
+        closing = '}' if opening == '{' else ']'
+        if stream.peek() == closing:
+            return
+        while True:
+            if opening == '{':
+                key = stream.value()
+                if stream.take() != ':':
+                    raise ValueError('Malformed JSON in {}'.format(path))
+                yield key, stream.value()
+            else:
+                yield stream.value()
+            separator = stream.take()
+            if separator == closing:
+                return
+            if separator != ',':
+                raise ValueError('Malformed JSON in {}'.format(path))
 
 
 def db_needs_update():
@@ -95,45 +182,83 @@ def update_db():
     # Create the database tables
     eos.db.gamedata_meta.create_all()
 
-    def _readData(minerName, jsonName, keyIdName=None):
-        compiled_data = None
+    # Everything is written in one transaction; it is a fresh DB file which is
+    # simply rebuilt if anything goes wrong, so there's no need for durability
+    for pragma in (
+        'PRAGMA journal_mode = MEMORY',
+        'PRAGMA synchronous = OFF',
+        'PRAGMA temp_store = MEMORY',
+        'PRAGMA cache_size = -65536'
+    ):
+        eos.db.gamedata_session.execute(sqlalchemy.text(pragma))
+
+    timings = []
+    buildStart = time.perf_counter()
+
+    @contextlib.contextmanager
+    def _stage(name):
+        print(name)
+        start = time.perf_counter()
+        yield
+        timings.append((name, time.perf_counter() - start))
+
+    def _iterData(minerName, jsonName, keyIdName=None):
         for i in itertools.count(0):
-            try:
-                with open(os.path.join(JSON_DIR, minerName, '{}.{}.json'.format(jsonName, i)), encoding='utf-8') as f:
-                    rawData = json.load(f)
-                    if i == 0:
-                        compiled_data = {} if type(rawData) == dict else []
-                    if type(rawData) == dict:
-                        compiled_data.update(rawData)
-                    else:
-                        compiled_data.extend(rawData)
-            except FileNotFoundError:
+            path = os.path.join(JSON_DIR, minerName, '{}.{}.json'.format(jsonName, i))
+            if not os.path.isfile(path):
                 break
+            for entry in _iterJson(path):
+                if not keyIdName:
+                    yield entry
+                    continue
+                # IDs in keys, rows in values
+                k, v = entry
+                row = {}
+                row.update(v)
+                row[keyIdName] = int(k)
+                yield row
 
-        if not keyIdName:
-            return compiled_data
-        # IDs in keys, rows in values
-        data = []
-        for k, v in compiled_data.items():
-            row = {}
-            row.update(v)
-            row[keyIdName] = int(k)
-            data.append(row)
-        return data
+    def _readData(minerName, jsonName, keyIdName):
+        # Later files take precedence over earlier ones if the same ID is met twice
+        return list({row[keyIdName]: row for row in _iterData(minerName, jsonName, keyIdName)}.values())
 
     def _addRows(data, cls, fieldMap=None):
         if fieldMap is None:
             fieldMap = {}
+        mapper = sqlalchemy.inspect(cls)
+        table = mapper.local_table
+        # Rows are keyed by names of mapped attributes (or fieldMap keys), while
+        # bulk insert needs positions of table columns
+        columns = [column.key for column in table.columns]
+        columnPositions = {column: i for i, column in enumerate(columns)}
+        attrPositions = {prop.key: columnPositions[prop.columns[0].key] for prop in mapper.column_attrs}
+        for synonym in mapper.synonyms:
+            if synonym.name in attrPositions:
+                attrPositions[synonym.key] = attrPositions[synonym.name]
+        statement = 'INSERT INTO "{}" ({}) VALUES ({})'.format(
+            table.name, ', '.join('"{}"'.format(column) for column in columns), ', '.join('?' * len(columns)))
+        # Straight to sqlite3 cursor of the session transaction, skipping ORM and
+        # SQLAlchemy statement processing altogether
+        cursor = eos.db.gamedata_session.connection().connection.cursor()
+        rows = []
         for row in data:
-            instance = cls()
+            dbRow = [None] * len(columns)
             for k, v in row.items():
+                position = attrPositions.get(fieldMap.get(k, k))
+                if position is None:
+                    continue
                 if isinstance(v, str):
                     v = v.strip()
-                setattr(instance, fieldMap.get(k, k), v)
-            eos.db.gamedata_session.add(instance)
+                dbRow[position] = v
+            rows.append(dbRow)
+            if len(rows) >= INSERT_BATCH_SIZE:
+                cursor.executemany(statement, rows)
+                rows = []
+        if rows:
+            cursor.executemany(statement, rows)
+        cursor.close()
 
     def processEveTypes():
-        print('processing evetypes')
         data = _readData('fsd_built', 'types', keyIdName='typeID')
         for row in data:
             if (
@@ -178,13 +303,14 @@ def update_db():
                     1983)  # the "container" for the abyssal environments
             ):
                 newData.append(row)
+        return newData
+
+    def addEveTypes(eveTypesData):
         map = {'typeName_en-us': 'typeName', 'description_en-us': '_description'}
         map.update({'description'+v: '_description'+v for (k, v) in eos.config.translation_mapping.items() if k != 'en'})
-        _addRows(newData, eos.gamedata.Item, fieldMap=map)
-        return newData
+        _addRows(eveTypesData, eos.gamedata.Item, fieldMap=map)
 
     def processEveGroups():
-        print('processing evegroups')
         data = _readData('fsd_built', 'groups', keyIdName='groupID')
         map = {'groupName_en-us': 'name'}
         map.update({'groupName'+v: 'name'+v for (k, v) in eos.config.translation_mapping.items() if k != 'en'})
@@ -192,14 +318,12 @@ def update_db():
         return data
 
     def processEveCategories():
-        print('processing evecategories')
         data = _readData('fsd_built', 'categories', keyIdName='categoryID')
         map = { 'categoryName_en-us': 'name' }
         map.update({'categoryName'+v: 'name'+v for (k, v) in eos.config.translation_mapping.items() if k != 'en'})
         _addRows(data, eos.gamedata.Category, fieldMap=map)
 
     def processDogmaAttributes():
-        print('processing dogmaattributes')
         data = _readData('fsd_built', 'dogmaattributes', keyIdName='attributeID')
         map = {
             'displayName_en-us': 'displayName',
@@ -207,11 +331,13 @@ def update_db():
         }
         _addRows(data, eos.gamedata.AttributeInfo, fieldMap=map)
 
-    def processDogmaTypeAttributes(eveTypesData):
-        print('processing dogmatypeattributes')
-        data = _readData('fsd_built', 'typedogma', keyIdName='typeID')
+    def processDogmaTypes(eveTypesData):
+        # Type attributes and type effects come from the same file, so it is
+        # streamed just once for both
         eveTypeIds = set(r['typeID'] for r in eveTypesData)
-        newData = []
+        attribData = []
+        effectData = []
+        seenTypes = set()
         seenKeys = set()
 
         def checkKey(key):
@@ -220,65 +346,49 @@ def update_db():
             seenKeys.add(key)
             return True
 
-        for typeData in data:
-            if typeData['typeID'] not in eveTypeIds:
+        for typeData in _iterData('fsd_built', 'typedogma', keyIdName='typeID'):
+            typeID = typeData['typeID']
+            if typeID not in eveTypeIds or typeID in seenTypes:
                 continue
+            seenTypes.add(typeID)
             for row in typeData.get('dogmaAttributes', ()):
-                row['typeID'] = typeData['typeID']
+                row['typeID'] = typeID
                 if checkKey((row['typeID'], row['attributeID'])):
-                    newData.append(row)
+                    attribData.append(row)
+            for row in typeData.get('dogmaEffects', ()):
+                row['typeID'] = typeID
+                effectData.append(row)
         for row in eveTypesData:
             for attrId, attrName in {4: 'mass', 38: 'capacity', 161: 'volume', 162: 'radius'}.items():
                 if attrName in row and checkKey((row['typeID'], attrId)):
-                    newData.append({'typeID': row['typeID'], 'attributeID': attrId, 'value': row[attrName]})
+                    attribData.append({'typeID': row['typeID'], 'attributeID': attrId, 'value': row[attrName]})
 
-        _addRows(newData, eos.gamedata.Attribute)
-        return newData
+        _addRows(attribData, eos.gamedata.Attribute)
+        _addRows(effectData, eos.gamedata.ItemEffect)
+        return attribData, effectData
 
     def processDynamicItemAttributes():
-        print('processing dynamicitemattributes')
-        data = _readData('fsd_built', 'dynamicitemattributes')
-        for mutaID, mutaData in data.items():
-            muta = eos.gamedata.DynamicItem()
-            muta.typeID = mutaID
-            muta.resultingTypeID = mutaData['inputOutputMapping'][0]['resultingType']
-            eos.db.gamedata_session.add(muta)
-
-            for x in mutaData['inputOutputMapping'][0]['applicableTypes']:
-                item = eos.gamedata.DynamicItemItem()
-                item.typeID = mutaID
-                item.applicableTypeID = x
-                eos.db.gamedata_session.add(item)
-
-            for attrID, attrData in mutaData['attributeIDs'].items():
-                attr = eos.gamedata.DynamicItemAttribute()
-                attr.typeID = mutaID
-                attr.attributeID = attrID
-                attr.min = attrData['min']
-                attr.max = attrData['max']
-                eos.db.gamedata_session.add(attr)
+        mutaData = []
+        applicableData = []
+        attrData = []
+        for mutaID, mutaRow in _iterData('fsd_built', 'dynamicitemattributes'):
+            mutaID = int(mutaID)
+            mutaData.append({
+                'typeID': mutaID,
+                'resultingTypeID': mutaRow['inputOutputMapping'][0]['resultingType']})
+            for x in mutaRow['inputOutputMapping'][0]['applicableTypes']:
+                applicableData.append({'typeID': mutaID, 'applicableTypeID': x})
+            for attrID, attrRow in mutaRow['attributeIDs'].items():
+                attrData.append({'typeID': mutaID, 'attributeID': int(attrID), 'min': attrRow['min'], 'max': attrRow['max']})
+        _addRows(mutaData, eos.gamedata.DynamicItem)
+        _addRows(applicableData, eos.gamedata.DynamicItemItem)
+        _addRows(attrData, eos.gamedata.DynamicItemAttribute)
 
     def processDogmaEffects():
-        print('processing dogmaeffects')
         data = _readData('fsd_built', 'dogmaeffects', keyIdName='effectID')
         _addRows(data, eos.gamedata.Effect, fieldMap={'resistanceAttributeID': 'resistanceID'})
 
-    def processDogmaTypeEffects(eveTypesData):
-        print('processing dogmatypeeffects')
-        data = _readData('fsd_built', 'typedogma', keyIdName='typeID')
-        eveTypeIds = set(r['typeID'] for r in eveTypesData)
-        newData = []
-        for typeData in data:
-            if typeData['typeID'] not in eveTypeIds:
-                continue
-            for row in typeData.get('dogmaEffects', ()):
-                row['typeID'] = typeData['typeID']
-                newData.append(row)
-        _addRows(newData, eos.gamedata.ItemEffect)
-        return newData
-
     def processDogmaUnits():
-        print('processing dogmaunits')
         data = _readData('fsd_built', 'dogmaunits', keyIdName='unitID')
         _addRows(data, eos.gamedata.Unit, fieldMap={
             'name': 'unitName',
@@ -286,7 +396,6 @@ def update_db():
         })
 
     def processMarketGroups():
-        print('processing marketgroups')
         data = _readData('fsd_built', 'marketgroups', keyIdName='marketGroupID')
         map = {
             'name_en-us': 'marketGroupName',
@@ -297,23 +406,19 @@ def update_db():
         _addRows(data, eos.gamedata.MarketGroup, fieldMap=map)
 
     def processMetaGroups():
-        print('processing metagroups')
         data = _readData('fsd_built', 'metagroups', keyIdName='metaGroupID')
         map = {'name_en-us': 'metaGroupName'}
         map.update({'name' + v: 'metaGroupName' + v for (k, v) in eos.config.translation_mapping.items() if k != 'en'})
         _addRows(data, eos.gamedata.MetaGroup, fieldMap=map)
 
     def processCloneGrades():
-        print('processing clonegrades')
-        data = _readData('fsd_lite', 'clonegrades')
-
         newData = []
         # December, 2017 - CCP decided to use only one set of skill levels for alpha clones. However, this is still
         # represented in the data as a skillset per race. To ensure that all skills are the same, we store them in a way
         # that we can check to make sure all races have the same skills, as well as skill levels
         check = {}
-        for ID in data:
-            for skill in data[ID]['skills']:
+        for ID, cloneData in _iterData('fsd_lite', 'clonegrades'):
+            for skill in cloneData['skills']:
                 newData.append({
                     'alphaCloneID': int(ID),
                     'alphaCloneName': 'Alpha Clone',
@@ -328,20 +433,15 @@ def update_db():
         if len(newData) == 0:
             raise Exception('Alpha Clone processing failed')
 
-        tmp = []
+        cloneParents = {}
         for row in newData:
-            if row['alphaCloneID'] not in tmp:
-                cloneParent = eos.gamedata.AlphaClone()
-                setattr(cloneParent, 'alphaCloneID', row['alphaCloneID'])
-                setattr(cloneParent, 'alphaCloneName', row['alphaCloneName'])
-                eos.db.gamedata_session.add(cloneParent)
-                tmp.append(row['alphaCloneID'])
+            cloneParents.setdefault(row['alphaCloneID'], {
+                'alphaCloneID': row['alphaCloneID'],
+                'alphaCloneName': row['alphaCloneName']})
+        _addRows(cloneParents.values(), eos.gamedata.AlphaClone)
         _addRows(newData, eos.gamedata.AlphaCloneSkill)
 
     def processTraits():
-        print('processing traits')
-        data = _readData('phobos', 'traits')
-
         def convertSection(sectionData):
             sectionLines = []
             headerText = '<b>{}</b>'.format(sectionData['header'])
@@ -354,7 +454,7 @@ def update_db():
             return sectionLine
 
         newData = []
-        for row in data:
+        for row in _iterData('phobos', 'traits'):
             try:
                 newRow = {
                     'typeID': row['typeID'],
@@ -379,13 +479,9 @@ def update_db():
         _addRows(newData, eos.gamedata.Traits, fieldMap={'traitText_en-us': 'traitText'})
 
     def processMetadata():
-        print('processing metadata')
-        data = _readData('phobos', 'metadata')
-        _addRows(data, eos.gamedata.MetaData)
+        _addRows(_iterData('phobos', 'metadata'), eos.gamedata.MetaData)
 
     def processReqSkills(eveTypesData):
-        print('processing requiredskillsfortypes')
-
         def composeReqSkills(raw):
             reqSkills = {}
             for skillTypeID, skillLevel in raw.items():
@@ -393,35 +489,23 @@ def update_db():
             return reqSkills
 
         eveTypeIds = set(r['typeID'] for r in eveTypesData)
-        data = _readData('fsd_built', 'requiredskillsfortypes')
         reqsByItem = {}
         itemsByReq = {}
-        for typeID, skillreqData in data.items():
+        for typeID, skillreqData in _iterData('fsd_built', 'requiredskillsfortypes'):
             typeID = int(typeID)
             if typeID not in eveTypeIds:
                 continue
             for skillTypeID, skillLevel in composeReqSkills(skillreqData).items():
                 reqsByItem.setdefault(typeID, {})[skillTypeID] = skillLevel
                 itemsByReq.setdefault(skillTypeID, {})[typeID] = skillLevel
-        for item in eos.db.gamedata_session.query(eos.gamedata.Item).all():
-            if item.typeID in reqsByItem:
-                item.reqskills = json.dumps(reqsByItem[item.typeID])
-            if item.typeID in itemsByReq:
-                item.requiredfor = json.dumps(itemsByReq[item.typeID])
+        # Stored in type rows, which are written after this
+        for row in eveTypesData:
+            if row['typeID'] in reqsByItem:
+                row['reqskills'] = json.dumps(reqsByItem[row['typeID']])
+            if row['typeID'] in itemsByReq:
+                row['requiredfor'] = json.dumps(itemsByReq[row['typeID']])
 
     def processReplacements(eveTypesData, eveGroupsData, dogmaTypeAttributesData, dogmaTypeEffectsData):
-        print('finding item replacements')
-
-        def compareAttrs(attrs1, attrs2):
-            # Consider items as different if they have no attrs
-            if len(attrs1) == 0 and len(attrs2) == 0:
-                return False
-            if set(attrs1) != set(attrs2):
-                return False
-            if all(attrs1[aid] == attrs2[aid] for aid in attrs1):
-                return True
-            return False
-
         skillReqAttribs = {
             182: 277,
             183: 278,
@@ -486,8 +570,10 @@ def update_db():
         for row in eveGroupsData:
             groupCategories[row['groupID']] = row['categoryID']
         # As EVE affects various types mostly depending on their group or skill requirements,
-        # we're going to group various types up this way
-        # Format: {(group ID, frozenset(skillreq, type, IDs), frozenset(type, effect, IDs): [type ID, {attribute ID: attribute value}]}
+        # we're going to group various types up this way. Items are the same only when all their
+        # attributes are the same too, so canonical form of attribute map goes into key as well,
+        # and every bucket with more than one item is a set of mutual replacements
+        # Format: {(group ID, frozenset(skillreq, type, IDs), frozenset(type, effect, IDs), frozenset((attribute ID, attribute value))): [type IDs]}
         groupedData = {}
         for row in eveTypesData:
             typeID = row['typeID']
@@ -515,25 +601,17 @@ def update_db():
             typeSkillreqs = frozenset(typesSkillReqs.get(typeID, {}))
             typeGroup = typesGroups[typeID]
             typeEffects = frozenset(typesEffects.get(typeID, ()))
-            groupData = groupedData.setdefault((typeGroup, typeSkillreqs, typeEffects), [])
-            groupData.append((typeID, typeAttribs))
-        # Format: {type ID: set(type IDs)}
-        replacements = {}
-        # Now, go through composed groups and for every item within it
-        # find items which are the same
-        for groupData in groupedData.values():
-            for type1, type2 in itertools.combinations(groupData, 2):
-                if compareAttrs(type1[1], type2[1]):
-                    replacements.setdefault(type1[0], set()).add(type2[0])
-                    replacements.setdefault(type2[0], set()).add(type1[0])
-        # Update DB session with data we generated
-        for item in eos.db.gamedata_session.query(eos.gamedata.Item).all():
-            itemReplacements = replacements.get(item.typeID)
-            if itemReplacements is not None:
-                item.replacements = ','.join('{}'.format(tid) for tid in sorted(itemReplacements))
+            typeAttribsKey = frozenset(typeAttribs.items())
+            groupedData.setdefault((typeGroup, typeSkillreqs, typeEffects, typeAttribsKey), []).append(typeID)
+        # Stored in type rows, which are written after this
+        eveTypesMap = {row['typeID']: row for row in eveTypesData}
+        for typeIDs in groupedData.values():
+            if len(typeIDs) < 2:
+                continue
+            for typeID in typeIDs:
+                eveTypesMap[typeID]['replacements'] = ','.join('{}'.format(tid) for tid in sorted(typeIDs) if tid != typeID)
 
     def processImplantSets(eveTypesData):
-        print('composing implant sets')
         # Includes only implants which can be considered part of sets, not all implants
         implant_groups = (300, 1730)
         specials = {'Genolution': ('Genolution Core Augmentation', r'CA-\d+')}
@@ -564,31 +642,43 @@ def update_db():
             data.append(row)
         _addRows(data, eos.gamedata.ImplantSet)
 
-    eveTypesData = processEveTypes()
-    eveGroupsData = processEveGroups()
-    processEveCategories()
-    processDogmaAttributes()
-    dogmaTypeAttributesData = processDogmaTypeAttributes(eveTypesData)
-    processDynamicItemAttributes()
-    processDogmaEffects()
-    dogmaTypeEffectsData = processDogmaTypeEffects(eveTypesData)
-    processDogmaUnits()
-    processMarketGroups()
-    processMetaGroups()
-    processCloneGrades()
-    processTraits()
-    processMetadata()
-
-    eos.db.gamedata_session.flush()
-    processReqSkills(eveTypesData)
-    processReplacements(eveTypesData, eveGroupsData, dogmaTypeAttributesData, dogmaTypeEffectsData)
-    processImplantSets(eveTypesData)
+    with _stage('processing evetypes'):
+        eveTypesData = processEveTypes()
+    with _stage('processing evegroups'):
+        eveGroupsData = processEveGroups()
+    with _stage('processing evecategories'):
+        processEveCategories()
+    with _stage('processing dogmaattributes'):
+        processDogmaAttributes()
+    with _stage('processing dogmatypeattributes and dogmatypeeffects'):
+        dogmaTypeAttributesData, dogmaTypeEffectsData = processDogmaTypes(eveTypesData)
+    with _stage('processing dynamicitemattributes'):
+        processDynamicItemAttributes()
+    with _stage('processing dogmaeffects'):
+        processDogmaEffects()
+    with _stage('processing dogmaunits'):
+        processDogmaUnits()
+    with _stage('processing marketgroups'):
+        processMarketGroups()
+    with _stage('processing metagroups'):
+        processMetaGroups()
+    with _stage('processing clonegrades'):
+        processCloneGrades()
+    with _stage('processing traits'):
+        processTraits()
+    with _stage('processing metadata'):
+        processMetadata()
+    with _stage('processing requiredskillsfortypes'):
+        processReqSkills(eveTypesData)
+    with _stage('finding item replacements'):
+        processReplacements(eveTypesData, eveGroupsData, dogmaTypeAttributesData, dogmaTypeEffectsData)
+    with _stage('writing evetypes'):
+        addEveTypes(eveTypesData)
+    with _stage('composing implant sets'):
+        processImplantSets(eveTypesData)
 
     # Add schema version to prevent further updates
-    metadata_schema_version = eos.gamedata.MetaData()
-    metadata_schema_version.field_name = 'schema_version'
-    metadata_schema_version.field_value = GAMEDATA_SCHEMA_VERSION
-    eos.db.gamedata_session.add(metadata_schema_version)
+    _addRows([{'field_name': 'schema_version', 'field_value': GAMEDATA_SCHEMA_VERSION}], eos.gamedata.MetaData)
 
     eos.db.gamedata_session.flush()
 
@@ -849,10 +939,14 @@ def update_db():
     hardcodeSuppressionTackleRange()
     hardcodeSovUpgradeBuffs()
 
-    eos.db.gamedata_session.commit()
-    eos.db.gamedata_engine.execute('VACUUM')
+    with _stage('committing'):
+        eos.db.gamedata_session.commit()
+    with _stage('vacuuming'):
+        eos.db.gamedata_engine.execute('VACUUM')
 
-    print('done')
+    print('done in {:.2f}s'.format(time.perf_counter() - buildStart))
+    for name, duration in timings:
+        print('  {:<55} {:>8.2f}s'.format(name, duration))
 
 
 if __name__ == '__main__':
@@ -9,6 +9,8 @@ pyfalog = Logger(__name__)
 
 debug = False
 gamedataCache = True
+# Upper bound of gamedata query cache; list results count as many entries as they hold
+gamedataCacheLimit = 50000
 saveddataCache = True
 gamedata_version = ""
 gamedata_date = ""
@@ -18,10 +18,15 @@
 # ===============================================================================
 
 import re
+import sqlite3
 import threading
+import weakref
+from urllib.request import pathname2url
 
 from sqlalchemy import MetaData, create_engine, event
+from sqlalchemy.engine.url import make_url
 from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.pool import QueuePool
 
 from . import migration
 from eos import config
@@ -56,24 +61,93 @@ else:
     gamedata_engine = create_engine(gamedata_connectionstring, echo=config.debug)
 
 
-@event.listens_for(gamedata_engine, 'connect')
 def create_functions(dbapi_connection, connection_record):
     dbapi_connection.create_function('regexp', 2, re_fn)
 
 
+event.listen(gamedata_engine, 'connect', create_functions)
+
+
 gamedata_meta = MetaData()
 gamedata_meta.bind = gamedata_engine
 GamedataSession = scoped_session(sessionmaker(bind=gamedata_engine, autoflush=False, expire_on_commit=False))
 gamedata_session = GamedataSession()
 
-gamedata_sessions = {threading.get_ident(): gamedata_session}
+# Connections handed to threads other than the one which imported eos.db
+GAMEDATA_POOL_SIZE = 4
+GAMEDATA_POOL_OVERFLOW = 4
+GAMEDATA_POOL_TIMEOUT = 30
+
+
+def _makeGamedataWorkerEngine():
+    """
+    Engine for gamedata reads done by worker threads. Gamedata file does not
+    change while pyfa is running, so it is opened read-only and immutable, which
+    lets SQLite skip file locking altogether; connections come from a bounded
+    pool. Falls back to main engine when gamedata is not a plain file.
+    """
+    if callable(gamedata_connectionstring):
+        return gamedata_engine
+    path = make_url(gamedata_connectionstring).database
+    if not path or path == ':memory:':
+        return gamedata_engine
+    uri = 'file:{}?mode=ro&immutable=1'.format(pathname2url(path))
+
+    def connect():
+        return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+    engine = create_engine(
+        "sqlite://", creator=connect, poolclass=QueuePool, pool_size=GAMEDATA_POOL_SIZE,
+        max_overflow=GAMEDATA_POOL_OVERFLOW, pool_timeout=GAMEDATA_POOL_TIMEOUT, echo=config.debug)
+    event.listen(engine, 'connect', create_functions)
+    return engine
+
+
+gamedata_worker_engine = _makeGamedataWorkerEngine()
+# Worker sessions never write, and in autocommit mode they give connection back
+# to the pool after every query instead of holding it for their lifetime
+GamedataWorkerSession = sessionmaker(
+    bind=gamedata_worker_engine, autocommit=True, autoflush=False, expire_on_commit=False)
+
+gamedata_sessions_lock = threading.Lock()
+# Worker sessions are not closed when their thread finishes, as objects they
+# loaded may still be in use (e.g. via query cache); they are reused instead
+idle_gamedata_sessions = []
+gamedata_local = threading.local()
+gamedata_local.session = gamedata_session
+
+
+class GamedataSessionLease:
+    """
+    Binds pooled gamedata session to a thread. Lease lives in thread-local
+    storage, so session goes back to the pool once thread is gone.
+    """
+
+    def __init__(self):
+        with gamedata_sessions_lock:
+            self.session = idle_gamedata_sessions.pop() if idle_gamedata_sessions else GamedataWorkerSession()
+        weakref.finalize(self, returnGamedataSession, self.session)
+
+
+def returnGamedataSession(session):
+    with gamedata_sessions_lock:
+        idle_gamedata_sessions.append(session)
 
 
 def get_gamedata_session():
-    thread_id = threading.get_ident()
-    if thread_id not in gamedata_sessions:
-        gamedata_sessions[thread_id] = GamedataSession()
-    return gamedata_sessions[thread_id]
+    session = getattr(gamedata_local, 'session', None)
+    if session is None:
+        lease = gamedata_local.lease = GamedataSessionLease()
+        session = gamedata_local.session = lease.session
+    return session
+
+
+def release_gamedata_session():
+    """Give session of current worker thread back to the pool right away"""
+    if getattr(gamedata_local, 'lease', None) is None:
+        return
+    del gamedata_local.session
+    del gamedata_local.lease
 
 
 pyfalog.debug('Getting gamedata version')
@@ -117,7 +191,7 @@ pyfalog.debug('Importing gamedata DB scheme')
 from eos.db.gamedata import alphaClones, attribute, category, effect, group, item, marketGroup, metaData, metaGroup, queries, traits, unit, dynamicAttributes, implantSet
 pyfalog.debug('Importing saveddata DB scheme')
 # noinspection PyPep8
-from eos.db.saveddata import booster, cargo, character, damagePattern, databaseRepair, drone, fighter, fit, implant, implantSet, \
+from eos.db.saveddata import booster, cargo, character, damagePattern, databaseRepair, drone, fighter, fit, fitStats, implant, implantSet, \
     miscData, mutatorMod, mutatorDrone, module, override, price, queries, skill, targetProfile, user
 
 pyfalog.debug('Importing gamedata queries')
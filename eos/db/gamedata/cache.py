@@ -0,0 +1,150 @@
+# ===============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of eos.
+#
+# eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with eos.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+import threading
+from collections import OrderedDict
+
+
+class GamedataCache:
+    """
+    LRU cache for gamedata query results. Entities (items, groups etc.) get one
+    canonical entry keyed by their ID, and any amount of alias keys (names,
+    translated names, keys of queries which returned them) which point to it;
+    aliases are dropped together with their entry.
+
+    Size is bounded by total weight of entries rather than by their count: list
+    results weigh as much as elements they hold, everything else weighs 1.
+    Queries are never run under the lock, it only guards bookkeeping.
+
+    Single lock is enough here: every locked section is a few dict operations,
+    which under GIL would not run in parallel anyway, so threads only wait for
+    each other for microseconds. Striping by key hash would not work well
+    either, as aliases of an entry hash into different stripes than the entry
+    itself, and LRU order is global.
+    """
+
+    def __init__(self, limit):
+        self.__lock = threading.Lock()
+        # canonical key: [value, weight, set of alias keys]
+        self.__entries = OrderedDict()
+        # alias key: canonical key
+        self.__aliases = {}
+        self.__weight = 0
+        self.__limit = limit
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def getWeight(value):
+        if isinstance(value, (list, tuple, set, frozenset, dict)):
+            return max(1, len(value))
+        return 1
+
+    @property
+    def limit(self):
+        return self.__limit
+
+    @limit.setter
+    def limit(self, limit):
+        with self.__lock:
+            self.__limit = limit
+            self.__evict()
+
+    def __len__(self):
+        with self.__lock:
+            return len(self.__entries)
+
+    def __contains__(self, key):
+        with self.__lock:
+            key = self.__aliases.get(key, key)
+            return key in self.__entries
+
+    def get(self, key, default=None):
+        with self.__lock:
+            key = self.__aliases.get(key, key)
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, aliases=(), replace=False):
+        """
+        Store value under canonical key. If another thread has stored something
+        there already, that value is kept unless replace is set. Returns value
+        which ended up in cache.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                entry = self.__entries[key] = [value, self.getWeight(value), set()]
+                self.__weight += entry[1]
+            else:
+                self.__entries.move_to_end(key)
+                if replace:
+                    weight = self.getWeight(value)
+                    self.__weight += weight - entry[1]
+                    entry[0] = value
+                    entry[1] = weight
+            for alias in aliases:
+                if alias == key:
+                    continue
+                oldKey = self.__aliases.get(alias)
+                if oldKey is not None and oldKey != key:
+                    oldEntry = self.__entries.get(oldKey)
+                    if oldEntry is not None:
+                        oldEntry[2].discard(alias)
+                self.__aliases[alias] = key
+                entry[2].add(alias)
+            value = entry[0]
+            self.__evict()
+            return value
+
+    def __evict(self):
+        # Newest entry is always kept, even if it alone is above the limit
+        while self.__weight > self.__limit and len(self.__entries) > 1:
+            key, (value, weight, aliases) = self.__entries.popitem(last=False)
+            self.__weight -= weight
+            for alias in aliases:
+                self.__aliases.pop(alias, None)
+            self.evictions += 1
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__aliases.clear()
+            self.__weight = 0
+
+    def resetStats(self):
+        with self.__lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def getStats(self):
+        with self.__lock:
+            return {
+                "entries": len(self.__entries),
+                "aliases": len(self.__aliases),
+                "weight": self.__weight,
+                "limit": self.__limit,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions}
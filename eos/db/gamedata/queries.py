@@ -23,27 +23,80 @@ from sqlalchemy.sql import and_, or_, select
 
 import eos.config
 from eos.db import get_gamedata_session
+from eos.db.gamedata.cache import GamedataCache
 from eos.db.gamedata.item import items_table
 from eos.db.gamedata.group import groups_table
 from eos.db.util import processEager, processWhere
 from eos.gamedata import AlphaClone, Attribute, AttributeInfo, Category, DynamicItem, Group, Item, MarketGroup, MetaData, MetaGroup, ImplantSet
 
-cache = {}
 configVal = getattr(eos.config, "gamedataCache", None)
-if configVal is True:
-    def cachedQuery(amount, *keywords):
+# Cache below is used only when query caching is on, otherwise nothing reads
+# from it and there is no point in maintaining it
+cacheEnabled = configVal is True
+cache = GamedataCache(getattr(eos.config, "gamedataCacheLimit", 50000))
+
+# Attributes of entities which are used as their alias keys in query cache, on
+# top of the ID used for canonical key
+ENTITY_ALIASES = {
+    Item: ("typeName", "name"),
+    Group: ("name",),
+    Category: ("name",),
+    MetaGroup: ("metaGroupName",),
+    AttributeInfo: ("name",)}
+
+
+def getEntityKey(entity, lookfor):
+    return entity.__name__, lookfor
+
+
+def getCachedEntity(entity, lookfor):
+    if not cacheEnabled:
+        return None
+    return cache.get(getEntityKey(entity, lookfor))
+
+
+def cacheEntity(entity, value, aliases=(), replace=False):
+    """Put entity into query cache under its ID and its names; returns cached entity"""
+    if not cacheEnabled:
+        return value
+    aliases = set(aliases)
+    for attr in ENTITY_ALIASES.get(entity, ()):
+        name = getattr(value, attr, None)
+        if name:
+            aliases.add(getEntityKey(entity, name))
+    return cache.put(getEntityKey(entity, value.ID), value, aliases=aliases, replace=replace)
+
+
+if cacheEnabled:
+    def cachedQuery(amount, *keywords, entity=None):
+        """
+        Cache results of decorated query. When entity is passed, query is a
+        lookup of a single entity by its ID or name, and all lookups resolving
+        to the same entity share one cache entry.
+        """
         def deco(function):
             def checkAndReturn(*args, **kwargs):
                 useCache = kwargs.pop("useCache", True)
-                cacheKey = []
-                cacheKey.extend(args)
-                for keyword in keywords:
-                    cacheKey.append(kwargs.get(keyword))
-
-                cacheKey = tuple(cacheKey)
-                handler = cache.get(cacheKey)
-                if handler is None or not useCache:
-                    handler = cache[cacheKey] = function(*args, **kwargs)
+                if entity is not None:
+                    cacheKey = getEntityKey(entity, args[0] if args else kwargs.get(keywords[0]))
+                else:
+                    cacheKey = [function.__name__]
+                    cacheKey.extend(args)
+                    for keyword in keywords:
+                        cacheKey.append(kwargs.get(keyword))
+                    cacheKey = tuple(cacheKey)
+
+                handler = cache.get(cacheKey) if useCache else None
+                if handler is None:
+                    handler = function(*args, **kwargs)
+                    if handler is None:
+                        return handler
+                    # Query runs without locking, so when several threads race
+                    # for the same key everyone gets the first stored result
+                    if entity is not None:
+                        handler = cacheEntity(entity, handler, aliases=(cacheKey,), replace=not useCache)
+                    else:
+                        handler = cache.put(cacheKey, handler, replace=not useCache)
 
                 return handler
 
@@ -52,11 +105,13 @@ if configVal is True:
         return deco
 
 elif callable(configVal):
-    cachedQuery = eos.config.gamedataCache
+    def cachedQuery(amount, *keywords, entity=None):
+        return configVal(amount, *keywords)
 else:
-    def cachedQuery(amount, *keywords):
+    def cachedQuery(amount, *keywords, entity=None):
         def deco(function):
             def checkAndReturn(*args, **kwargs):
+                kwargs.pop("useCache", None)
                 return function(*args, **kwargs)
 
             return checkAndReturn
@@ -64,6 +119,25 @@ else:
         return deco
 
 
+def warmUpCache(typeIDs):
+    """Load items with passed IDs into query cache in a few batched queries"""
+    if not cacheEnabled:
+        return 0
+    return len(getItemsByID(typeIDs))
+
+
+def isCacheEnabled():
+    return cacheEnabled
+
+
+def getCacheStats():
+    return cache.getStats()
+
+
+def resetCacheStats():
+    cache.resetStats()
+
+
 def sqlizeNormalString(line):
     # Escape backslashes first, as they will be as escape symbol in queries
     # Then escape percent and underscore signs
@@ -72,10 +146,7 @@ def sqlizeNormalString(line):
     return line
 
 
-itemNameMap = {}
-
-
-@cachedQuery(1, "lookfor")
+@cachedQuery(1, "lookfor", entity=Item)
 def getItem(lookfor, eager=None):
     if isinstance(lookfor, int):
         if eager is None:
@@ -83,21 +154,74 @@ def getItem(lookfor, eager=None):
         else:
             item = get_gamedata_session().query(Item).options(*processEager(eager)).filter(Item.ID == lookfor).first()
     elif isinstance(lookfor, str):
-        if lookfor in itemNameMap:
-            id = itemNameMap[lookfor]
-            if eager is None:
-                item = get_gamedata_session().query(Item).get(id)
-            else:
-                item = get_gamedata_session().query(Item).options(*processEager(eager)).filter(Item.ID == id).first()
-        else:
-            # Item names are unique, so we can use first() instead of one()
-            item = get_gamedata_session().query(Item).options(*processEager(eager)).filter(Item.typeName == lookfor).first()
-            if item is not None:
-                itemNameMap[lookfor] = item.ID
+        # Item names are unique, so we can use first() instead of one()
+        item = get_gamedata_session().query(Item).options(*processEager(eager)).filter(Item.typeName == lookfor).first()
+        # Translated names are aliases of cached items as well, so look them up too
+        if item is None and eos.config.lang != "":
+            item = get_gamedata_session().query(Item).options(*processEager(eager)).filter(Item.name == lookfor).first()
     else:
         raise TypeError("Need integer or string as argument")
     return item
 
+
+# SQLite limits amount of bound parameters per statement, so batched lookups are split into chunks
+BATCH_CHUNK_SIZE = 400
+
+
+def _chunks(seq, size=BATCH_CHUNK_SIZE):
+    seq = list(seq)
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+
+def getItemsByName(names, eager=None):
+    """
+    Resolve many item names at once. Names are matched against english name as well as
+    name in currently selected language. Returns {name: item} for all names which were
+    found; when query caching is on, resolved items are also put into query cache, so
+    that subsequent getItem() calls with the same names or IDs do not hit the database.
+    """
+    names = set(n for n in names if isinstance(n, str))
+    found = {}
+    # Take whatever we have in cache already
+    for name in list(names):
+        item = getCachedEntity(Item, name)
+        if item is not None:
+            found[name] = item
+            names.discard(name)
+    localized = eos.config.lang != ""
+    for chunk in _chunks(names):
+        if localized:
+            filter = or_(Item.typeName.in_(chunk), Item.name.in_(chunk))
+        else:
+            filter = Item.typeName.in_(chunk)
+        chunk = set(chunk)
+        for item in get_gamedata_session().query(Item).options(*processEager(eager)).filter(filter).all():
+            item = cacheEntity(Item, item)
+            for name in {item.typeName, item.name}:
+                if name in chunk and name not in found:
+                    found[name] = item
+    return found
+
+
+def getItemsByID(itemIDs, eager=None):
+    """
+    Resolve many item IDs at once. Returns {ID: item} for all IDs which were found, and
+    puts resolved items into query cache like getItemsByName() does.
+    """
+    itemIDs = set(i for i in itemIDs if isinstance(i, int))
+    found = {}
+    for itemID in list(itemIDs):
+        item = getCachedEntity(Item, itemID)
+        if item is not None:
+            found[itemID] = item
+            itemIDs.discard(itemID)
+    for chunk in _chunks(itemIDs):
+        for item in get_gamedata_session().query(Item).options(*processEager(eager)).filter(Item.ID.in_(chunk)).all():
+            found[item.ID] = cacheEntity(Item, item)
+    return found
+
+
 @cachedQuery(1, "itemIDs")
 def getItems(itemIDs, eager=None):
     if not isinstance(itemIDs, (tuple, list, set)) or not all(isinstance(t, int) for t in itemIDs):
@@ -151,24 +275,23 @@ def getItems(lookfor, eager=None):
     results = []
 
     for id in lookfor:
-        if (id, None) in cache:
-            results.append(cache.get((id, None)))
+        item = getCachedEntity(Item, id)
+        if item is not None:
+            results.append(item)
         else:
             toGet.append(id)
 
     if len(toGet) > 0:
         # Get items that aren't currently cached, and store them in the cache
         items = get_gamedata_session().query(Item).filter(Item.ID.in_(toGet)).all()
-        for item in items:
-            cache[(item.ID, None)] = item
-        results += items
+        results += [cacheEntity(Item, item) for item in items]
 
     # sort the results based on the original indexing
     results.sort(key=lambda x: lookfor.index(x.ID))
     return results
 
 
-@cachedQuery(1, "lookfor")
+@cachedQuery(1, "lookfor", entity=AlphaClone)
 def getAlphaClone(lookfor, eager=None):
     if isinstance(lookfor, int):
         if eager is None:
@@ -186,10 +309,7 @@ def getAlphaCloneList(eager=None):
     return clones
 
 
-groupNameMap = {}
-
-
-@cachedQuery(1, "lookfor")
+@cachedQuery(1, "lookfor", entity=Group)
 def getGroup(lookfor, eager=None):
     if isinstance(lookfor, int):
         if eager is None:
@@ -197,26 +317,15 @@ def getGroup(lookfor, eager=None):
         else:
             group = get_gamedata_session().query(Group).options(*processEager(eager)).filter(Group.ID == lookfor).first()
     elif isinstance(lookfor, str):
-        if lookfor in groupNameMap:
-            id = groupNameMap[lookfor]
-            if eager is None:
-                group = get_gamedata_session().query(Group).get(id)
-            else:
-                group = get_gamedata_session().query(Group).options(*processEager(eager)).filter(Group.ID == id).first()
-        else:
-            # Group names are unique, so we can use first() instead of one()
-            group = get_gamedata_session().query(Group).options(*processEager(eager)).filter(Group.name == lookfor).first()
-            if group is not None:
-                groupNameMap[lookfor] = group.ID
+        # Group names are unique, so we can use first() instead of one()
+        group = get_gamedata_session().query(Group).options(*processEager(eager)).filter(
+                Group.name == lookfor).first()
     else:
         raise TypeError("Need integer or string as argument")
     return group
 
 
-categoryNameMap = {}
-
-
-@cachedQuery(1, "lookfor")
+@cachedQuery(1, "lookfor", entity=Category)
 def getCategory(lookfor, eager=None):
     if isinstance(lookfor, int):
         if eager is None:
@@ -225,28 +334,15 @@ def getCategory(lookfor, eager=None):
             category = get_gamedata_session().query(Category).options(*processEager(eager)).filter(
                     Category.ID == lookfor).first()
     elif isinstance(lookfor, str):
-        if lookfor in categoryNameMap:
-            id = categoryNameMap[lookfor]
-            if eager is None:
-                category = get_gamedata_session().query(Category).get(id)
-            else:
-                category = get_gamedata_session().query(Category).options(*processEager(eager)).filter(
-                        Category.ID == id).first()
-        else:
-            # Category names are unique, so we can use first() instead of one()
-            category = get_gamedata_session().query(Category).options(*processEager(eager)).filter(
-                    Category.name == lookfor).first()
-            if category is not None:
-                categoryNameMap[lookfor] = category.ID
+        # Category names are unique, so we can use first() instead of one()
+        category = get_gamedata_session().query(Category).options(*processEager(eager)).filter(
+                Category.name == lookfor).first()
     else:
         raise TypeError("Need integer or string as argument")
     return category
 
 
-metaGroupNameMap = {}
-
-
-@cachedQuery(1, "lookfor")
+@cachedQuery(1, "lookfor", entity=MetaGroup)
 def getMetaGroup(lookfor, eager=None):
     if isinstance(lookfor, int):
         if eager is None:
@@ -255,19 +351,9 @@ def getMetaGroup(lookfor, eager=None):
             metaGroup = get_gamedata_session().query(MetaGroup).options(*processEager(eager)).filter(
                     MetaGroup.ID == lookfor).first()
     elif isinstance(lookfor, str):
-        if lookfor in metaGroupNameMap:
-            id = metaGroupNameMap[lookfor]
-            if eager is None:
-                metaGroup = get_gamedata_session().query(MetaGroup).get(id)
-            else:
-                metaGroup = get_gamedata_session().query(MetaGroup).options(*processEager(eager)).filter(
-                        MetaGroup.ID == id).first()
-        else:
-            # MetaGroup names are unique, so we can use first() instead of one()
-            metaGroup = get_gamedata_session().query(MetaGroup).options(*processEager(eager)).filter(
-                    MetaGroup.metaGroupName == lookfor).first()
-            if metaGroup is not None:
-                metaGroupNameMap[lookfor] = metaGroup.ID
+        # MetaGroup names are unique, so we can use first() instead of one()
+        metaGroup = get_gamedata_session().query(MetaGroup).options(*processEager(eager)).filter(
+                MetaGroup.metaGroupName == lookfor).first()
     else:
         raise TypeError("Need integer or string as argument")
     return metaGroup
@@ -277,7 +363,7 @@ def getMetaGroups():
     return get_gamedata_session().query(MetaGroup).all()
 
 
-@cachedQuery(1, "lookfor")
+@cachedQuery(1, "lookfor", entity=MarketGroup)
 def getMarketGroup(lookfor, eager=None):
     if isinstance(lookfor, int):
         if eager is None:
@@ -397,7 +483,7 @@ def getVariations(itemids, groupIDs=None, where=None, eager=None):
     return vars
 
 
-@cachedQuery(1, "attr")
+@cachedQuery(1, "attr", entity=AttributeInfo)
 def getAttributeInfo(attr, eager=None):
     if isinstance(attr, str):
         filter = AttributeInfo.name == attr
@@ -0,0 +1,49 @@
+# ===============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of eos.
+#
+# eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with eos.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from sqlalchemy import Table, Column, Boolean, DateTime, Float, ForeignKey, Index, String
+from sqlalchemy.orm import mapper
+
+from eos.db import saveddata_meta
+from eos.saveddata.fitStats import FitStats
+
+
+fitStats_table = Table("fitStats", saveddata_meta,
+                       Column("fitID", ForeignKey("fits.ID", ondelete="CASCADE"), primary_key=True),
+                       Column("fitModified", DateTime, nullable=True),
+                       Column("skillHash", String, nullable=True),
+                       Column("gamedataVersion", String, nullable=True),
+                       Column("calculated", DateTime, nullable=True),
+                       Column("dps", Float, nullable=False, default=0),
+                       Column("volley", Float, nullable=False, default=0),
+                       Column("hp", Float, nullable=False, default=0),
+                       Column("ehp", Float, nullable=False, default=0),
+                       Column("capStable", Boolean, nullable=False, default=0),
+                       Column("capState", Float, nullable=False, default=0),
+                       Column("maxSpeed", Float, nullable=False, default=0),
+                       Column("alignTime", Float, nullable=False, default=0),
+                       Column("signatureRadius", Float, nullable=False, default=0),
+                       Column("maxTargetRange", Float, nullable=False, default=0))
+
+# Covers lookups of still valid stats for many fits at once
+Index("ix_fitStats_key", fitStats_table.c.fitID, fitStats_table.c.fitModified,
+      fitStats_table.c.gamedataVersion, fitStats_table.c.skillHash)
+
+mapper(FitStats, fitStats_table)
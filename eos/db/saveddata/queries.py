@@ -19,12 +19,13 @@
 
 import sys
 
-from sqlalchemy.sql import and_
+from sqlalchemy.sql import and_, or_
 from sqlalchemy import desc, select
 from sqlalchemy import func
 
 from eos.db import saveddata_session, sd_lock
 from eos.db.saveddata.fit import fits_table, projectedFits_table
+from eos.db.saveddata.module import modules_table
 from eos.db.util import processEager, processWhere
 from eos.saveddata.price import Price
 from eos.saveddata.user import User
@@ -34,6 +35,7 @@ from eos.saveddata.targetProfile import TargetProfile
 from eos.saveddata.character import Character
 from eos.saveddata.implantSet import ImplantSet
 from eos.saveddata.fit import Fit, FitLite
+from eos.saveddata.fitStats import FitStats
 from eos.saveddata.module import Module
 from eos.saveddata.miscData import MiscData
 from eos.saveddata.override import Override
@@ -337,6 +339,54 @@ def getFitListLite():
     return fits
 
 
+def getHotTypeIDs(limit=1000):
+    """
+    Get IDs of ships and modules which are used in saved fits the most, most
+    used ones first. Used to warm up gamedata cache.
+    """
+    counts = {}
+    with sd_lock:
+        for column in (fits_table.c.shipID, modules_table.c.itemID, modules_table.c.chargeID):
+            stmt = select([column, func.count()]).where(column.isnot(None)).group_by(column)
+            for typeID, count in eos.db.saveddata_session.execute(stmt):
+                counts[typeID] = counts.get(typeID, 0) + count
+    return sorted(counts, key=counts.get, reverse=True)[:limit]
+
+
+def getFitStats(fitIDs, gamedataVersion):
+    """
+    Get stored stats which are still valid for fit modification timestamp and
+    gamedata version, along with character ID of each fit. Skill state is not
+    stored in fits table, thus it has to be checked by caller.
+    """
+    fitIDs = list(fitIDs)
+    data = []
+    with sd_lock:
+        # Split lookup to stay below SQLite bound parameter limit
+        for i in range(0, len(fitIDs), 400):
+            query = saveddata_session.query(FitStats, fits_table.c.characterID).join(
+                fits_table, and_(
+                    fits_table.c.ID == FitStats.fitID,
+                    # Fits saved before modification time was tracked have none
+                    or_(
+                        fits_table.c.modified == FitStats.fitModified,
+                        and_(fits_table.c.modified.is_(None), FitStats.fitModified.is_(None))))).filter(
+                FitStats.fitID.in_(fitIDs[i:i + 400]),
+                FitStats.gamedataVersion == gamedataVersion)
+            data.extend(query.all())
+    return data
+
+
+def removeFitStats(fitIDs=None):
+    with sd_lock:
+        query = saveddata_session.query(FitStats)
+        if fitIDs is not None:
+            query = query.filter(FitStats.fitID.in_(list(fitIDs)))
+        deleted_rows = query.delete(synchronize_session="fetch")
+    commit()
+    return deleted_rows
+
+
 @cachedQuery(Price, 1, "typeID")
 def getPrice(typeID):
     if isinstance(typeID, int):
@@ -552,6 +602,25 @@ def save(stuff):
     commit()
 
 
+def saveMany(stuff, chunkSize=200, callback=None):
+    """
+    Save many objects, committing once per chunk instead of once per object.
+    Callback is called with amount of objects saved so far after every chunk;
+    if it returns False, the rest is not saved. Returns amount of saved objects.
+    """
+    stuff = list(stuff)
+    saved = 0
+    for i in range(0, len(stuff), chunkSize):
+        chunk = stuff[i:i + chunkSize]
+        with sd_lock:
+            saveddata_session.add_all(chunk)
+        commit()
+        saved += len(chunk)
+        if callback is not None and callback(saved) is False:
+            break
+    return saved
+
+
 def remove(stuff):
     removeCachedEntry(type(stuff), stuff.ID)
     with sd_lock:
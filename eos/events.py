@@ -1,10 +1,15 @@
 # Decided to put this in it's own file so that we can easily choose not to import it (thanks to mac-deprecated builds =/)
 
 import datetime
+import threading
+from contextlib import contextmanager
+from itertools import chain
+
 from sqlalchemy.event import listen
+from sqlalchemy.orm import Session
 from sqlalchemy.orm.collections import InstrumentedList
 
-from eos.db.saveddata.fit import projectedFitSourceRel, boostedOntoRel
+from eos.db.saveddata.fit import CommandFit, ProjectedFit, projectedFitSourceRel, boostedOntoRel
 
 from eos.saveddata.fit import Fit
 from eos.saveddata.module import Module
@@ -20,6 +25,75 @@ ignored_rels = [
 ]
 
 
+# Active batches of this thread: sets of fit IDs, or None for all fits
+_batchState = threading.local()
+# Fits modified during batches, which still need modified time set
+_pendingFits = {}
+_pendingLock = threading.Lock()
+
+
+def _getBatches():
+    try:
+        return _batchState.batches
+    except AttributeError:
+        batches = _batchState.batches = []
+        return batches
+
+
+@contextmanager
+def batched(*fits):
+    """
+    Hold back modification time updates of passed fits (all fits if none are
+    passed) until the end of the block, and set it once for every fit which
+    was modified. Pending times are also set before session flush, so that
+    they are saved along with the changes.
+    """
+    batches = _getBatches()
+    batches.append(frozenset(id(fit) for fit in fits) if fits else None)
+    try:
+        yield
+    finally:
+        batches.pop()
+        stamp_pending_fits()
+
+
+def get_dependent_fits(fit):
+    """Fits which given fit boosts or is projected onto, their stats change along with it"""
+    boosted = (info.boosted_fit for info in getattr(fit, 'boostedOnto', {}).values())
+    victims = (info.victim_fit for info in getattr(fit, 'projectedOnto', {}).values())
+    return [other for other in chain(boosted, victims) if other is not None and other is not fit]
+
+
+def mark_fit_modified(fit):
+    for target in chain((fit,), get_dependent_fits(fit)):
+        _mark_modified(target)
+
+
+def _mark_modified(fit):
+    batches = _getBatches()
+    if batches:
+        fitKey = id(fit)
+        for batch in batches:
+            if batch is None or fitKey in batch:
+                with _pendingLock:
+                    _pendingFits[fitKey] = fit
+                return
+    fit.modified = datetime.datetime.now()
+
+
+def stamp_pending_fits(*args):
+    if not _pendingFits:
+        return
+    batches = _getBatches()
+    now = datetime.datetime.now()
+    with _pendingLock:
+        for fitKey, fit in list(_pendingFits.items()):
+            # Fits of batches which are still open are stamped only before flush
+            if args or not any(batch is None or fitKey in batch for batch in batches):
+                fit.modified = now
+                del _pendingFits[fitKey]
+
+
 def update_fit_modified(target, value, oldvalue, initiator):
     if not target.owner:
         return
@@ -36,7 +110,7 @@ def update_fit_modified(target, value, oldvalue, initiator):
 
         # ensure this is a fit we're dealing with
         if isinstance(parent, Fit):
-            parent.modified = datetime.datetime.now()
+            mark_fit_modified(parent)
 
 
 def apply_col_listeners(target, context):
@@ -58,7 +132,18 @@ def rel_listener(target, value, initiator):
     if not target or (isinstance(value, Module) and value.isEmpty):
         return
 
-    target.modified = datetime.datetime.now()
+    mark_fit_modified(target)
+
+
+def command_info_listener(target, value, oldvalue, initiator):
+    # Turning command fit on / off changes stats of boosted fit
+    if value != oldvalue and target.boosted_fit is not None:
+        mark_fit_modified(target.boosted_fit)
+
+
+def projection_info_listener(target, value, oldvalue, initiator):
+    if value != oldvalue and target.victim_fit is not None:
+        mark_fit_modified(target.victim_fit)
 
 
 def apply_rel_listeners(target, context):
@@ -84,3 +169,7 @@ listen(Fighter, 'load', apply_col_listeners)
 listen(Cargo, 'load', apply_col_listeners)
 listen(Implant, 'load', apply_col_listeners)
 listen(Booster, 'load', apply_col_listeners)
+listen(CommandFit.active, 'set', command_info_listener)
+listen(ProjectedFit.active, 'set', projection_info_listener)
+listen(ProjectedFit._ProjectedFit__amount, 'set', projection_info_listener)
+listen(Session, 'before_flush', stamp_pending_fits)
@@ -27,6 +27,7 @@ from sqlalchemy.orm import reconstructor
 import eos.effects
 import eos.db
 from eos.saveddata.price import Price as types_Price
+from eos.utils import calcTrace
 from .eqBase import EqBase
 
 
@@ -68,6 +69,8 @@ class Effect(EqBase):
             pyfalog.debug("Generating effect: {0} ({1}) [runTime: {2}]", self.name, self.effectID, self.runTime)
             self.__generateHandler()
 
+        if calcTrace.tracer is not None:
+            return calcTrace.tracer.wrapEffect(self, self.__handler)
         return self.__handler
 
     @property
@@ -229,6 +232,7 @@ class Item(EqBase):
     def init(self):
         self.__race = None
         self.__requiredSkills = None
+        self.__requiredSkillsClosure = None
         self.__requiredFor = None
         self.__offensive = None
         self.__assistive = None
@@ -318,6 +322,25 @@ class Item(EqBase):
                         self.__requiredSkills[skillItem] = skillLevel
         return self.__requiredSkills
 
+    @property
+    def requiredSkillsClosure(self):
+        """
+        Flat tuple of (skill ID, level) pairs of direct and indirect
+        requirements, with the highest level needed for every skill.
+        """
+        if self.__requiredSkillsClosure is None:
+            # Empty until calculated, in case requirements ever loop
+            self.__requiredSkillsClosure = ()
+            levels = {}
+            for skillItem, skillLevel in self.requiredSkills.items():
+                if skillLevel > levels.get(skillItem.ID, 0):
+                    levels[skillItem.ID] = skillLevel
+                for subSkillID, subSkillLevel in skillItem.requiredSkillsClosure:
+                    if subSkillLevel > levels.get(subSkillID, 0):
+                        levels[subSkillID] = subSkillLevel
+            self.__requiredSkillsClosure = tuple(levels.items())
+        return self.__requiredSkillsClosure
+
     @property
     def requiredFor(self):
         if self.__requiredFor is None:
@@ -119,6 +119,12 @@ class ModifiedAttributeDict(MutableMapping):
         #   modifying item, operation, stacking group, pre-resist amount,
         #   post-resist amount, affects result or not)}}
         self.__affectedBy = {}
+        # Same afflictions indexed by modifying entity
+        # Format:
+        # {modifying item: [(
+        #   attr name, modifying fit, operation, stacking group,
+        #   pre-resist amount, post-resist amount, affects result or not)]}
+        self.__afflictors = {}
         # Overrides (per item)
         self.__overrides = {}
         # Mutators (per module)
@@ -138,6 +144,7 @@ class ModifiedAttributeDict(MutableMapping):
         self.__intermediary.clear()
         self.__modified.clear()
         self.__affectedBy.clear()
+        self.__afflictors.clear()
         self.__forced.clear()
         self.__preAssigns.clear()
         self.__preIncreases.clear()
@@ -433,6 +440,12 @@ class ModifiedAttributeDict(MutableMapping):
     def iterAfflictions(self):
         return self.__affectedBy.__iter__()
 
+    def getAfflictorAfflictions(self, afflictor):
+        return self.__afflictors.get(afflictor, ())
+
+    def iterAfflictors(self):
+        return self.__afflictors.__iter__()
+
     def __afflict(self, attributeName, operator, stackingGroup, preResAmount, postResAmount, used=True):
         """Add modifier to list of things affecting current item"""
         # Do nothing if no fit is assigned
@@ -460,6 +473,10 @@ class ModifiedAttributeDict(MutableMapping):
 
         # Add current affliction to list
         affs.append((modifier, operator, stackingGroup, preResAmount, postResAmount, used))
+        afflictorAffs = self.__afflictors.get(modifier)
+        if afflictorAffs is None:
+            afflictorAffs = self.__afflictors[modifier] = []
+        afflictorAffs.append((attributeName, fit, operator, stackingGroup, preResAmount, postResAmount, used))
 
     def preAssign(self, attributeName, value, **kwargs):
         """Overwrites original value of the entity with given one, allowing further modification"""
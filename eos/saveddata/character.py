@@ -17,7 +17,9 @@
 # along with eos.  If not, see <http://www.gnu.org/licenses/>.
 # ===============================================================================
 
+import hashlib
 import time
+from copy import deepcopy
 
 from logbook import Logger
 from itertools import chain
@@ -36,6 +38,8 @@ class Character:
     __itemList = None
     __itemIDMap = None
     __itemNameMap = None
+    # Character this one was copied from for calculation, see getCalcCopy()
+    calcSource = None
 
     def __init__(self, name, defaultLevel=None, initSkills=True):
         self.savedName = name
@@ -229,10 +233,25 @@ class Character:
 
         return skill
 
+    def getSkillLevels(self):
+        """Map of skill ID to its current level, for skills character has entries for"""
+        return {skill.itemID: skill.level for skill in self.__skills}
+
     @property
     def implants(self):
         return self.__implants
 
+    def getSkillStateHash(self):
+        """
+        Digest of character state which affects fit stats - skill levels (as
+        they are now, including unsaved ones), alpha clone and implants.
+        """
+        state = (
+            self.alphaCloneID,
+            sorted((skill.itemID, skill.level) for skill in self.__skills),
+            sorted((implant.itemID, implant.active) for implant in self.__implants))
+        return hashlib.sha1(repr(state).encode('utf-8')).hexdigest()
+
     @property
     def isDirty(self):
         return len(self.dirtySkills) > 0
@@ -292,6 +311,23 @@ class Character:
 
         return copy
 
+    def getCalcCopy(self):
+        """
+        Get copy of the character which can be used to calculate fits with
+        changed skill levels. The copy is never attached to saveddata session.
+        """
+        copy = Character("%s copy" % self.name, initSkills=False)
+        copy.calcSource = self
+        copy.alphaClone = self.alphaClone
+        copy.secStatus = self.secStatus
+
+        for skill in self.skills:
+            copy.addSkill(Skill(copy, skill.itemID, skill.level, False, skill.learned))
+        for implant in self.implants:
+            copy.implants.append(deepcopy(implant))
+
+        return copy
+
     @validates("ID", "name", "ownerID")
     def validator(self, key, val):
         map = {
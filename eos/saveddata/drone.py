@@ -19,7 +19,6 @@
 
 import math
 
-from copy import deepcopy
 from logbook import Logger
 from sqlalchemy.orm import reconstructor, validates
 
@@ -30,6 +29,7 @@ from eos.saveddata.mutatedMixin import MutatedMixin, MutaError
 from eos.saveddata.mutator import MutatorDrone
 from eos.utils.cycles import CycleInfo
 from eos.utils.default import DEFAULT
+from eos.utils.statCache import cachedStat, clearStatCache
 from eos.utils.stats import DmgTypes, RRTypes
 
 
@@ -79,11 +79,6 @@ class Drone(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut, Mu
     def build(self):
         """ Build object. Assumes proper and valid item already set """
         self.__charge = None
-        self.__baseVolley = None
-        self.__baseRRAmount = None
-        self.__miningYield = None
-        self.__miningDrain = None
-        self.__ehp = None
         self.__itemModifiedAttributes = ModifiedAttributeDict()
         self.__itemModifiedAttributes.original = self._item.attributes
         self.__itemModifiedAttributes.overrides = self._item.overrides
@@ -163,17 +158,17 @@ class Drone(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut, Mu
     def getVolleyParameters(self, targetProfile=None):
         if not self.dealsDamage or self.amountActive <= 0:
             return {0: DmgTypes.default()}
-        if self.__baseVolley is None:
-            dmgGetter = self.getModifiedChargeAttr if self.hasAmmo else self.getModifiedItemAttr
-            dmgMult = self.amountActive * (self.getModifiedItemAttr("damageMultiplier", 1))
-            self.__baseVolley = DmgTypes(
-                em=(dmgGetter("emDamage", 0)) * dmgMult,
-                thermal=(dmgGetter("thermalDamage", 0)) * dmgMult,
-                kinetic=(dmgGetter("kineticDamage", 0)) * dmgMult,
-                explosive=(dmgGetter("explosiveDamage", 0)) * dmgMult)
-        volley = deepcopy(self.__baseVolley)
-        volley.profile = targetProfile
-        return {0: volley}
+        return {0: self.__getBaseVolley(self.amountActive).applyProfile(targetProfile)}
+
+    @cachedStat
+    def __getBaseVolley(self, amount):
+        dmgGetter = self.getModifiedChargeAttr if self.hasAmmo else self.getModifiedItemAttr
+        dmgMult = amount * (self.getModifiedItemAttr("damageMultiplier", 1))
+        return DmgTypes(
+            em=(dmgGetter("emDamage", 0)) * dmgMult,
+            thermal=(dmgGetter("thermalDamage", 0)) * dmgMult,
+            kinetic=(dmgGetter("kineticDamage", 0)) * dmgMult,
+            explosive=(dmgGetter("explosiveDamage", 0)) * dmgMult)
 
     def getVolley(self, targetProfile=None):
         return self.getVolleyParameters(targetProfile=targetProfile)[0]
@@ -200,20 +195,23 @@ class Drone(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut, Mu
         amount = self.amount if ignoreState else self.amountActive
         if amount <= 0:
             return {}
-        if self.__baseRRAmount is None:
-            self.__baseRRAmount = {}
-            hullAmount = self.getModifiedItemAttr("structureDamageAmount", 0)
-            armorAmount = self.getModifiedItemAttr("armorDamageAmount", 0)
-            shieldAmount = self.getModifiedItemAttr("shieldBonus", 0)
-            if shieldAmount:
-                self.__baseRRAmount[0] = RRTypes(
-                    shield=shieldAmount * amount,
-                    armor=0, hull=0, capacitor=0)
-            if armorAmount or hullAmount:
-                self.__baseRRAmount[self.cycleTime] = RRTypes(
-                    shield=0, armor=armorAmount * amount,
-                    hull=hullAmount * amount, capacitor=0)
-        return self.__baseRRAmount
+        return self.__getBaseRRAmount(amount)
+
+    @cachedStat
+    def __getBaseRRAmount(self, amount):
+        baseRRAmount = {}
+        hullAmount = self.getModifiedItemAttr("structureDamageAmount", 0)
+        armorAmount = self.getModifiedItemAttr("armorDamageAmount", 0)
+        shieldAmount = self.getModifiedItemAttr("shieldBonus", 0)
+        if shieldAmount:
+            baseRRAmount[0] = RRTypes(
+                shield=shieldAmount * amount,
+                armor=0, hull=0, capacitor=0)
+        if armorAmount or hullAmount:
+            baseRRAmount[self.cycleTime] = RRTypes(
+                shield=0, armor=armorAmount * amount,
+                hull=hullAmount * amount, capacitor=0)
+        return baseRRAmount
 
     def getRemoteReps(self, ignoreState=False):
         rrDuringCycle = RRTypes(0, 0, 0, 0)
@@ -239,17 +237,14 @@ class Drone(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut, Mu
     def getMiningYPS(self, ignoreState=False):
         if not ignoreState and self.amountActive <= 0:
             return 0
-        if self.__miningYield is None:
-            self.__miningYield, self.__miningDrain = self.__calculateMining()
-        return self.__miningYield
+        return self.__calculateMining()[0]
 
     def getMiningDPS(self, ignoreState=False):
         if not ignoreState and self.amountActive <= 0:
             return 0
-        if self.__miningDrain is None:
-            self.__miningYield, self.__miningDrain = self.__calculateMining()
-        return self.__miningDrain
+        return self.__calculateMining()[1]
 
+    @cachedStat
     def __calculateMining(self):
         if self.mines is True:
             getter = self.getModifiedItemAttr
@@ -268,6 +263,7 @@ class Drone(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut, Mu
             return 0, 0
 
     @property
+    @cachedStat
     def maxRange(self):
         attrs = ("shieldTransferRange", "powerTransferRange",
                  "energyDestabilizationRange", "empFieldRange",
@@ -291,14 +287,11 @@ class Drone(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut, Mu
         return hp
 
     @property
+    @cachedStat
     def ehp(self):
-        if self.__ehp is None:
-            if self.owner is None or self.owner.damagePattern is None:
-                ehp = self.hp
-            else:
-                ehp = self.owner.damagePattern.calculateEhp(self)
-            self.__ehp = ehp
-        return self.__ehp
+        if self.owner is None or self.owner.damagePattern is None:
+            return self.hp
+        return self.owner.damagePattern.calculateEhp(self)
 
     def calculateShieldRecharge(self):
         capacity = self.getModifiedItemAttr("shieldCapacity")
@@ -309,6 +302,7 @@ class Drone(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut, Mu
     # Fscking ship scanners. If you find any other falloff attributes,
     # Put them in the attrs tuple.
     @property
+    @cachedStat
     def falloff(self):
         attrs = ("falloff", "falloffEffectiveness")
         for attr in attrs:
@@ -331,12 +325,12 @@ class Drone(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut, Mu
         else:
             return val
 
+    @property
+    def statGeneration(self):
+        return getattr(self.owner, 'statGeneration', None)
+
     def clear(self):
-        self.__baseVolley = None
-        self.__baseRRAmount = None
-        self.__miningYield = None
-        self.__miningDrain = None
-        self.__ehp = None
+        clearStatCache(self)
         self.itemModifiedAttributes.clear()
         self.chargeModifiedAttributes.clear()
 
@@ -19,7 +19,6 @@
 
 import math
 
-from copy import deepcopy
 from logbook import Logger
 from sqlalchemy.orm import reconstructor, validates
 
@@ -30,8 +29,9 @@ from eos.modifiedAttributeDict import ChargeAttrShortcut, ItemAttrShortcut, Modi
 from eos.saveddata.fighterAbility import FighterAbility
 from eos.utils.cycles import CycleInfo, CycleSequence
 from eos.utils.default import DEFAULT
+from eos.utils.statCache import cachedStat, clearStatCache
 from eos.utils.float import floatUnerr
-from eos.utils.stats import DmgTypes
+from eos.utils.stats import DmgAccumulator, DmgTypes
 
 
 pyfalog = Logger(__name__)
@@ -95,9 +95,6 @@ class Fighter(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut):
     def build(self):
         """ Build object. Assumes proper and valid item already set """
         self.__charge = None
-        self.__baseVolley = None
-        self.__miningyield = None
-        self.__ehp = None
         self.__itemModifiedAttributes = ModifiedAttributeDict()
         self.__chargeModifiedAttributes = ModifiedAttributeDict()
 
@@ -194,20 +191,18 @@ class Fighter(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut):
     def getVolleyParametersPerEffect(self, targetProfile=None):
         if not self.active or self.amount <= 0:
             return {}
-        if self.__baseVolley is None:
-            self.__baseVolley = {}
-            for ability in self.abilities:
-                # Not passing resists here as we want to calculate and store base volley
-                self.__baseVolley[ability.effectID] = {0: ability.getVolley()}
         adjustedVolleys = {}
-        for effectID, effectData in self.__baseVolley.items():
+        for effectID, effectData in self.__getBaseVolley().items():
             adjustedVolleys[effectID] = {}
             for volleyTime, baseVolley in effectData.items():
-                adjustedVolley = deepcopy(baseVolley)
-                adjustedVolley.profile = targetProfile
-                adjustedVolleys[effectID][volleyTime] = adjustedVolley
+                adjustedVolleys[effectID][volleyTime] = baseVolley.applyProfile(targetProfile)
         return adjustedVolleys
 
+    @cachedStat
+    def __getBaseVolley(self):
+        # Not passing resists here as we want to calculate and store base volley
+        return {ability.effectID: {0: ability.getVolley()} for ability in self.abilities}
+
     def getVolleyPerEffect(self, targetProfile=None):
         volleyParams = self.getVolleyParametersPerEffect(targetProfile=targetProfile)
         volleyMap = {}
@@ -217,16 +212,13 @@ class Fighter(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut):
 
     def getVolley(self, targetProfile=None):
         volleyParams = self.getVolleyParametersPerEffect(targetProfile=targetProfile)
-        volley = DmgTypes.default()
+        volley = DmgAccumulator()
         for volleyData in volleyParams.values():
-            volley += volleyData[0]
-        return volley
+            volley.add(volleyData[0])
+        return volley.result()
 
     def getDps(self, targetProfile=None):
-        dps = DmgTypes.default()
-        for subdps in self.getDpsPerEffect(targetProfile=targetProfile).values():
-            dps += subdps
-        return dps
+        return DmgTypes.sum(self.getDpsPerEffect(targetProfile=targetProfile).values())
 
     def getDpsPerEffect(self, targetProfile=None):
         if not self.active or self.amount <= 0:
@@ -262,6 +254,7 @@ class Fighter(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut):
             for a in self.abilities
             if a.numShots == 0 and a.cycleTime > 0}
 
+    @cachedStat
     def getCycleParametersPerEffect(self, reloadOverride=None):
         factorReload = reloadOverride if reloadOverride is not None else self.owner.factorReload
         # Assume it can cycle infinitely
@@ -308,6 +301,7 @@ class Fighter(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut):
         return cycleParams
 
     @property
+    @cachedStat
     def maxRange(self):
         attrs = ("shieldTransferRange", "powerTransferRange",
                  "energyDestabilizationRange", "empFieldRange",
@@ -326,6 +320,7 @@ class Fighter(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut):
     # Fscking ship scanners. If you find any other falloff attributes,
     # Put them in the attrs tuple.
     @property
+    @cachedStat
     def falloff(self):
         attrs = ("falloff", "falloffEffectiveness")
         for attr in attrs:
@@ -342,14 +337,11 @@ class Fighter(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut):
         return hp
 
     @property
+    @cachedStat
     def ehp(self):
-        if self.__ehp is None:
-            if self.owner is None or self.owner.damagePattern is None:
-                ehp = self.hp
-            else:
-                ehp = self.owner.damagePattern.calculateEhp(self)
-            self.__ehp = ehp
-        return self.__ehp
+        if self.owner is None or self.owner.damagePattern is None:
+            return self.hp
+        return self.owner.damagePattern.calculateEhp(self)
 
     def calculateShieldRecharge(self):
         capacity = self.getModifiedItemAttr("shieldCapacity")
@@ -369,10 +361,12 @@ class Fighter(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut):
         else:
             return val
 
+    @property
+    def statGeneration(self):
+        return getattr(self.owner, 'statGeneration', None)
+
     def clear(self):
-        self.__baseVolley = None
-        self.__miningyield = None
-        self.__ehp = None
+        clearStatCache(self)
         self.itemModifiedAttributes.clear()
         self.chargeModifiedAttributes.clear()
         [x.clear() for x in self.abilities]
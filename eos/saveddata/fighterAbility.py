@@ -129,8 +129,7 @@ class FighterAbility:
             exp = self.fighter.getModifiedItemAttr("{}DamageExp".format(self.attrPrefix), 0)
         dmgMult = self.fighter.amount * self.fighter.getModifiedItemAttr("{}DamageMultiplier".format(self.attrPrefix), 1)
         volley = DmgTypes(em=em * dmgMult, thermal=therm * dmgMult, kinetic=kin * dmgMult, explosive=exp * dmgMult)
-        volley.profile = targetProfile
-        return volley
+        return volley.applyProfile(targetProfile)
 
     def getDps(self, targetProfile=None, cycleTimeOverride=None):
         volley = self.getVolley(targetProfile=targetProfile)
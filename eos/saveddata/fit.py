@@ -25,6 +25,7 @@ from math import ceil, log, sqrt
 
 from logbook import Logger
 from sqlalchemy.orm import reconstructor, validates
+from sqlalchemy.orm.attributes import set_committed_value
 
 import eos.db
 from eos import capSim
@@ -39,8 +40,10 @@ from eos.saveddata.damagePattern import DamagePattern
 from eos.saveddata.module import Module
 from eos.saveddata.ship import Ship
 from eos.saveddata.targetProfile import TargetProfile
+from eos.utils import calcTrace
 from eos.utils.float import floatUnerr
-from eos.utils.stats import DmgTypes, RRTypes
+from eos.utils.statCache import cachedStat, nextGeneration
+from eos.utils.stats import DmgAccumulator, DmgTypes, RRTypes
 
 pyfalog = Logger(__name__)
 
@@ -62,10 +65,27 @@ class FitLite:
         return 'FitLite(ID={})'.format(self.ID)
 
 
+class CommandBonusCollector:
+    """
+    Stands in for the boosted fit when gang effects of command fit are run,
+    collecting buffs they provide instead of applying them anywhere.
+    """
+
+    def __init__(self):
+        self.bonuses = {}
+
+    def addCommandBonus(self, warfareBuffID, value, module, effect, runTime="normal"):
+        # Same merging rules as in Fit.addCommandBonus
+        if warfareBuffID not in self.bonuses or abs(self.bonuses[warfareBuffID][1]) < abs(value):
+            self.bonuses[warfareBuffID] = (runTime, value, module, effect)
+
+
 class Fit:
     """Represents a fitting, with modules, ship, implants, etc."""
 
     PEAK_RECHARGE = 0.25
+    # Fit this one was copied from for calculation, see getCalcCopy()
+    calcSource = None
 
     def __init__(self, ship=None, name=""):
         """Initialize a fit from the program"""
@@ -134,31 +154,19 @@ class Fit:
 
     def build(self):
         self.__extraDrains = []
-        self.__ehp = None
-        self.__weaponDpsMap = {}
-        self.__weaponVolleyMap = {}
-        self.__remoteRepMap = {}
-        self.__minerYield = None
-        self.__droneYield = None
-        self.__minerDrain = None
-        self.__droneDrain = None
-        self.__droneDps = None
-        self.__droneVolley = None
-        self.__sustainableTank = None
-        self.__effectiveSustainableTank = None
-        self.__effectiveTank = None
+        # Stats derived from calculated attributes of the fit and its items
+        # are cached for this generation, see eos.utils.statCache
+        self.statGeneration = nextGeneration()
         self.__calculated = False
-        self.__capStable = None
-        self.__capState = None
-        self.__capUsed = None
-        self.__capRecharge = None
-        self.__savedCapSimData = {}
         self.__calculatedTargets = []
         self.factorReload = False
         self.boostsFits = set()
         self.gangBoosts = None
         self.__ecmProjectedList = []
         self.commandBonuses = {}
+        # Buffs this fit provides as command fit, as (skill state, buffs) of
+        # the current calculation; cleared together with calculated state
+        self.__commandBonusCache = None
         # Reps received, as a list of (amount, cycle time in seconds)
         self._hullRr = []
         self._armorRr = []
@@ -167,19 +175,9 @@ class Fit:
         self._shieldRr = []
 
     def clearFactorReloadDependentData(self):
-        # Here we clear all data known to rely on cycle parameters
-        # (which, in turn, relies on factor reload flag)
-        self.__weaponDpsMap.clear()
-        self.__droneDps = None
-        self.__remoteRepMap.clear()
-        self.__capStable = None
-        self.__capState = None
-        self.__capUsed = None
-        self.__capRecharge = None
-        self.__savedCapSimData.clear()
-        # Ancillary tank modules affect this
-        self.__sustainableTank = None
-        self.__effectiveSustainableTank = None
+        # Cycle parameters of items rely on factor reload flag, and many stats
+        # rely on them, so we just drop all the derived stats
+        self.statGeneration = nextGeneration()
 
     @property
     def targetProfile(self):
@@ -200,10 +198,6 @@ class Fit:
         else:
             self.__userTargetProfile = targetProfile
             self.__builtinTargetProfileID = None
-        self.__weaponDpsMap = {}
-        self.__weaponVolleyMap = {}
-        self.__droneDps = None
-        self.__droneVolley = None
 
     @property
     def damagePattern(self):
@@ -226,8 +220,8 @@ class Fit:
         else:
             self.__userDamagePattern = damagePattern
             self.__builtinDamagePatternID = None
-        self.__ehp = None
-        self.__effectiveTank = None
+        # EHP of fit and its items depends on damage pattern
+        self.statGeneration = nextGeneration()
 
     @property
     def isInvalid(self):
@@ -322,18 +316,27 @@ class Fit:
 
     @property
     def projectedFits(self):
+        if self.calcSource is not None:
+            # Self-projection of source fit becomes self-projection of its copy
+            return [self if fit is self.calcSource else fit for fit in self.calcSource.projectedFits]
         # only in extreme edge cases will the fit be invalid, but to be sure do
         # not return them.
         return [fit for fit in list(self.projectedFitDict.values()) if not fit.isInvalid]
 
     @property
     def commandFits(self):
+        if self.calcSource is not None:
+            return self.calcSource.commandFits
         return [fit for fit in list(self.commandFitDict.values()) if not fit.isInvalid]
 
     def getProjectionInfo(self, fitID):
+        if self.calcSource is not None:
+            return self.calcSource.getProjectionInfo(fitID)
         return self.projectedOnto.get(fitID, None)
 
     def getCommandInfo(self, fitID):
+        if self.calcSource is not None:
+            return self.calcSource.getCommandInfo(fitID)
         return self.boostedOnto.get(fitID, None)
 
     @property
@@ -345,24 +348,29 @@ class Fit:
         return self.__projectedFighters
 
     def getWeaponDps(self, spoolOptions=None):
-        if spoolOptions not in self.__weaponDpsMap:
-            self.calculateWeaponDmgStats(spoolOptions)
-        return self.__weaponDpsMap[spoolOptions]
+        return self.getRawWeaponDps(spoolOptions=spoolOptions).applyProfile(self.targetProfile)
 
     def getWeaponVolley(self, spoolOptions=None):
-        if spoolOptions not in self.__weaponVolleyMap:
-            self.calculateWeaponDmgStats(spoolOptions)
-        return self.__weaponVolleyMap[spoolOptions]
+        return self.getRawWeaponVolley(spoolOptions=spoolOptions).applyProfile(self.targetProfile)
 
     def getDroneDps(self):
-        if self.__droneDps is None:
-            self.calculateDroneDmgStats()
-        return self.__droneDps
+        return self.getRawDroneDps().applyProfile(self.targetProfile)
 
     def getDroneVolley(self):
-        if self.__droneVolley is None:
-            self.calculateDroneDmgStats()
-        return self.__droneVolley
+        return self.getRawDroneVolley().applyProfile(self.targetProfile)
+
+    # Raw damage getters return stats before application of target profile
+    def getRawWeaponDps(self, spoolOptions=None):
+        return self.calculateWeaponDmgStats(spoolOptions)[1]
+
+    def getRawWeaponVolley(self, spoolOptions=None):
+        return self.calculateWeaponDmgStats(spoolOptions)[0]
+
+    def getRawDroneDps(self):
+        return self.calculateDroneDmgStats()[1]
+
+    def getRawDroneVolley(self):
+        return self.calculateDroneDmgStats()[0]
 
     def getTotalDps(self, spoolOptions=None):
         return self.getDroneDps() + self.getWeaponDps(spoolOptions=spoolOptions)
@@ -372,31 +380,19 @@ class Fit:
 
     @property
     def minerYield(self):
-        if self.__minerYield is None:
-            self.calculatemining()
-
-        return self.__minerYield
+        return self.calculatemining()[0]
 
     @property
     def minerDrain(self):
-        if self.__minerDrain is None:
-            self.calculatemining()
-
-        return self.__minerDrain
+        return self.calculatemining()[1]
 
     @property
     def droneYield(self):
-        if self.__droneYield is None:
-            self.calculatemining()
-
-        return self.__droneYield
+        return self.calculatemining()[2]
 
     @property
     def droneDrain(self):
-        if self.__droneDrain is None:
-            self.calculatemining()
-
-        return self.__droneDrain
+        return self.calculatemining()[3]
 
     @property
     def totalYield(self):
@@ -512,26 +508,10 @@ class Fit:
         return True
 
     def clear(self, projected=False, command=False):
-        self.__effectiveTank = None
-        self.__weaponDpsMap = {}
-        self.__weaponVolleyMap = {}
-        self.__remoteRepMap = {}
-        self.__minerYield = None
-        self.__droneYield = None
-        self.__minerDrain = None
-        self.__droneDrain = None
-        self.__effectiveSustainableTank = None
-        self.__sustainableTank = None
-        self.__droneDps = None
-        self.__droneVolley = None
-        self.__ehp = None
+        self.statGeneration = nextGeneration()
         self.__calculated = False
-        self.__capStable = None
-        self.__capState = None
-        self.__capUsed = None
-        self.__capRecharge = None
-        self.__savedCapSimData.clear()
         self.__ecmProjectedList = []
+        self.__commandBonusCache = None
         # self.commandBonuses = {}
 
         del self.__calculatedTargets[:]
@@ -600,11 +580,28 @@ class Fit:
         if warfareBuffID not in self.commandBonuses or abs(self.commandBonuses[warfareBuffID][1]) < abs(value):
             self.commandBonuses[warfareBuffID] = (runTime, value, module, effect)
 
+    def __getCommandBonuses(self):
+        """
+        Buffs this fit provides to fits under its command. Gang effects are run
+        only once per calculation of this fit and character skill state.
+        """
+        skillState = self.character.getSkillStateHash() if self.character is not None else None
+        if self.__commandBonusCache is None or self.__commandBonusCache[0] != skillState:
+            collector = CommandBonusCollector()
+            for runTime in ("early", "normal", "late"):
+                for module in self.modules:
+                    module.calculateModifiedAttributes(collector, runTime, False, True)
+            self.__commandBonusCache = (skillState, collector.bonuses)
+        return self.__commandBonusCache[1]
+
+    def __applyCommandBonuses(self, targetFit):
+        for warfareBuffID, (runTime, value, module, effect) in self.__getCommandBonuses().items():
+            targetFit.addCommandBonus(warfareBuffID, value, module, effect, runTime)
+
     def addProjectedEcm(self, strength):
         self.__ecmProjectedList.append(strength)
 
     def __runCommandBoosts(self, runTime="normal"):
-        pyfalog.debug("Applying gang boosts for {0}", repr(self))
         for warfareBuffID in list(self.commandBonuses.keys()):
             # Unpack all data required to run effect properly
             effect_runTime, value, thing, effect = self.commandBonuses[warfareBuffID]
@@ -975,8 +972,14 @@ class Fit:
                 The type of calculation our current iteration is in. This helps us determine the interactions between
                 fits that rely on others for proper calculations
         """
-        pyfalog.info("Starting fit calculation on: {0}, calc: {1}", repr(self), CalcType(type).name)
+        tracer = calcTrace.tracer
+        if tracer is None:
+            self.__calculateModifiedAttributes(targetFit, type)
+            return
+        with tracer.fitCalculation(self, targetFit, type):
+            self.__calculateModifiedAttributes(targetFit, type)
 
+    def __calculateModifiedAttributes(self, targetFit, type):
         # If we are projecting this fit onto another one, collect the projection info for later use
 
         # We also deal with self-projection here by setting self as a copy (to get a new fit object) to apply onto original fit
@@ -995,7 +998,6 @@ class Fit:
                     value.boosted_fit.__resetDependentCalcs()
 
         if targetFit and type == CalcType.PROJECTED:
-            pyfalog.debug("Calculating projections from {0} to target {1}", repr(self), repr(targetFit))
             projectionInfo = self.getProjectionInfo(targetFit.ID)
 
         # Start applying any command fits that we may have.
@@ -1006,7 +1008,7 @@ class Fit:
             for fit in self.commandFits:
                 commandInfo = fit.getCommandInfo(self.ID)
                 # Continue loop if we're trying to apply ourselves or if this fit isn't active
-                if not commandInfo.active or self == commandInfo.booster_fit:
+                if not commandInfo.active or commandInfo.booster_fit in (self, self.calcSource):
                     continue
 
                 commandInfo.booster_fit.calculateModifiedAttributes(self, CalcType.COMMAND)
@@ -1028,11 +1030,14 @@ class Fit:
         # command stuffs. ninja edit: this is probably already being
         # done with the calculated conditional in the calc loop
         if self.__calculated and type == CalcType.LOCAL:
-            pyfalog.debug("Fit has already been calculated and is local, returning: {0}", self)
+            return
+
+        # Calculated command fits only need to hand their buffs over
+        if self.__calculated and type == CalcType.COMMAND:
+            self.__applyCommandBonuses(targetFit)
             return
 
         if not self.__calculated:
-            pyfalog.info("Fit is not yet calculated; will be running local calcs for {}".format(repr(self)))
             self.clear()
 
         # Loop through our run times here. These determine which effects are run in which order.
@@ -1070,12 +1075,6 @@ class Fit:
                         self.register(item)
                         item.calculateModifiedAttributes(self, runTime, False)
 
-                    # Run command effects against target fit. We only have to worry about modules
-                    if type == CalcType.COMMAND and item in self.modules:
-                        # Apply the gang boosts to target fit
-                        # targetFit.register(item, origin=self)
-                        item.calculateModifiedAttributes(targetFit, runTime, False, True)
-
             # pyfalog.debug("Command Bonuses: {}".format(self.commandBonuses))
 
             # If we are calculating our local or projected fit and have command bonuses, apply them
@@ -1089,11 +1088,16 @@ class Fit:
 
         # Recursive command ships (A <-> B) get marked as calculated, which means that they aren't recalced when changing
         # tabs. See GH issue 1193
-        if type == CalcType.COMMAND and targetFit in self.commandFits:
-            pyfalog.debug("{} is in the command listing for COMMAND ({}), do not mark self as calculated (recursive)".format(repr(targetFit), repr(self)))
-        else:
+        if type != CalcType.COMMAND or targetFit not in self.commandFits:
             self.__calculated = True
 
+        # Apply the gang boosts to target fit, they are collected off fully calculated modules
+        if type == CalcType.COMMAND:
+            self.__applyCommandBonuses(targetFit)
+        # Drop stats which might have been requested while attributes were
+        # being modified
+        self.statGeneration = nextGeneration()
+
         # Only apply projected fits if fit it not projected itself.
         if type == CalcType.LOCAL:
             for fit in self.projectedFits:
@@ -1102,13 +1106,12 @@ class Fit:
                     if fit == self:
                         # If doing self projection, no need to run through the recursion process. Simply run the
                         # projection effects on ourselves
-                        pyfalog.debug("Running self-projection for {0}", repr(self))
                         for runTime in ("early", "normal", "late"):
                             self.__runProjectionEffects(runTime, self, projInfo)
                     else:
                         fit.calculateModifiedAttributes(self, type=CalcType.PROJECTED)
-
-        pyfalog.debug('Done with fit calculation')
+            # Projected fits modify our attributes as well
+            self.statGeneration = nextGeneration()
 
     def __runProjectionEffects(self, runTime, targetFit, projectionInfo):
         """
@@ -1364,10 +1367,7 @@ class Fit:
 
     @property
     def capStable(self):
-        if self.__capStable is None:
-            self.simulateCap()
-
-        return self.__capStable
+        return self.simulateCap()[0]
 
     @property
     def capState(self):
@@ -1375,28 +1375,19 @@ class Fit:
         If the cap is stable, the capacitor state is the % at which it is stable.
         If the cap is unstable, this is the amount of time before it runs out
         """
-        if self.__capState is None:
-            self.simulateCap()
-
-        return self.__capState
+        return self.simulateCap()[1]
 
     @property
     def capUsed(self):
-        if self.__capUsed is None:
-            self.simulateCap()
-
-        return self.__capUsed
+        return self.simulateCap()[2]
 
     @property
     def capRecharge(self):
-        if self.__capRecharge is None:
-            self.simulateCap()
-
-        return self.__capRecharge
+        return self.simulateCap()[3]
 
     @property
     def capDelta(self):
-        return (self.__capRecharge or 0) - (self.__capUsed or 0)
+        return self.capRecharge - self.capUsed
 
     def calculateCapRecharge(self, percent=PEAK_RECHARGE, capacity=None, rechargeRate=None):
         if capacity is None:
@@ -1472,22 +1463,27 @@ class Fit:
 
         return drains, capUsed, capAdded
 
+    @cachedStat
     def simulateCap(self):
-        drains, self.__capUsed, self.__capRecharge = self.__generateDrain()
-        self.__capRecharge += self.calculateCapRecharge()
+        """Get (cap stable, cap state, cap used, cap recharge) tuple"""
+        drains, capUsed, capRecharge = self.__generateDrain()
+        capRecharge += self.calculateCapRecharge()
         sim = self.__runCapSim(drains=drains)
         if sim is not None:
             capState = (sim.cap_stable_low + sim.cap_stable_high) / (2 * sim.capacitorCapacity)
-            self.__capStable = capState > 0
-            self.__capState = min(100, capState * 100) if self.__capStable else sim.t / 1000.0
+            capStable = capState > 0
+            capState = min(100, capState * 100) if capStable else sim.t / 1000.0
         else:
-            self.__capStable = True
-            self.__capState = 100
+            capStable = True
+            capState = 100
+        return capStable, capState, capUsed, capRecharge
 
+    @cachedStat
     def getCapSimData(self, startingCap):
-        if startingCap not in self.__savedCapSimData:
-            self.__runCapSim(startingCap=startingCap, tMax=3600, optimizeRepeats=False)
-        return self.__savedCapSimData[startingCap]
+        sim = self.__runCapSim(startingCap=startingCap, tMax=3600, optimizeRepeats=False)
+        if sim is None:
+            return []
+        return sim.saved_changes
 
     def __runCapSim(self, drains=None, startingCap=None, tMax=None, optimizeRepeats=True):
         if drains is None:
@@ -1508,12 +1504,8 @@ class Fit:
             sim.reload = self.factorReload
             sim.optimize_repeats = optimizeRepeats
             sim.run()
-            # We do not want to store partial results
-            if not sim.result_optimized_repeats:
-                self.__savedCapSimData[startingCap] = sim.saved_changes
             return sim
         else:
-            self.__savedCapSimData[startingCap] = []
             return None
 
     def getCapRegenGainFromMod(self, mod):
@@ -1524,19 +1516,17 @@ class Fit:
                 rechargeRate=self.ship.getModifiedItemAttrExtended("rechargeRate", ignoreAfflictors=[mod]) / 1000.0)
         return currentRegen - nomodRegen
 
+    @cachedStat
     def getRemoteReps(self, spoolOptions=None):
-        if spoolOptions not in self.__remoteRepMap:
-            remoteReps = RRTypes(0, 0, 0, 0)
-
-            for module in self.modules:
-                remoteReps += module.getRemoteReps(spoolOptions=spoolOptions)
+        remoteReps = RRTypes(0, 0, 0, 0)
 
-            for drone in self.drones:
-                remoteReps += drone.getRemoteReps()
+        for module in self.modules:
+            remoteReps += module.getRemoteReps(spoolOptions=spoolOptions)
 
-            self.__remoteRepMap[spoolOptions] = remoteReps
+        for drone in self.drones:
+            remoteReps += drone.getRemoteReps()
 
-        return self.__remoteRepMap[spoolOptions]
+        return remoteReps
 
     @property
     def hp(self):
@@ -1547,15 +1537,11 @@ class Fit:
         return hp
 
     @property
+    @cachedStat
     def ehp(self):
-        if self.__ehp is None:
-            if self.damagePattern is None:
-                ehp = self.hp
-            else:
-                ehp = self.damagePattern.calculateEhp(self.ship)
-            self.__ehp = ehp
-
-        return self.__ehp
+        if self.damagePattern is None:
+            return self.hp
+        return self.damagePattern.calculateEhp(self.ship)
 
     @property
     def tank(self):
@@ -1570,160 +1556,147 @@ class Fit:
         return reps
 
     @property
+    @cachedStat
     def effectiveTank(self):
-        if self.__effectiveTank is None:
-            if self.damagePattern is None:
-                ehps = self.tank
-            else:
-                ehps = self.damagePattern.calculateEffectiveTank(self, self.tank)
-
-            self.__effectiveTank = ehps
-
-        return self.__effectiveTank
+        if self.damagePattern is None:
+            return self.tank
+        return self.damagePattern.calculateEffectiveTank(self, self.tank)
 
     @property
     def sustainableTank(self):
-        if self.__sustainableTank is None:
-            self.calculateSustainableTank()
-
-        return self.__sustainableTank
+        return self.calculateSustainableTank()
 
     @property
+    @cachedStat
     def effectiveSustainableTank(self):
-        if self.__effectiveSustainableTank is None:
-            if self.damagePattern is None:
-                tank = self.sustainableTank
-            else:
-                tank = self.damagePattern.calculateEffectiveTank(self, self.sustainableTank)
-            self.__effectiveSustainableTank = tank
-        return self.__effectiveSustainableTank
+        if self.damagePattern is None:
+            return self.sustainableTank
+        return self.damagePattern.calculateEffectiveTank(self, self.sustainableTank)
 
+    @cachedStat
     def calculateSustainableTank(self):
-        if self.__sustainableTank is None:
-            sustainable = {
-                "passiveShield": self.calculateShieldRecharge(),
-                "shieldRepair": self.extraAttributes["shieldRepair"] + self._getAppliedShieldRr(),
-                "armorRepair": self.extraAttributes["armorRepair"] + self._getAppliedArmorRr(),
-                "armorRepairPreSpool": self.extraAttributes["armorRepairPreSpool"] + self._getAppliedArmorPreSpoolRr(),
-                "armorRepairFullSpool": self.extraAttributes["armorRepairFullSpool"] + self._getAppliedArmorFullSpoolRr(),
-                "hullRepair": self.extraAttributes["hullRepair"] + self._getAppliedHullRr()
+        sustainable = {
+            "passiveShield": self.calculateShieldRecharge(),
+            "shieldRepair": self.extraAttributes["shieldRepair"] + self._getAppliedShieldRr(),
+            "armorRepair": self.extraAttributes["armorRepair"] + self._getAppliedArmorRr(),
+            "armorRepairPreSpool": self.extraAttributes["armorRepairPreSpool"] + self._getAppliedArmorPreSpoolRr(),
+            "armorRepairFullSpool": self.extraAttributes["armorRepairFullSpool"] + self._getAppliedArmorFullSpoolRr(),
+            "hullRepair": self.extraAttributes["hullRepair"] + self._getAppliedHullRr()
+        }
+        if not self.capStable or self.factorReload:
+            # Map a local repairer type to the attribute it uses
+            groupAttrMap = {
+                "Shield Booster": "shieldBonus",
+                "Ancillary Shield Booster": "shieldBonus",
+                "Armor Repair Unit": "armorDamageAmount",
+                "Ancillary Armor Repairer": "armorDamageAmount",
+                "Hull Repair Unit": "structureDamageAmount"
+            }
+            # Map local repairer type to tank type
+            groupStoreMap = {
+                "Shield Booster": "shieldRepair",
+                "Ancillary Shield Booster": "shieldRepair",
+                "Armor Repair Unit": "armorRepair",
+                "Ancillary Armor Repairer": "armorRepair",
+                "Hull Repair Unit": "hullRepair"
             }
-            if not self.capStable or self.factorReload:
-                # Map a local repairer type to the attribute it uses
-                groupAttrMap = {
-                    "Shield Booster": "shieldBonus",
-                    "Ancillary Shield Booster": "shieldBonus",
-                    "Armor Repair Unit": "armorDamageAmount",
-                    "Ancillary Armor Repairer": "armorDamageAmount",
-                    "Hull Repair Unit": "structureDamageAmount"
-                }
-                # Map local repairer type to tank type
-                groupStoreMap = {
-                    "Shield Booster": "shieldRepair",
-                    "Ancillary Shield Booster": "shieldRepair",
-                    "Armor Repair Unit": "armorRepair",
-                    "Ancillary Armor Repairer": "armorRepair",
-                    "Hull Repair Unit": "hullRepair"
-                }
-                repairers = []
-                localAdjustment = {"shieldRepair": 0, "armorRepair": 0, "hullRepair": 0}
-                capUsed = self.capUsed
-                for tankType in localAdjustment:
-                    dict = self.extraAttributes.getAfflictions(tankType)
-                    if self in dict:
-                        for afflictor, operator, stackingGroup, preResAmount, postResAmount, used in dict[self]:
-                            if not used:
-                                continue
-                            if afflictor.projected:
-                                continue
-                            if afflictor.item.group.name not in groupAttrMap:
-                                continue
-                            usesCap = True
-                            try:
-                                if afflictor.capUse:
-                                    capUsed -= afflictor.capUse
-                                else:
-                                    usesCap = False
-                            except AttributeError:
+            repairers = []
+            localAdjustment = {"shieldRepair": 0, "armorRepair": 0, "hullRepair": 0}
+            capUsed = self.capUsed
+            for tankType in localAdjustment:
+                dict = self.extraAttributes.getAfflictions(tankType)
+                if self in dict:
+                    for afflictor, operator, stackingGroup, preResAmount, postResAmount, used in dict[self]:
+                        if not used:
+                            continue
+                        if afflictor.projected:
+                            continue
+                        if afflictor.item.group.name not in groupAttrMap:
+                            continue
+                        usesCap = True
+                        try:
+                            if afflictor.capUse:
+                                capUsed -= afflictor.capUse
+                            else:
                                 usesCap = False
-
-                            # Normal Repairers
-                            if usesCap and not afflictor.charge:
-                                cycleTime = afflictor.rawCycleTime
-                                amount = afflictor.getModifiedItemAttr(groupAttrMap[afflictor.item.group.name])
-                                localAdjustment[tankType] -= amount / (cycleTime / 1000.0)
-                                repairers.append(afflictor)
-                            # Ancillary Armor reps etc
-                            elif usesCap and afflictor.charge:
-                                cycleTime = afflictor.rawCycleTime
-                                amount = afflictor.getModifiedItemAttr(groupAttrMap[afflictor.item.group.name])
-                                if afflictor.charge.name == "Nanite Repair Paste":
-                                    multiplier = afflictor.getModifiedItemAttr("chargedArmorDamageMultiplier") or 1
-                                else:
-                                    multiplier = 1
-                                localAdjustment[tankType] -= amount * multiplier / (cycleTime / 1000.0)
-                                repairers.append(afflictor)
-                            # Ancillary Shield boosters etc
-                            elif not usesCap and afflictor.item.group.name in ("Ancillary Shield Booster", "Ancillary Remote Shield Booster"):
-                                cycleTime = afflictor.rawCycleTime
-                                amount = afflictor.getModifiedItemAttr(groupAttrMap[afflictor.item.group.name])
-                                if self.factorReload and afflictor.charge:
-                                    reloadtime = afflictor.reloadTime
-                                else:
-                                    reloadtime = 0.0
-                                offdutycycle = reloadtime / ((max(afflictor.numShots, 1) * cycleTime) + reloadtime)
-                                localAdjustment[tankType] -= amount * offdutycycle / (cycleTime / 1000.0)
-
-                # Sort repairers by efficiency. We want to use the most efficient repairers first
-                repairers.sort(key=lambda _mod: _mod.getModifiedItemAttr(
-                        groupAttrMap[_mod.item.group.name]) * (_mod.getModifiedItemAttr(
-                        "chargedArmorDamageMultiplier") or 1) / _mod.getModifiedItemAttr("capacitorNeed"), reverse=True)
-
-                # Loop through every module until we're above peak recharge
-                # Most efficient first, as we sorted earlier.
-                # calculate how much the repper can rep stability & add to total
-                totalPeakRecharge = self.capRecharge
-                for afflictor in repairers:
-                    if capUsed > totalPeakRecharge:
-                        break
-
-                    if self.factorReload and afflictor.charge:
-                        reloadtime = afflictor.reloadTime
-                    else:
-                        reloadtime = 0.0
-
-                    cycleTime = afflictor.rawCycleTime
-                    capPerSec = afflictor.capUse
-
-                    if capPerSec is not None and cycleTime is not None:
-                        # Check how much this repper can work
-                        sustainability = min(1, (totalPeakRecharge - capUsed) / capPerSec)
-                        amount = afflictor.getModifiedItemAttr(groupAttrMap[afflictor.item.group.name])
-                        # Add the sustainable amount
-                        if not afflictor.charge:
-                            localAdjustment[groupStoreMap[afflictor.item.group.name]] += sustainability * amount / (
-                                    cycleTime / 1000.0)
-                        else:
+                        except AttributeError:
+                            usesCap = False
+
+                        # Normal Repairers
+                        if usesCap and not afflictor.charge:
+                            cycleTime = afflictor.rawCycleTime
+                            amount = afflictor.getModifiedItemAttr(groupAttrMap[afflictor.item.group.name])
+                            localAdjustment[tankType] -= amount / (cycleTime / 1000.0)
+                            repairers.append(afflictor)
+                        # Ancillary Armor reps etc
+                        elif usesCap and afflictor.charge:
+                            cycleTime = afflictor.rawCycleTime
+                            amount = afflictor.getModifiedItemAttr(groupAttrMap[afflictor.item.group.name])
                             if afflictor.charge.name == "Nanite Repair Paste":
                                 multiplier = afflictor.getModifiedItemAttr("chargedArmorDamageMultiplier") or 1
                             else:
                                 multiplier = 1
-                            ondutycycle = (max(afflictor.numShots, 1) * cycleTime) / (
-                                    (max(afflictor.numShots, 1) * cycleTime) + reloadtime)
-                            localAdjustment[groupStoreMap[
-                                afflictor.item.group.name]] += sustainability * amount * ondutycycle * multiplier / (
-                                    cycleTime / 1000.0)
-
-                        capUsed += capPerSec
-                sustainable["shieldRepair"] += localAdjustment["shieldRepair"]
-                sustainable["armorRepair"] += localAdjustment["armorRepair"]
-                sustainable["armorRepairPreSpool"] += localAdjustment["armorRepair"]
-                sustainable["armorRepairFullSpool"] += localAdjustment["armorRepair"]
-                sustainable["hullRepair"] += localAdjustment["hullRepair"]
-
-            self.__sustainableTank = sustainable
-
-        return self.__sustainableTank
+                            localAdjustment[tankType] -= amount * multiplier / (cycleTime / 1000.0)
+                            repairers.append(afflictor)
+                        # Ancillary Shield boosters etc
+                        elif not usesCap and afflictor.item.group.name in ("Ancillary Shield Booster", "Ancillary Remote Shield Booster"):
+                            cycleTime = afflictor.rawCycleTime
+                            amount = afflictor.getModifiedItemAttr(groupAttrMap[afflictor.item.group.name])
+                            if self.factorReload and afflictor.charge:
+                                reloadtime = afflictor.reloadTime
+                            else:
+                                reloadtime = 0.0
+                            offdutycycle = reloadtime / ((max(afflictor.numShots, 1) * cycleTime) + reloadtime)
+                            localAdjustment[tankType] -= amount * offdutycycle / (cycleTime / 1000.0)
+
+            # Sort repairers by efficiency. We want to use the most efficient repairers first
+            repairers.sort(key=lambda _mod: _mod.getModifiedItemAttr(
+                    groupAttrMap[_mod.item.group.name]) * (_mod.getModifiedItemAttr(
+                    "chargedArmorDamageMultiplier") or 1) / _mod.getModifiedItemAttr("capacitorNeed"), reverse=True)
+
+            # Loop through every module until we're above peak recharge
+            # Most efficient first, as we sorted earlier.
+            # calculate how much the repper can rep stability & add to total
+            totalPeakRecharge = self.capRecharge
+            for afflictor in repairers:
+                if capUsed > totalPeakRecharge:
+                    break
+
+                if self.factorReload and afflictor.charge:
+                    reloadtime = afflictor.reloadTime
+                else:
+                    reloadtime = 0.0
+
+                cycleTime = afflictor.rawCycleTime
+                capPerSec = afflictor.capUse
+
+                if capPerSec is not None and cycleTime is not None:
+                    # Check how much this repper can work
+                    sustainability = min(1, (totalPeakRecharge - capUsed) / capPerSec)
+                    amount = afflictor.getModifiedItemAttr(groupAttrMap[afflictor.item.group.name])
+                    # Add the sustainable amount
+                    if not afflictor.charge:
+                        localAdjustment[groupStoreMap[afflictor.item.group.name]] += sustainability * amount / (
+                                cycleTime / 1000.0)
+                    else:
+                        if afflictor.charge.name == "Nanite Repair Paste":
+                            multiplier = afflictor.getModifiedItemAttr("chargedArmorDamageMultiplier") or 1
+                        else:
+                            multiplier = 1
+                        ondutycycle = (max(afflictor.numShots, 1) * cycleTime) / (
+                                (max(afflictor.numShots, 1) * cycleTime) + reloadtime)
+                        localAdjustment[groupStoreMap[
+                            afflictor.item.group.name]] += sustainability * amount * ondutycycle * multiplier / (
+                                cycleTime / 1000.0)
+
+                    capUsed += capPerSec
+            sustainable["shieldRepair"] += localAdjustment["shieldRepair"]
+            sustainable["armorRepair"] += localAdjustment["armorRepair"]
+            sustainable["armorRepairPreSpool"] += localAdjustment["armorRepair"]
+            sustainable["armorRepairFullSpool"] += localAdjustment["armorRepair"]
+            sustainable["hullRepair"] += localAdjustment["hullRepair"]
+
+        return sustainable
 
     def calculateLockTime(self, radius):
         scanRes = self.ship.getModifiedItemAttr("scanResolution")
@@ -1732,7 +1705,9 @@ class Fit:
         else:
             return self.ship.getModifiedItemAttr("scanSpeed") / 1000.0
 
+    @cachedStat
     def calculatemining(self):
+        """Get (miner yield, miner drain, drone yield, drone drain) tuple"""
         minerYield = 0
         minerDrain = 0
         droneYield = 0
@@ -1745,42 +1720,35 @@ class Fit:
             droneYield += drone.getMiningYPS()
             droneDrain += drone.getMiningDPS()
 
-        self.__minerYield = minerYield
-        self.__minerDrain = minerDrain
-        self.__droneYield = droneYield
-        self.__droneDrain = droneDrain
+        return minerYield, minerDrain, droneYield, droneDrain
 
+    @cachedStat
     def calculateWeaponDmgStats(self, spoolOptions):
-        weaponVolley = DmgTypes.default()
-        weaponDps = DmgTypes.default()
+        """Get (volley, dps) tuple of weapons, before application of target profile"""
+        weaponVolley = DmgAccumulator()
+        weaponDps = DmgAccumulator()
 
         for mod in self.modules:
-            weaponVolley += mod.getVolley(spoolOptions=spoolOptions)
-            weaponDps += mod.getDps(spoolOptions=spoolOptions)
-
-        weaponVolley.profile = self.targetProfile
-        weaponDps.profile = self.targetProfile
+            weaponVolley.add(mod.getVolley(spoolOptions=spoolOptions))
+            weaponDps.add(mod.getDps(spoolOptions=spoolOptions))
 
-        self.__weaponVolleyMap[spoolOptions] = weaponVolley
-        self.__weaponDpsMap[spoolOptions] = weaponDps
+        return weaponVolley.result(), weaponDps.result()
 
+    @cachedStat
     def calculateDroneDmgStats(self):
-        droneVolley = DmgTypes.default()
-        droneDps = DmgTypes.default()
+        """Get (volley, dps) tuple of drones and fighters, before application of target profile"""
+        droneVolley = DmgAccumulator()
+        droneDps = DmgAccumulator()
 
         for drone in self.drones:
-            droneVolley += drone.getVolley()
-            droneDps += drone.getDps()
+            droneVolley.add(drone.getVolley())
+            droneDps.add(drone.getDps())
 
         for fighter in self.fighters:
-            droneVolley += fighter.getVolley()
-            droneDps += fighter.getDps()
+            droneVolley.add(fighter.getVolley())
+            droneDps.add(fighter.getDps())
 
-        droneVolley.profile = self.targetProfile
-        droneDps.profile = self.targetProfile
-
-        self.__droneDps = droneDps
-        self.__droneVolley = droneVolley
+        return droneVolley.result(), droneDps.result()
 
     @property
     def fits(self):
@@ -1894,36 +1862,23 @@ class Fit:
 
 
     def __deepcopy__(self, memo=None):
+        from eos.events import batched
         fitCopy = Fit()
-        # Character and owner are not copied
-        fitCopy.character = self.__character
-        fitCopy.owner = self.owner
-        fitCopy.ship = deepcopy(self.ship)
-        fitCopy.mode = deepcopy(self.mode)
-        fitCopy.name = "%s copy" % self.name
-        fitCopy.damagePattern = self.damagePattern
-        fitCopy.targetProfile = self.targetProfile
-        fitCopy.implantLocation = self.implantLocation
-        fitCopy.systemSecurity = self.systemSecurity
-        fitCopy.pilotSecurity = self.pilotSecurity
-        fitCopy.notes = self.notes
-
-        for i in self.modules:
-            fitCopy.modules.appendIgnoreEmpty(deepcopy(i))
-        toCopy = (
-            "drones",
-            "fighters",
-            "cargo",
-            "implants",
-            "boosters",
-            "projectedModules",
-            "projectedDrones",
-            "projectedFighters")
-        for name in toCopy:
-            orig = getattr(self, name)
-            c = getattr(fitCopy, name)
-            for i in orig:
-                c.append(deepcopy(i))
+        # Every attribute of every copied item is set, update modification time once
+        with batched(fitCopy):
+            # Character and owner are not copied
+            fitCopy.character = self.__character
+            fitCopy.owner = self.owner
+            fitCopy.ship = deepcopy(self.ship)
+            fitCopy.mode = deepcopy(self.mode)
+            fitCopy.name = "%s copy" % self.name
+            fitCopy.damagePattern = self.damagePattern
+            fitCopy.targetProfile = self.targetProfile
+            fitCopy.implantLocation = self.implantLocation
+            fitCopy.systemSecurity = self.systemSecurity
+            fitCopy.pilotSecurity = self.pilotSecurity
+            fitCopy.notes = self.notes
+            self.__copyItems(fitCopy)
 
         # this bit is required -- see GH issue # 83
         def forceUpdateSavedata(fit):
@@ -1950,6 +1905,57 @@ class Fit:
 
         return fitCopy
 
+    def getCalcCopy(self, copyCharacter=False):
+        """
+        Get copy of the fit which can be edited and recalculated freely, e.g.
+        for what-if evaluations. Unlike deepcopy, the copy is never attached
+        to saveddata session: command and projected fits are not copied, they
+        are looked up on this fit instead and applied to the copy the same way.
+        Character is shared with this fit unless copyCharacter is set.
+        """
+        fitCopy = Fit()
+        character = self.character.getCalcCopy() if copyCharacter else self.__character
+        # Character has backref to fits, which would add copy to the session.
+        # ID is needed to look up projection and command info of source fit
+        set_committed_value(fitCopy, '_Fit__character', character)
+        set_committed_value(fitCopy, 'ID', self.ID)
+        fitCopy.calcSource = self
+        fitCopy.ship = deepcopy(self.ship)
+        fitCopy.mode = deepcopy(self.mode)
+        fitCopy.name = self.name
+        fitCopy.damagePattern = self.damagePattern
+        fitCopy.targetProfile = self.targetProfile
+        fitCopy.implantLocation = self.implantLocation
+        fitCopy.systemSecurity = self.systemSecurity
+        fitCopy.pilotSecurity = self.pilotSecurity
+        fitCopy.ignoreRestrictions = self.ignoreRestrictions
+        fitCopy.factorReload = self.factorReload
+        self.__copyItems(fitCopy)
+        # Owner of items is normally set up by SQLAlchemy on flush
+        for item in chain(
+                fitCopy.modules, fitCopy.drones, fitCopy.fighters, fitCopy.cargo, fitCopy.boosters,
+                fitCopy.projectedModules, fitCopy.projectedDrones, fitCopy.projectedFighters):
+            item.owner = fitCopy
+        return fitCopy
+
+    def __copyItems(self, fitCopy):
+        for i in self.modules:
+            fitCopy.modules.appendIgnoreEmpty(deepcopy(i))
+        toCopy = (
+            "drones",
+            "fighters",
+            "cargo",
+            "implants",
+            "boosters",
+            "projectedModules",
+            "projectedDrones",
+            "projectedFighters")
+        for name in toCopy:
+            orig = getattr(self, name)
+            c = getattr(fitCopy, name)
+            for i in orig:
+                c.append(deepcopy(i))
+
     def __repr__(self):
         return "Fit(ID={}, ship={}, name={}) at {}".format(
                 self.ID, self.ship.item.name, self.name, hex(id(self))
@@ -0,0 +1,73 @@
+# ===============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of eos.
+#
+# eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with eos.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+import datetime
+
+
+class FitStats:
+    """
+    Summary stats of a fit, as they were when fit was last calculated. Row is
+    valid only as long as fit modification timestamp, character skill state
+    hash and gamedata version match ones stored in it.
+    """
+
+    def __init__(self, fitID):
+        self.fitID = fitID
+        self.fitModified = None
+        self.skillHash = None
+        self.gamedataVersion = None
+        self.calculated = None
+        self.dps = 0
+        self.volley = 0
+        self.hp = 0
+        self.ehp = 0
+        self.capStable = False
+        self.capState = 0
+        self.maxSpeed = 0
+        self.alignTime = 0
+        self.signatureRadius = 0
+        self.maxTargetRange = 0
+
+    def update(self, fit, skillHash, gamedataVersion):
+        """Take stats from fully calculated fit"""
+        self.fitModified = fit.modified
+        self.skillHash = skillHash
+        self.gamedataVersion = gamedataVersion
+        self.calculated = datetime.datetime.now()
+        self.dps = fit.getTotalDps().total
+        self.volley = fit.getTotalVolley().total
+        self.hp = sum(fit.hp.values())
+        self.ehp = sum(fit.ehp.values())
+        self.capStable = bool(fit.capStable)
+        self.capState = fit.capState or 0
+        self.maxSpeed = fit.maxSpeed or 0
+        self.alignTime = fit.alignTime or 0
+        self.signatureRadius = fit.ship.getModifiedItemAttr("signatureRadius") or 0
+        self.maxTargetRange = fit.maxTargetRange or 0
+
+    def isValid(self, fitModified, skillHash, gamedataVersion):
+        return (
+            self.fitModified == fitModified and
+            self.skillHash == skillHash and
+            self.gamedataVersion == gamedataVersion)
+
+    def __repr__(self):
+        return "FitStats(fitID={}, dps={:.1f}, ehp={:.0f}) at {}".format(
+            self.fitID, self.dps, self.ehp, hex(id(self)))
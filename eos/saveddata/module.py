@@ -33,7 +33,8 @@ from eos.utils.cycles import CycleInfo, CycleSequence
 from eos.utils.default import DEFAULT
 from eos.utils.float import floatUnerr
 from eos.utils.spoolSupport import calculateSpoolup, resolveSpoolOptions
-from eos.utils.stats import BreacherInfo, DmgTypes, RRTypes
+from eos.utils.statCache import cachedStat, clearStatCache
+from eos.utils.stats import BreacherInfo, DmgAccumulator, DmgTypes, RRTypes
 
 
 pyfalog = Logger(__name__)
@@ -124,13 +125,8 @@ class Module(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut, M
 
         self.rahPatternOverride = None
 
-        self.__baseVolley = None
-        self.__baseRRAmount = None
-        self.__miningYield = None
-        self.__miningDrain = None
         self.__reloadTime = None
         self.__reloadForce = None
-        self.__chargeCycles = None
         self.__hardpoint = FittingHardpoint.NONE
         self.__itemModifiedAttributes = ModifiedAttributeDict(parent=self)
         self.__chargeModifiedAttributes = ModifiedAttributeDict(parent=self)
@@ -210,23 +206,20 @@ class Module(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut, M
         return charges
 
     @property
+    @cachedStat
     def numShots(self):
         if self.charge is None:
             return 0
-        if self.__chargeCycles is None and self.charge:
-            numCharges = self.numCharges
-            # Usual ammo like projectiles and missiles
-            if numCharges > 0 and "chargeRate" in self.itemModifiedAttributes:
-                self.__chargeCycles = self.__calculateAmmoShots()
-            # Frequency crystals (combat and mining lasers)
-            elif numCharges > 0 and "crystalsGetDamaged" in self.chargeModifiedAttributes:
-                self.__chargeCycles = self.__calculateCrystalShots()
-            # Scripts and stuff
-            else:
-                self.__chargeCycles = 0
-            return self.__chargeCycles
+        numCharges = self.numCharges
+        # Usual ammo like projectiles and missiles
+        if numCharges > 0 and "chargeRate" in self.itemModifiedAttributes:
+            return self.__calculateAmmoShots()
+        # Frequency crystals (combat and mining lasers)
+        elif numCharges > 0 and "crystalsGetDamaged" in self.chargeModifiedAttributes:
+            return self.__calculateCrystalShots()
+        # Scripts and stuff
         else:
-            return self.__chargeCycles
+            return 0
 
     @property
     def modPosition(self):
@@ -302,6 +295,7 @@ class Module(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut, M
         return numShots
 
     @property
+    @cachedStat
     def maxRange(self):
         attrs = ("maxRange", "shieldTransferRange", "powerTransferRange",
                  "energyDestabilizationRange", "empFieldRange",
@@ -371,6 +365,7 @@ class Module(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut, M
         return lowerRange, higherRange, higherChance
 
     @property
+    @cachedStat
     def falloff(self):
         attrs = ("falloffEffectiveness", "falloff", "shipScanFalloff")
         for attr in attrs:
@@ -417,19 +412,16 @@ class Module(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut, M
             return 0
         if not ignoreState and self.state < FittingModuleState.ACTIVE:
             return 0
-        if self.__miningYield is None:
-            self.__miningYield, self.__miningDrain = self.__calculateMining()
-        return self.__miningYield
+        return self.__calculateMining()[0]
 
     def getMiningDPS(self, ignoreState=False):
         if self.isEmpty:
             return 0
         if not ignoreState and self.state < FittingModuleState.ACTIVE:
             return 0
-        if self.__miningDrain is None:
-            self.__miningYield, self.__miningDrain = self.__calculateMining()
-        return self.__miningDrain
+        return self.__calculateMining()[1]
 
+    @cachedStat
     def __calculateMining(self):
         yield_ = self.getModifiedItemAttr("miningAmount")
         if yield_:
@@ -477,41 +469,6 @@ class Module(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut, M
     def getVolleyParameters(self, spoolOptions=None, targetProfile=None, ignoreState=False):
         if self.isEmpty or (self.state < FittingModuleState.ACTIVE and not ignoreState):
             return {0: DmgTypes.default()}
-        if self.__baseVolley is None:
-            self.__baseVolley = {}
-            if self.isBreacher:
-                dmgDelay = 1
-                subcycles = math.floor(self.getModifiedChargeAttr("dotDuration", 0) / 1000)
-                breacher_info = BreacherInfo(
-                    absolute=self.getModifiedChargeAttr("dotMaxDamagePerTick", 0),
-                    relative=self.getModifiedChargeAttr("dotMaxHPPercentagePerTick", 0) / 100)
-                for i in range(subcycles):
-                    volley = DmgTypes.default()
-                    volley.add_breacher(dmgDelay + i, breacher_info)
-                    self.__baseVolley[dmgDelay + i] = volley
-            else:
-                dmgGetter = self.getModifiedChargeAttr if self.charge else self.getModifiedItemAttr
-                dmgMult = self.getModifiedItemAttr("damageMultiplier", 1)
-                # Some delay attributes have non-0 default value, so we have to pick according to effects
-                if {'superWeaponAmarr', 'superWeaponCaldari', 'superWeaponGallente', 'superWeaponMinmatar', 'lightningWeapon'}.intersection(self.item.effects):
-                    dmgDelay = self.getModifiedItemAttr("damageDelayDuration", 0)
-                elif {'doomsdayBeamDOT', 'doomsdaySlash', 'doomsdayConeDOT', 'debuffLance'}.intersection(self.item.effects):
-                    dmgDelay = self.getModifiedItemAttr("doomsdayWarningDuration", 0)
-                else:
-                    dmgDelay = 0
-                dmgDuration = self.getModifiedItemAttr("doomsdayDamageDuration", 0)
-                dmgSubcycle = self.getModifiedItemAttr("doomsdayDamageCycleTime", 0)
-                # Reaper DD can damage each target only once
-                if dmgDuration != 0 and dmgSubcycle != 0 and 'doomsdaySlash' not in self.item.effects:
-                    subcycles = math.floor(floatUnerr(dmgDuration / dmgSubcycle))
-                else:
-                    subcycles = 1
-                for i in range(subcycles):
-                    self.__baseVolley[dmgDelay + dmgSubcycle * i] = DmgTypes(
-                        em=(dmgGetter("emDamage", 0)) * dmgMult,
-                        thermal=(dmgGetter("thermalDamage", 0)) * dmgMult,
-                        kinetic=(dmgGetter("kineticDamage", 0)) * dmgMult,
-                        explosive=(dmgGetter("explosiveDamage", 0)) * dmgMult)
         spoolType, spoolAmount = resolveSpoolOptions(spoolOptions, self)
         spoolBoost = calculateSpoolup(
             self.getModifiedItemAttr("damageMultiplierBonusMax", 0),
@@ -519,12 +476,46 @@ class Module(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut, M
             self.rawCycleTime / 1000, spoolType, spoolAmount)[0]
         spoolMultiplier = 1 + spoolBoost
         adjustedVolleys = {}
-        for volleyTime, baseVolley in self.__baseVolley.items():
-            adjustedVolley = baseVolley * spoolMultiplier
-            adjustedVolley.profile = targetProfile
-            adjustedVolleys[volleyTime] = adjustedVolley
+        for volleyTime, baseVolley in self.__getBaseVolley().items():
+            adjustedVolleys[volleyTime] = (baseVolley * spoolMultiplier).applyProfile(targetProfile)
         return adjustedVolleys
 
+    @cachedStat
+    def __getBaseVolley(self):
+        baseVolley = {}
+        if self.isBreacher:
+            dmgDelay = 1
+            subcycles = math.floor(self.getModifiedChargeAttr("dotDuration", 0) / 1000)
+            breacher_info = BreacherInfo(
+                absolute=self.getModifiedChargeAttr("dotMaxDamagePerTick", 0),
+                relative=self.getModifiedChargeAttr("dotMaxHPPercentagePerTick", 0) / 100)
+            for i in range(subcycles):
+                baseVolley[dmgDelay + i] = DmgTypes(0, 0, 0, 0, breachers={dmgDelay + i: (breacher_info,)})
+        else:
+            dmgGetter = self.getModifiedChargeAttr if self.charge else self.getModifiedItemAttr
+            dmgMult = self.getModifiedItemAttr("damageMultiplier", 1)
+            # Some delay attributes have non-0 default value, so we have to pick according to effects
+            if {'superWeaponAmarr', 'superWeaponCaldari', 'superWeaponGallente', 'superWeaponMinmatar', 'lightningWeapon'}.intersection(self.item.effects):
+                dmgDelay = self.getModifiedItemAttr("damageDelayDuration", 0)
+            elif {'doomsdayBeamDOT', 'doomsdaySlash', 'doomsdayConeDOT', 'debuffLance'}.intersection(self.item.effects):
+                dmgDelay = self.getModifiedItemAttr("doomsdayWarningDuration", 0)
+            else:
+                dmgDelay = 0
+            dmgDuration = self.getModifiedItemAttr("doomsdayDamageDuration", 0)
+            dmgSubcycle = self.getModifiedItemAttr("doomsdayDamageCycleTime", 0)
+            # Reaper DD can damage each target only once
+            if dmgDuration != 0 and dmgSubcycle != 0 and 'doomsdaySlash' not in self.item.effects:
+                subcycles = math.floor(floatUnerr(dmgDuration / dmgSubcycle))
+            else:
+                subcycles = 1
+            for i in range(subcycles):
+                baseVolley[dmgDelay + dmgSubcycle * i] = DmgTypes(
+                    em=(dmgGetter("emDamage", 0)) * dmgMult,
+                    thermal=(dmgGetter("thermalDamage", 0)) * dmgMult,
+                    kinetic=(dmgGetter("kineticDamage", 0)) * dmgMult,
+                    explosive=(dmgGetter("explosiveDamage", 0)) * dmgMult)
+        return baseVolley
+
     def getVolley(self, spoolOptions=None, targetProfile=None, ignoreState=False):
         volleyParams = self.getVolleyParameters(spoolOptions=spoolOptions, targetProfile=targetProfile, ignoreState=ignoreState)
         if len(volleyParams) == 0:
@@ -532,21 +523,20 @@ class Module(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut, M
         return volleyParams[min(volleyParams)]
 
     def getDps(self, spoolOptions=None, targetProfile=None, ignoreState=False):
-        dps = DmgTypes.default()
         cycleParams = self.getCycleParameters()
         if cycleParams is None:
-            return dps
+            return DmgTypes.default()
         volleyParams = self.getVolleyParameters(spoolOptions=spoolOptions, targetProfile=targetProfile, ignoreState=ignoreState)
         avgCycleTime = cycleParams.averageTime
         if len(volleyParams) == 0 or avgCycleTime == 0:
-            return dps
+            return DmgTypes.default()
         if self.isBreacher:
             return volleyParams[min(volleyParams)]
-        for volleyValue in volleyParams.values():
-            dps += volleyValue
         dpsFactor = 1 / (avgCycleTime / 1000)
-        dps *= dpsFactor
-        return dps
+        dps = DmgAccumulator()
+        for volleyValue in volleyParams.values():
+            dps.add(volleyValue, dpsFactor)
+        return dps.result()
 
     def isRemoteRepping(self, ignoreState=False):
         repParams = self.getRepAmountParameters(ignoreState=ignoreState)
@@ -569,26 +559,6 @@ class Module(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut, M
         rrType = remoteModuleGroups.get(self.item.group.name)
         if rrType is None:
             return {}
-        if self.__baseRRAmount is None:
-            self.__baseRRAmount = {}
-            shieldAmount = 0
-            armorAmount = 0
-            hullAmount = 0
-            capacitorAmount = 0
-            if rrType == "Hull":
-                hullAmount += self.getModifiedItemAttr("structureDamageAmount", 0)
-            elif rrType == "Armor":
-                if self.item.group.name == "Ancillary Remote Armor Repairer" and self.charge:
-                    mult = self.getModifiedItemAttr("chargedArmorDamageMultiplier", 1)
-                else:
-                    mult = 1
-                armorAmount += self.getModifiedItemAttr("armorDamageAmount", 0) * mult
-            elif rrType == "Shield":
-                shieldAmount += self.getModifiedItemAttr("shieldBonus", 0)
-            elif rrType == "Capacitor":
-                capacitorAmount += self.getModifiedItemAttr("powerTransferAmount", 0)
-            rrDelay = 0 if rrType == "Shield" else self.rawCycleTime
-            self.__baseRRAmount[rrDelay] = RRTypes(shield=shieldAmount, armor=armorAmount, hull=hullAmount, capacitor=capacitorAmount)
         spoolType, spoolAmount = resolveSpoolOptions(spoolOptions, self)
         spoolBoost = calculateSpoolup(
             self.getModifiedItemAttr("repairMultiplierBonusMax", 0),
@@ -596,13 +566,35 @@ class Module(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut, M
             self.rawCycleTime / 1000, spoolType, spoolAmount)[0]
         spoolMultiplier = 1 + spoolBoost
         adjustedRRAmount = {}
-        for rrTime, rrAmount in self.__baseRRAmount.items():
+        for rrTime, rrAmount in self.__getBaseRRAmount(rrType).items():
             if spoolMultiplier == 1:
                 adjustedRRAmount[rrTime] = rrAmount
             else:
                 adjustedRRAmount[rrTime] = rrAmount * spoolMultiplier
         return adjustedRRAmount
 
+    @cachedStat
+    def __getBaseRRAmount(self, rrType):
+        shieldAmount = 0
+        armorAmount = 0
+        hullAmount = 0
+        capacitorAmount = 0
+        if rrType == "Hull":
+            hullAmount += self.getModifiedItemAttr("structureDamageAmount", 0)
+        elif rrType == "Armor":
+            if self.item.group.name == "Ancillary Remote Armor Repairer" and self.charge:
+                mult = self.getModifiedItemAttr("chargedArmorDamageMultiplier", 1)
+            else:
+                mult = 1
+            armorAmount += self.getModifiedItemAttr("armorDamageAmount", 0) * mult
+        elif rrType == "Shield":
+            shieldAmount += self.getModifiedItemAttr("shieldBonus", 0)
+        elif rrType == "Capacitor":
+            capacitorAmount += self.getModifiedItemAttr("powerTransferAmount", 0)
+        rrDelay = 0 if rrType == "Shield" else self.rawCycleTime
+        return {rrDelay: RRTypes(shield=shieldAmount, armor=armorAmount, hull=hullAmount, capacitor=capacitorAmount)}
+
+    @cachedStat
     def getRemoteReps(self, spoolOptions=None, ignoreState=False, reloadOverride=None):
         rrDuringCycle = RRTypes(0, 0, 0, 0)
         cycleParams = self.getCycleParameters(reloadOverride=reloadOverride)
@@ -893,14 +885,14 @@ class Module(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut, M
         else:
             return val
 
+    @property
+    def statGeneration(self):
+        return getattr(self.owner, 'statGeneration', None)
+
     def clear(self):
-        self.__baseVolley = None
-        self.__baseRRAmount = None
-        self.__miningYield = None
-        self.__miningDrain = None
+        clearStatCache(self)
         self.__reloadTime = None
         self.__reloadForce = None
-        self.__chargeCycles = None
         self.itemModifiedAttributes.clear()
         self.chargeModifiedAttributes.clear()
 
@@ -965,6 +957,7 @@ class Module(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut, M
         else:
             return self.getCycleParameters(reloadOverride=reloadOverride)
 
+    @cachedStat
     def getCycleParameters(self, reloadOverride=None):
         """Copied from new eos as well"""
         # Determine if we'll take into account reload time or not
@@ -43,6 +43,9 @@ class PriceStatus(IntEnum):
 
 
 class Price:
+    # Changes on every price update or reset, for those who keep formatted prices
+    generation = 0
+
     def __init__(self, typeID):
         self.typeID = typeID
         self.time = 0
@@ -72,3 +75,4 @@ class Price:
         self.time = time()
         self.price = price
         self.status = status
+        Price.generation += 1
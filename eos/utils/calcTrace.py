@@ -0,0 +1,194 @@
+# ===============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of eos.
+#
+# eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with eos.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+"""
+Tracing of fit calculation, to find out which effects make calculation of a
+fit slow.
+
+Calculation code checks module-level tracer once per fit calculation and once
+per effect handler lookup; when it is None, that check is all tracing costs.
+Installed tracer gets wall time of every effect handler call and of every fit
+calculation, and can summarize them as text or export them in Chrome trace
+format (chrome://tracing, Perfetto).
+
+    with CalcTracer() as tracer:
+        fit.calculateModifiedAttributes()
+    print(tracer.report())
+    tracer.saveChromeTrace('calc.json')
+"""
+
+import json
+import os
+import threading
+import weakref
+from collections import defaultdict
+from contextlib import contextmanager
+from time import perf_counter
+
+from eos.const import CalcType
+
+
+# Currently installed tracer, None when tracing is off
+tracer = None
+
+
+def setTracer(newTracer):
+    """Install tracer, or disable tracing with None. Returns previous tracer."""
+    global tracer
+    oldTracer = tracer
+    tracer = newTracer
+    return oldTracer
+
+
+def getFitLabel(fit):
+    ship = getattr(fit, 'ship', None)
+    shipName = getattr(getattr(ship, 'item', None), 'name', None)
+    return '{}: {} ({})'.format(shipName, getattr(fit, 'name', None), getattr(fit, 'ID', None))
+
+
+class CalcTracer:
+    """
+    Collects timings of fit calculations. Aggregated timings are kept for
+    the whole lifetime of tracer; individual events, which are needed only
+    for Chrome trace, are kept up to maxEvents.
+    """
+
+    def __init__(self, maxEvents=1000000):
+        self.maxEvents = maxEvents
+        self.events = []
+        self.droppedEvents = 0
+        # Effect ID -> [effect name, calls, total time]
+        self.effectTimes = {}
+        self.runTimeTimes = defaultdict(float)
+        # Fit label -> [calculations, total time, time in effects]
+        self.fitTimes = {}
+        # Keyed by fit itself: ids of collected fits get reused by new ones
+        self.__labels = weakref.WeakKeyDictionary()
+        self.__lock = threading.Lock()
+        self.__start = perf_counter()
+        self.__previous = None
+
+    def __enter__(self):
+        self.__previous = setTracer(self)
+        return self
+
+    def __exit__(self, *exc):
+        setTracer(self.__previous)
+        self.__previous = None
+
+    def __getLabel(self, fit):
+        # Fits are labeled once, formatting labels in hot loop is too slow
+        label = self.__labels.get(fit)
+        if label is None:
+            label = self.__labels[fit] = getFitLabel(fit)
+        return label
+
+    def __addEvent(self, event):
+        if len(self.events) < self.maxEvents:
+            self.events.append(event)
+        else:
+            self.droppedEvents += 1
+
+    def wrapEffect(self, effect, handler):
+        """Get function which calls effect handler and records its wall time"""
+        def tracedHandler(fit, *args, **kwargs):
+            start = perf_counter()
+            try:
+                return handler(fit, *args, **kwargs)
+            finally:
+                self.addEffectTime(effect, fit, start, perf_counter() - start)
+        return tracedHandler
+
+    def addEffectTime(self, effect, fit, start, duration):
+        label = self.__getLabel(fit)
+        runTime = effect.runTime
+        with self.__lock:
+            effectTime = self.effectTimes.get(effect.ID)
+            if effectTime is None:
+                effectTime = self.effectTimes[effect.ID] = [effect.name, 0, 0.0]
+            effectTime[1] += 1
+            effectTime[2] += duration
+            self.runTimeTimes[runTime] += duration
+            fitTime = self.fitTimes.get(label)
+            if fitTime is None:
+                fitTime = self.fitTimes[label] = [0, 0.0, 0.0]
+            fitTime[2] += duration
+            self.__addEvent((effect.name, runTime, start, duration, threading.get_ident(), label))
+
+    @contextmanager
+    def fitCalculation(self, fit, targetFit, type):
+        label = self.__getLabel(fit)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            duration = perf_counter() - start
+            with self.__lock:
+                fitTime = self.fitTimes.get(label)
+                if fitTime is None:
+                    fitTime = self.fitTimes[label] = [0, 0.0, 0.0]
+                # Time of projected and command calculations goes to fit
+                # which runs them, and is counted in its total as well
+                fitTime[0] += 1
+                if targetFit is None or targetFit is fit:
+                    fitTime[1] += duration
+                name = 'calc {}: {}'.format(CalcType(type).name, label)
+                self.__addEvent((name, 'fit', start, duration, threading.get_ident(), label))
+
+    def getTopEffects(self, count=None):
+        """Get (effect ID, name, calls, total time) tuples, slowest effects first"""
+        with self.__lock:
+            rows = [(effectID, name, calls, total) for effectID, (name, calls, total) in self.effectTimes.items()]
+        rows.sort(key=lambda r: r[3], reverse=True)
+        return rows if count is None else rows[:count]
+
+    def report(self, count=20):
+        """Get text summary of recorded timings, with count slowest effects"""
+        lines = ['Top {} effects by cumulative time:'.format(count)]
+        lines.append('{:>10} {:>8} {:>10}  {}'.format('total ms', 'calls', 'mean us', 'effect'))
+        for effectID, name, calls, total in self.getTopEffects(count):
+            lines.append('{:>10.2f} {:>8} {:>10.1f}  {} ({})'.format(total * 1000, calls, total / calls * 1000000, name, effectID))
+        lines.append('')
+        lines.append('Effect time by run time:')
+        for runTime in sorted(self.runTimeTimes, key=self.runTimeTimes.get, reverse=True):
+            lines.append('{:>10.2f}  {}'.format(self.runTimeTimes[runTime] * 1000, runTime))
+        lines.append('')
+        lines.append('Fits:')
+        lines.append('{:>10} {:>10} {:>8}  {}'.format('total ms', 'effect ms', 'calcs', 'fit'))
+        for label, (calcs, total, effects) in sorted(self.fitTimes.items(), key=lambda i: i[1][1], reverse=True):
+            lines.append('{:>10.2f} {:>10.2f} {:>8}  {}'.format(total * 1000, effects * 1000, calcs, label))
+        if self.droppedEvents:
+            lines.append('')
+            lines.append('{} events over limit were not kept for trace'.format(self.droppedEvents))
+        return '\n'.join(lines)
+
+    def getChromeTrace(self):
+        pid = os.getpid()
+        with self.__lock:
+            events = list(self.events)
+        traceEvents = [{
+            'name': name, 'cat': category, 'ph': 'X', 'pid': pid, 'tid': tid,
+            'ts': (start - self.__start) * 1000000, 'dur': duration * 1000000,
+            'args': {'fit': label}}
+            for name, category, start, duration, tid, label in events]
+        return {'traceEvents': traceEvents, 'displayTimeUnit': 'ms'}
+
+    def saveChromeTrace(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.getChromeTrace(), f)
@@ -0,0 +1,179 @@
+# ===============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of eos.
+#
+# eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with eos.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+"""
+Aggregation of damage and tank stats over fleets of fits against many target
+profiles and damage patterns. Raw stats are taken from each fit once, and then
+all profiles are applied to all fits at once via matrix operations.
+
+Passed fits have to be calculated already.
+"""
+
+import numpy as np
+
+
+DAMAGE_TYPES = ('em', 'thermal', 'kinetic', 'explosive')
+TANK_LAYERS = (('shield', 'shieldCapacity'), ('armor', 'armorHP'), ('hull', 'hp'))
+# Repairs from Fit.tank which go to each tank layer
+TANK_REPAIRS = {
+    'shield': ('passiveShield', 'shieldRepair'),
+    'armor': ('armorRepair',),
+    'hull': ('hullRepair',)}
+
+
+def _getResonanceAttr(layer, damageType):
+    attrName = '{}{}DamageResonance'.format(layer if layer != 'hull' else '', damageType.capitalize())
+    return attrName[0].lower() + attrName[1:]
+
+
+def _getProfileMatrix(profiles):
+    """Get N x 4 matrix of em/thermal/kinetic/explosive amounts of passed profiles or patterns"""
+    return np.array([
+        [getattr(p, '{}Amount'.format(t), 0) for t in DAMAGE_TYPES]
+        for p in profiles], dtype=float).reshape(-1, 4)
+
+
+class FleetStats:
+    """
+    Results of fleet aggregation. Matrices are indexed by [fit, profile]; "fit"
+    ones are stats of a single ship, "group" ones are multiplied by amount of
+    ships with that fit, and "total" ones are sums over the whole fleet.
+    """
+
+    def __init__(self, fits, counts, targetProfiles, damagePatterns, dps, volley, ehp, ehps):
+        self.fits = fits
+        self.counts = counts
+        self.targetProfiles = targetProfiles
+        self.damagePatterns = damagePatterns
+        self.fitDps = dps
+        self.fitVolley = volley
+        self.fitEhp = ehp
+        self.fitEhps = ehps
+
+    @property
+    def groupDps(self):
+        return self.fitDps * self.counts[:, None]
+
+    @property
+    def groupVolley(self):
+        return self.fitVolley * self.counts[:, None]
+
+    @property
+    def groupEhp(self):
+        return self.fitEhp * self.counts[:, None]
+
+    @property
+    def groupEhps(self):
+        return self.fitEhps * self.counts[:, None]
+
+    @property
+    def totalDps(self):
+        return self.groupDps.sum(axis=0)
+
+    @property
+    def totalVolley(self):
+        return self.groupVolley.sum(axis=0)
+
+    @property
+    def totalEhp(self):
+        return self.groupEhp.sum(axis=0)
+
+    @property
+    def totalEhps(self):
+        return self.groupEhps.sum(axis=0)
+
+    def getDpsTable(self, profileNameGetter=lambda p: p.name if p is not None else 'No Profile'):
+        """Get (header, rows) of fleet DPS versus target profiles, with fleet total as last row"""
+        header = ['Fit', 'Amount'] + [profileNameGetter(p) for p in self.targetProfiles]
+        groupDps = self.groupDps
+        rows = []
+        for i, (fit, count) in enumerate(zip(self.fits, self.counts)):
+            rows.append([fit.name, int(count)] + groupDps[i].tolist())
+        rows.append(['Total', int(self.counts.sum())] + self.totalDps.tolist())
+        return header, rows
+
+
+def aggregateFleet(fits, targetProfiles=(), damagePatterns=(), spoolOptions=None):
+    """
+    Aggregate stats of fleet.
+
+    fits -- iterable of (fit, amount of ships) pairs
+    targetProfiles -- profiles to calculate outgoing DPS and volley against;
+    None stands for no profile
+    damagePatterns -- incoming damage patterns to calculate EHP and effective
+    repairs against. Note that resonances of reactive armor hardeners are as
+    adapted to each fit's own damage pattern
+    """
+    fits = list(fits)
+    targetProfiles = list(targetProfiles)
+    damagePatterns = list(damagePatterns)
+    counts = np.array([count for fit, count in fits], dtype=float)
+    fits = [fit for fit, count in fits]
+
+    # Raw stats, taken once per fit
+    rawDps = []
+    rawVolley = []
+    hps = []
+    resonances = []
+    repairs = []
+    for fit in fits:
+        rawDps.append(fit.getRawWeaponDps(spoolOptions=spoolOptions) + fit.getRawDroneDps())
+        rawVolley.append(fit.getRawWeaponVolley(spoolOptions=spoolOptions) + fit.getRawDroneVolley())
+        ship = fit.ship
+        hps.append([ship.getModifiedItemAttr(attr) for layer, attr in TANK_LAYERS])
+        resonances.append([
+            [ship.getModifiedItemAttr(_getResonanceAttr(layer, t)) for t in DAMAGE_TYPES]
+            for layer, attr in TANK_LAYERS])
+        tank = fit.tank
+        repairs.append([sum(tank[r] for r in TANK_REPAIRS[layer]) for layer, attr in TANK_LAYERS])
+
+    dps = _applyProfiles(rawDps, targetProfiles)
+    volley = _applyProfiles(rawVolley, targetProfiles)
+
+    # Effective resonance of each fit's layer against each pattern, in
+    # [fit, layer, pattern] form
+    weights = _getProfileMatrix(damagePatterns)
+    totals = weights.sum(axis=1)
+    weights = weights / np.where(totals == 0, 1, totals)[:, None]
+    resonances = np.array(resonances, dtype=float).reshape(-1, len(TANK_LAYERS), 4)
+    dividers = resonances @ weights.T
+    dividers = np.where(dividers == 0, 1, dividers)
+    hps = np.array(hps, dtype=float).reshape(-1, len(TANK_LAYERS))
+    repairs = np.array(repairs, dtype=float).reshape(-1, len(TANK_LAYERS))
+    ehp = (hps[:, :, None] / dividers).sum(axis=1)
+    ehps = (repairs[:, :, None] / dividers).sum(axis=1)
+
+    return FleetStats(
+        fits=fits, counts=counts, targetProfiles=targetProfiles, damagePatterns=damagePatterns,
+        dps=dps, volley=volley, ehp=ehp, ehps=ehps)
+
+
+def _applyProfiles(dmgs, targetProfiles):
+    """Apply all profiles to all raw damage vectors, get [fit, profile] matrix of total damage"""
+    # None profile means no resists
+    resists = _getProfileMatrix(targetProfiles)
+    raw = np.array([[dmg.em, dmg.thermal, dmg.kinetic, dmg.explosive] for dmg in dmgs], dtype=float).reshape(-1, 4)
+    result = raw @ (1 - resists).T
+    # Pure damage of breachers depends on target HP, it's rare enough to be
+    # handled per fit
+    for i, dmg in enumerate(dmgs):
+        if dmg.breachers:
+            for j, profile in enumerate(targetProfiles):
+                result[i, j] += dmg.applyProfile(profile).pure
+    return result
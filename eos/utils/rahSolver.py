@@ -0,0 +1,121 @@
+# ===============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of eos.
+#
+# eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with eos.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+"""
+Equilibrium solver for reactive armor hardener. Result depends only on damage
+profile after armor resists, base resonances of RAH and its shift amount, thus
+it is memoized on those; recalculation of a fit which did not change them (e.g.
+when unrelated module is toggled) does not run the simulation again.
+"""
+
+from functools import lru_cache
+
+
+# The number of iterations is limited to prevent an infinite loop if something goes wrong
+MAX_CYCLES = 50
+# Amount of last cycles to average if no loop has been found
+FALLBACK_CYCLES = 20
+# Resonances are rounded to this amount of digits to detect repeated states
+LOOP_PRECISION = 6
+RESULT_PRECISION = 3
+# The strange order is to emulate the ingame sorting when different types have taken the same amount of damage
+SORT_ORDER = (0, 3, 2, 1)
+
+
+def solve(damageTaken, resonances, shiftAmount):
+    """
+    Get RAH resonances averaged over its equilibrium loop.
+
+    damageTaken -- em/thermal/kinetic/explosive damage after armor resists
+    resonances -- em/thermal/kinetic/explosive base resonances of RAH
+    shiftAmount -- resistance shift per cycle, as fraction
+    """
+    return _solve(tuple(damageTaken), tuple(resonances), shiftAmount)
+
+
+def solveMany(damageProfiles, resonances, shiftAmount):
+    """Solve for many damage profiles at once, e.g. for damage pattern sweeps"""
+    resonances = tuple(resonances)
+    results = {}
+    for damageTaken in damageProfiles:
+        damageTaken = tuple(damageTaken)
+        if damageTaken not in results:
+            results[damageTaken] = _solve(damageTaken, resonances, shiftAmount)
+    return [results[tuple(d)] for d in damageProfiles]
+
+
+def clearCache():
+    _solve.cache_clear()
+
+
+def getCacheInfo():
+    return _solve.cache_info()
+
+
+@lru_cache(maxsize=2048)
+def _solve(damageTaken, resonances, shiftAmount):
+    current = list(resonances)
+    cycleList = []
+    seen = {}
+    loopStart = -FALLBACK_CYCLES
+    for num in range(MAX_CYCLES):
+        # This doesn't take into account stacking penalties. In a few cases fitting a Damage Control causes an inaccurate result.
+        # Sort to drop the highest damage value to the bottom; sort is stable, thus ties keep SORT_ORDER
+        order = sorted(SORT_ORDER, key=lambda i: damageTaken[i] * current[i])
+        taken = [damageTaken[i] * current[i] for i in order]
+        res = [current[i] for i in order]
+
+        if taken[2] == 0:
+            # One damage type: the top damage type takes from the other three
+            # Since the resistances not taking damage will end up going to the type taking damage we just do the whole thing at once.
+            change0 = 1 - res[0]
+            change1 = 1 - res[1]
+            change2 = 1 - res[2]
+            change3 = -(change0 + change1 + change2)
+        elif taken[1] == 0:
+            # Two damage types: the top two damage types take from the other two
+            # Since the resistances not taking damage will end up going equally to the types taking damage we just do the whole thing at once.
+            change0 = 1 - res[0]
+            change1 = 1 - res[1]
+            change2 = -(change0 + change1) / 2
+            change3 = -(change0 + change1) / 2
+        else:
+            # Three or four damage types: the top two damage types take from the other two
+            change0 = min(shiftAmount, 1 - res[0])
+            change1 = min(shiftAmount, 1 - res[1])
+            change2 = -(change0 + change1) / 2
+            change3 = -(change0 + change1) / 2
+
+        current[order[0]] = res[0] + change0
+        current[order[1]] = res[1] + change1
+        current[order[2]] = res[2] + change2
+        current[order[3]] = res[3] + change3
+
+        # See if the current RAH profile has been encountered before, indicating a loop
+        stateKey = tuple(round(r, LOOP_PRECISION) for r in current)
+        if stateKey in seen:
+            loopStart = seen[stateKey]
+            break
+        seen[stateKey] = len(cycleList)
+        cycleList.append(tuple(current))
+
+    # Average the profiles in the RAH loop, or the last ones if it didn't find a loop
+    loopCycles = cycleList[loopStart:]
+    numCycles = len(loopCycles)
+    return tuple(round(sum(cycle[i] for cycle in loopCycles) / numCycles, RESULT_PRECISION) for i in range(4))
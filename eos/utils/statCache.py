@@ -0,0 +1,93 @@
+# ===============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of eos.
+#
+# eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with eos.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+"""
+Cache of stats derived from calculated attributes of fits and their items.
+
+Every fit has stat generation, which is replaced with a new unique value
+whenever results of fit calculation may change. Cached values are stored on
+each object together with generation they were calculated for, so bumping
+generation of fit makes values on the fit and all its items stale at once,
+without walking through them.
+"""
+
+from collections import Counter
+from functools import wraps
+from itertools import count
+
+
+_generations = count(1)
+recomputeCounts = Counter()
+hitCounts = Counter()
+
+
+def nextGeneration():
+    return next(_generations)
+
+
+def cachedStat(method):
+    """
+    Memoize method on stat generation of object it is called on, which is
+    taken from its statGeneration attribute. Arguments become part of the
+    cache key; if generation is None or arguments cannot be hashed, value is
+    not cached.
+    """
+    name = method.__qualname__
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        generation = self.statGeneration
+        if generation is None:
+            recomputeCounts[name] += 1
+            return method(self, *args, **kwargs)
+        cache = getattr(self, '_statCache', None)
+        if cache is None or cache[0] != generation:
+            cache = self._statCache = (generation, {})
+        values = cache[1]
+        key = (name, args, tuple(sorted(kwargs.items()))) if args or kwargs else name
+        try:
+            value = values[key]
+        except KeyError:
+            pass
+        except TypeError:
+            recomputeCounts[name] += 1
+            return method(self, *args, **kwargs)
+        else:
+            hitCounts[name] += 1
+            return value
+        recomputeCounts[name] += 1
+        value = values[key] = method(self, *args, **kwargs)
+        return value
+
+    return wrapper
+
+
+def clearStatCache(obj):
+    """Drop all values cached on passed object"""
+    obj._statCache = None
+
+
+def getStatCounters():
+    """Get {stat name: (recomputations, cache hits)} map"""
+    return {name: (recomputeCounts[name], hitCounts[name]) for name in set(recomputeCounts) | set(hitCounts)}
+
+
+def resetStatCounters():
+    recomputeCounts.clear()
+    hitCounts.clear()
@@ -19,7 +19,6 @@
 
 
 import math
-from collections import defaultdict
 
 from eos.utils.float import floatUnerr
 from utils.repr import makeReprStr
@@ -31,131 +30,113 @@ def _t(x):
 
 class BreacherInfo:
 
+    __slots__ = ('absolute', 'relative')
+
     def __init__(self, absolute, relative):
         self.absolute = absolute
         self.relative = relative
 
     def __mul__(self, mul):
-        return type(self)(absolute=self.absolute * mul, relative=self.relative * mul)
-
-    def __imul__(self, mul):
         if mul == 1:
             return self
-        self.absolute *= mul
-        self.relative *= mul
-        return self
+        return type(self)(absolute=self.absolute * mul, relative=self.relative * mul)
 
     def __truediv__(self, div):
+        if div == 1:
+            return self
         return type(self)(absolute=self.absolute / div, relative=self.relative / div)
 
 
-class DmgTypes:
-    """
-    Container for volley stats, which stores breacher pod data
-    in raw form, before application of it to target profile.
-    """
-
-    def __init__(self, em, thermal, kinetic, explosive):
-        self._em = em
-        self._thermal = thermal
-        self._kinetic = kinetic
-        self._explosive = explosive
-        self._breachers = defaultdict(lambda: [])
-        self.__profile = None
-        # Cached data
-        self.__cached_em = None
-        self.__cached_thermal = None
-        self.__cached_kinetic = None
-        self.__cached_explosive = None
-        self.__cached_pure = None
-        self.__cached_total = None
-
-    @classmethod
-    def default(cls):
-        return cls(0, 0, 0, 0)
+def _mergeBreachers(breachers1, breachers2):
+    if not breachers2:
+        return breachers1
+    if not breachers1:
+        return breachers2
+    merged = dict(breachers1)
+    for key, infos in breachers2.items():
+        merged[key] = merged.get(key, ()) + infos
+    return merged
 
-    def _clear_cached(self):
-        self.__cached_em = None
-        self.__cached_thermal = None
-        self.__cached_kinetic = None
-        self.__cached_explosive = None
-        self.__cached_pure = None
-        self.__cached_total = None
 
-    def add_breacher(self, key, data):
-        self._breachers[key].append(data)
+def _scaleBreachers(breachers, mul):
+    if not breachers or mul == 1:
+        return breachers
+    return {k: tuple(b * mul for b in v) for k, v in breachers.items()}
 
-    @property
-    def profile(self):
-        return self.__profile
 
-    @profile.setter
-    def profile(self, profile):
-        self.__profile = profile
-        self._clear_cached()
+class DmgTypes:
+    """
+    Immutable damage vector for volley and DPS stats. Breacher pod data is
+    stored in raw form, {key: tuple of BreacherInfo}, and only when there is
+    any, as damage it deals depends on target HP. Resistances of target profile
+    are applied as separate explicit step, see applyProfile().
+    """
 
-    @property
-    def em(self):
-        if self.__cached_em is not None:
-            return self.__cached_em
-        dmg = self._em
-        if self.profile is not None:
-            dmg *= 1 - getattr(self.profile, "emAmount", 0)
-        self.__cached_em = dmg
-        return dmg
+    __slots__ = ('em', 'thermal', 'kinetic', 'explosive', 'breachers', 'profile')
 
-    @property
-    def thermal(self):
-        if self.__cached_thermal is not None:
-            return self.__cached_thermal
-        dmg = self._thermal
-        if self.profile is not None:
-            dmg *= 1 - getattr(self.profile, "thermalAmount", 0)
-        self.__cached_thermal = dmg
-        return dmg
+    def __init__(self, em, thermal, kinetic, explosive, breachers=None, profile=None):
+        self.em = em
+        self.thermal = thermal
+        self.kinetic = kinetic
+        self.explosive = explosive
+        self.breachers = breachers or None
+        self.profile = profile
 
-    @property
-    def kinetic(self):
-        if self.__cached_kinetic is not None:
-            return self.__cached_kinetic
-        dmg = self._kinetic
-        if self.profile is not None:
-            dmg *= 1 - getattr(self.profile, "kineticAmount", 0)
-        self.__cached_kinetic = dmg
-        return dmg
+    @classmethod
+    def default(cls):
+        # Vectors are never changed, thus all zero vectors can be the same object
+        return _zeroDmg
 
-    @property
-    def explosive(self):
-        if self.__cached_explosive is not None:
-            return self.__cached_explosive
-        dmg = self._explosive
+    @classmethod
+    def sum(cls, dmgs):
+        acc = DmgAccumulator()
+        for dmg in dmgs:
+            acc.add(dmg)
+        return acc.result()
+
+    def applyProfile(self, profile):
+        """
+        Return vector with resistances of passed target profile applied to raw
+        damage. Vector which has profile applied already does not keep its raw
+        damage, so it can't get another profile.
+        """
+        if profile is None or profile is self.profile:
+            return self
         if self.profile is not None:
-            dmg *= 1 - getattr(self.profile, "explosiveAmount", 0)
-        self.__cached_explosive = dmg
-        return dmg
+            raise ValueError("Damage vector has target profile applied already")
+        return type(self)(
+            em=self.em * (1 - getattr(profile, "emAmount", 0)),
+            thermal=self.thermal * (1 - getattr(profile, "thermalAmount", 0)),
+            kinetic=self.kinetic * (1 - getattr(profile, "kineticAmount", 0)),
+            explosive=self.explosive * (1 - getattr(profile, "explosiveAmount", 0)),
+            breachers=self.breachers,
+            profile=profile)
+
+    def shiftBreachers(self, offset):
+        """Return vector with keys of breacher data moved by offset"""
+        if not self.breachers:
+            return self
+        return type(self)(
+            em=self.em, thermal=self.thermal, kinetic=self.kinetic, explosive=self.explosive,
+            breachers={offset + k: v for k, v in self.breachers.items()},
+            profile=self.profile)
 
     @property
     def pure(self):
-        if self.__cached_pure is not None:
-            return self.__cached_pure
+        if not self.breachers:
+            return 0
         if self.profile is None:
-            dmg = sum(
+            return sum(
                 max((b.absolute for b in bs), default=0)
-                for bs in self._breachers.values())
-        else:
-            dmg = sum(
-                max((min(b.absolute, b.relative * getattr(self.profile, "hp", math.inf)) for b in bs), default=0)
-                for bs in self._breachers.values())
-        self.__cached_pure = dmg
-        return dmg
+                for bs in self.breachers.values())
+        hp = getattr(self.profile, "hp", math.inf)
+        return sum(
+            max((min(b.absolute, b.relative * hp) for b in bs), default=0)
+            for bs in self.breachers.values())
 
     @property
     def total(self):
-        if self.__cached_total is not None:
-            return self.__cached_total
-        dmg = self.em + self.thermal + self.kinetic + self.explosive + self.pure
-        self.__cached_total = dmg
-        return dmg
+        return self.em + self.thermal + self.kinetic + self.explosive + self.pure
 
     # Iterator is needed to support tuple-style unpacking
     def __iter__(self):
@@ -172,80 +153,60 @@ class DmgTypes:
         # Round for comparison's sake because often damage profiles are
         # generated from data which includes float errors
         return (
-                floatUnerr(self._em) == floatUnerr(other._em) and
-                floatUnerr(self._thermal) == floatUnerr(other._thermal) and
-                floatUnerr(self._kinetic) == floatUnerr(other._kinetic) and
-                floatUnerr(self._explosive) == floatUnerr(other._explosive) and
-                sorted(self._breachers) == sorted(other._breachers) and
+                floatUnerr(self.em) == floatUnerr(other.em) and
+                floatUnerr(self.thermal) == floatUnerr(other.thermal) and
+                floatUnerr(self.kinetic) == floatUnerr(other.kinetic) and
+                floatUnerr(self.explosive) == floatUnerr(other.explosive) and
+                sorted(self.breachers or ()) == sorted(other.breachers or ()) and
                 self.profile == other.profile)
 
-    def __add__(self, other):
-        new = type(self)(
-            em=self._em + other._em,
-            thermal=self._thermal + other._thermal,
-            kinetic=self._kinetic + other._kinetic,
-            explosive=self._explosive + other._explosive)
-        new.profile = self.profile
-        for k, v in self._breachers.items():
-            new._breachers[k].extend(v)
-        for k, v in other._breachers.items():
-            new._breachers[k].extend(v)
-        return new
+    __hash__ = None
 
-    def __iadd__(self, other):
-        self._em += other._em
-        self._thermal += other._thermal
-        self._kinetic += other._kinetic
-        self._explosive += other._explosive
-        for k, v in other._breachers.items():
-            self._breachers[k].extend(v)
-        self._clear_cached()
-        return self
+    def __add__(self, other):
+        return type(self)(
+            em=self.em + other.em,
+            thermal=self.thermal + other.thermal,
+            kinetic=self.kinetic + other.kinetic,
+            explosive=self.explosive + other.explosive,
+            breachers=_mergeBreachers(self.breachers, other.breachers),
+            profile=self.profile if self.profile is not None else other.profile)
 
     def __mul__(self, mul):
-        new = type(self)(
-            em=self._em * mul,
-            thermal=self._thermal * mul,
-            kinetic=self._kinetic * mul,
-            explosive=self._explosive * mul)
-        new.profile = self.profile
-        for k, v in self._breachers.items():
-            new._breachers[k] = [b * mul for b in v]
-        return new
-
-    def __imul__(self, mul):
         if mul == 1:
             return self
-        self._em *= mul
-        self._thermal *= mul
-        self._kinetic *= mul
-        self._explosive *= mul
-        for v in self._breachers.values():
-            for b in v:
-                b *= mul
-        self._clear_cached()
-        return self
+        return type(self)(
+            em=self.em * mul,
+            thermal=self.thermal * mul,
+            kinetic=self.kinetic * mul,
+            explosive=self.explosive * mul,
+            breachers=_scaleBreachers(self.breachers, mul),
+            profile=self.profile)
 
     def __truediv__(self, div):
-        new = type(self)(
-            em=self._em / div,
-            thermal=self._thermal / div,
-            kinetic=self._kinetic / div,
-            explosive=self._explosive / div)
-        new.profile = self.profile
-        for k, v in self._breachers.items():
-            new._breachers[k] = [b / div for b in v]
-        return new
+        if div == 1:
+            return self
+        return type(self)(
+            em=self.em / div,
+            thermal=self.thermal / div,
+            kinetic=self.kinetic / div,
+            explosive=self.explosive / div,
+            breachers={k: tuple(b / div for b in v) for k, v in self.breachers.items()} if self.breachers else None,
+            profile=self.profile)
 
     def __bool__(self):
-        return any((
-            self._em, self._thermal, self._kinetic, self._explosive,
-            any(b.absolute or b.relative for b in self._breachers)))
+        return bool(
+            self.em or self.thermal or self.kinetic or self.explosive or
+            (self.breachers and any(b.absolute or b.relative for bs in self.breachers.values() for b in bs)))
+
+    # Vectors are immutable, so there is no need to copy them
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     def __repr__(self):
-        class_name = type(self).__name__
-        return (f'<{class_name}(em={self._em}, thermal={self._thermal}, kinetic={self._kinetic}, '
-                f'explosive={self._explosive}, breachers={len(self._breachers)})>')
+        return makeReprStr(self, ['em', 'thermal', 'kinetic', 'explosive', 'total'])
 
     @staticmethod
     def names(short=None, postProcessor=None, includePure=False):
@@ -260,6 +221,65 @@ class DmgTypes:
         return value
 
 
+_zeroDmg = DmgTypes(0, 0, 0, 0)
+
+
+class DmgAccumulator:
+    """
+    Mutable counterpart of DmgTypes for summation loops: adds vectors in place
+    instead of allocating new vector on every step.
+    """
+
+    __slots__ = ('em', 'thermal', 'kinetic', 'explosive', 'breachers', 'profile')
+
+    def __init__(self):
+        self.em = 0
+        self.thermal = 0
+        self.kinetic = 0
+        self.explosive = 0
+        self.breachers = None
+        self.profile = None
+
+    def add(self, dmg, mul=1):
+        """Add vector multiplied by mul"""
+        if mul == 1:
+            self.em += dmg.em
+            self.thermal += dmg.thermal
+            self.kinetic += dmg.kinetic
+            self.explosive += dmg.explosive
+        else:
+            self.em += dmg.em * mul
+            self.thermal += dmg.thermal * mul
+            self.kinetic += dmg.kinetic * mul
+            self.explosive += dmg.explosive * mul
+        if dmg.breachers:
+            if self.breachers is None:
+                self.breachers = {}
+            for key, infos in dmg.breachers.items():
+                if mul != 1:
+                    infos = tuple(b * mul for b in infos)
+                self.breachers[key] = self.breachers.get(key, ()) + infos
+        if self.profile is None:
+            self.profile = dmg.profile
+        return self
+
+    def scale(self, mul):
+        """Multiply accumulated values by mul"""
+        if mul == 1:
+            return self
+        self.em *= mul
+        self.thermal *= mul
+        self.kinetic *= mul
+        self.explosive *= mul
+        self.breachers = _scaleBreachers(self.breachers, mul)
+        return self
+
+    def result(self):
+        return DmgTypes(
+            em=self.em, thermal=self.thermal, kinetic=self.kinetic, explosive=self.explosive,
+            breachers=dict(self.breachers) if self.breachers else None, profile=self.profile)
+
+
 class RRTypes:
     """Container for tank data stats."""
 
@@ -0,0 +1,293 @@
+# ===============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of eos.
+#
+# eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with eos.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+"""
+Timeline of effects of cycling items, e.g. damage or repairs over time.
+
+Cycles described by CycleInfo/CycleSequence are walked in runs of identical
+cycles rather than one by one, values which depend on spoolup are requested
+only until spoolup is saturated, and results are stored as per-key step
+functions which have points only where values change. All times here are in
+seconds.
+"""
+
+import math
+from copy import copy
+
+from eos.utils.cycles import CycleSequence
+from eos.utils.float import floatUnerr
+
+
+class CycleRun:
+    """
+    Run of consecutive cycles with the same timing. Cycle state is specified
+    for the first cycle of the run: nonstopCycles is amount of cycles item did
+    without pause before it (which is what spoolup depends on), reloadCycles is
+    amount of cycles since last reload.
+    """
+
+    __slots__ = ('start', 'activeTime', 'inactiveTime', 'isInactivityReload', 'quantity', 'nonstopCycles', 'reloadCycles')
+
+    def __init__(self, start, activeTime, inactiveTime, isInactivityReload, quantity, nonstopCycles, reloadCycles):
+        self.start = start
+        self.activeTime = activeTime
+        self.inactiveTime = inactiveTime
+        self.isInactivityReload = isInactivityReload
+        self.quantity = quantity
+        self.nonstopCycles = nonstopCycles
+        self.reloadCycles = reloadCycles
+
+    @property
+    def period(self):
+        return self.activeTime + self.inactiveTime
+
+    @property
+    def end(self):
+        return self.start + self.period * self.quantity
+
+    def getStart(self, index):
+        return self.start + self.period * index
+
+    def slice(self, first, last=None):
+        """Get run of cycles [first, last) of this run"""
+        if last is None:
+            last = self.quantity
+        if first == 0:
+            nonstopCycles = self.nonstopCycles
+            reloadCycles = self.reloadCycles
+        else:
+            nonstopCycles = 0 if self.inactiveTime > 0 else self.nonstopCycles + first
+            reloadCycles = 0 if self.isInactivityReload else self.reloadCycles + first
+        return CycleRun(
+            start=self.getStart(first), activeTime=self.activeTime, inactiveTime=self.inactiveTime,
+            isInactivityReload=self.isInactivityReload, quantity=last - first,
+            nonstopCycles=nonstopCycles, reloadCycles=reloadCycles)
+
+
+def iterCycleRuns(cycleParams, maxTime):
+    """
+    Yield runs of cycles of passed cycle parameters. Like cycle-by-cycle
+    simulation, it stops after the first cycle which starts past max time.
+    """
+    currentTime = 0
+    nonstopCycles = 0
+    reloadCycles = 0
+    for cycleInfo in _iterCycleInfos(cycleParams):
+        if cycleInfo.quantity <= 0:
+            continue
+        activeTime = cycleInfo.activeTime / 1000
+        inactiveTime = cycleInfo.inactiveTime / 1000
+        period = activeTime + inactiveTime
+        # Cycles which start at max time or before it, plus one more
+        if period > 0:
+            neededCycles = max(math.floor(floatUnerr((maxTime - currentTime) / period)) + 2, 1)
+        else:
+            neededCycles = 1
+        isLast = neededCycles <= cycleInfo.quantity
+        run = CycleRun(
+            start=currentTime, activeTime=activeTime, inactiveTime=inactiveTime,
+            isInactivityReload=cycleInfo.isInactivityReload,
+            quantity=min(cycleInfo.quantity, neededCycles),
+            nonstopCycles=nonstopCycles, reloadCycles=reloadCycles)
+        yield run
+        if isLast:
+            return
+        currentTime = run.end
+        if inactiveTime > 0:
+            nonstopCycles = 0
+        else:
+            nonstopCycles += run.quantity
+        if cycleInfo.isInactivityReload:
+            reloadCycles = 0
+        else:
+            reloadCycles += run.quantity
+
+
+def _iterCycleInfos(cycleParams):
+    if not isinstance(cycleParams, CycleSequence):
+        yield cycleParams
+        return
+    i = 0
+    while i < cycleParams.quantity:
+        for item in cycleParams.sequence:
+            yield from _iterCycleInfos(item)
+        i += 1
+
+
+class SpoolValues:
+    """
+    Per-cycle values of item, requested from getter by amount of nonstop
+    cycles. Spoolup only grows until it reaches its max, thus once the value
+    does not change between two consecutive cycles, it is considered
+    saturated and getter is not called any longer.
+    """
+
+    def __init__(self, getter):
+        self._getter = getter
+        self._values = {}
+        self._saturatedAt = None
+
+    @classmethod
+    def constant(cls, value):
+        spoolValues = cls(None)
+        spoolValues._values[0] = value
+        spoolValues._saturatedAt = 0
+        return spoolValues
+
+    def isSaturated(self, nonstopCycles):
+        return self._saturatedAt is not None and nonstopCycles >= self._saturatedAt
+
+    def get(self, nonstopCycles):
+        if self.isSaturated(nonstopCycles):
+            return self._values[self._saturatedAt]
+        try:
+            return self._values[nonstopCycles]
+        except KeyError:
+            pass
+        value = self._values[nonstopCycles] = self._getter(nonstopCycles)
+        if nonstopCycles - 1 in self._values and self._values[nonstopCycles - 1] == value:
+            self._saturatedAt = nonstopCycles - 1
+        return value
+
+
+def iterRunValues(run, spoolValues):
+    """Split run into parts over which values do not change, yield (part, value) pairs"""
+    # Every cycle after pause starts from scratch
+    if run.inactiveTime > 0:
+        if run.quantity > 1 and run.nonstopCycles != 0:
+            yield run.slice(0, 1), spoolValues.get(run.nonstopCycles)
+            yield run.slice(1), spoolValues.get(0)
+        else:
+            yield run, spoolValues.get(run.nonstopCycles)
+        return
+    for i in range(run.quantity):
+        nonstopCycles = run.nonstopCycles + i
+        value = spoolValues.get(nonstopCycles)
+        if spoolValues.isSaturated(nonstopCycles):
+            yield run.slice(i), value
+            return
+        yield run.slice(i, i + 1), value
+
+
+def iterReloadParts(run, cyclesUntilReload):
+    """
+    Split run into parts by whether cycles exceed amount of cycles item can do
+    until reload, yield (part, isExceeding) pairs
+    """
+    firstExceeding = run.reloadCycles >= cyclesUntilReload
+    if run.isInactivityReload:
+        # Every cycle after the first one goes right after reload
+        splitIndex = 1 if firstExceeding != (cyclesUntilReload < 1) else run.quantity
+    else:
+        splitIndex = run.quantity if firstExceeding else cyclesUntilReload - run.reloadCycles
+    if splitIndex == 0 or splitIndex >= run.quantity:
+        yield run, firstExceeding
+        return
+    yield run.slice(0, splitIndex), firstExceeding
+    yield run.slice(splitIndex), not firstExceeding
+
+
+class Timeline:
+    """
+    Step functions of rates (e.g. DPS) and discrete amounts (e.g. damage of
+    separate volleys) of multiple sources, in {key: {time: value}} format.
+    Rate segments with gaps between them get zero value in the gaps.
+    """
+
+    def __init__(self, rateZero):
+        self.rates = {}
+        self.amounts = {}
+        self._rateZero = rateZero
+        self._lastRates = {}
+
+    def addRate(self, key, timeStart, timeEnd, value):
+        pointData = self.rates.setdefault(key, {})
+        try:
+            prevTimeEnd, prevValue = self._lastRates[key]
+        except KeyError:
+            pointData[timeStart] = value
+        else:
+            if floatUnerr(prevTimeEnd) < floatUnerr(timeStart):
+                pointData[prevTimeEnd] = self._rateZero
+                pointData[timeStart] = value
+            elif value != prevValue:
+                pointData[timeStart] = value
+        self._lastRates[key] = (timeEnd, value)
+
+    def addRunRate(self, key, run, value, offset=0):
+        """Add the same rate during active time of all cycles of the run"""
+        # Without pauses it is a single segment
+        if run.inactiveTime == 0:
+            self.addRate(key, run.start + offset, run.end + offset, value)
+            return
+        for i in range(run.quantity):
+            timeStart = run.getStart(i) + offset
+            self.addRate(key, timeStart, timeStart + run.activeTime, value)
+
+    def addAmount(self, key, time, amount):
+        self.amounts.setdefault(key, {})[time] = amount
+
+    def addRunAmounts(self, key, run, amounts, offset=0, amountGetter=None):
+        """
+        Add amounts, specified as {time in cycle: amount}, for all cycles of
+        the run. Amount getter, if passed, receives original amount and time
+        and returns amount to store.
+        """
+        keyAmounts = self.amounts.setdefault(key, {})
+        for i in range(run.quantity):
+            cycleStart = run.getStart(i) + offset
+            for amountTime, amount in amounts.items():
+                time = cycleStart + amountTime
+                keyAmounts[time] = amount if amountGetter is None else amountGetter(amount, time)
+
+
+def mergeSteps(stepsByKey):
+    """Convert {key: {time: value}} step functions into {time: {key: value}} form"""
+    changesByTime = {}
+    for key, steps in stepsByKey.items():
+        for time in steps:
+            changesByTime.setdefault(time, []).append(key)
+    merged = {}
+    timeData = {}
+    for time in sorted(changesByTime):
+        timeData = copy(timeData)
+        for key in changesByTime[time]:
+            timeData[key] = stepsByKey[key][time]
+        merged[time] = timeData
+    return merged
+
+
+def mergeAmounts(amountsByKey):
+    """Convert {key: {time: amount}} amounts into cumulative {time: {key: total amount}} form"""
+    changesByTime = {}
+    for key, amounts in amountsByKey.items():
+        for time in amounts:
+            changesByTime.setdefault(time, []).append(key)
+    merged = {}
+    timeData = {}
+    for time in sorted(changesByTime):
+        timeData = copy(timeData)
+        for key in changesByTime[time]:
+            amount = amountsByKey[key][time]
+            if key in timeData:
+                timeData[key] = timeData[key] + amount
+            else:
+                timeData[key] = amount
+        merged[time] = timeData
+    return merged
@@ -0,0 +1,298 @@
+# ===============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of eos.
+#
+# eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with eos.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+"""
+What-if evaluation of hypothetical fit edits, e.g. "what if I swap this DDA for
+a BCS". Edits are applied to calc copy of the fit (see Fit.getCalcCopy()),
+which is made once and then edited in place and reverted after each
+evaluation. This way trying many alternatives costs only their recalculation:
+saveddata session is never involved, and items which are not edited are
+reused as they are.
+"""
+
+from eos.const import FittingModuleState
+from eos.saveddata.module import Module
+
+
+STATS = {
+    'dps': lambda fit: fit.getTotalDps().total,
+    'volley': lambda fit: fit.getTotalVolley().total,
+    'ehp': lambda fit: sum(fit.ehp.values()),
+    'maxSpeed': lambda fit: fit.maxSpeed,
+    'alignTime': lambda fit: fit.alignTime,
+    'maxTargetRange': lambda fit: fit.maxTargetRange,
+    'cpuUsed': lambda fit: fit.cpuUsed,
+    'pgUsed': lambda fit: fit.pgUsed,
+    'capUsed': lambda fit: fit.capUsed,
+    'capStable': lambda fit: int(fit.capStable),
+    # Stable level as fraction of capacity for stable fits, time before it runs
+    # out in seconds for unstable ones
+    'capState': lambda fit: fit.capState}
+DEFAULT_STATS = ('dps', 'volley', 'ehp', 'maxSpeed', 'alignTime', 'cpuUsed', 'pgUsed')
+
+
+class ReplaceModule:
+    """Put module into position, keeping charge and state of old one where possible"""
+
+    def __init__(self, position, item, state=None):
+        self.position = position
+        self.item = item
+        self.state = state
+
+    def apply(self, fit):
+        """Apply edit to the fit, return function which reverts it or None if edit is not possible"""
+        try:
+            oldMod = fit.modules[self.position]
+        except IndexError:
+            return None
+        try:
+            newMod = Module(self.item)
+        except ValueError:
+            return None
+        if newMod.slot != oldMod.slot:
+            return None
+        state = self.state
+        if state is None:
+            state = oldMod.state if not oldMod.isEmpty else FittingModuleState.ACTIVE
+        newMod.state = newMod.getMaxState(proposedState=state)
+        if not oldMod.isEmpty and newMod.isValidCharge(oldMod.charge):
+            newMod.charge = oldMod.charge
+        fit.modules.replace(self.position, newMod)
+        newMod.owner = fit
+
+        def revert():
+            fit.modules.replace(self.position, oldMod)
+
+        if newMod not in fit.modules:
+            return None
+        if not newMod.fits(fit):
+            revert()
+            return None
+        return revert
+
+
+class AddModule:
+    """
+    Put module into first free slot of its kind, or after all other modules,
+    the same way fitting it via GUI does. Other modules of its group which
+    cannot stay in their state alongside it are set to the state they can have.
+    """
+
+    def __init__(self, item, state=FittingModuleState.ACTIVE):
+        self.item = item
+        self.state = state
+
+    def apply(self, fit):
+        try:
+            newMod = Module(self.item)
+        except ValueError:
+            return None
+        if newMod.slot is None:
+            return None
+        newMod.state = newMod.getMaxState(proposedState=self.state)
+        oldModules = list(fit.modules)
+        fit.modules.append(newMod)
+        if newMod not in fit.modules:
+            return None
+        newMod.owner = fit
+        position = newMod.position
+        changedStates = {}
+
+        def revert():
+            for mod, state in changedStates.items():
+                mod.state = state
+            if position < len(oldModules):
+                fit.modules.replace(position, oldModules[position])
+            else:
+                fit.modules.remove(newMod)
+
+        if not newMod.fits(fit):
+            revert()
+            return None
+        for mod in fit.modules:
+            if mod is newMod or mod.isEmpty:
+                continue
+            canHaveState = mod.canHaveState(mod.state)
+            if canHaveState is not True:
+                changedStates[mod] = mod.state
+                mod.state = canHaveState
+        return revert
+
+
+class RemoveModule:
+
+    def __init__(self, position):
+        self.position = position
+
+    def apply(self, fit):
+        try:
+            oldMod = fit.modules[self.position]
+        except IndexError:
+            return None
+        if oldMod.isEmpty:
+            return None
+        fit.modules.free(self.position)
+        fit.modules[self.position].owner = fit
+
+        def revert():
+            fit.modules.replace(self.position, oldMod)
+
+        return revert
+
+
+class ChangeModuleState:
+
+    def __init__(self, position, state):
+        self.position = position
+        self.state = state
+
+    def apply(self, fit):
+        try:
+            mod = fit.modules[self.position]
+        except IndexError:
+            return None
+        if mod.isEmpty or not mod.isValidState(self.state):
+            return None
+        oldState = mod.state
+        mod.state = self.state
+
+        def revert():
+            mod.state = oldState
+
+        return revert
+
+
+class ChangeModuleCharge:
+
+    def __init__(self, position, charge):
+        self.position = position
+        self.charge = charge
+
+    def apply(self, fit):
+        try:
+            mod = fit.modules[self.position]
+        except IndexError:
+            return None
+        if mod.isEmpty or (self.charge is not None and not mod.isValidCharge(self.charge)):
+            return None
+        oldCharge = mod.charge
+        mod.charge = self.charge
+
+        def revert():
+            mod.charge = oldCharge
+
+        return revert
+
+
+class ChangeSkillLevel:
+    """Set level of skill; possible only for fits calculated with copy of their character"""
+
+    def __init__(self, skillID, level):
+        self.skillID = skillID
+        self.level = level
+
+    def apply(self, fit):
+        character = fit.character
+        if character.calcSource is None:
+            return None
+        try:
+            skill = character.getSkill(self.skillID)
+        except KeyError:
+            return None
+        oldLevel = skill.activeLevel
+        skill.setLevel(self.level, ignoreRestrict=True)
+
+        def revert():
+            skill.setLevel(oldLevel, ignoreRestrict=True)
+
+        return revert
+
+
+def evaluateOnce(fit, edits, stats=DEFAULT_STATS, copyCharacter=False):
+    """
+    Get stats of the fit with all edits applied, or None if any of them is not
+    possible. Unlike WhatIf, calculates calc copy only once, without baseline.
+    """
+    fitCopy = fit.getCalcCopy(copyCharacter=copyCharacter)
+    for edit in edits:
+        if edit.apply(fitCopy) is None:
+            return None
+    fitCopy.calculateModifiedAttributes()
+    return {name: STATS[name](fitCopy) for name in stats}
+
+
+class WhatIfResult:
+
+    def __init__(self, edits, values, baseline):
+        self.edits = edits
+        self.values = values
+        self.deltas = {k: values[k] - baseline[k] for k in values}
+
+    def __repr__(self):
+        return 'WhatIfResult(deltas={})'.format(self.deltas)
+
+
+class WhatIf:
+    """
+    Evaluates stats of the fit with hypothetical edits. Passed fit itself is
+    never modified; stats of the unedited copy are available as baseline.
+    Skill edits need copyCharacter to be set.
+    """
+
+    def __init__(self, fit, stats=DEFAULT_STATS, copyCharacter=False):
+        self.fit = fit.getCalcCopy(copyCharacter=copyCharacter)
+        self.stats = tuple(stats)
+        self.baseline = self.__getStats()
+
+    def __getStats(self):
+        self.fit.calculated = False
+        self.fit.calculateModifiedAttributes()
+        return {name: STATS[name](self.fit) for name in self.stats}
+
+    def evaluate(self, edits):
+        """Get stats of the fit with all edits applied, or None if any of them is not possible"""
+        reverts = []
+        try:
+            for edit in edits:
+                revert = edit.apply(self.fit)
+                if revert is None:
+                    return None
+                reverts.append(revert)
+            return WhatIfResult(edits, self.__getStats(), self.baseline)
+        finally:
+            for revert in reversed(reverts):
+                revert()
+
+    def rankModuleReplacements(self, position, items, stat='dps', reverse=True):
+        """
+        Evaluate replacement of module in position with each of passed items,
+        and get results sorted by change of passed stat, best first. Items
+        which cannot be fit there are skipped.
+        """
+        results = []
+        seen = set()
+        for item in items:
+            if item.ID in seen:
+                continue
+            seen.add(item.ID)
+            result = self.evaluate((ReplaceModule(position, item),))
+            if result is not None:
+                results.append((item, result))
+        results.sort(key=lambda r: r[1].deltas[stat], reverse=reverse)
+        return results
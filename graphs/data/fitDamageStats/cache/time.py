@@ -18,11 +18,10 @@
 # =============================================================================
 
 
-from copy import copy
-
 from eos.utils.float import floatUnerr
 from eos.utils.spoolSupport import SpoolOptions, SpoolType
 from eos.utils.stats import DmgTypes
+from eos.utils.timeline import SpoolValues, Timeline, iterCycleRuns, iterRunValues, mergeAmounts, mergeSteps
 from graphs.data.base import FitDataCache
 
 
@@ -71,24 +70,9 @@ class TimeCache(FitDataCache):
         # Final cache has been generated already, don't do anything
         if 'finalDmg' in fitCache:
             return
-        intCache = fitCache['internalDmg']
-        changesByTime = {}
-        for key, dmgMap in intCache.items():
-            for time in dmgMap:
-                changesByTime.setdefault(time, []).append(key)
         # Here we convert cache to following format:
         # {time: {key: damage done by key at this time}}
-        finalCache = fitCache['finalDmg'] = {}
-        timeDmgData = {}
-        for time in sorted(changesByTime):
-            timeDmgData = copy(timeDmgData)
-            for key in changesByTime[time]:
-                keyDmg = intCache[key][time]
-                if key in timeDmgData:
-                    timeDmgData[key] = timeDmgData[key] + keyDmg
-                else:
-                    timeDmgData[key] = keyDmg
-            finalCache[time] = timeDmgData
+        fitCache['finalDmg'] = mergeAmounts(fitCache['internalDmg'])
         # We do not need internal cache once we have final
         del fitCache['internalDmg']
 
@@ -103,76 +87,44 @@ class TimeCache(FitDataCache):
         # Final cache has been generated already, don't do anything
         if 'finalDps' in fitCache and 'finalVolley' in fitCache:
             return
-        # Convert cache from segments with assigned values into points
-        # which are located at times when dps/volley values change
-        pointCache = {}
-        for key, dmgList in fitCache['internalDpsVolley'].items():
-            pointData = pointCache[key] = {}
-            prevDps = None
-            prevVolley = None
-            prevTimeEnd = None
-            for timeStart, timeEnd, dps, volley in dmgList:
-                # First item
-                if not pointData:
-                    pointData[timeStart] = (dps, volley)
-                # Gap between items
-                elif floatUnerr(prevTimeEnd) < floatUnerr(timeStart):
-                    pointData[prevTimeEnd] = (DmgTypes.default(), DmgTypes.default())
-                    pointData[timeStart] = (dps, volley)
-                # Changed value
-                elif dps != prevDps or volley != prevVolley:
-                    pointData[timeStart] = (dps, volley)
-                prevDps = dps
-                prevVolley = volley
-                prevTimeEnd = timeEnd
+        # Internal cache already has points which are located at times when
+        # dps/volley values change, here we convert it to following format:
+        # {time: {key: (dps, volley}}
+        finalDpsVolleyCache = mergeSteps(fitCache['internalDpsVolley'])
         # We have data in another form, do not need old one any longer
         del fitCache['internalDpsVolley']
-        changesByTime = {}
-        for key, dmgMap in pointCache.items():
-            for time in dmgMap:
-                changesByTime.setdefault(time, []).append(key)
-        # Here we convert cache to following format:
-        # {time: {key: (dps, volley}}
         finalDpsCache = fitCache['finalDps'] = {}
         finalVolleyCache = fitCache['finalVolley'] = {}
-        timeDpsData = {}
-        timeVolleyData = {}
-        for time in sorted(changesByTime):
-            timeDpsData = copy(timeDpsData)
-            timeVolleyData = copy(timeVolleyData)
-            for key in changesByTime[time]:
-                dps, volley = pointCache[key][time]
-                timeDpsData[key] = dps
-                timeVolleyData[key] = volley
-            finalDpsCache[time] = timeDpsData
-            finalVolleyCache[time] = timeVolleyData
+        for time, timeDpsVolleyData in finalDpsVolleyCache.items():
+            finalDpsCache[time] = {k: v[0] for k, v in timeDpsVolleyData.items()}
+            finalVolleyCache[time] = {k: v[1] for k, v in timeDpsVolleyData.items()}
 
     def _generateInternalForm(self, src, maxTime):
         if self._isTimeCacheValid(src=src, maxTime=maxTime):
             return
         fitCache = self._data[src.item.ID] = {'maxTime': maxTime}
-        intCacheDpsVolley = fitCache['internalDpsVolley'] = {}
-        intCacheDmg = fitCache['internalDmg'] = {}
-
-        def addDpsVolley(ddKey, addedTimeStart, addedTimeFinish, addedVolleys):
-            if not addedVolleys:
-                return
-            volleySum = sum(addedVolleys, DmgTypes.default())
-            if volleySum.total > 0:
-                addedDps = volleySum / (addedTimeFinish - addedTimeStart)
-                # We can take "just best" volley, no matter target resistances, because all
-                # known items have the same damage type ratio throughout their cycle - and
-                # applying resistances doesn't change final outcome
-                bestVolley = max(addedVolleys, key=lambda v: v.total)
-                ddCacheDps = intCacheDpsVolley.setdefault(ddKey, [])
-                ddCacheDps.append((addedTimeStart, addedTimeFinish, addedDps, bestVolley))
-
-        def addDmg(ddKey, addedTime, addedDmg):
-            if addedDmg.total == 0:
-                return
-            addedDmg._breachers = {addedTime + k: v for k, v in addedDmg._breachers.items()}
-            addedDmg._clear_cached()
-            intCacheDmg.setdefault(ddKey, {})[addedTime] = addedDmg
+        timeline = Timeline(rateZero=(DmgTypes.default(), DmgTypes.default()))
+        fitCache['internalDpsVolley'] = timeline.rates
+        fitCache['internalDmg'] = timeline.amounts
+
+        def addCycles(ddKey, cycleParams, spoolValues, offset=0, firstVolleyOnly=False):
+            for run in iterCycleRuns(cycleParams, maxTime):
+                for part, volleyParams in iterRunValues(run, spoolValues):
+                    if not volleyParams:
+                        continue
+                    if firstVolleyOnly:
+                        volleyParams = dict(list(volleyParams.items())[:1])
+                    timeline.addRunAmounts(
+                        ddKey, part, {t / 1000: v for t, v in volleyParams.items() if v.total != 0}, offset=offset,
+                        amountGetter=lambda volley, time: volley.shiftBreachers(time))
+                    cycleVolleys = list(volleyParams.values())
+                    volleySum = DmgTypes.sum(cycleVolleys)
+                    if volleySum.total > 0:
+                        # We can take "just best" volley, no matter target resistances, because all
+                        # known items have the same damage type ratio throughout their cycle - and
+                        # applying resistances doesn't change final outcome
+                        bestVolley = max(cycleVolleys, key=lambda v: v.total)
+                        timeline.addRunRate(ddKey, part, (volleySum / part.activeTime, bestVolley), offset=offset)
 
         # Modules
         for mod in src.item.activeModulesIter():
@@ -181,34 +133,13 @@ class TimeCache(FitDataCache):
             cycleParams = mod.getCycleParametersForDps(reloadOverride=True)
             if cycleParams is None:
                 continue
-            currentTime = 0
-            nonstopCycles = 0
-            isBreacher = mod.isBreacher
-            for cycleTimeMs, inactiveTimeMs, isInactivityReload in cycleParams.iterCycles():
-                cycleVolleys = []
-                volleyParams = mod.getVolleyParameters(spoolOptions=SpoolOptions(SpoolType.CYCLES, nonstopCycles, True))
-
-                for volleyTimeMs, volley in volleyParams.items():
-                    cycleVolleys.append(volley)
-                    time = currentTime + volleyTimeMs / 1000
-                    if isBreacher:
-                        time += 1
-                    addDmg(mod, time, volley)
-                    if isBreacher:
-                        break
-                timeStart = currentTime
-                timeFinish = currentTime + cycleTimeMs / 1000
-                if isBreacher:
-                    timeStart += 1
-                    timeFinish += 1
-                addDpsVolley(mod, timeStart, timeFinish, cycleVolleys)
-                if inactiveTimeMs > 0:
-                    nonstopCycles = 0
-                else:
-                    nonstopCycles += 1
-                if currentTime > maxTime:
-                    break
-                currentTime += cycleTimeMs / 1000 + inactiveTimeMs / 1000
+            spoolValues = SpoolValues(lambda nonstopCycles, mod=mod: mod.getVolleyParameters(
+                spoolOptions=SpoolOptions(SpoolType.CYCLES, nonstopCycles, True)))
+            # Breachers deal damage over time, separately from their cycle
+            if mod.isBreacher:
+                addCycles(mod, cycleParams, spoolValues, offset=1, firstVolleyOnly=True)
+            else:
+                addCycles(mod, cycleParams, spoolValues)
         # Drones
         for drone in src.item.activeDronesIter():
             if not drone.isDealingDamage():
@@ -216,17 +147,7 @@ class TimeCache(FitDataCache):
             cycleParams = drone.getCycleParameters(reloadOverride=True)
             if cycleParams is None:
                 continue
-            currentTime = 0
-            volleyParams = drone.getVolleyParameters()
-            for cycleTimeMs, inactiveTimeMs, isInactivityReload in cycleParams.iterCycles():
-                cycleVolleys = []
-                for volleyTimeMs, volley in volleyParams.items():
-                    cycleVolleys.append(volley)
-                    addDmg(drone, currentTime + volleyTimeMs / 1000, volley)
-                addDpsVolley(drone, currentTime, currentTime + cycleTimeMs / 1000, cycleVolleys)
-                if currentTime > maxTime:
-                    break
-                currentTime += cycleTimeMs / 1000 + inactiveTimeMs / 1000
+            addCycles(drone, cycleParams, SpoolValues.constant(drone.getVolleyParameters()))
         # Fighters
         for fighter in src.item.activeFightersIter():
             if not fighter.isDealingDamage():
@@ -238,17 +159,7 @@ class TimeCache(FitDataCache):
             for effectID, abilityCycleParams in cycleParams.items():
                 if effectID not in volleyParams:
                     continue
-                currentTime = 0
-                abilityVolleyParams = volleyParams[effectID]
-                for cycleTimeMs, inactiveTimeMs, isInactivityReload in abilityCycleParams.iterCycles():
-                    cycleVolleys = []
-                    for volleyTimeMs, volley in abilityVolleyParams.items():
-                        cycleVolleys.append(volley)
-                        addDmg((fighter, effectID), currentTime + volleyTimeMs / 1000, volley)
-                    addDpsVolley((fighter, effectID), currentTime, currentTime + cycleTimeMs / 1000, cycleVolleys)
-                    if currentTime > maxTime:
-                        break
-                    currentTime += cycleTimeMs / 1000 + inactiveTimeMs / 1000
+                addCycles((fighter, effectID), abilityCycleParams, SpoolValues.constant(volleyParams[effectID]))
 
     def _isTimeCacheValid(self, src, maxTime):
         try:
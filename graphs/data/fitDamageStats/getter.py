@@ -21,7 +21,7 @@
 import eos.config
 from eos.saveddata.targetProfile import TargetProfile
 from eos.utils.spoolSupport import SpoolOptions, SpoolType
-from eos.utils.stats import DmgTypes
+from eos.utils.stats import DmgAccumulator
 from graphs.data.base import PointGetter, SmoothPointGetter
 from service.settings import GraphSettings
 from .calc.application import getApplicationPerKey
@@ -29,16 +29,15 @@ from .calc.projected import getScramRange, getScrammables, getTackledSpeed, getS
 
 
 def applyDamage(dmgMap, applicationMap, tgtResists, tgtFullHp):
-    total = DmgTypes.default()
+    total = DmgAccumulator()
     for key, dmg in dmgMap.items():
-        total += dmg * applicationMap.get(key, 0)
+        total.add(dmg, applicationMap.get(key, 0))
     if not GraphSettings.getInstance().get('ignoreResists'):
         emRes, thermRes, kinRes, exploRes = tgtResists
     else:
         emRes = thermRes = kinRes = exploRes = 0
-    total.profile = TargetProfile(
-        emAmount=emRes, thermalAmount=thermRes, kineticAmount=kinRes, explosiveAmount=exploRes, hp=tgtFullHp)
-    return total
+    return total.result().applyProfile(TargetProfile(
+        emAmount=emRes, thermalAmount=thermRes, kineticAmount=kinRes, explosiveAmount=exploRes, hp=tgtFullHp))
 
 
 # Y mixins
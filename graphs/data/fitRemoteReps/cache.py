@@ -18,11 +18,10 @@
 # =============================================================================
 
 
-from copy import copy
-
 from eos.utils.float import floatUnerr
 from eos.utils.spoolSupport import SpoolOptions, SpoolType
 from eos.utils.stats import RRTypes
+from eos.utils.timeline import SpoolValues, Timeline, iterCycleRuns, iterReloadParts, iterRunValues, mergeAmounts, mergeSteps
 from graphs.data.base import FitDataCache
 
 
@@ -57,41 +56,12 @@ class TimeCache(FitDataCache):
         # Final cache has been generated already, don't do anything
         if 'finalRps' in fitCache:
             return
-        # Convert cache from segments with assigned values into points
-        # which are located at times when rps value changes
-        pointCache = {}
-        for key, rpsList in fitCache['internalRps'].items():
-            pointData = pointCache[key] = {}
-            prevRps = None
-            prevTimeEnd = None
-            for timeStart, timeEnd, rps in rpsList:
-                # First item
-                if not pointData:
-                    pointData[timeStart] = rps
-                # Gap between items
-                elif floatUnerr(prevTimeEnd) < floatUnerr(timeStart):
-                    pointData[prevTimeEnd] = RRTypes(0, 0, 0, 0)
-                    pointData[timeStart] = rps
-                # Changed value
-                elif rps != prevRps:
-                    pointData[timeStart] = rps
-                prevRps = rps
-                prevTimeEnd = timeEnd
+        # Internal cache already has points which are located at times when
+        # rps value changes, here we convert it to following format:
+        # {time: {key: rps}
+        fitCache['finalRps'] = mergeSteps(fitCache['internalRps'])
         # We have data in another form, do not need old one any longer
         del fitCache['internalRps']
-        changesByTime = {}
-        for key, rpsMap in pointCache.items():
-            for time in rpsMap:
-                changesByTime.setdefault(time, []).append(key)
-        # Here we convert cache to following format:
-        # {time: {key: rps}
-        finalRpsCache = fitCache['finalRps'] = {}
-        timeRpsData = {}
-        for time in sorted(changesByTime):
-            timeRpsData = copy(timeRpsData)
-            for key in changesByTime[time]:
-                timeRpsData[key] = pointCache[key][time]
-            finalRpsCache[time] = timeRpsData
 
     def prepareRepAmountData(self, src, ancReload, maxTime):
         # Time is none means that time parameter has to be ignored,
@@ -103,24 +73,9 @@ class TimeCache(FitDataCache):
         # Final cache has been generated already, don't do anything
         if 'finalRepAmount' in fitCache:
             return
-        intCache = fitCache['internalRepAmount']
-        changesByTime = {}
-        for key, remAmountMap in intCache.items():
-            for time in remAmountMap:
-                changesByTime.setdefault(time, []).append(key)
         # Here we convert cache to following format:
         # {time: {key: hp repaired by key at this time}}
-        finalCache = fitCache['finalRepAmount'] = {}
-        timeRepAmountData = {}
-        for time in sorted(changesByTime):
-            timeRepAmountData = copy(timeRepAmountData)
-            for key in changesByTime[time]:
-                keyRepAmount = intCache[key][time]
-                if key in timeRepAmountData:
-                    timeRepAmountData[key] = timeRepAmountData[key] + keyRepAmount
-                else:
-                    timeRepAmountData[key] = keyRepAmount
-            finalCache[time] = timeRepAmountData
+        fitCache['finalRepAmount'] = mergeAmounts(fitCache['internalRepAmount'])
         # We do not need internal cache once we have final
         del fitCache['internalRepAmount']
 
@@ -129,21 +84,20 @@ class TimeCache(FitDataCache):
         if self._isTimeCacheValid(src=src, ancReload=ancReload, maxTime=maxTime):
             return
         fitCache = self._data.setdefault(src.item.ID, {})[ancReload] = {'maxTime': maxTime}
-        intCacheRps = fitCache['internalRps'] = {}
-        intCacheRepAmount = fitCache['internalRepAmount'] = {}
+        timeline = Timeline(rateZero=RRTypes(0, 0, 0, 0))
+        fitCache['internalRps'] = timeline.rates
+        fitCache['internalRepAmount'] = timeline.amounts
 
-        def addRps(rrKey, addedTimeStart, addedTimeFinish, addedRepAmounts):
-            if not addedRepAmounts:
-                return
-            repAmountSum = sum(addedRepAmounts, RRTypes(0, 0, 0, 0))
-            if repAmountSum.shield > 0 or repAmountSum.armor > 0 or repAmountSum.hull > 0:
-                addedRps = repAmountSum / (addedTimeFinish - addedTimeStart)
-                rrCacheRps = intCacheRps.setdefault(rrKey, [])
-                rrCacheRps.append((addedTimeStart, addedTimeFinish, addedRps))
+        def isRepping(repAmount):
+            return repAmount.shield > 0 or repAmount.armor > 0 or repAmount.hull > 0
 
-        def addRepAmount(rrKey, addedTime, addedRepAmount):
-            if addedRepAmount.shield > 0 or addedRepAmount.armor > 0 or addedRepAmount.hull > 0:
-                intCacheRepAmount.setdefault(rrKey, {})[addedTime] = addedRepAmount
+        def addCycles(rrKey, run, repAmountParams):
+            if not repAmountParams:
+                return
+            timeline.addRunAmounts(rrKey, run, {t / 1000: r for t, r in repAmountParams.items() if isRepping(r)})
+            repAmountSum = sum(repAmountParams.values(), RRTypes(0, 0, 0, 0))
+            if isRepping(repAmountSum):
+                timeline.addRunRate(rrKey, run, repAmountSum / run.activeTime)
 
         # Modules
         for mod in src.item.activeModulesIter():
@@ -157,30 +111,21 @@ class TimeCache(FitDataCache):
                 cycleParams = mod.getCycleParameters(reloadOverride=True)
             if cycleParams is None:
                 continue
-            currentTime = 0
-            nonstopCycles = 0
-            cyclesWithoutReload = 0
-            cyclesUntilReload = mod.numShots
-            for cycleTimeMs, inactiveTimeMs, isInactivityReload in cycleParams.iterCycles():
-                cyclesWithoutReload += 1
-                cycleRepAmounts = []
-                repAmountParams = mod.getRepAmountParameters(spoolOptions=SpoolOptions(SpoolType.CYCLES, nonstopCycles, True))
-                for repTimeMs, repAmount in repAmountParams.items():
-                    # Loaded ancillary armor rep can keep running at less efficiency if we decide to not reload
-                    if isAncArmor and mod.charge and not ancReload and cyclesWithoutReload > cyclesUntilReload:
-                        repAmount = repAmount / mod.getModifiedItemAttr('chargedArmorDamageMultiplier', 1)
-                    cycleRepAmounts.append(repAmount)
-                    addRepAmount(mod, currentTime + repTimeMs / 1000, repAmount)
-                addRps(mod, currentTime, currentTime + cycleTimeMs / 1000, cycleRepAmounts)
-                if inactiveTimeMs > 0:
-                    nonstopCycles = 0
-                else:
-                    nonstopCycles += 1
-                if isInactivityReload:
-                    cyclesWithoutReload = 0
-                if currentTime > maxTime:
-                    break
-                currentTime += cycleTimeMs / 1000 + inactiveTimeMs / 1000
+            spoolValues = SpoolValues(lambda nonstopCycles, mod=mod: mod.getRepAmountParameters(
+                spoolOptions=SpoolOptions(SpoolType.CYCLES, nonstopCycles, True)))
+            # Loaded ancillary armor rep can keep running at less efficiency if we decide to not reload
+            isAncArmorUnloading = isAncArmor and mod.charge and not ancReload
+            for run in iterCycleRuns(cycleParams, maxTime):
+                for part, repAmountParams in iterRunValues(run, spoolValues):
+                    if not isAncArmorUnloading:
+                        addCycles(mod, part, repAmountParams)
+                        continue
+                    for subpart, isUnloaded in iterReloadParts(part, mod.numShots):
+                        if isUnloaded:
+                            mult = mod.getModifiedItemAttr('chargedArmorDamageMultiplier', 1)
+                            addCycles(mod, subpart, {t: r / mult for t, r in repAmountParams.items()})
+                        else:
+                            addCycles(mod, subpart, repAmountParams)
         # Drones
         for drone in src.item.activeDronesIter():
             if not drone.isRemoteRepping():
@@ -188,17 +133,9 @@ class TimeCache(FitDataCache):
             cycleParams = drone.getCycleParameters(reloadOverride=True)
             if cycleParams is None:
                 continue
-            currentTime = 0
             repAmountParams = drone.getRepAmountParameters()
-            for cycleTimeMs, inactiveTimeMs, isInactivityReload in cycleParams.iterCycles():
-                cycleRepAmounts = []
-                for repTimeMs, repAmount in repAmountParams.items():
-                    cycleRepAmounts.append(repAmount)
-                    addRepAmount(drone, currentTime + repTimeMs / 1000, repAmount)
-                addRps(drone, currentTime, currentTime + cycleTimeMs / 1000, cycleRepAmounts)
-                if currentTime > maxTime:
-                    break
-                currentTime += cycleTimeMs / 1000 + inactiveTimeMs / 1000
+            for run in iterCycleRuns(cycleParams, maxTime):
+                addCycles(drone, run, repAmountParams)
 
     def _isTimeCacheValid(self, src, ancReload, maxTime):
         try:
@@ -91,6 +91,7 @@ class GraphCanvasPanel(wx.Panel):
         self.canvas = Canvas(self, -1, self.figure)
         self.canvas.SetBackgroundColour(wx.Colour(*rgbtuple))
         self.canvas.mpl_connect('button_press_event', self.OnMplCanvasClick)
+        self.canvas.mpl_connect('draw_event', self.OnMplCanvasDraw)
         self.subplot = self.figure.add_subplot(111)
         self.subplot.grid(True)
         mainSizer.Add(self.canvas, 1, wx.EXPAND | wx.ALL, 0)
@@ -100,14 +101,22 @@ class GraphCanvasPanel(wx.Panel):
         self.xMark = None
         self.mplOnDragHandler = None
         self.mplOnReleaseHandler = None
+        # Canvas consists of background layer, which has axes and lines of
+        # series and is redrawn only when series change, and of overlay with
+        # X mark and its labels, which is blitted on top of saved background
+        # (source, target) -> (line, plot data, color, line style)
+        self.seriesLines = {}
+        self.overlayData = None
+        self.overlayArtists = []
+        self.background = None
+        self.accurateMarks = True
 
     def draw(self, accurateMarks=True):
-        self.subplot.clear()
-        self.subplot.grid(True)
         allXs = set()
         allYs = set()
         plotData = {}
         legendData = []
+        seenSeries = set()
         chosenX = self.graphFrame.ctrlPanel.xType
         chosenY = self.graphFrame.ctrlPanel.yType
         self.subplot.set(
@@ -145,28 +154,26 @@ class GraphCanvasPanel(wx.Panel):
                     pyfalog.warning('Invalid line style "{}" for "{}"'.format(target.lightnessID, target.name))
                     continue
                 lineStyle = lineStyleData.mplSpec
-            color = hsv_to_rgb(hsl_to_hsv(color))
+            color = tuple(hsv_to_rgb(hsl_to_hsv(color)))
 
             # Get point data
             try:
-                xs, ys = view.getPlotPoints(
+                points = view.getPlotPoints(
                     mainInput=mainInput,
                     miscInputs=miscInputs,
                     xSpec=chosenX,
                     ySpec=chosenY,
                     src=source,
                     tgt=target)
+                xs, ys = points
                 if not self.__checkNumbers(xs, ys):
                     pyfalog.warning('Failed to plot "{}" vs "{}" due to inf or NaN in values'.format(source.name, '' if target is None else target.name))
                     continue
                 plotData[(source, target)] = (xs, ys)
                 allXs.update(xs)
                 allYs.update(ys)
-                # If we have single data point, show marker - otherwise line won't be shown
-                if len(xs) == 1 and len(ys) == 1:
-                    self.subplot.plot(xs, ys, color=color, linestyle=lineStyle, marker='.')
-                else:
-                    self.subplot.plot(xs, ys, color=color, linestyle=lineStyle)
+                self.__updateSeriesLine(source, target, points, color, lineStyle)
+                seenSeries.add((source, target))
                 # Fill data for legend
                 if target is None:
                     legendData.append((color, lineStyle, source.shortName))
@@ -176,10 +183,15 @@ class GraphCanvasPanel(wx.Panel):
                 raise
             except Exception:
                 pyfalog.warning('Failed to plot "{}" vs "{}"'.format(source.name, '' if target is None else target.name))
+                self.overlayData = None
                 self.canvas.draw()
                 self.Refresh()
                 return
 
+        # Lines of series which are not plotted anymore
+        for key in set(self.seriesLines).difference(seenSeries):
+            self.seriesLines.pop(key)[0].remove()
+
         # Setting Y limits for canvas
         if self.graphFrame.ctrlPanel.showY0:
             allYs.add(0)
@@ -187,94 +199,15 @@ class GraphCanvasPanel(wx.Panel):
         canvasMinX, canvasMaxX = self._getLimits(allXs, minExtra=0.02, maxExtra=0.02)
         self.subplot.set_ylim(bottom=canvasMinY, top=canvasMaxY)
         self.subplot.set_xlim(left=canvasMinX, right=canvasMaxX)
-        # Process X marks line
-        if self.xMark is not None:
-            minX = min(allXs, default=None)
-            maxX = max(allXs, default=None)
-            if minX is not None and maxX is not None:
-                minY = min(allYs, default=None)
-                maxY = max(allYs, default=None)
-                yDiff = (maxY or 0) - (minY or 0)
-                xMark = max(min(self.xMark, maxX), minX)
-                # If in top 10% of X coordinates, align labels differently
-                if xMark > canvasMinX + 0.9 * (canvasMaxX - canvasMinX):
-                    labelAlignment = 'right'
-                    labelPrefix = ''
-                    labelSuffix = ' '
-                else:
-                    labelAlignment = 'left'
-                    labelPrefix = ' '
-                    labelSuffix = ''
-                # Draw line
-                self.subplot.axvline(x=xMark, linestyle='dotted', linewidth=1, color=(0, 0, 0))
-                # Draw its X position
-                if chosenX.unit is None:
-                    xLabel = '{}{}{}'.format(labelPrefix, roundToPrec(xMark, 4), labelSuffix)
-                else:
-                    xLabel = '{}{} {}{}'.format(labelPrefix, roundToPrec(xMark, 4), chosenX.unit, labelSuffix)
-                self.subplot.annotate(
-                    xLabel, xy=(xMark, canvasMaxY - 0.01 * (canvasMaxY - canvasMinY)), xytext=(0, 0), annotation_clip=False,
-                    textcoords='offset pixels', ha=labelAlignment, va='top', fontsize='small')
-                # Get Y values
-                yMarks = set()
-
-                def addYMark(val):
-                    if val is None:
-                        return
-                    # Round according to shown Y range - the bigger the range,
-                    # the rougher the rounding
-                    if yDiff != 0:
-                        rounded = roundToPrec(val, 4, nsValue=yDiff)
-                    else:
-                        rounded = val
-                    # If due to some bug or insufficient plot density we're
-                    # out of bounds, do not add anything
-                    if minY <= val <= maxY or minY <= rounded <= maxY:
-                        yMarks.add(rounded)
-
-                for source, target in iterList:
-                    xs, ys = plotData[(source, target)]
-                    if not xs or xMark < min(xs) or xMark > max(xs):
-                        continue
-                    # Fetch values from graphs when we're asked to provide accurate data
-                    if accurateMarks:
-                        try:
-                            y = view.getPoint(
-                                x=xMark,
-                                miscInputs=miscInputs,
-                                xSpec=chosenX,
-                                ySpec=chosenY,
-                                src=source,
-                                tgt=target)
-                            addYMark(y)
-                        except (KeyboardInterrupt, SystemExit):
-                            raise
-                        except Exception:
-                            pyfalog.warning('Failed to get X mark for "{}" vs "{}"'.format(source.name, '' if target is None else target.name))
-                            # Silently skip this mark, otherwise other marks and legend display will fail
-                            continue
-                    # Otherwise just do linear interpolation between two points
-                    else:
-                        if xMark in xs:
-                            # We might have multiples of the same value in our sequence, pick value for the last one
-                            idx = len(xs) - xs[::-1].index(xMark) - 1
-                            addYMark(ys[idx])
-                            continue
-                        idx = bisect(xs, xMark)
-                        yMark = self._interpolateX(x=xMark, x1=xs[idx - 1], y1=ys[idx - 1], x2=xs[idx], y2=ys[idx])
-                        addYMark(yMark)
-
-                # Draw Y values
-                for yMark in yMarks:
-                    self.subplot.annotate(
-                        '{}{}{}'.format(labelPrefix, yMark, labelSuffix), xy=(xMark, yMark), xytext=(0, 0),
-                        textcoords='offset pixels', ha=labelAlignment, va='center', fontsize='small')
 
         legendLines = []
         for i, iData in enumerate(legendData):
             color, lineStyle, label = iData
             legendLines.append(Line2D([0], [0], color=color, linestyle=lineStyle, label=label.replace('$', r'\$')))
 
+        oldLegend = self.subplot.get_legend()
+        if oldLegend is not None:
+            oldLegend.remove()
         if len(legendLines) > 0 and self.graphFrame.ctrlPanel.showLegend:
             legend = self.subplot.legend(handles=legendLines)
             for t in legend.get_texts():
@@ -282,17 +215,155 @@ class GraphCanvasPanel(wx.Panel):
             for l in legend.get_lines():
                 l.set_linewidth(1)
 
+        # Everything needed to draw X mark without redrawing series
+        self.overlayData = {
+            'view': view, 'miscInputs': miscInputs, 'chosenX': chosenX, 'chosenY': chosenY,
+            'iterList': [k for k in iterList if k in plotData], 'plotData': plotData,
+            'allXs': allXs, 'allYs': allYs, 'canvasLimits': (canvasMinX, canvasMaxX, canvasMinY, canvasMaxY)}
+        self.accurateMarks = accurateMarks
+        # Overlay is drawn on top of new background by draw event handler
         self.canvas.draw()
         self.Refresh()
 
+    def __updateSeriesLine(self, source, target, points, color, lineStyle):
+        """Create line of series, or update it if its data or style has changed"""
+        key = (source, target)
+        xs, ys = points
+        # If we have single data point, show marker - otherwise line won't be shown
+        marker = '.' if len(xs) == 1 and len(ys) == 1 else 'None'
+        cached = self.seriesLines.get(key)
+        if cached is not None:
+            line, oldPoints, oldColor, oldLineStyle = cached
+            # Plot data objects are cached by graph until something affecting
+            # them changes, so identity check is enough
+            if oldPoints is points and oldColor == color and oldLineStyle == lineStyle:
+                return
+            line.set_data(xs, ys)
+            line.set_color(color)
+            line.set_linestyle(lineStyle)
+            line.set_marker(marker)
+        else:
+            line, = self.subplot.plot(xs, ys, color=color, linestyle=lineStyle, marker=marker)
+        self.seriesLines[key] = (line, points, color, lineStyle)
+
+    def drawOverlay(self, accurateMarks=True):
+        """Redraw X mark only, on top of background saved after last full draw"""
+        self.accurateMarks = accurateMarks
+        if self.background is None:
+            self.canvas.draw()
+            self.Refresh()
+            return
+        self.canvas.restore_region(self.background)
+        self.__updateOverlayArtists()
+        for artist in self.overlayArtists:
+            self.subplot.draw_artist(artist)
+        self.canvas.blit(self.figure.bbox)
+
+    def __updateOverlayArtists(self):
+        for artist in self.overlayArtists:
+            artist.remove()
+        self.overlayArtists = []
+        data = self.overlayData
+        if self.xMark is None or data is None:
+            return
+        allXs = data['allXs']
+        allYs = data['allYs']
+        minX = min(allXs, default=None)
+        maxX = max(allXs, default=None)
+        if minX is None or maxX is None:
+            return
+        view = data['view']
+        miscInputs = data['miscInputs']
+        chosenX = data['chosenX']
+        chosenY = data['chosenY']
+        canvasMinX, canvasMaxX, canvasMinY, canvasMaxY = data['canvasLimits']
+        minY = min(allYs, default=None)
+        maxY = max(allYs, default=None)
+        yDiff = (maxY or 0) - (minY or 0)
+        xMark = max(min(self.xMark, maxX), minX)
+        # If in top 10% of X coordinates, align labels differently
+        if xMark > canvasMinX + 0.9 * (canvasMaxX - canvasMinX):
+            labelAlignment = 'right'
+            labelPrefix = ''
+            labelSuffix = ' '
+        else:
+            labelAlignment = 'left'
+            labelPrefix = ' '
+            labelSuffix = ''
+        # Draw line
+        self.overlayArtists.append(self.subplot.axvline(
+            x=xMark, linestyle='dotted', linewidth=1, color=(0, 0, 0), animated=True))
+        # Draw its X position
+        if chosenX.unit is None:
+            xLabel = '{}{}{}'.format(labelPrefix, roundToPrec(xMark, 4), labelSuffix)
+        else:
+            xLabel = '{}{} {}{}'.format(labelPrefix, roundToPrec(xMark, 4), chosenX.unit, labelSuffix)
+        self.overlayArtists.append(self.subplot.annotate(
+            xLabel, xy=(xMark, canvasMaxY - 0.01 * (canvasMaxY - canvasMinY)), xytext=(0, 0), annotation_clip=False,
+            textcoords='offset pixels', ha=labelAlignment, va='top', fontsize='small', animated=True))
+        # Get Y values
+        yMarks = set()
+
+        def addYMark(val):
+            if val is None:
+                return
+            # Round according to shown Y range - the bigger the range,
+            # the rougher the rounding
+            if yDiff != 0:
+                rounded = roundToPrec(val, 4, nsValue=yDiff)
+            else:
+                rounded = val
+            # If due to some bug or insufficient plot density we're
+            # out of bounds, do not add anything
+            if minY <= val <= maxY or minY <= rounded <= maxY:
+                yMarks.add(rounded)
+
+        for source, target in data['iterList']:
+            xs, ys = data['plotData'][(source, target)]
+            if not xs or xMark < min(xs) or xMark > max(xs):
+                continue
+            # Fetch values from graphs when we're asked to provide accurate data
+            if self.accurateMarks:
+                try:
+                    y = view.getPoint(
+                        x=xMark,
+                        miscInputs=miscInputs,
+                        xSpec=chosenX,
+                        ySpec=chosenY,
+                        src=source,
+                        tgt=target)
+                    addYMark(y)
+                except (KeyboardInterrupt, SystemExit):
+                    raise
+                except Exception:
+                    pyfalog.warning('Failed to get X mark for "{}" vs "{}"'.format(source.name, '' if target is None else target.name))
+                    # Silently skip this mark, otherwise other marks and legend display will fail
+                    continue
+            # Otherwise just do linear interpolation between two points
+            else:
+                if xMark in xs:
+                    # We might have multiples of the same value in our sequence, pick value for the last one
+                    idx = len(xs) - xs[::-1].index(xMark) - 1
+                    addYMark(ys[idx])
+                    continue
+                idx = bisect(xs, xMark)
+                yMark = self._interpolateX(x=xMark, x1=xs[idx - 1], y1=ys[idx - 1], x2=xs[idx], y2=ys[idx])
+                addYMark(yMark)
+
+        # Draw Y values
+        for yMark in yMarks:
+            self.overlayArtists.append(self.subplot.annotate(
+                '{}{}{}'.format(labelPrefix, yMark, labelSuffix), xy=(xMark, yMark), xytext=(0, 0),
+                textcoords='offset pixels', ha=labelAlignment, va='center', fontsize='small', animated=True))
+
     def markXApproximate(self, x):
         if x is not None:
             self.xMark = x
-            self.draw(accurateMarks=False)
+            self.drawOverlay(accurateMarks=False)
 
     def unmarkX(self):
         self.xMark = None
-        self.draw()
+        self.drawOverlay()
 
     @staticmethod
     def _getLimits(vals, minExtra=0, maxExtra=0):
@@ -351,4 +422,12 @@ class GraphCanvasPanel(wx.Panel):
             # sometimes when you release button, x coordinate changes. To avoid that,
             # we just re-use coordinates set on click/drag and just request to redraw
             # using accurate data
-            self.draw(accurateMarks=True)
+            self.drawOverlay(accurateMarks=True)
+
+    def OnMplCanvasDraw(self, event):
+        # Background changes on full draws only (including ones caused by
+        # resizing); save it and put overlay on top of it
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.__updateOverlayArtists()
+        for artist in self.overlayArtists:
+            self.subplot.draw_artist(artist)
@@ -4,6 +4,8 @@ import os
 import sys
 from logbook import Logger
 pyfalog = Logger(__name__)
+from gui.dispatcher import WxDispatcher
+from service.dispatcher import setDispatcher
 from service.settings import LocaleSettings
 
 
@@ -16,6 +18,9 @@ class PyfaApp(wx.App):
         # Name for my application.
         self.appName = "pyfa"
 
+        # Services deliver their results to GUI thread
+        setDispatcher(WxDispatcher())
+
         #------------
 
         # # Simplified init method.
@@ -18,7 +18,10 @@
 # =============================================================================
 
 import io
+import json
 import os.path
+import queue
+import threading
 import zipfile
 from collections import OrderedDict
 
@@ -32,6 +35,56 @@ import config
 pyfalog = Logger(__name__)
 
 
+class IconAtlas:
+    """
+    Icons of one location packed into a few big images, see
+    scripts/icon_atlas.py. Sheet of each scale is decoded once, when icon of
+    that scale is requested first time.
+    """
+
+    def __init__(self, index, readFile):
+        self.sheetFiles = {int(scale): fname for scale, fname in index['sheets'].items()}
+        self.images = index['images']
+        self.readFile = readFile
+        self.sheets = {}
+        self.lock = threading.Lock()
+
+    def __contains__(self, filename):
+        return filename in self.images
+
+    def getImage(self, filename):
+        try:
+            scale, x, y, w, h = self.images[filename]
+        except KeyError:
+            return None
+        with self.lock:
+            sheet = self.sheets.get(scale)
+            if sheet is None:
+                data = self.readFile(self.sheetFiles[scale])
+                if data is None:
+                    return None
+                sheet = self.sheets[scale] = wx.Image(io.BytesIO(data))
+        return sheet.GetSubImage(wx.Rect(x, y, w, h))
+
+
+class IconPrefetcher(threading.Thread):
+    """Decodes icons which are likely to be shown soon in background"""
+
+    def __init__(self):
+        super().__init__(name='IconPrefetcher', daemon=True)
+        self.queue = queue.Queue()
+
+    def run(self):
+        while True:
+            key = self.queue.get()
+            try:
+                BitmapLoader.prefetchImage(key)
+            except (KeyboardInterrupt, SystemExit):
+                raise
+            except Exception as e:
+                pyfalog.warning('Failed to prefetch icon {}: {}', key, e)
+
+
 class BitmapLoader:
     # Can be None if we're running from tests
     if config.imgsZIP is None:
@@ -45,9 +98,21 @@ class BitmapLoader:
             pyfalog.info("Using local image files.")
             archive = None
 
+    # Least recently used bitmaps are evicted first; keys are (name,
+    # location, scale)
     cached_bitmaps = OrderedDict()
     dont_use_cached_bitmaps = False
     max_cached_bitmaps = 500
+    # Images decoded by prefetcher, bitmaps are made out of them in main
+    # thread when they are requested
+    prefetched_images = OrderedDict()
+    max_prefetched_images = 1000
+    prefetch_lock = threading.Lock()
+    prefetcher = None
+
+    # Location -> IconAtlas, or None if location has no atlas
+    atlases = {}
+    atlas_lock = threading.Lock()
 
     scaling_factor = None
 
@@ -60,24 +125,71 @@ class BitmapLoader:
         static.SetBitmap(bitmap)
         return static
 
+    @classmethod
+    def getScale(cls):
+        if cls.scaling_factor is None:
+            cls.scaling_factor = 1 if 'wxGTK' in wx.PlatformInfo else int(wx.GetApp().GetTopWindow().GetContentScaleFactor())
+        return cls.scaling_factor
+
     @classmethod
     def getBitmap(cls, name, location):
         if cls.dont_use_cached_bitmaps:
             return cls.loadBitmap(name, location)
 
-        path = "%s%s" % (name, location)
-
-        if len(cls.cached_bitmaps) == cls.max_cached_bitmaps:
-            cls.cached_bitmaps.popitem(False)
-
-        if path not in cls.cached_bitmaps:
-            bmp = cls.loadBitmap(name, location)
-            cls.cached_bitmaps[path] = bmp
+        key = (name, location, cls.getScale())
+        try:
+            bmp = cls.cached_bitmaps[key]
+        except KeyError:
+            pass
         else:
-            bmp = cls.cached_bitmaps[path]
+            cls.cached_bitmaps.move_to_end(key)
+            return bmp
 
+        with cls.prefetch_lock:
+            img = cls.prefetched_images.pop(key, None)
+        if img is not None:
+            bmp = img.ConvertToBitmap()
+        else:
+            bmp = cls.loadBitmap(name, location)
+        cls.cached_bitmaps[key] = bmp
+        while len(cls.cached_bitmaps) > cls.max_cached_bitmaps:
+            cls.cached_bitmaps.popitem(last=False)
         return bmp
 
+    @classmethod
+    def prefetch(cls, names, location):
+        """
+        Decode icons in background, in passed order, so that they are
+        available without delay when requested.
+        """
+        if cls.dont_use_cached_bitmaps:
+            return
+        scale = cls.getScale()
+        if cls.prefetcher is None:
+            cls.prefetcher = IconPrefetcher()
+            cls.prefetcher.start()
+        for name in names:
+            key = (name, location, scale)
+            if key not in cls.cached_bitmaps:
+                cls.prefetcher.queue.put(key)
+
+    @classmethod
+    def prefetchImage(cls, key):
+        with cls.prefetch_lock:
+            if key in cls.prefetched_images:
+                return
+        # Bitmaps are not touched here, only checked
+        if key in cls.cached_bitmaps:
+            return
+        name, location, scale = key
+        img = cls.loadFinalImage(name, location, scale)
+        if img is None:
+            return
+        with cls.prefetch_lock:
+            cls.prefetched_images[key] = img
+            while len(cls.prefetched_images) > cls.max_prefetched_images:
+                cls.prefetched_images.popitem(last=False)
+
     @classmethod
     def getImage(cls, name, location):
         bmp = cls.getBitmap(name, location)
@@ -88,10 +200,14 @@ class BitmapLoader:
 
     @classmethod
     def loadBitmap(cls, name, location):
-        if cls.scaling_factor is None:
-            cls.scaling_factor = 1 if 'wxGTK' in wx.PlatformInfo else int(wx.GetApp().GetTopWindow().GetContentScaleFactor())
-        scale = cls.scaling_factor
+        img = cls.loadFinalImage(name, location, cls.getScale())
+        if img is None:
+            return None
+        return img.ConvertToBitmap()
 
+    @classmethod
+    def loadFinalImage(cls, name, location, scale):
+        """Load image of given scale, or of closest smaller one, and scale it to be shown"""
         filename, img = cls.loadScaledBitmap(name, location, scale)
 
         while img is None and scale > 0:
@@ -104,8 +220,8 @@ class BitmapLoader:
             return None
 
         if scale > 1:
-            return img.Scale(round(img.GetWidth() // scale), round(img.GetHeight() // scale)).ConvertToBitmap()
-        return img.ConvertToBitmap()
+            return img.Scale(round(img.GetWidth() // scale), round(img.GetHeight() // scale))
+        return img
 
     @classmethod
     def loadScaledBitmap(cls, name, location, scale=0):
@@ -124,8 +240,43 @@ class BitmapLoader:
         img = cls.loadImage(filename, location)
         return filename, img
 
+    @classmethod
+    def getAtlas(cls, location):
+        with cls.atlas_lock:
+            try:
+                return cls.atlases[location]
+            except KeyError:
+                pass
+            atlas = None
+            data = cls.readFile('{}.atlas.json'.format(location))
+            if data is not None:
+                try:
+                    atlas = IconAtlas(json.loads(data), cls.readFile)
+                except (ValueError, KeyError) as e:
+                    pyfalog.warning("Broken icon atlas for {0}: {1}".format(location, e))
+            cls.atlases[location] = atlas
+            return atlas
+
+    @classmethod
+    def readFile(cls, path):
+        """Read file relative to images folder, None if it does not exist"""
+        if cls.archive:
+            try:
+                return cls.archive.read(path)
+            except KeyError:
+                return None
+        path = os.path.join(config.pyfaPath, 'imgs', *path.split('/'))
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+
     @classmethod
     def loadImage(cls, filename, location):
+        atlas = cls.getAtlas(location)
+        if atlas is not None and filename in atlas:
+            return atlas.getImage(filename)
+
         if cls.archive:
             path = os.path.join(location, filename)
             if os.sep != "/" and os.sep in path:
@@ -15,7 +15,7 @@ from eos.saveddata.fit import Fit
 
 import gui.mainFrame
 from gui.contextMenu import ContextMenu
-from gui.bitmap_loader import BitmapLoader
+from gui.cachingImageList import CachingImageList
 
 _t = wx.GetTranslation
 
@@ -87,6 +87,7 @@ class ItemAffectedBy(wx.Panel):
         self.PopulateTree()
         self.Layout()
         self.affectedBy.Bind(wx.EVT_CONTEXT_MENU, self.spawnMenu)
+        self.affectedBy.Bind(wx.EVT_TREE_ITEM_EXPANDING, self.expandLookup)
 
     def spawnMenu(self, event):
         item, _ = self.affectedBy.HitTest(self.ScreenToClient(event.Position))
@@ -107,10 +108,34 @@ class ItemAffectedBy(wx.Panel):
         menu = ContextMenu.getMenu(self, stuff, (stuff,), *contexts)
         self.PopupMenu(menu)
 
+    def addLazyChildren(self, treeItem, populate):
+        """Children of tree item are added by populate(treeItem) when it's expanded first time"""
+        dummy = self.affectedBy.AppendItem(treeItem, "dummy")
+        self.affectedBy.SetItemData(dummy, populate)
+
+    def populateLazyChildren(self, treeItem):
+        child = self.affectedBy.GetFirstChild(treeItem)[0]
+        if child.IsOk() and self.affectedBy.GetItemText(child) == "dummy":
+            populate = self.affectedBy.GetItemData(child)
+            self.affectedBy.Delete(child)
+            populate(treeItem)
+
+    def populateAllLazyChildren(self, treeItem):
+        self.populateLazyChildren(treeItem)
+        child, cookie = self.affectedBy.GetFirstChild(treeItem)
+        while child.IsOk():
+            self.populateAllLazyChildren(child)
+            child, cookie = self.affectedBy.GetNextChild(treeItem, cookie)
+
+    def expandLookup(self, event):
+        self.populateLazyChildren(event.GetItem())
+        event.Skip()
+
     def ExpandCollapseTree(self):
 
         self.Freeze()
         if self.expand == 1:
+            self.populateAllLazyChildren(self.affectedBy.GetRootItem())
             self.affectedBy.ExpandAll()
         else:
             try:
@@ -164,7 +189,7 @@ class ItemAffectedBy(wx.Panel):
         root = self.affectedBy.AddRoot("WINPWNZ0R")
         self.affectedBy.SetItemData(root, None)
 
-        self.imageList = wx.ImageList(16, 16)
+        self.imageList = CachingImageList(16, 16)
         self.affectedBy.SetImageList(self.imageList)
 
         if self.showAttrView:
@@ -174,6 +199,40 @@ class ItemAffectedBy(wx.Panel):
 
         self.ExpandCollapseTree()
 
+    def getAttrIcon(self, attrInfo):
+        if attrInfo and attrInfo.iconID is not None:
+            icon = self.imageList.GetImageIndex(attrInfo.iconID, "icons")
+            if icon == -1:
+                icon = self.imageList.GetImageIndex("transparent16x16", "gui")
+            return icon
+        return self.imageList.GetImageIndex("0", "icons")
+
+    def getItemIcon(self, afflictorType, item):
+        if afflictorType == Ship:
+            return self.imageList.GetImageIndex("ship_small", "gui")
+        elif item.iconID:
+            return self.imageList.GetImageIndex(item.iconID, "icons")
+        return -1
+
+    def getChangedAttrs(self, attributes):
+        """Get function which tells if attribute value differs from original one"""
+        changed = {}
+
+        def isChanged(attrName):
+            result = changed.get(attrName)
+            if result is None:
+                # if value is 0 or there has been no change from original to modified, skip it
+                result = changed[attrName] = attributes[attrName] != attributes.getOriginal(attrName, 0)
+            return result
+        return isChanged
+
+    def addFitNode(self, root, thing):
+        # This block simply directs which parent we are adding to (root or projected fit)
+        if thing == self.stuff:
+            return root
+        icon = self.imageList.GetImageIndex("ship_small", "gui")
+        return self.affectedBy.AppendItem(root, "{} ({})".format(thing.name, thing.ship.item.name), icon)
+
     def sortAttrDisplayName(self, attr):
         info = self.stuff.item.attributes.get(attr)
         if info and info.displayName:
@@ -188,15 +247,16 @@ class ItemAffectedBy(wx.Panel):
         are local afflictions (everything else, even gang boosts at this time)
         The value of this is yet another dictionary in the following format:
 
-        "attribute name": {
-              "Module Name": [
-                   class of affliction,
-                   affliction item (required due to GH issue #335)
-                   modifier type
-                   amount of modification
-                   whether this affliction was projected
-              ]
-        }
+        "attribute name": [
+            class of affliction,
+            affliction item (required due to GH issue #335)
+            modifier type
+            amount of modification
+            whether this affliction was projected
+        ]
+
+        Only attribute nodes are added to the tree right away; afflictions of
+        an attribute are added when its node is expanded.
         """
         attributes = self.stuff.itemModifiedAttributes if self.item == self.stuff.item else self.stuff.chargeModifiedAttributes
         container = {}
@@ -243,13 +303,7 @@ class ItemAffectedBy(wx.Panel):
 
         # Now, we take our created dictionary and start adding stuff to our tree
         for thing in rootOrder:
-            # This block simply directs which parent we are adding to (root or projected fit)
-            if thing == self.stuff:
-                parent = root
-            else:  # projected fit
-                icon = self.imageList.Add(BitmapLoader.getBitmap("ship_small", "gui"))
-                child = self.affectedBy.AppendItem(root, "{} ({})".format(thing.name, thing.ship.item.name), icon)
-                parent = child
+            parent = self.addFitNode(root, thing)
 
             attributes = container[thing]
             attrOrder = sorted(list(attributes.keys()), key=self.sortAttrDisplayName)
@@ -257,18 +311,7 @@ class ItemAffectedBy(wx.Panel):
             for attrName in attrOrder:
                 attrInfo = self.stuff.item.attributes.get(attrName)
                 displayName = attrInfo.displayName if attrInfo and attrInfo.displayName else attrName
-
-                if attrInfo:
-                    if attrInfo.iconID is not None:
-                        iconFile = attrInfo.iconID
-                        icon = BitmapLoader.getBitmap(iconFile, "icons")
-                        if icon is None:
-                            icon = BitmapLoader.getBitmap("transparent16x16", "gui")
-                        attrIcon = self.imageList.Add(icon)
-                    else:
-                        attrIcon = self.imageList.Add(BitmapLoader.getBitmap("0", "icons"))
-                else:
-                    attrIcon = self.imageList.Add(BitmapLoader.getBitmap("0", "icons"))
+                attrIcon = self.getAttrIcon(attrInfo)
 
                 if self.showRealNames:
                     display = attrName
@@ -281,41 +324,35 @@ class ItemAffectedBy(wx.Panel):
                 child = self.affectedBy.AppendItem(parent, display, attrIcon)
                 self.affectedBy.SetItemData(child, saved)
                 self.treeItems.append(child)
+                self.addLazyChildren(child, lambda treeItem, items=attributes[attrName]: self.addAttributeAfflictors(treeItem, items))
 
-                items = attributes[attrName]
-                items.sort(key=lambda x: self.ORDER.index(x[0]))
-                for itemInfo in items:
-                    afflictorType, afflictor, item, attrModifier, attrAmount, projected = itemInfo
-
-                    if afflictorType == Ship:
-                        itemIcon = self.imageList.Add(BitmapLoader.getBitmap("ship_small", "gui"))
-                    elif item.iconID:
-                        bitmap = BitmapLoader.getBitmap(item.iconID, "icons")
-                        itemIcon = self.imageList.Add(bitmap) if bitmap else -1
-                    else:
-                        itemIcon = -1
+    def addAttributeAfflictors(self, treeItem, items):
+        items.sort(key=lambda x: self.ORDER.index(x[0]))
+        for itemInfo in items:
+            afflictorType, afflictor, item, attrModifier, attrAmount, projected = itemInfo
+            itemIcon = self.getItemIcon(afflictorType, item)
 
-                    displayStr = item.name
+            displayStr = item.name
 
-                    if projected:
-                        displayStr += " (projected)"
+            if projected:
+                displayStr += " (projected)"
 
-                    penalized = ""
-                    if '*' in attrModifier:
-                        if 's' in attrModifier:
-                            penalized += "(penalized)"
-                        if 'r' in attrModifier:
-                            penalized += "(resisted)"
-                        attrModifier = "*"
+            penalized = ""
+            if '*' in attrModifier:
+                if 's' in attrModifier:
+                    penalized += "(penalized)"
+                if 'r' in attrModifier:
+                    penalized += "(resisted)"
+                attrModifier = "*"
 
-                    if attrModifier == "+" and attrAmount < 0:
-                        attrModifier = "-"
-                        attrAmount = -attrAmount
+            if attrModifier == "+" and attrAmount < 0:
+                attrModifier = "-"
+                attrAmount = -attrAmount
 
-                    # this is the Module node, the attribute will be attached to this
-                    display = "%s %s %.2f %s" % (displayStr, attrModifier, attrAmount, penalized)
-                    treeItem = self.affectedBy.AppendItem(child, display, itemIcon)
-                    self.affectedBy.SetItemData(treeItem, afflictor)
+            # this is the Module node, the attribute will be attached to this
+            display = "%s %s %.2f %s" % (displayStr, attrModifier, attrAmount, penalized)
+            child = self.affectedBy.AppendItem(treeItem, display, itemIcon)
+            self.affectedBy.SetItemData(child, afflictor)
 
     def buildModuleView(self, root):
         """
@@ -331,50 +368,53 @@ class ItemAffectedBy(wx.Panel):
             item that will be used to determine icon (required due to GH issue #335)
             whether this affliction is actually used (unlearned skills are not used)
         ]
+
+        Afflictions are taken from per-afflictor index of attribute container.
+        Only module nodes are added to the tree right away; attributes of a
+        module are added when its node is expanded.
         """
 
         attributes = self.stuff.itemModifiedAttributes if self.item == self.stuff.item else self.stuff.chargeModifiedAttributes
+        isChanged = self.getChangedAttrs(attributes)
         container = {}
-        for attrName in attributes.iterAfflictions():
-            # if value is 0 or there has been no change from original to modified, return
-            if attributes[attrName] == (attributes.getOriginal(attrName, 0)):
+        for afflictor in attributes.iterAfflictors():
+            if getattr(afflictor, 'item', None) is None:
                 continue
 
-            for fit, afflictors in attributes.getAfflictions(attrName).items():
-                for afflictor, operator, stackingGroup, preResAmount, postResAmount, used in afflictors:
-                    if not used or getattr(afflictor, 'item', None) is None:
-                        continue
-
-                    if fit.ID != self.activeFit:
-                        # affliction fit does not match our fit
-                        if fit not in container:
-                            container[fit] = {}
-                        items = container[fit]
-                    else:
-                        # local afflictions
-                        if self.stuff not in container:
-                            container[self.stuff] = {}
-                        items = container[self.stuff]
-
-                    if afflictor == self.stuff and getattr(afflictor, 'charge', None):
-                        # we are showing a charges modifications, see #335
-                        item = afflictor.charge
-                    else:
-                        item = afflictor.item
-
-                    # items hold our module: info mappings
-                    if item.name not in items:
-                        items[item.name] = [type(afflictor), set(), [], item, getattr(afflictor, "projected", False)]
-
-                    info = items[item.name]
-                    info[1].add(afflictor)
-                    operatorStr = formatOperator(operator, stackingGroup, preResAmount, postResAmount)
-                    # If info[1] > 1, there are two separate modules working.
-                    # Check to make sure we only include the modifier once
-                    # See GH issue 154
-                    if len(info[1]) > 1 and (attrName, operatorStr, postResAmount) in info[2]:
-                        continue
-                    info[2].append((attrName, operatorStr, postResAmount))
+            if afflictor == self.stuff and getattr(afflictor, 'charge', None):
+                # we are showing a charges modifications, see #335
+                item = afflictor.charge
+            else:
+                item = afflictor.item
+
+            for attrName, fit, operator, stackingGroup, preResAmount, postResAmount, used in attributes.getAfflictorAfflictions(afflictor):
+                if not used or not isChanged(attrName):
+                    continue
+
+                if fit.ID != self.activeFit:
+                    # affliction fit does not match our fit
+                    if fit not in container:
+                        container[fit] = {}
+                    items = container[fit]
+                else:
+                    # local afflictions
+                    if self.stuff not in container:
+                        container[self.stuff] = {}
+                    items = container[self.stuff]
+
+                # items hold our module: info mappings
+                if item.name not in items:
+                    items[item.name] = [type(afflictor), set(), [], item, getattr(afflictor, "projected", False)]
+
+                info = items[item.name]
+                info[1].add(afflictor)
+                operatorStr = formatOperator(operator, stackingGroup, preResAmount, postResAmount)
+                # If info[1] > 1, there are two separate modules working.
+                # Check to make sure we only include the modifier once
+                # See GH issue 154
+                if len(info[1]) > 1 and (attrName, operatorStr, postResAmount) in info[2]:
+                    continue
+                info[2].append((attrName, operatorStr, postResAmount))
 
         # Make sure projected fits are on top
         rootOrder = list(container.keys())
@@ -382,13 +422,7 @@ class ItemAffectedBy(wx.Panel):
 
         # Now, we take our created dictionary and start adding stuff to our tree
         for thing in rootOrder:
-            # This block simply directs which parent we are adding to (root or projected fit)
-            if thing == self.stuff:
-                parent = root
-            else:  # projected fit
-                icon = self.imageList.Add(BitmapLoader.getBitmap("ship_small", "gui"))
-                child = self.affectedBy.AppendItem(root, "{} ({})".format(thing.name, thing.ship.item.name), icon)
-                parent = child
+            parent = self.addFitNode(root, thing)
 
             items = container[thing]
             order = list(items.keys())
@@ -398,13 +432,7 @@ class ItemAffectedBy(wx.Panel):
                 info = items[itemName]
                 afflictorType, afflictors, attrData, item, projected = info
                 counter = len(afflictors)
-                if afflictorType == Ship:
-                    itemIcon = self.imageList.Add(BitmapLoader.getBitmap("ship_small", "gui"))
-                elif item.iconID:
-                    bitmap = BitmapLoader.getBitmap(item.iconID, "icons")
-                    itemIcon = self.imageList.Add(bitmap) if bitmap else -1
-                else:
-                    itemIcon = -1
+                itemIcon = self.getItemIcon(afflictorType, item)
 
                 displayStr = itemName
 
@@ -419,60 +447,51 @@ class ItemAffectedBy(wx.Panel):
                 self.affectedBy.SetItemData(child, afflictors.pop())
 
                 if counter > 0:
-                    attributes = []
-                    for attrName, attrModifier, attrAmount in attrData:
-                        attrInfo = self.stuff.item.attributes.get(attrName)
-                        displayName = attrInfo.displayName if attrInfo else ""
-
-                        if attrInfo:
-                            if attrInfo.iconID is not None:
-                                iconFile = attrInfo.iconID
-                                icon = BitmapLoader.getBitmap(iconFile, "icons")
-                                if icon is None:
-                                    icon = BitmapLoader.getBitmap("transparent16x16", "gui")
-
-                                attrIcon = self.imageList.Add(icon)
-                            else:
-                                attrIcon = self.imageList.Add(BitmapLoader.getBitmap("0", "icons"))
-                        else:
-                            attrIcon = self.imageList.Add(BitmapLoader.getBitmap("0", "icons"))
-
-                        penalized = ""
-                        if '*' in attrModifier:
-                            if 's' in attrModifier:
-                                penalized += "(penalized)"
-                            if 'r' in attrModifier:
-                                penalized += "(resisted)"
-                            attrModifier = "*"
-
-                        if attrModifier == "+" and attrAmount < 0:
-                            attrModifier = "-"
-                            attrAmount = -attrAmount
-
-                        attributes.append((attrName, (displayName if displayName else attrName), attrModifier,
-                                           attrAmount, penalized, attrIcon))
-
-                    attrSorted = sorted(attributes, key=lambda attribName: attribName[0])
-                    for attr in attrSorted:
-                        attrName, displayName, attrModifier, attrAmount, penalized, attrIcon = attr
-
-                        if self.showRealNames:
-                            display = "%s %s %.2f %s" % (attrName, attrModifier, attrAmount, penalized)
-                            saved = "%s %s %.2f %s" % (
-                                displayName if displayName else attrName,
-                                attrModifier,
-                                attrAmount,
-                                penalized
-                            )
-                        else:
-                            display = "%s %s %.2f %s" % (
-                                displayName if displayName else attrName,
-                                attrModifier,
-                                attrAmount,
-                                penalized
-                            )
-                            saved = "%s %s %.2f %s" % (attrName, attrModifier, attrAmount, penalized)
-
-                        treeitem = self.affectedBy.AppendItem(child, display, attrIcon)
-                        self.affectedBy.SetItemData(treeitem, saved)
-                        self.treeItems.append(treeitem)
+                    self.addLazyChildren(child, lambda treeItem, attrData=attrData: self.addModuleAttributes(treeItem, attrData))
+
+    def addModuleAttributes(self, treeItem, attrData):
+        attributes = []
+        for attrName, attrModifier, attrAmount in attrData:
+            attrInfo = self.stuff.item.attributes.get(attrName)
+            displayName = attrInfo.displayName if attrInfo else ""
+            attrIcon = self.getAttrIcon(attrInfo)
+
+            penalized = ""
+            if '*' in attrModifier:
+                if 's' in attrModifier:
+                    penalized += "(penalized)"
+                if 'r' in attrModifier:
+                    penalized += "(resisted)"
+                attrModifier = "*"
+
+            if attrModifier == "+" and attrAmount < 0:
+                attrModifier = "-"
+                attrAmount = -attrAmount
+
+            attributes.append((attrName, (displayName if displayName else attrName), attrModifier,
+                               attrAmount, penalized, attrIcon))
+
+        attrSorted = sorted(attributes, key=lambda attribName: attribName[0])
+        for attr in attrSorted:
+            attrName, displayName, attrModifier, attrAmount, penalized, attrIcon = attr
+
+            if self.showRealNames:
+                display = "%s %s %.2f %s" % (attrName, attrModifier, attrAmount, penalized)
+                saved = "%s %s %.2f %s" % (
+                    displayName if displayName else attrName,
+                    attrModifier,
+                    attrAmount,
+                    penalized
+                )
+            else:
+                display = "%s %s %.2f %s" % (
+                    displayName if displayName else attrName,
+                    attrModifier,
+                    attrAmount,
+                    penalized
+                )
+                saved = "%s %s %.2f %s" % (attrName, attrModifier, attrAmount, penalized)
+
+            treeitem = self.affectedBy.AppendItem(treeItem, display, attrIcon)
+            self.affectedBy.SetItemData(treeitem, saved)
+            self.treeItems.append(treeitem)
@@ -3,7 +3,7 @@ from logbook import Logger
 
 import gui.builtinMarketBrowser.pfSearchBox as SBox
 import gui.globalEvents as GE
-from config import slotColourMap, slotColourMapDark
+from gui.utils.color import slotColourMap, slotColourMapDark
 from eos.saveddata.module import Module
 from gui.builtinMarketBrowser.events import ItemSelected, RECENTLY_USED_MODULES, CHARGES_FOR_FIT
 from gui.contextMenu import ContextMenu
@@ -286,7 +286,7 @@ class ItemView(Display):
             item.marketShortcut = i + 1
         Display.refresh(self, items)
 
-    def columnBackground(self, colItem, item):
+    def columnBackground(self, item):
         if self.sFit.serviceFittingOptions["colorFitBySlot"]:
             colorMap = slotColourMapDark if isDark() else slotColourMap
             return colorMap.get(Module.calculateSlot(item)) or self.GetBackgroundColour()
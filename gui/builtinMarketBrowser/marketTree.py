@@ -1,5 +1,6 @@
 import wx
 
+from gui.bitmap_loader import BitmapLoader
 from gui.cachingImageList import CachingImageList
 from gui.builtinMarketBrowser.events import RECENTLY_USED_MODULES, CHARGES_FOR_FIT
 
@@ -59,6 +60,7 @@ class MarketTree(wx.TreeCtrl):
             # And add real market group contents
             sMkt = self.sMkt
             currentMktGrp = sMkt.getMarketGroup(self.GetItemData(root), eager="children")
+            prefetchGroups = []
 
             for childMktGrp in sMkt.getMarketGroupChildren(currentMktGrp):
                 # If market should have items but it doesn't, do not show it
@@ -76,9 +78,19 @@ class MarketTree(wx.TreeCtrl):
                     continue
                 if sMkt.marketGroupHasTypesCheck(childMktGrp) is False:
                     self.AppendItem(childId, "dummy")
+                else:
+                    prefetchGroups.append(childMktGrp)
 
             self.SortChildren(root)
 
+            # Item groups are likely to be opened next, warm up their icons
+            iconIDs = []
+            for mktGrp in prefetchGroups:
+                for item in sMkt.getItemsByMarketGroup(mktGrp, vars_=False):
+                    if item.iconID and item.iconID not in iconIDs:
+                        iconIDs.append(item.iconID)
+            BitmapLoader.prefetch(iconIDs, "icons")
+
     def OnCollapsed(self, event):
         self.CollapseAllChildren(event.Item)
         event.Skip()
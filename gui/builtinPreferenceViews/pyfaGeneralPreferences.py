@@ -141,6 +141,15 @@ class PFGeneralPref(PreferenceView):
                                                     wx.DefaultPosition, wx.DefaultSize, 0)
         mainSizer.Add(self.cbShowShipBrowserTooltip, 0, wx.ALL | wx.EXPAND, 5)
 
+        self.cbCacheFitStats = wx.CheckBox(panel, wx.ID_ANY, _t("Store fit stats for ship browser"),
+                                           wx.DefaultPosition, wx.DefaultSize, 0)
+        if "wxGTK" not in wx.PlatformInfo:
+            self.cbCacheFitStats.SetCursor(helpCursor)
+        self.cbCacheFitStats.SetToolTip(wx.ToolTip(
+                _t('Keep summary stats of fits in the database, and show them in ship browser tooltips without loading fits. '
+                   'Stats of fits are calculated in the background when needed.')))
+        mainSizer.Add(self.cbCacheFitStats, 0, wx.ALL | wx.EXPAND, 5)
+
         self.cbReloadAll = wx.CheckBox(panel, wx.ID_ANY, _t("Change charge in all modules of the same type"),
                                        wx.DefaultPosition, wx.DefaultSize, 0)
         if "wxGTK" not in wx.PlatformInfo:
@@ -176,6 +185,7 @@ class PFGeneralPref(PreferenceView):
         self.cbGaugeAnimation.SetValue(self.sFit.serviceFittingOptions["enableGaugeAnimation"])
         self.cbOpenFitInNew.SetValue(self.sFit.serviceFittingOptions["openFitInNew"])
         self.cbShowShipBrowserTooltip.SetValue(self.sFit.serviceFittingOptions["showShipBrowserTooltip"])
+        self.cbCacheFitStats.SetValue(self.sFit.serviceFittingOptions["cacheFitStats"])
         self.cbReloadAll.SetValue(self.sFit.serviceFittingOptions["ammoChangeAll"])
         self.cbExpMutants.SetValue(self.sFit.serviceFittingOptions["expandedMutantNames"])
         self.rbAddLabels.SetSelection(self.sFit.serviceFittingOptions["additionsLabels"])
@@ -192,6 +202,7 @@ class PFGeneralPref(PreferenceView):
         self.cbGaugeAnimation.Bind(wx.EVT_CHECKBOX, self.onCBGaugeAnimation)
         self.cbOpenFitInNew.Bind(wx.EVT_CHECKBOX, self.onCBOpenFitInNew)
         self.cbShowShipBrowserTooltip.Bind(wx.EVT_CHECKBOX, self.onCBShowShipBrowserTooltip)
+        self.cbCacheFitStats.Bind(wx.EVT_CHECKBOX, self.onCBCacheFitStats)
         self.cbReloadAll.Bind(wx.EVT_CHECKBOX, self.onCBReloadAll)
         self.cbExpMutants.Bind(wx.EVT_CHECKBOX, self.onCBExpMutants)
 
@@ -273,6 +284,9 @@ class PFGeneralPref(PreferenceView):
     def onCBShowShipBrowserTooltip(self, event):
         self.sFit.serviceFittingOptions["showShipBrowserTooltip"] = self.cbShowShipBrowserTooltip.GetValue()
 
+    def onCBCacheFitStats(self, event):
+        self.sFit.serviceFittingOptions["cacheFitStats"] = self.cbCacheFitStats.GetValue()
+
     def onCBReloadAll(self, event):
         self.sFit.serviceFittingOptions["ammoChangeAll"] = self.cbReloadAll.GetValue()
 
@@ -16,6 +16,7 @@ import gui.utils.draw as drawUtils
 import gui.utils.fonts as fonts
 from gui.bitmap_loader import BitmapLoader
 from gui.builtinShipBrowser.pfBitmapFrame import PFBitmapFrame
+from gui.utils.numberFormatter import formatAmount
 from service.fit import Fit
 from .events import BoosterListUpdated, FitSelected, ImportSelected, SearchSelected, Stage3Selected
 
@@ -25,7 +26,7 @@ _t = wx.GetTranslation
 
 class FitItem(SFItem.SFBrowserItem):
     def __init__(self, parent, fitID=None, shipFittingInfo=("Test", "TestTrait", "cnc's avatar", 0, 0, None), shipID=None,
-                 itemData=None, graphicID=None,
+                 itemData=None, graphicID=None, fitStats=None,
                  id=wx.ID_ANY, pos=wx.DefaultPosition,
                  size=(0, 40), style=0):
 
@@ -59,6 +60,7 @@ class FitItem(SFItem.SFBrowserItem):
             self.shipBmp = BitmapLoader.getBitmap("ship_no_image_big", "gui")
 
         self.shipFittingInfo = shipFittingInfo
+        self.fitStats = fitStats
         self.shipName, self.shipTrait, self.fitName, self.fitBooster, self.timestamp, self.notes = shipFittingInfo
 
         if config.debug:
@@ -162,7 +164,13 @@ class FitItem(SFItem.SFBrowserItem):
             notes = ""
             if self.notes:
                 notes = '─' * 20 + "\nNotes: {}\n".format(self.notes[:197] + '...' if len(self.notes) > 200 else self.notes)
-            self.SetToolTip(wx.ToolTip('{}\n{}{}\n{}'.format(self.shipName, notes, '─' * 20, self.shipTrait)))
+            stats = ""
+            if self.fitStats:
+                stats = '─' * 20 + "\nDPS: {}  EHP: {}  Speed: {} m/s\n".format(
+                    formatAmount(self.fitStats.dps, 3, 0, 0),
+                    formatAmount(self.fitStats.ehp, 3, 0, 9),
+                    formatAmount(self.fitStats.maxSpeed, 3, 0, 0))
+            self.SetToolTip(wx.ToolTip('{}\n{}{}{}\n{}'.format(self.shipName, notes, stats, '─' * 20, self.shipTrait)))
 
     def OnKeyUp(self, event):
         if event.GetKeyCode() in (32, 13):  # space and enter
@@ -62,6 +62,9 @@ class Miscellanea(ViewColumn):
     def getImageId(self, mod):
         return -1
 
+    def getFormatKey(self):
+        return eos.config.settings['globalDefaultSpoolupPercentage']
+
     def getParameters(self):
         return ("displayName", bool, False), ("showIcon", bool, True)
 
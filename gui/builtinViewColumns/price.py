@@ -24,7 +24,7 @@ from eos.saveddata.cargo import Cargo
 from eos.saveddata.drone import Drone
 from eos.saveddata.fighter import Fighter
 from eos.saveddata.module import Module
-from eos.saveddata.price import PriceStatus
+from eos.saveddata.price import Price as EosPrice, PriceStatus
 from gui.bitmap_loader import BitmapLoader
 from gui.utils.numberFormatter import formatAmount
 from gui.viewColumn import ViewColumn
@@ -70,14 +70,12 @@ class Price(ViewColumn):
 
         return formatPrice(stuff, priceObj)
 
-    def delayedText(self, mod, display, colItem):
+    def delayedText(self, mod, display):
         sPrice = ServicePrice.getInstance()
 
         def callback(item):
             priceObj = item[0]
-            colItem.SetText(formatPrice(mod, priceObj))
-
-            display.SetItem(colItem)
+            display.setCellText(mod, self, formatPrice(mod, priceObj))
 
         sPrice.getPrices([mod.item], callback, waitforthread=True)
 
@@ -87,5 +85,8 @@ class Price(ViewColumn):
     def getToolTip(self, mod):
         return self.name
 
+    def getFormatKey(self):
+        return EosPrice.generation
+
 
 Price.register()
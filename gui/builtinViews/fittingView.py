@@ -42,7 +42,7 @@ from gui.utils.staticHelpers import DragDropHelper
 from gui.utils.dark import isDark
 from service.fit import Fit
 from service.market import Market
-from config import slotColourMap, slotColourMapDark, errColor, errColorDark
+from gui.utils.color import slotColourMap, slotColourMapDark, errColor, errColorDark
 from gui.fitCommands.helpers import getSimilarModPositions
 
 pyfalog = Logger(__name__)
@@ -25,6 +25,7 @@ import time
 import wx
 from logbook import Logger
 
+import eos.config
 import eos.db
 from gui.auxWindow import AuxiliaryFrame
 from gui.builtinShipBrowser.events import FitSelected
@@ -39,7 +40,7 @@ class DevTools(AuxiliaryFrame):
     def __init__(self, parent):
         super().__init__(
             parent, id=wx.ID_ANY, title="Development Tools", resizeable=True,
-            size=wx.Size(400, 320) if "wxGTK" in wx.PlatformInfo else wx.Size(400, 240))
+            size=wx.Size(400, 420) if "wxGTK" in wx.PlatformInfo else wx.Size(400, 330))
         self.mainFrame = parent
         self.block = False
         self.SetSizeHints(wx.DefaultSize, wx.DefaultSize)
@@ -68,6 +69,20 @@ class DevTools(AuxiliaryFrame):
 
         self.cmdPrint.Bind(wx.EVT_BUTTON, self.cmd_print)
 
+        self.cacheStats = wx.StaticText(self, wx.ID_ANY, "")
+        mainSizer.Add(self.cacheStats, 0, wx.EXPAND | wx.TOP | wx.BOTTOM, 5)
+
+        cacheSizer = wx.BoxSizer(wx.HORIZONTAL)
+        self.cacheRefresh = wx.Button(self, wx.ID_ANY, "Refresh Cache Stats", wx.DefaultPosition, wx.DefaultSize, 0)
+        cacheSizer.Add(self.cacheRefresh, 1, wx.EXPAND | wx.RIGHT, 5)
+        self.cacheReset = wx.Button(self, wx.ID_ANY, "Reset Cache Stats", wx.DefaultPosition, wx.DefaultSize, 0)
+        cacheSizer.Add(self.cacheReset, 1, wx.EXPAND)
+        mainSizer.Add(cacheSizer, 0, wx.EXPAND | wx.TOP | wx.BOTTOM, 5)
+
+        self.cacheRefresh.Bind(wx.EVT_BUTTON, self.cache_stats)
+        self.cacheReset.Bind(wx.EVT_BUTTON, self.cache_reset)
+        self.cache_stats(None)
+
         self.SetSizer(mainSizer)
 
         self.Layout()
@@ -96,6 +111,20 @@ class DevTools(AuxiliaryFrame):
         for x in self.mainFrame.command.GetCommands():
             print("{}{} {}".format("==> " if x == self.mainFrame.command.GetCurrentCommand() else "", x.GetName(), x))
 
+    def cache_stats(self, evt):
+        stats = eos.db.getCacheStats()
+        lookups = stats["hits"] + stats["misses"]
+        self.cacheStats.SetLabel(
+            "Gamedata cache{state}: {entries} entries, {aliases} aliases, size {weight}/{limit}\n"
+            "Hits: {hits}, misses: {misses} ({ratio:.1%} hit rate), evictions: {evictions}".format(
+                state="" if eos.config.gamedataCache is True else " (query caching off)",
+                ratio=stats["hits"] / lookups if lookups else 0, **stats))
+        self.Layout()
+
+    def cache_reset(self, evt):
+        eos.db.resetCacheStats()
+        self.cache_stats(evt)
+
     def gc_collect(self, evt):
         print(gc.collect())
         print(gc.get_debug())
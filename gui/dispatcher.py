@@ -0,0 +1,17 @@
+# noinspection PyPackageRequirements
+import wx
+
+from service.dispatcher import Dispatcher
+
+
+class WxDispatcher(Dispatcher):
+    """Delivers service callbacks to GUI thread via wx event loop"""
+
+    def callAfter(self, func, *args, **kwargs):
+        wx.CallAfter(func, *args, **kwargs)
+
+    def translate(self, text):
+        return wx.GetTranslation(text)
+
+    def createCommandProcessor(self, maxCommands=-1):
+        return wx.CommandProcessor(maxCommands=maxCommands)
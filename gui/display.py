@@ -20,22 +20,40 @@
 # noinspection PyPackageRequirements
 import wx
 import gui.mainFrame
+from eos.saveddata.fit import Fit
 from gui.viewColumn import ViewColumn
 from gui.cachingImageList import CachingImageList
 
 
 class Display(wx.ListCtrl):
+    """
+    Virtual list of objects, one per row, with text and images of cells
+    provided by active columns. Only rows which are painted get formatted;
+    formatted cells are kept until stats of row change (for fit items, which
+    have statGeneration), or until next refresh for other rows, so repaints
+    and scrolling do not format anything again. Changes of columns or of
+    their formatting options drop all formatted cells.
+    """
 
     DEFAULT_COLS = None
 
     def __init__(self, parent, size=wx.DefaultSize, style=0):
         wx.ListCtrl.__init__(self)
         self.EnableSystemTheme(False)
-        self.Create(parent, size=size, style=wx.LC_REPORT | style)
+        self.Create(parent, size=size, style=wx.LC_REPORT | wx.LC_VIRTUAL | style)
         self.imageList = CachingImageList(16, 16)
         self.SetImageList(self.imageList, wx.IMAGE_LIST_SMALL)
         self.activeColumns = []
         self.columnsMinWidth = []
+        self.rows = []
+        # (row ID, column index) -> (row, row stat generation, text, image ID)
+        self.cellCache = {}
+        self.formatKey = None
+        # Row index -> wx.ItemAttr
+        self.rowAttrs = {}
+        self.contentKey = None
+        self.contentGeneration = 0
+        self.widthsGeneration = None
         self.Bind(wx.EVT_LIST_COL_END_DRAG, self.resizeChecker)
         self.Bind(wx.EVT_LIST_COL_BEGIN_DRAG, self.resizeSkip)
 
@@ -46,7 +64,6 @@ class Display(wx.ListCtrl):
 
         self.imageListBase = self.imageList.ImageCount
 
-
     # Override native HitTestSubItem (doesn't work as it should on GTK)
     # Source: ObjectListView
 
@@ -97,6 +114,8 @@ class Display(wx.ListCtrl):
         info.SetWidth(-1)
         info.SetAlign(wx.LIST_FORMAT_LEFT)
         self.InsertColumn(i, info)
+        self.cellCache.clear()
+        self.widthsGeneration = None
         col.resized = False
         if i == 0 and col.size != wx.LIST_AUTOSIZE_USEHEADER:
             col.size += 4
@@ -131,6 +150,8 @@ class Display(wx.ListCtrl):
         del self.activeColumns[i]
         del self.columnsMinWidth[i]
         self.DeleteColumn(i)
+        self.cellCache.clear()
+        self.widthsGeneration = None
 
     def getColIndex(self, colClass):
         for i, col in enumerate(self.activeColumns):
@@ -187,66 +208,37 @@ class Display(wx.ListCtrl):
 
     def populate(self, stuff):
         if stuff is not None:
-            listItemCount = self.GetItemCount()
-            stuffItemCount = len(stuff)
-
-            if listItemCount < stuffItemCount:
-                for i in range(stuffItemCount - listItemCount):
-                    self.InsertItem(self.GetItemCount(), "")
-
-            if listItemCount > stuffItemCount:
-                if listItemCount - stuffItemCount > 20 > stuffItemCount:
-                    self.DeleteAllItems()
-                    for i in range(stuffItemCount):
-                        self.InsertItem(self.GetItemCount(), "")
-                else:
-                    for i in range(listItemCount - stuffItemCount):
-                        self.DeleteItem(self.getLastItem())
-                    self.Refresh()
+            self.rows = list(stuff)
+            if self.GetItemCount() != len(self.rows):
+                self.SetItemCount(len(self.rows))
 
     def refresh(self, stuff):
         if stuff is None:
             return
-        item = -1
-        for id_, st in enumerate(stuff):
-
-            item = self.GetNextItem(item)
-
-            for i, col in enumerate(self.activeColumns):
-                colItem = self.GetItem(item, i)
-                oldText = colItem.GetText()
-                oldImageId = colItem.GetImage()
-                oldColour = colItem.GetBackgroundColour()
-                newText = col.getText(st)
-                if newText is False:
-                    col.delayedText(st, self, colItem)
-                    newText = "\u21bb"
-                newColour = self.columnBackground(colItem, st)
-
-                newImageId = col.getImageId(st)
-
-                colItem.SetText(newText)
-                colItem.SetImage(newImageId)
-                colItem.SetBackgroundColour(newColour)
-
-                mask = 0
-
-                if oldText != newText:
-                    mask |= wx.LIST_MASK_TEXT
-                    colItem.SetText(newText)
-                if oldImageId != newImageId:
-                    mask |= wx.LIST_MASK_IMAGE
-                    colItem.SetImage(newImageId)
-
-                if mask:
-                    colItem.SetMask(mask)
-                    self.SetItem(colItem)
-                else:
-                    if newColour != oldColour:
-                        self.SetItem(colItem)
-
-                self.SetItemData(item, id_)
-
+        self.rows = list(stuff)
+        if self.GetItemCount() != len(self.rows):
+            self.SetItemCount(len(self.rows))
+        # Cells of rows which have stats are checked against their generation
+        # when painted; widths are recalculated only if rows or their stats
+        # have changed
+        formatKey = tuple(col.getFormatKey() for col in self.activeColumns)
+        if formatKey != self.formatKey:
+            self.formatKey = formatKey
+            self.cellCache.clear()
+        else:
+            keptRows = {id(row) for row in self.rows if self.getRowGeneration(row) is not None}
+            self.cellCache = {k: v for k, v in self.cellCache.items() if k[0] in keptRows}
+        self.rowAttrs.clear()
+        if self.rows:
+            self.RefreshItems(0, len(self.rows) - 1)
+        contentKey = [(id(row), getattr(row, 'statGeneration', None)) for row in self.rows]
+        if contentKey != self.contentKey:
+            self.contentKey = contentKey
+            self.contentGeneration += 1
+
+        if self.widthsGeneration == self.contentGeneration:
+            return
+        self.widthsGeneration = self.contentGeneration
         for i, col in enumerate(self.activeColumns):
             if not col.resized:
                 if col.size == wx.LIST_AUTOSIZE_USEHEADER:
@@ -263,12 +255,97 @@ class Display(wx.ListCtrl):
         self.populate(stuff)
         self.refresh(stuff)
 
+    def getCell(self, rowIndex, column):
+        try:
+            row = self.rows[rowIndex]
+            col = self.activeColumns[column]
+        except IndexError:
+            return None
+        key = (id(row), column)
+        generation = self.getRowGeneration(row)
+        cell = self.cellCache.get(key)
+        if cell is not None and cell[0] is row and cell[1] == generation:
+            return cell
+        text = col.getText(row)
+        delayed = text is False
+        if delayed:
+            text = "\u21bb"
+        cell = self.cellCache[key] = (row, generation, text, col.getImageId(row))
+        # Placeholder is cached as well, so that text is requested only once
+        if delayed:
+            col.delayedText(row, self)
+        return cell
+
+    @staticmethod
+    def getRowGeneration(row):
+        """
+        Get stat generation of row; its cells are formatted again once it
+        changes. None for rows whose cells may change without it, those are
+        formatted again on every refresh.
+        """
+        # Fits are listed with their name and projection or command info,
+        # which are not part of their stats
+        if isinstance(row, Fit):
+            return None
+        return getattr(row, 'statGeneration', None)
+
+    def setCellText(self, row, col, text):
+        """Set text of cells of column for row, which was formatted with delay"""
+        try:
+            column = self.activeColumns.index(col)
+        except ValueError:
+            return
+        for rowIndex, currRow in enumerate(self.rows):
+            if currRow is row:
+                cell = self.getCell(rowIndex, column)
+                self.cellCache[(id(row), column)] = (row, cell[1], text, cell[3])
+                self.RefreshItem(rowIndex)
+
+    def OnGetItemText(self, item, column):
+        cell = self.getCell(item, column)
+        return cell[2] if cell is not None else ""
+
+    def OnGetItemImage(self, item):
+        return self.OnGetItemColumnImage(item, 0)
+
+    def OnGetItemColumnImage(self, item, column):
+        cell = self.getCell(item, column)
+        return cell[3] if cell is not None else -1
+
+    def OnGetItemAttr(self, item):
+        attr = self.rowAttrs.get(item)
+        if attr is None and 0 <= item < len(self.rows):
+            colour = self.columnBackground(self.rows[item])
+            if colour is not None:
+                attr = self.rowAttrs[item] = wx.ItemAttr()
+                attr.SetBackgroundColour(colour)
+        return attr
+
+    # Virtual list has no per-item storage; attributes set by subclasses are
+    # kept here until next refresh
+    def getRowAttr(self, item):
+        attr = self.rowAttrs.get(item)
+        if attr is None:
+            attr = self.rowAttrs[item] = wx.ItemAttr()
+        self.RefreshItem(item)
+        return attr
+
+    def SetItemBackgroundColour(self, item, colour):
+        self.getRowAttr(item).SetBackgroundColour(colour)
+
+    def SetItemTextColour(self, item, colour):
+        self.getRowAttr(item).SetTextColour(colour)
+
+    def SetItemFont(self, item, font):
+        self.getRowAttr(item).SetFont(font)
+
     def getColumn(self, point):
         row, _, col = self.HitTestSubItem(point)
         return col
 
-    def columnBackground(self, colItem, item):
-        return colItem.GetBackgroundColour()
+    def columnBackground(self, item):
+        """Background colour of row showing item, None for default one"""
+        return None
 
     def getRowByAbs(self, pointAbs):
         if pointAbs == wx.Point(-1, -1):
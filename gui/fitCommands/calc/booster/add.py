@@ -1,16 +1,16 @@
-import wx
 from logbook import Logger
 
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcAddBoosterCommand(wx.Command):
+class CalcAddBoosterCommand(Command):
 
     def __init__(self, fitID, boosterInfo, position=None):
-        wx.Command.__init__(self, True, 'Add Booster')
+        Command.__init__(self, True, 'Add Booster')
         self.fitID = fitID
         self.newBoosterInfo = boosterInfo
         self.newPosition = position
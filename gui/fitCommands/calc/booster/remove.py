@@ -1,17 +1,17 @@
-import wx
 from logbook import Logger
 
 from gui.fitCommands.helpers import BoosterInfo
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcRemoveBoosterCommand(wx.Command):
+class CalcRemoveBoosterCommand(Command):
 
     def __init__(self, fitID, position):
-        wx.Command.__init__(self, True, 'Remove Booster')
+        Command.__init__(self, True, 'Remove Booster')
         self.fitID = fitID
         self.position = position
         self.savedBoosterInfo = None
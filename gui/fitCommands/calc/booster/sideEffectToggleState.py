@@ -1,16 +1,16 @@
-import wx
 from logbook import Logger
 
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcToggleBoosterSideEffectStateCommand(wx.Command):
+class CalcToggleBoosterSideEffectStateCommand(Command):
 
     def __init__(self, fitID, position, effectID, forceState=None):
-        wx.Command.__init__(self, True, 'Toggle Booster Side Effect State')
+        Command.__init__(self, True, 'Toggle Booster Side Effect State')
         self.fitID = fitID
         self.position = position
         self.effectID = effectID
@@ -1,16 +1,16 @@
-import wx
 from logbook import Logger
 
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcToggleBoosterStatesCommand(wx.Command):
+class CalcToggleBoosterStatesCommand(Command):
 
     def __init__(self, fitID, mainPosition, positions, forceStates=None):
-        wx.Command.__init__(self, True, 'Toggle Booster States')
+        Command.__init__(self, True, 'Toggle Booster States')
         self.fitID = fitID
         self.mainPosition = mainPosition
         self.positions = positions
@@ -1,16 +1,16 @@
-import wx
 from logbook import Logger
 
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcAddCargoCommand(wx.Command):
+class CalcAddCargoCommand(Command):
 
     def __init__(self, fitID, cargoInfo):
-        wx.Command.__init__(self, True, 'Add Cargo')
+        Command.__init__(self, True, 'Add Cargo')
         self.fitID = fitID
         self.cargoInfo = cargoInfo
 
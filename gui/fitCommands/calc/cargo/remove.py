@@ -1,17 +1,17 @@
-import wx
 from logbook import Logger
 
 from gui.fitCommands.helpers import CargoInfo
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcRemoveCargoCommand(wx.Command):
+class CalcRemoveCargoCommand(Command):
 
     def __init__(self, fitID, cargoInfo):
-        wx.Command.__init__(self, True, 'Remove Cargo')
+        Command.__init__(self, True, 'Remove Cargo')
         self.fitID = fitID
         self.cargoInfo = cargoInfo
         self.savedRemovedAmount = None
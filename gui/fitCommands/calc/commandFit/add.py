@@ -1,17 +1,17 @@
-import wx
 from logbook import Logger
 
 import eos.db
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcAddCommandCommand(wx.Command):
+class CalcAddCommandCommand(Command):
 
     def __init__(self, fitID, commandFitID, state=None):
-        wx.Command.__init__(self, True, 'Add Command Fit')
+        Command.__init__(self, True, 'Add Command Fit')
         self.fitID = fitID
         self.commandFitID = commandFitID
         self.state = state
@@ -1,16 +1,16 @@
-import wx
 from logbook import Logger
 
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcRemoveCommandFitCommand(wx.Command):
+class CalcRemoveCommandFitCommand(Command):
 
     def __init__(self, fitID, commandFitID):
-        wx.Command.__init__(self, True, 'Remove Command Fit')
+        Command.__init__(self, True, 'Remove Command Fit')
         self.fitID = fitID
         self.commandFitID = commandFitID
         self.savedState = None
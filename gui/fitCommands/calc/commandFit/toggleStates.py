@@ -1,16 +1,16 @@
-import wx
 from logbook import Logger
 
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcToggleCommandFitStatesCommand(wx.Command):
+class CalcToggleCommandFitStatesCommand(Command):
 
     def __init__(self, fitID, mainCommandFitID, commandFitIDs, forceStates=None):
-        wx.Command.__init__(self, True, 'Toggle Command Fit States')
+        Command.__init__(self, True, 'Toggle Command Fit States')
         self.fitID = fitID
         self.mainCommandFitID = mainCommandFitID
         self.commandFitIDs = commandFitIDs
@@ -1,7 +1,7 @@
-import wx
 from logbook import Logger
 
 from gui.fitCommands.helpers import DroneInfo, droneStackLimit
+from service.command import Command
 from service.fit import Fit
 from service.market import Market
 
@@ -9,10 +9,10 @@ from service.market import Market
 pyfalog = Logger(__name__)
 
 
-class CalcAddLocalDroneCommand(wx.Command):
+class CalcAddLocalDroneCommand(Command):
 
     def __init__(self, fitID, droneInfo, forceNewStack=False, ignoreRestrictions=False):
-        wx.Command.__init__(self, True, 'Add Local Drone')
+        Command.__init__(self, True, 'Add Local Drone')
         self.fitID = fitID
         self.droneInfo = droneInfo
         self.forceNewStack = forceNewStack
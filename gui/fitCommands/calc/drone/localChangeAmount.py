@@ -1,17 +1,17 @@
-import wx
 from logbook import Logger
 
 from gui.fitCommands.helpers import DroneInfo
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcChangeLocalDroneAmountCommand(wx.Command):
+class CalcChangeLocalDroneAmountCommand(Command):
 
     def __init__(self, fitID, position, amount):
-        wx.Command.__init__(self, True, 'Change Local Drone Amount')
+        Command.__init__(self, True, 'Change Local Drone Amount')
         self.fitID = fitID
         self.position = position
         self.amount = amount
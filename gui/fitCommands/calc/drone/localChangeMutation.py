@@ -1,16 +1,16 @@
-import wx
 from logbook import Logger
 
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcChangeLocalDroneMutationCommand(wx.Command):
+class CalcChangeLocalDroneMutationCommand(Command):
 
     def __init__(self, fitID, position, mutation, oldMutation=None):
-        wx.Command.__init__(self, True, 'Change Local Drone Mutation')
+        Command.__init__(self, True, 'Change Local Drone Mutation')
         self.fitID = fitID
         self.position = position
         self.mutation = mutation
@@ -1,17 +1,17 @@
-import wx
 from logbook import Logger
 
 from gui.fitCommands.helpers import DroneInfo
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcRemoveLocalDroneCommand(wx.Command):
+class CalcRemoveLocalDroneCommand(Command):
 
     def __init__(self, fitID, position, amount):
-        wx.Command.__init__(self, True, 'Remove Local Drone')
+        Command.__init__(self, True, 'Remove Local Drone')
         self.fitID = fitID
         self.position = position
         self.amountToRemove = amount
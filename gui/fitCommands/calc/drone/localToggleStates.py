@@ -1,17 +1,17 @@
-import wx
 from logbook import Logger
 
 import eos.db
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcToggleLocalDroneStatesCommand(wx.Command):
+class CalcToggleLocalDroneStatesCommand(Command):
 
     def __init__(self, fitID, mainPosition, positions, forceActiveAmounts=None):
-        wx.Command.__init__(self, True, 'Toggle Local Drone States')
+        Command.__init__(self, True, 'Toggle Local Drone States')
         self.fitID = fitID
         self.mainPosition = mainPosition
         self.positions = positions
@@ -1,18 +1,18 @@
 import math
-import wx
 from logbook import Logger
 
 from gui.fitCommands.helpers import DroneInfo
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcAddProjectedDroneCommand(wx.Command):
+class CalcAddProjectedDroneCommand(Command):
 
     def __init__(self, fitID, droneInfo):
-        wx.Command.__init__(self, True, 'Add Projected Drone')
+        Command.__init__(self, True, 'Add Projected Drone')
         self.fitID = fitID
         self.droneInfo = droneInfo
         self.savedDroneInfo = None
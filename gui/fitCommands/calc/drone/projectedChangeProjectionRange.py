@@ -1,16 +1,16 @@
-import wx
 from logbook import Logger
 
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcChangeProjectedDroneProjectionRangeCommand(wx.Command):
+class CalcChangeProjectedDroneProjectionRangeCommand(Command):
 
     def __init__(self, fitID, itemID, projectionRange):
-        wx.Command.__init__(self, True, 'Change Projected Drone Projection Range')
+        Command.__init__(self, True, 'Change Projected Drone Projection Range')
         self.fitID = fitID
         self.itemID = itemID
         self.projectionRange = projectionRange
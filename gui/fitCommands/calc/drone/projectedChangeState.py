@@ -1,17 +1,17 @@
-import wx
 from logbook import Logger
 
 import eos.db
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcChangeProjectedDroneStateCommand(wx.Command):
+class CalcChangeProjectedDroneStateCommand(Command):
 
     def __init__(self, fitID, itemID, state):
-        wx.Command.__init__(self, True, 'Change Projected Drone State')
+        Command.__init__(self, True, 'Change Projected Drone State')
         self.fitID = fitID
         self.itemID = itemID
         self.state = state
@@ -1,17 +1,17 @@
-import wx
 from logbook import Logger
 
 from gui.fitCommands.helpers import DroneInfo
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcRemoveProjectedDroneCommand(wx.Command):
+class CalcRemoveProjectedDroneCommand(Command):
 
     def __init__(self, fitID, itemID, amount):
-        wx.Command.__init__(self, True, 'Remove Projected Drone')
+        Command.__init__(self, True, 'Remove Projected Drone')
         self.fitID = fitID
         self.itemID = itemID
         self.amountToRemove = amount
@@ -1,16 +1,16 @@
-import wx
 from logbook import Logger
 
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcToggleFighterAbilityStatesCommand(wx.Command):
+class CalcToggleFighterAbilityStatesCommand(Command):
 
     def __init__(self, fitID, projected, mainPosition, positions, effectID, forceStates=None):
-        wx.Command.__init__(self, True, 'Toggle Fighter Ability States')
+        Command.__init__(self, True, 'Toggle Fighter Ability States')
         self.fitID = fitID
         self.projected = projected
         self.mainPosition = mainPosition
@@ -1,16 +1,16 @@
-import wx
 from logbook import Logger
 
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcChangeFighterAmountCommand(wx.Command):
+class CalcChangeFighterAmountCommand(Command):
 
     def __init__(self, fitID, projected, position, amount):
-        wx.Command.__init__(self, True, 'Change Fighter Amount')
+        Command.__init__(self, True, 'Change Fighter Amount')
         self.fitID = fitID
         self.projected = projected
         self.position = position
@@ -1,16 +1,16 @@
-import wx
 from logbook import Logger
 
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcAddLocalFighterCommand(wx.Command):
+class CalcAddLocalFighterCommand(Command):
 
     def __init__(self, fitID, fighterInfo, position=None, ignoreRestrictions=False):
-        wx.Command.__init__(self, True, 'Add Fighter')
+        Command.__init__(self, True, 'Add Fighter')
         self.fitID = fitID
         self.fighterInfo = fighterInfo
         self.position = position
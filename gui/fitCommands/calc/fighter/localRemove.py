@@ -1,17 +1,17 @@
-import wx
 from logbook import Logger
 
 from gui.fitCommands.helpers import FighterInfo
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcRemoveLocalFighterCommand(wx.Command):
+class CalcRemoveLocalFighterCommand(Command):
 
     def __init__(self, fitID, position):
-        wx.Command.__init__(self, True, 'Remove Fighter')
+        Command.__init__(self, True, 'Remove Fighter')
         self.fitID = fitID
         self.position = position
         self.savedFighterInfo = None
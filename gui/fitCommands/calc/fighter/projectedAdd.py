@@ -1,16 +1,16 @@
-import wx
 from logbook import Logger
 
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcAddProjectedFighterCommand(wx.Command):
+class CalcAddProjectedFighterCommand(Command):
 
     def __init__(self, fitID, fighterInfo, position=None):
-        wx.Command.__init__(self, True, 'Add Projected Fighter')
+        Command.__init__(self, True, 'Add Projected Fighter')
         self.fitID = fitID
         self.fighterInfo = fighterInfo
         self.position = position
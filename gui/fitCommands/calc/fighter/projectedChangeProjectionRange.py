@@ -1,16 +1,16 @@
-import wx
 from logbook import Logger
 
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcChangeProjectedFighterProjectionRangeCommand(wx.Command):
+class CalcChangeProjectedFighterProjectionRangeCommand(Command):
 
     def __init__(self, fitID, position, projectionRange):
-        wx.Command.__init__(self, True, 'Change Projected Fighter Projection Range')
+        Command.__init__(self, True, 'Change Projected Fighter Projection Range')
         self.fitID = fitID
         self.position = position
         self.projectionRange = projectionRange
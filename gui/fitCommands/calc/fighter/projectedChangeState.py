@@ -1,16 +1,16 @@
-import wx
 from logbook import Logger
 
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcChangeProjectedFighterStateCommand(wx.Command):
+class CalcChangeProjectedFighterStateCommand(Command):
 
     def __init__(self, fitID, position, state):
-        wx.Command.__init__(self, True, 'Change Projected Fighter State')
+        Command.__init__(self, True, 'Change Projected Fighter State')
         self.fitID = fitID
         self.position = position
         self.state = state
@@ -1,17 +1,17 @@
-import wx
 from logbook import Logger
 
 from gui.fitCommands.helpers import FighterInfo
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcRemoveProjectedFighterCommand(wx.Command):
+class CalcRemoveProjectedFighterCommand(Command):
 
     def __init__(self, fitID, position):
-        wx.Command.__init__(self, True, 'Add Projected Fighter')
+        Command.__init__(self, True, 'Add Projected Fighter')
         self.fitID = fitID
         self.position = position
         self.savedFighterInfo = None
@@ -1,16 +1,16 @@
-import wx
 from logbook import Logger
 
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcChangeFitPilotSecurityCommand(wx.Command):
+class CalcChangeFitPilotSecurityCommand(Command):
 
     def __init__(self, fitID, secStatus):
-        wx.Command.__init__(self, True, 'Change Fit Pilot Security')
+        Command.__init__(self, True, 'Change Fit Pilot Security')
         self.fitID = fitID
         self.secStatus = secStatus
         self.savedSecStatus = None
@@ -1,16 +1,16 @@
-import wx
 from logbook import Logger
 
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcFitRenameCommand(wx.Command):
+class CalcFitRenameCommand(Command):
 
     def __init__(self, fitID, name):
-        wx.Command.__init__(self, True, 'Rename Fit')
+        Command.__init__(self, True, 'Rename Fit')
         self.fitID = fitID
         self.name = name
         self.savedName = None
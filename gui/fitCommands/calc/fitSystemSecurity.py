@@ -1,16 +1,16 @@
-import wx
 from logbook import Logger
 
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcChangeFitSystemSecurityCommand(wx.Command):
+class CalcChangeFitSystemSecurityCommand(Command):
 
     def __init__(self, fitID, secStatus):
-        wx.Command.__init__(self, True, 'Change Fit System Security')
+        Command.__init__(self, True, 'Change Fit System Security')
         self.fitID = fitID
         self.secStatus = secStatus
         self.savedSecStatus = None
@@ -1,16 +1,16 @@
-import wx
 from logbook import Logger
 
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcAddImplantCommand(wx.Command):
+class CalcAddImplantCommand(Command):
 
     def __init__(self, fitID, implantInfo, position=None):
-        wx.Command.__init__(self, True, 'Add Implant')
+        Command.__init__(self, True, 'Add Implant')
         self.fitID = fitID
         self.newImplantInfo = implantInfo
         self.newPosition = position
@@ -1,16 +1,16 @@
-import wx
 from logbook import Logger
 
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcChangeImplantLocationCommand(wx.Command):
+class CalcChangeImplantLocationCommand(Command):
 
     def __init__(self, fitID, source):
-        wx.Command.__init__(self, True, 'Change Implant Location')
+        Command.__init__(self, True, 'Change Implant Location')
         self.fitID = fitID
         self.source = source
         self.savedSource = None
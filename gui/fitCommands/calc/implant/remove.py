@@ -1,17 +1,17 @@
-import wx
 from logbook import Logger
 
 from gui.fitCommands.helpers import ImplantInfo
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcRemoveImplantCommand(wx.Command):
+class CalcRemoveImplantCommand(Command):
 
     def __init__(self, fitID, position):
-        wx.Command.__init__(self, True, 'Remove Implant')
+        Command.__init__(self, True, 'Remove Implant')
         self.fitID = fitID
         self.position = position
         self.savedImplantInfo = None
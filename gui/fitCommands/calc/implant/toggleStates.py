@@ -1,16 +1,16 @@
-import wx
 from logbook import Logger
 
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcToggleImplantStatesCommand(wx.Command):
+class CalcToggleImplantStatesCommand(Command):
 
     def __init__(self, fitID, mainPosition, positions, forceStates=None):
-        wx.Command.__init__(self, True, 'Toggle Implant States')
+        Command.__init__(self, True, 'Toggle Implant States')
         self.fitID = fitID
         self.mainPosition = mainPosition
         self.positions = positions
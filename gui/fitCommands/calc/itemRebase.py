@@ -1,6 +1,6 @@
-import wx
 from logbook import Logger
 
+from service.command import Command
 from service.fit import Fit
 from service.market import Market
 
@@ -8,10 +8,10 @@ from service.market import Market
 pyfalog = Logger(__name__)
 
 
-class CalcRebaseItemCommand(wx.Command):
+class CalcRebaseItemCommand(Command):
 
     def __init__(self, fitID, containerName, position, itemID):
-        wx.Command.__init__(self, True, 'Rebase Item')
+        Command.__init__(self, True, 'Rebase Item')
         self.fitID = fitID
         self.containerName = containerName
         self.position = position
@@ -1,7 +1,7 @@
-import wx
 from logbook import Logger
 
 from gui.fitCommands.helpers import restoreCheckedStates
+from service.command import Command
 from service.fit import Fit
 from service.market import Market
 
@@ -9,10 +9,10 @@ from service.market import Market
 pyfalog = Logger(__name__)
 
 
-class CalcChangeModuleChargesCommand(wx.Command):
+class CalcChangeModuleChargesCommand(Command):
 
     def __init__(self, fitID, projected, chargeMap, ignoreRestrictions=False, recalc=True):
-        wx.Command.__init__(self, True, 'Change Module Charges')
+        Command.__init__(self, True, 'Change Module Charges')
         self.fitID = fitID
         self.projected = projected
         self.chargeMap = chargeMap
@@ -1,16 +1,16 @@
-import wx
 from logbook import Logger
 
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcChangeModuleSpoolCommand(wx.Command):
+class CalcChangeModuleSpoolCommand(Command):
 
     def __init__(self, fitID, projected, position, spoolType, spoolAmount):
-        wx.Command.__init__(self, True, 'Change Module Spool')
+        Command.__init__(self, True, 'Change Module Spool')
         self.fitID = fitID
         self.projected = projected
         self.position = position
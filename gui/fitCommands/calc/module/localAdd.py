@@ -1,18 +1,18 @@
-import wx
 from logbook import Logger
 
 import eos.db
 from gui.fitCommands.helpers import restoreCheckedStates, activeStateLimit
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcAddLocalModuleCommand(wx.Command):
+class CalcAddLocalModuleCommand(Command):
 
     def __init__(self, fitID, newModInfo):
-        wx.Command.__init__(self, True, 'Add Module')
+        Command.__init__(self, True, 'Add Module')
         self.fitID = fitID
         self.newModInfo = newModInfo
         self.savedPosition = None
@@ -1,18 +1,18 @@
-import wx
 from logbook import Logger
 
 from eos.saveddata.module import Module
 from gui.fitCommands.helpers import restoreCheckedStates
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcChangeLocalModuleStatesCommand(wx.Command):
+class CalcChangeLocalModuleStatesCommand(Command):
 
     def __init__(self, fitID, mainPosition, positions, click):
-        wx.Command.__init__(self, True, 'Change Module States')
+        Command.__init__(self, True, 'Change Module States')
         self.fitID = fitID
         self.mainPosition = mainPosition
         self.positions = positions
@@ -1,20 +1,20 @@
 import copy
 
-import wx
 from logbook import Logger
 
 import eos.db
 from gui.fitCommands.helpers import restoreCheckedStates
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcCloneLocalModuleCommand(wx.Command):
+class CalcCloneLocalModuleCommand(Command):
 
     def __init__(self, fitID, srcPosition, dstPosition):
-        wx.Command.__init__(self, True, 'Clone Local Module')
+        Command.__init__(self, True, 'Clone Local Module')
         self.fitID = fitID
         self.srcPosition = srcPosition
         self.dstPosition = dstPosition
@@ -1,19 +1,19 @@
-import wx
 from logbook import Logger
 
 import eos.db
 from eos.const import FittingSlot
 from gui.fitCommands.helpers import ModuleInfo, restoreCheckedStates, restoreRemovedDummies
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcRemoveLocalModulesCommand(wx.Command):
+class CalcRemoveLocalModulesCommand(Command):
 
     def __init__(self, fitID, positions, recalc=True, clearTail=False):
-        wx.Command.__init__(self, True, 'Remove Module')
+        Command.__init__(self, True, 'Remove Module')
         self.fitID = fitID
         self.positions = positions
         self.recalc = recalc
@@ -1,18 +1,18 @@
-import wx
 from logbook import Logger
 
 import eos.db
 from gui.fitCommands.helpers import ModuleInfo, restoreCheckedStates, activeStateLimit
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcReplaceLocalModuleCommand(wx.Command):
+class CalcReplaceLocalModuleCommand(Command):
 
     def __init__(self, fitID, position, newModInfo, unloadInvalidCharges=False, ignoreRestrictions=False, recalc=True):
-        wx.Command.__init__(self, True, 'Replace Module')
+        Command.__init__(self, True, 'Replace Module')
         self.fitID = fitID
         self.position = position
         self.newModInfo = newModInfo
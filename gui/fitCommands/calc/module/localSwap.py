@@ -1,16 +1,16 @@
-import wx
 from logbook import Logger
 
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcSwapLocalModuleCommand(wx.Command):
+class CalcSwapLocalModuleCommand(Command):
 
     def __init__(self, fitID, position1, position2):
-        wx.Command.__init__(self, True, 'Swap Modules')
+        Command.__init__(self, True, 'Swap Modules')
         self.fitID = fitID
         self.position1 = position1
         self.position2 = position2
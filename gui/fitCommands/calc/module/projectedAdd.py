@@ -1,19 +1,19 @@
-import wx
 from logbook import Logger
 
 import eos.db
 from eos.const import FittingModuleState
 from gui.fitCommands.helpers import restoreCheckedStates
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcAddProjectedModuleCommand(wx.Command):
+class CalcAddProjectedModuleCommand(Command):
 
     def __init__(self, fitID, modInfo, position=None, ignoreRestrictions=False, recalc=True):
-        wx.Command.__init__(self, True)
+        Command.__init__(self, True)
         self.fitID = fitID
         self.newModInfo = modInfo
         self.newPosition = position
@@ -1,17 +1,17 @@
-import wx
 from logbook import Logger
 
 from gui.fitCommands.helpers import restoreCheckedStates
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcChangeProjectedModuleProjectionRangeCommand(wx.Command):
+class CalcChangeProjectedModuleProjectionRangeCommand(Command):
 
     def __init__(self, fitID, position, projectionRange):
-        wx.Command.__init__(self, True)
+        Command.__init__(self, True)
         self.fitID = fitID
         self.position = position
         self.projectionRange = projectionRange
@@ -1,9 +1,9 @@
-import wx
 from logbook import Logger
 
 from eos.const import FittingModuleState
 from eos.saveddata.module import Module
 from gui.fitCommands.helpers import restoreCheckedStates
+from service.command import Command
 from service.fit import Fit
 
 
@@ -16,10 +16,10 @@ STATE_MAP = {
     'overheat': FittingModuleState.OVERHEATED}
 
 
-class CalcChangeProjectedModuleStatesCommand(wx.Command):
+class CalcChangeProjectedModuleStatesCommand(Command):
 
     def __init__(self, fitID, positions, proposedState):
-        wx.Command.__init__(self, True, 'Change Projected Module States')
+        Command.__init__(self, True, 'Change Projected Module States')
         self.fitID = fitID
         self.positions = positions
         self.proposedState = STATE_MAP[proposedState]
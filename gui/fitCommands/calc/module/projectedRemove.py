@@ -1,18 +1,18 @@
-import wx
 from logbook import Logger
 
 import eos.db
 from gui.fitCommands.helpers import ModuleInfo, restoreCheckedStates
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcRemoveProjectedModuleCommand(wx.Command):
+class CalcRemoveProjectedModuleCommand(Command):
 
     def __init__(self, fitID, position, recalc=True):
-        wx.Command.__init__(self, True)
+        Command.__init__(self, True)
         self.fitID = fitID
         self.position = position
         self.recalc = recalc
@@ -1,18 +1,18 @@
-import wx
 from logbook import Logger
 
 import eos.db
 from gui.fitCommands.helpers import restoreCheckedStates
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcAddProjectedFitCommand(wx.Command):
+class CalcAddProjectedFitCommand(Command):
 
     def __init__(self, fitID, projectedFitID, amount, state=None):
-        wx.Command.__init__(self, True, 'Add Projected Fit')
+        Command.__init__(self, True, 'Add Projected Fit')
         self.fitID = fitID
         self.projectedFitID = projectedFitID
         self.amount = amount
@@ -1,16 +1,16 @@
-import wx
 from logbook import Logger
 
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcChangeProjectedFitAmountCommand(wx.Command):
+class CalcChangeProjectedFitAmountCommand(Command):
 
     def __init__(self, fitID, projectedFitID, amount, relative=False):
-        wx.Command.__init__(self, True, 'Change Projected Fit Amount')
+        Command.__init__(self, True, 'Change Projected Fit Amount')
         self.fitID = fitID
         self.projectedFitID = projectedFitID
         self.amount = amount
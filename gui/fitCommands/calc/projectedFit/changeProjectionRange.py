@@ -1,17 +1,17 @@
-import wx
 from logbook import Logger
 
 from gui.fitCommands.helpers import restoreCheckedStates
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcChangeProjectedFitProjectionRangeCommand(wx.Command):
+class CalcChangeProjectedFitProjectionRangeCommand(Command):
 
     def __init__(self, fitID, projectedFitID, projectionRange):
-        wx.Command.__init__(self, True, 'Change Projected Fit Projection Range')
+        Command.__init__(self, True, 'Change Projected Fit Projection Range')
         self.fitID = fitID
         self.projectedFitID = projectedFitID
         self.projectionRange = projectionRange
@@ -1,17 +1,17 @@
-import wx
 from logbook import Logger
 
 from gui.fitCommands.helpers import restoreCheckedStates
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcChangeProjectedFitStateCommand(wx.Command):
+class CalcChangeProjectedFitStateCommand(Command):
 
     def __init__(self, fitID, projectedFitID, state):
-        wx.Command.__init__(self, True, 'Change Projected Fit State')
+        Command.__init__(self, True, 'Change Projected Fit State')
         self.fitID = fitID
         self.projectedFitID = projectedFitID
         self.state = state
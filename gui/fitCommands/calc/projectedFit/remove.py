@@ -1,17 +1,17 @@
-import wx
 from logbook import Logger
 
 from gui.fitCommands.helpers import restoreCheckedStates
+from service.command import Command
 from service.fit import Fit
 
 
 pyfalog = Logger(__name__)
 
 
-class CalcRemoveProjectedFitCommand(wx.Command):
+class CalcRemoveProjectedFitCommand(Command):
 
     def __init__(self, fitID, projectedFitID, amount):
-        wx.Command.__init__(self, True, 'Add Projected Fit')
+        Command.__init__(self, True, 'Add Projected Fit')
         self.fitID = fitID
         self.projectedFitID = projectedFitID
         self.amount = amount
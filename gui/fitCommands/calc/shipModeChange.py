@@ -1,7 +1,7 @@
-import wx
 from logbook import Logger
 
 from eos.saveddata.mode import Mode
+from service.command import Command
 from service.fit import Fit
 from service.market import Market
 
@@ -9,10 +9,10 @@ from service.market import Market
 pyfalog = Logger(__name__)
 
 
-class CalcChangeShipModeCommand(wx.Command):
+class CalcChangeShipModeCommand(Command):
 
     def __init__(self, fitID, itemID):
-        wx.Command.__init__(self, True, 'Change Ship Mode')
+        Command.__init__(self, True, 'Change Ship Mode')
         self.fitID = fitID
         self.itemID = itemID
         self.savedItemID = None
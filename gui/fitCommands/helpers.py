@@ -1,16 +1,17 @@
 import math
 
-import wx
 from logbook import Logger
 
 import eos.db
 from eos.const import FittingModuleState
+from eos.events import batched
 from eos.saveddata.booster import Booster
 from eos.saveddata.cargo import Cargo
 from eos.saveddata.drone import Drone
 from eos.saveddata.fighter import Fighter
 from eos.saveddata.implant import Implant
 from eos.saveddata.module import Module
+from service.command import CommandProcessor
 from service.market import Market
 from utils.repr import makeReprStr
 
@@ -21,22 +22,29 @@ pyfalog = Logger(__name__)
 class InternalCommandHistory:
 
     def __init__(self):
-        self.__buffer = wx.CommandProcessor()
+        self.__buffer = CommandProcessor()
 
     def submit(self, command):
-        return self.__buffer.Submit(command)
+        with batched():
+            return self.__buffer.Submit(command)
 
     def submitBatch(self, *commands):
-        for command in commands:
-            if not self.__buffer.Submit(command):
-                # Undo what we already submitted
-                for commandToUndo in reversed(self.__buffer.Commands):
-                    if commandToUndo in commands:
-                        self.__buffer.Undo()
-                return False
-        return True
+        # Fits get one modification time update per batch
+        with batched():
+            for command in commands:
+                if not self.__buffer.Submit(command):
+                    # Undo what we already submitted
+                    for commandToUndo in reversed(self.__buffer.Commands):
+                        if commandToUndo in commands:
+                            self.__buffer.Undo()
+                    return False
+            return True
 
     def undoAll(self):
+        with batched():
+            return self.__undoAll()
+
+    def __undoAll(self):
         undoneCommands = []
         # Undo commands one by one, starting from the last
         for commandToUndo in reversed(self.__buffer.Commands):
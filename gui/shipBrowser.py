@@ -4,10 +4,12 @@ from logbook import Logger
 
 import gui.globalEvents as GE
 import gui.mainFrame
+from gui.bitmap_loader import BitmapLoader
 from gui.builtinShipBrowser.categoryItem import CategoryItem
 from gui.builtinShipBrowser.fitItem import FitItem
 from gui.builtinShipBrowser.shipItem import ShipItem
 from service.fit import Fit
+from service.fitStats import FitStats
 from service.market import Market
 
 from gui.builtinShipBrowser.events import EVT_SB_IMPORT_SEL, EVT_SB_STAGE1_SEL, EVT_SB_STAGE2_SEL, EVT_SB_STAGE3_SEL, EVT_SB_SEARCH_SEL
@@ -226,6 +228,10 @@ class ShipBrowser(wx.Panel):
                 override = False
                 break
 
+        # Renders are loaded in display order below; prefetcher goes from the
+        # other end, so they meet in the middle
+        BitmapLoader.prefetch([str(ship.graphicID) for ship in reversed(ships) if ship.graphicID], "renders")
+
         for ship in ships:
             fits = sFit.countFitsWithShip(ship.ID)
             t_fits += fits
@@ -337,8 +343,17 @@ class ShipBrowser(wx.Panel):
 
         shipTrait = ship.traits.display if (ship.traits is not None) else ""  # empty string if no traits
 
+        fitStats = {}
+        sFitStats = FitStats.getInstance()
+        if sFitStats.enabled:
+            fitIDs = [fitInfo[0] for fitInfo in fitList]
+            fitStats = sFitStats.getStats(fitIDs, calculate=False)
+            # Fits without stored stats will have them next time they are shown
+            sFitStats.calculateInBackground([fitID for fitID in fitIDs if fitID not in fitStats])
+
         for ID, name, booster, timestamp, notes, graphicID in fitList:
-            self.lpane.AddWidget(FitItem(self.lpane, ID, (shipName, shipTrait, name, booster, timestamp, notes), shipID, graphicID=graphicID))
+            self.lpane.AddWidget(FitItem(self.lpane, ID, (shipName, shipTrait, name, booster, timestamp, notes), shipID,
+                                         graphicID=graphicID, fitStats=fitStats.get(ID)))
 
         self.lpane.RefreshList()
         self.lpane.Thaw()
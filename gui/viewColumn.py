@@ -63,7 +63,12 @@ class ViewColumn:
     def getParameters():
         return tuple()
 
-    def delayedText(self, display, colItem):
+    def getFormatKey(self):
+        """Get value of options which text of column depends on besides its row; cells are formatted again when it changes"""
+        return None
+
+    def delayedText(self, mod, display):
+        """Start fetching text of cell which getText() returned False for; pass it to display.setCellText()"""
         raise NotImplementedError()
 
 
@@ -20,6 +20,7 @@
 
 
 import datetime
+import multiprocessing
 import os
 import sys
 from optparse import AmbiguousOptionError, BadOptionError, OptionParser
@@ -73,11 +74,15 @@ parser.add_option("-t", "--title", action="store", dest="title", help="Set Windo
 parser.add_option("-s", "--savepath", action="store", dest="savepath", help="Set the folder for savedata", default=None)
 parser.add_option("-l", "--logginglevel", action="store", dest="logginglevel", help="Set desired logging level [Critical|Error|Warning|Info|Debug]", default="Error")
 parser.add_option("-p", "--profile", action="store", dest="profile_path", help="Set location to save profileing.", default=None)
+parser.add_option("--calctrace", action="store", dest="calc_trace_path",
+                  help="Trace fit calculations, saving report and Chrome trace to given folder on exit.", default=None)
 parser.add_option("-i", "--language", action="store", dest="language", help="Sets the language for pyfa. Overrides user's saved settings. Format: xx_YY (eg: en_US). If translation doesn't exist, defaults to en_US", default=None)
 
 (options, args) = parser.parse_args()
 
 if __name__ == "__main__":
+    # Required for worker processes (e.g. bulk fit import) in frozen builds
+    multiprocessing.freeze_support()
 
     try:
         # first and foremost - check required libraries
@@ -143,6 +148,11 @@ if __name__ == "__main__":
         if options.title is None:
             options.title = "pyfa %s - Python Fitting Assistant" % (config.getVersion())
 
+        if options.calc_trace_path:
+            from eos.utils.calcTrace import CalcTracer, setTracer
+            calcTracer = CalcTracer()
+            setTracer(calcTracer)
+
         pyfa = PyfaApp(False)
 
         from gui.mainFrame import MainFrame
@@ -159,6 +169,14 @@ if __name__ == "__main__":
         else:
             pyfa.MainLoop()
 
+        if options.calc_trace_path:
+            setTracer(None)
+            trace_name = os.path.join(options.calc_trace_path, 'pyfa-calc-{}'.format(datetime.datetime.now().strftime('%Y%m%d_%H%M%S')))
+            pyfalog.info("Saving fit calculation trace to {}", trace_name)
+            with open(trace_name + '.txt', 'w') as f:
+                f.write(calcTracer.report())
+            calcTracer.saveChromeTrace(trace_name + '.json')
+
         # When main loop is over, threads have 5 seconds to comply...
         import threading
         from utils.timer import CountdownTimer
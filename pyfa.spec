@@ -1,6 +1,7 @@
 # -*- mode: python -*-
 
 import os
+import sys
 from itertools import chain
 import subprocess
 import requests.certs
@@ -9,11 +10,16 @@ import platform
 os_name = platform.system()
 block_cipher = None
 
+# Pack icons and renders into atlases, which pyfa reads instead of separate files
+subprocess.check_call([sys.executable, os.path.join('scripts', 'icon_atlas.py')])
+
 added_files = [
      ('imgs/gui/*.png', 'imgs/gui'),
      ('imgs/gui/*.gif', 'imgs/gui'),
      ('imgs/icons/*.png', 'imgs/icons'),
      ('imgs/renders/*.png', 'imgs/renders'),
+     ('imgs/*.atlas.json', 'imgs'),
+     ('imgs/*.atlas@*x.png', 'imgs'),
      ('service/jargon/*.yaml', 'service/jargon'),
      ('locale', 'locale'),
      (requests.certs.where(), '.'),  # is this needed anymore?
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+"""
+This script benchmarks damage vector math in the shapes it is used in: the
+damage graph, which applies damage of every source to a target at every
+point, and fleet DPS summation over many fits and their weapons.
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.realpath(os.path.join(script_dir, '..')))
+
+parser = argparse.ArgumentParser(description='This script benchmarks damage vector operations')
+parser.add_argument('-p', '--points', type=int, default=2000, help='Amount of points on damage graph')
+parser.add_argument('-s', '--sources', type=int, default=12, help='Amount of damage sources per fit')
+parser.add_argument('-f', '--fits', type=int, default=250, help='Amount of fits in fleet')
+parser.add_argument('-r', '--repeat', type=int, default=5, help='Amount of repeats, best one is reported')
+args = parser.parse_args()
+
+from eos.utils.stats import BreacherInfo, DmgAccumulator, DmgTypes
+
+
+class Profile:
+
+    def __init__(self, hp):
+        self.emAmount = 0.5
+        self.thermalAmount = 0.4
+        self.kineticAmount = 0.3
+        self.explosiveAmount = 0.2
+        self.hp = hp
+
+
+rng = random.Random(0)
+
+
+def makeVolley():
+    volley = DmgTypes(rng.random() * 100, rng.random() * 100, rng.random() * 100, rng.random() * 100)
+    return volley
+
+
+dmgMap = {i: makeVolley() for i in range(args.sources)}
+dmgMap['breacher'] = DmgTypes(0, 0, 0, 0, breachers={1: (BreacherInfo(absolute=1000, relative=0.01),)})
+applicationMaps = [{k: rng.random() for k in dmgMap} for _ in range(args.points)]
+profile = Profile(hp=50000)
+fleet = [[makeVolley() for _ in range(args.sources)] for _ in range(args.fits)]
+
+
+def graphAccumulated():
+    for applicationMap in applicationMaps:
+        total = DmgAccumulator()
+        for key, dmg in dmgMap.items():
+            total.add(dmg, applicationMap.get(key, 0))
+        total.result().applyProfile(profile).total
+
+
+def graphChained():
+    for applicationMap in applicationMaps:
+        total = DmgTypes.default()
+        for key, dmg in dmgMap.items():
+            total += dmg * applicationMap.get(key, 0)
+        total.applyProfile(profile).total
+
+
+def fleetAccumulated():
+    fleetDps = DmgAccumulator()
+    for weapons in fleet:
+        fitDps = DmgAccumulator()
+        for dps in weapons:
+            fitDps.add(dps)
+        fleetDps.add(fitDps.result().applyProfile(profile))
+    return fleetDps.result().total
+
+
+def fleetChained():
+    fleetDps = DmgTypes.default()
+    for weapons in fleet:
+        fitDps = DmgTypes.default()
+        for dps in weapons:
+            fitDps += dps
+        fleetDps += fitDps.applyProfile(profile)
+    return fleetDps.total
+
+
+for name, func in (
+        ('Damage graph, accumulator', graphAccumulated),
+        ('Damage graph, chained +', graphChained),
+        ('Fleet DPS, accumulator', fleetAccumulated),
+        ('Fleet DPS, chained +', fleetChained)):
+    best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+    print('{}: {:.2f}ms'.format(name, best * 1000))
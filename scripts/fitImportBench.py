@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+"""
+This script benchmarks importing of EFT fits, with modification time updates
+done on every change of every imported item, and with them batched into one
+update per fit (eos.events.batched). It reports import time and how many
+times fit modification time was set.
+"""
+
+import argparse
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.realpath(os.path.join(script_dir, '..')))
+
+parser = argparse.ArgumentParser(description='This script benchmarks fit import with batched change events')
+parser.add_argument('-d', '--db', default=os.path.join(script_dir, '..', 'eve.db'), help='Path to eve.db')
+parser.add_argument('-f', '--fits', type=int, default=100, help='Amount of fits imported per run')
+parser.add_argument('-r', '--repeat', type=int, default=5, help='Amount of repeats, best one is reported')
+args = parser.parse_args()
+
+import eos.config
+
+eos.config.gamedata_connectionstring = 'sqlite:///' + os.path.realpath(args.db)
+eos.config.saveddata_connectionstring = 'sqlite:///:memory:'
+
+import eos.db
+import eos.events
+from sqlalchemy.event import listen
+
+from eos.const import ImplantLocation
+from eos.saveddata.fit import Fit
+from service.port import Port
+
+
+EFT_FIT = """[Rifter, Bench {}]
+Damage Control II
+Gyrostabilizer II
+
+5MN Microwarpdrive II
+
+200mm AutoCannon II, Republic Fleet EMP S
+200mm AutoCannon II, Republic Fleet EMP S
+200mm AutoCannon II, Republic Fleet EMP S
+"""
+
+modifiedSets = [0]
+
+
+def countModified(target, value, oldvalue, initiator):
+    modifiedSets[0] += 1
+
+
+def attachListeners():
+    # Change listeners are attached when saved fit is loaded first time
+    fit = Port.importFitFromBuffer(EFT_FIT.format('warmup'))[1][0]
+    eos.db.commit()
+    fitID = fit.ID
+    eos.db.saveddata_session.expunge_all()
+    fit = eos.db.getFit(fitID)
+    eos.db.remove(fit)
+    eos.db.commit()
+
+
+@contextmanager
+def unbatched():
+    yield
+
+
+def importFits(batched):
+    """Build and save fits the way bulk import does; returns time it took"""
+    texts = [EFT_FIT.format(i) for i in range(args.fits)]
+    start = time.perf_counter()
+    with (eos.events.batched() if batched else unbatched()):
+        fits = [Port.importAuto(text)[2][0] for text in texts]
+        for fit in fits:
+            fit.implantLocation = ImplantLocation.FIT
+        eos.db.saveMany(fits)
+    duration = time.perf_counter() - start
+    for fit in fits:
+        eos.db.remove(fit)
+    return duration
+
+
+eos.db.saveddata_meta.create_all()
+attachListeners()
+listen(Fit.modified, 'set', countModified)
+
+for batched in (False, True):
+    modifiedSets[0] = 0
+    best = min(importFits(batched) for _ in range(args.repeat))
+    print('{:>10}: {:.1f} ms per {} fits, {} modification time updates per run'.format(
+        'batched' if batched else 'unbatched', best * 1000, args.fits, modifiedSets[0] // args.repeat))
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+"""
+This script runs concurrent gamedata lookups from several threads, to check
+that worker threads can use gamedata access layer safely and to see how it
+scales. It reports lookup rate and any errors or inconsistent results.
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.realpath(os.path.join(script_dir, '..')))
+
+parser = argparse.ArgumentParser(description='This script stress-tests gamedata access from worker threads')
+parser.add_argument('-d', '--db', default=os.path.join(script_dir, '..', 'eve.db'), help='Path to eve.db')
+parser.add_argument('-t', '--threads', type=int, default=8, help='Amount of concurrent threads')
+parser.add_argument('-n', '--lookups', type=int, default=20000, help='Lookups per thread')
+parser.add_argument('-u', '--uncached', type=float, default=0.2,
+                    help='Share of lookups which bypass query cache and hit the database')
+parser.add_argument('-r', '--rounds', type=int, default=2,
+                    help='Amount of rounds, each with fresh set of threads')
+args = parser.parse_args()
+
+import eos.config
+
+eos.config.gamedata_connectionstring = 'sqlite:///' + os.path.realpath(args.db)
+eos.config.saveddata_connectionstring = 'sqlite:///:memory:'
+
+import eos.db
+from eos.gamedata import Item
+
+typeIDs = [row[0] for row in eos.db.get_gamedata_session().query(Item.ID).filter(Item.published == True).all()]
+if not typeIDs:
+    sys.stderr.write('No published types found in {}\n'.format(args.db))
+    sys.exit(1)
+
+
+def worker(seed, stats):
+    rng = random.Random(seed)
+    lookups = errors = 0
+    try:
+        for _ in range(args.lookups):
+            typeID = rng.choice(typeIDs)
+            useCache = rng.random() >= args.uncached
+            item = eos.db.getItem(typeID, useCache=useCache)
+            # Touch relationship too, so lazy loads go through the pool as well
+            group = eos.db.getGroup(item.groupID, useCache=useCache)
+            if item.ID != typeID or group.ID != item.groupID:
+                errors += 1
+            lookups += 2
+    except Exception as e:
+        sys.stderr.write('Thread {} failed: {!r}\n'.format(seed, e))
+        errors += 1
+    stats.append((lookups, errors))
+
+
+for roundNum in range(args.rounds):
+    stats = []
+    threads = [threading.Thread(target=worker, args=(roundNum * args.threads + i, stats)) for i in range(args.threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    lookups = sum(s[0] for s in stats)
+    errors = sum(s[1] for s in stats)
+    print('Round {}: {} threads, {} lookups in {:.2f}s ({:.0f}/s), {} errors'.format(
+        roundNum + 1, args.threads, lookups, elapsed, lookups / elapsed, errors))
+    print('  idle worker sessions: {}, pooled connections: {}'.format(
+        len(eos.db.idle_gamedata_sessions), eos.db.gamedata_worker_engine.pool.status()))
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+"""
+This script benchmarks icon fetching the way a scrolled list does it: every
+frame, all icons of visible rows are requested, and the list scrolls down and
+then back up. Icons are read from separate files or from an atlas, with and
+without prefetching of the rows about to be shown, and with several sizes of
+bitmap cache.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.realpath(os.path.join(script_dir, '..')))
+
+parser = argparse.ArgumentParser(description='This script benchmarks icon fetch latency')
+parser.add_argument('-l', '--location', type=str, default='icons', help='Image location to scroll through')
+parser.add_argument('-r', '--rows', type=int, default=30, help='Amount of visible rows')
+parser.add_argument('-s', '--step', type=int, default=3, help='Rows scrolled per frame')
+parser.add_argument('-n', '--names', type=int, default=1500, help='Amount of images in scrolled list')
+parser.add_argument('-c', '--cache', type=str, default='100,500,2000', help='Comma-separated bitmap cache sizes')
+args = parser.parse_args()
+
+# noinspection PyPackageRequirements
+import wx
+
+from gui.bitmap_loader import BitmapLoader, IconAtlas
+from icon_atlas import SCALE_RE, buildAtlas, getAtlasFiles
+
+
+def getNames(location, count):
+    names = set()
+    for filename in os.listdir(os.path.join(script_dir, '..', 'imgs', location)):
+        if filename.endswith('.png'):
+            names.add(SCALE_RE.sub('', filename) if SCALE_RE.search(filename) else filename[:-4])
+    return sorted(names)[:count]
+
+
+def getFrames(names, rows, step):
+    starts = list(range(0, max(len(names) - rows, 0) + 1, step))
+    for start in starts + starts[::-1]:
+        yield start, names[start:start + rows]
+
+
+def reset(cacheSize, atlas):
+    BitmapLoader.cached_bitmaps.clear()
+    BitmapLoader.max_cached_bitmaps = cacheSize
+    if BitmapLoader.prefetcher is not None:
+        # Let prefetches of previous run drain
+        while not BitmapLoader.prefetcher.queue.empty():
+            time.sleep(0.01)
+    BitmapLoader.prefetched_images.clear()
+    BitmapLoader.atlases[args.location] = atlas
+
+
+def run(names, atlas, cacheSize, prefetch):
+    reset(cacheSize, atlas)
+    fetchTimes = []
+    frameTimes = []
+    for start, visible in getFrames(names, args.rows, args.step):
+        if prefetch:
+            BitmapLoader.prefetch(names[start + args.rows:start + args.rows * 2], args.location)
+        frameStart = time.perf_counter()
+        for name in visible:
+            fetchStart = time.perf_counter()
+            BitmapLoader.getBitmap(name, args.location)
+            fetchTimes.append(time.perf_counter() - fetchStart)
+        frameTimes.append(time.perf_counter() - frameStart)
+        # Some time to paint the frame, prefetcher works meanwhile
+        time.sleep(0.005)
+    fetchTimes.sort()
+    frameTimes.sort()
+    return (
+        sum(fetchTimes) / len(fetchTimes),
+        fetchTimes[int(len(fetchTimes) * 0.99)],
+        frameTimes[int(len(frameTimes) * 0.99)])
+
+
+app = wx.App(False)
+# Loader asks top window about scale otherwise
+BitmapLoader.scaling_factor = 1
+names = getNames(args.location, args.names)
+
+with tempfile.TemporaryDirectory() as atlasDir:
+    imgsDir = os.path.realpath(os.path.join(script_dir, '..', 'imgs'))
+    buildAtlas(imgsDir, args.location, outDir=atlasDir)
+
+    def readAtlasFile(path):
+        with open(os.path.join(atlasDir, path), 'rb') as f:
+            return f.read()
+
+    with open(os.path.join(atlasDir, getAtlasFiles(args.location))) as f:
+        index = json.load(f)
+
+    print('{} images, {} rows visible, {} rows per frame'.format(len(names), args.rows, args.step))
+    print('{:>8} {:>8} {:>9} {:>10} {:>10} {:>13}'.format('source', 'cache', 'prefetch', 'mean us', 'p99 us', 'frame p99 ms'))
+    for cacheSize in (int(s) for s in args.cache.split(',')):
+        for source in ('files', 'atlas'):
+            for prefetch in (False, True):
+                # Fresh atlas every run, so that sheet decoding is measured too
+                atlas = IconAtlas(index, readAtlasFile) if source == 'atlas' else None
+                mean, p99, frameP99 = run(names, atlas, cacheSize, prefetch)
+                print('{:>8} {:>8} {:>9} {:>10.1f} {:>10.1f} {:>13.2f}'.format(
+                    source, cacheSize, 'yes' if prefetch else 'no', mean * 1000000, p99 * 1000000, frameP99 * 1000))
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+"""
+This script packs icons and renders into atlases: one image per location and
+scale, plus JSON index with position of every original file in them. pyfa
+reads icons out of atlases when they are available, which saves opening and
+decoding a PNG per icon. Needs to be re-run whenever icons change; packaging
+runs it automatically.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+from PIL import Image
+
+
+ATLAS_WIDTH = 2048
+LOCATIONS = ('icons', 'renders')
+SCALE_RE = re.compile(r'@(\d+)x\.png$')
+
+
+def getAtlasFiles(location, scale=None):
+    """Names of index and of sheet with images of given scale, relative to imgs folder"""
+    if scale is None:
+        return '{}.atlas.json'.format(location)
+    return '{}.atlas@{}x.png'.format(location, scale)
+
+
+def packShelves(sizes, width):
+    """Place (name, w, h) rectangles on shelves, tallest first; return positions and total height"""
+    positions = {}
+    x = y = shelfHeight = 0
+    for name, w, h in sorted(sizes, key=lambda s: (-s[2], s[0])):
+        if x + w > width:
+            x = 0
+            y += shelfHeight
+            shelfHeight = 0
+        positions[name] = (x, y)
+        x += w
+        shelfHeight = max(shelfHeight, h)
+    return positions, y + shelfHeight
+
+
+def buildAtlas(imgsDir, location, outDir=None):
+    outDir = outDir or imgsDir
+    srcDir = os.path.join(imgsDir, location)
+    images = {}
+    for filename in sorted(os.listdir(srcDir)):
+        if not filename.endswith('.png'):
+            continue
+        match = SCALE_RE.search(filename)
+        scale = int(match.group(1)) if match else 0
+        images.setdefault(scale, []).append(filename)
+
+    index = {'sheets': {}, 'images': {}}
+    for scale, filenames in sorted(images.items()):
+        loaded = {}
+        for filename in filenames:
+            with Image.open(os.path.join(srcDir, filename)) as img:
+                loaded[filename] = img.convert('RGBA')
+        sizes = [(name, img.width, img.height) for name, img in loaded.items()]
+        width = min(ATLAS_WIDTH, sum(s[1] for s in sizes))
+        positions, height = packShelves(sizes, width)
+        sheet = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+        for name, (x, y) in positions.items():
+            sheet.paste(loaded[name], (x, y))
+            index['images'][name] = [scale, x, y, loaded[name].width, loaded[name].height]
+        sheetFile = getAtlasFiles(location, scale)
+        sheet.save(os.path.join(outDir, sheetFile), 'png')
+        index['sheets'][str(scale)] = sheetFile
+    with open(os.path.join(outDir, getAtlasFiles(location)), 'w') as f:
+        json.dump(index, f, separators=(',', ':'))
+    return len(index['images'])
+
+
+def buildAtlases(imgsDir, outDir=None, locations=LOCATIONS):
+    for location in locations:
+        count = buildAtlas(imgsDir, location, outDir=outDir)
+        print('Packed {} images of {}'.format(count, location))
+
+
+if __name__ == '__main__':
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description='This script packs pyfa icons into atlases')
+    parser.add_argument('-i', '--imgs', default=os.path.join(script_dir, '..', 'imgs'), type=str, help='path to imgs folder')
+    parser.add_argument('-o', '--output', default=None, type=str, help='where to put atlases, imgs folder by default')
+    args = parser.parse_args()
+    buildAtlases(os.path.abspath(args.imgs), outDir=args.output)
+    sys.exit(0)
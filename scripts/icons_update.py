@@ -13,6 +13,8 @@ from shutil import copyfile
 
 from PIL import Image
 
+from icon_atlas import buildAtlases
+
 
 def get_full_alias(short_alias):
     full_aliases = {
@@ -261,3 +263,7 @@ if toadd:
         print(('  {} renders are missing in export:'.format(len(missing))))
         for fname in sorted(missing):
             print(('    {}'.format(fname)))
+
+# Atlases left from previous icons would shadow updated files
+imgs_dir = os.path.abspath(os.path.join(script_dir, '..', 'imgs'))
+buildAtlases(imgs_dir)
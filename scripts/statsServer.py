@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+
+"""
+This script runs headless HTTP service which calculates stats of fits, see
+service/statsServer.py for the API. It does not need display or GUI session.
+
+Example:
+    curl -H 'Content-Type: text/plain' --data-binary @fit.txt localhost:8090/stats
+"""
+
+import argparse
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.realpath(os.path.join(script_dir, '..')))
+
+from service.statsServer import StatsServer
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='This script runs headless fit stats service')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on')
+    parser.add_argument('-p', '--port', type=int, default=8090, help='Port to listen on')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='Amount of worker processes, CPU count by default')
+    parser.add_argument('-s', '--savepath', default=None, help='Folder with saveddata database')
+    parser.add_argument('-d', '--db', default=None, help='Path to eve.db')
+    parser.add_argument('-t', '--timeout', type=float, default=60, help='Max time to calculate single fit, in seconds')
+    args = parser.parse_args()
+
+    server = StatsServer(
+        (args.host, args.port), workers=args.workers, savePath=args.savepath,
+        gameDB=os.path.realpath(args.db) if args.db else None, timeout=args.timeout)
+    print('Serving fit stats on http://{}:{} with {} workers'.format(args.host, args.port, server.workers))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -21,15 +21,15 @@
 import math
 from collections import OrderedDict
 
-import wx
 
 from eos.const import FittingHardpoint
 from eos.saveddata.module import Module
 from eos.utils.stats import DmgTypes
 from service.market import Market
+from service.dispatcher import translate
 
 
-_t = wx.GetTranslation
+_t = translate
 
 
 class Ammo:
@@ -28,12 +28,11 @@ from xml.etree import ElementTree
 from xml.dom import minidom
 import gzip
 
-# noinspection PyPackageRequirements
-import wx
 
 import config
 import eos.db
 from service.esi import Esi
+from service.dispatcher import callAfter, translate
 
 from eos.saveddata.implant import Implant as es_Implant
 from eos.saveddata.character import Character as es_Character, Skill
@@ -42,7 +41,7 @@ from eos.const import FittingSlot as es_Slot
 from eos.saveddata.fighter import Fighter as es_Fighter
 
 pyfalog = Logger(__name__)
-_t = wx.GetTranslation
+_t = translate
 
 class CharacterImportThread(threading.Thread):
 
@@ -97,7 +96,7 @@ class CharacterImportThread(threading.Thread):
                 pyfalog.error(e)
                 continue
 
-        wx.CallAfter(self.callback)
+        callAfter(self.callback)
 
     def stop(self):
         self.running = False
@@ -132,7 +131,7 @@ class SkillBackupThread(threading.Thread):
                 with open(path, mode='w', encoding='utf-8') as backupFile:
                     backupFile.write(backupData)
 
-        wx.CallAfter(self.callback)
+        callAfter(self.callback)
 
     def stop(self):
         self.running = False
@@ -386,7 +385,7 @@ class Character:
 
     def apiFetchCallback(self, guiCallback, e=None):
         eos.db.commit()
-        wx.CallAfter(guiCallback, e)
+        callAfter(guiCallback, e)
 
     @staticmethod
     def apiUpdateCharSheet(charID, skills, securitystatus):
@@ -412,11 +411,10 @@ class Character:
 
     @classmethod
     def _trainSkillReqs(cls, char, skill, persist):
-        for childSkillItem, neededSkillLevel in skill.item.requiredSkills.items():
-            childSkill = char.getSkill(childSkillItem.ID)
+        for childSkillID, neededSkillLevel in skill.item.requiredSkillsClosure:
+            childSkill = char.getSkill(childSkillID)
             if childSkill.level < neededSkillLevel:
                 childSkill.setLevel(neededSkillLevel, persist)
-                cls._trainSkillReqs(char, childSkill, persist)
 
     @staticmethod
     def revertLevel(charID, skillID):
@@ -453,37 +451,83 @@ class Character:
         char = eos.db.getCharacter(charID)
         return char.implants
 
-    def checkRequirements(self, fit):
-        # toCheck = []
-        reqs = {}
+    @staticmethod
+    def _getRequirementItems(fit):
+        """Items and charges of fit which need skills to be used"""
         for thing in itertools.chain(fit.modules, fit.drones, fit.fighters, (fit.ship,), fit.appliedImplants, fit.boosters):
             if isinstance(thing, es_Module) and thing.slot == es_Slot.RIG:
                 continue
-            for attr in ("item", "charge"):
-                if attr == "charge" and isinstance(thing, es_Fighter):
-                    # Fighter Bombers are automatically charged with micro bombs.
-                    # These have skill requirements attached, but aren't used in EVE.
+            item = getattr(thing, "item", None)
+            if item is not None:
+                yield item
+            # Fighter Bombers are automatically charged with micro bombs.
+            # These have skill requirements attached, but aren't used in EVE.
+            if not isinstance(thing, es_Fighter):
+                charge = getattr(thing, "charge", None)
+                if charge is not None:
+                    yield charge
+
+    @staticmethod
+    def _getLevelGetter(char):
+        if char is None:
+            return lambda skillID: 0
+        levels = char.getSkillLevels()
+        defaultLevel = char.defaultLevel or 0
+        return lambda skillID: levels.get(skillID, defaultLevel)
+
+    def getRequiredSkills(self, fits):
+        """Map of skill ID to level needed to use everything on passed fits"""
+        required = {}
+        seen = set()
+        for fit in fits:
+            for item in self._getRequirementItems(fit):
+                if item.ID in seen:
                     continue
-                subThing = getattr(thing, attr, None)
-                subReqs = {}
-                if subThing is not None:
-                    if isinstance(thing, es_Fighter) and attr == "charge":
-                        continue
-                    self._checkRequirements(fit.character, subThing, subReqs)
-                    if subReqs:
-                        reqs[subThing] = subReqs
+                seen.add(item.ID)
+                for skillID, level in item.requiredSkillsClosure:
+                    if level > required.get(skillID, 0):
+                        required[skillID] = level
+        return required
+
+    def getMissingSkills(self, fits, char=None):
+        """
+        Map of skill ID to level which is needed for passed fits, but which
+        character doesn't have; uses character of every fit if it's not passed.
+        """
+        missing = {}
+        byChar = {}
+        for fit in fits:
+            fitChar = char if char is not None else fit.character
+            byChar.setdefault(id(fitChar), (fitChar, []))[1].append(fit)
+        for fitChar, charFits in byChar.values():
+            getLevel = self._getLevelGetter(fitChar)
+            for skillID, level in self.getRequiredSkills(charFits).items():
+                if getLevel(skillID) < level and level > missing.get(skillID, 0):
+                    missing[skillID] = level
+        return missing
+
+    def checkRequirements(self, fit):
+        reqs = {}
+        getLevel = self._getLevelGetter(fit.character)
+        for subThing in self._getRequirementItems(fit):
+            if subThing in reqs:
+                continue
+            # Most items are usable, detailed tree is built only for the rest
+            if all(getLevel(skillID) >= level for skillID, level in subThing.requiredSkillsClosure):
+                continue
+            subReqs = {}
+            self._checkRequirements(getLevel, subThing, subReqs)
+            if subReqs:
+                reqs[subThing] = subReqs
 
         return reqs
 
-    def _checkRequirements(self, char, subThing, reqs):
+    def _checkRequirements(self, getLevel, subThing, reqs):
         for req, level in subThing.requiredSkills.items():
-            name = req.name
-            ID = req.ID
-            info = reqs.get(name)
-            currLevel, subs = info if info is not None else 0, {}
-            if level > currLevel and (char is None or char.getSkill(req).level < level):
-                reqs[name] = (level, ID, subs)
-                self._checkRequirements(char, req, subs)
+            if getLevel(req.ID) < level:
+                subs = {}
+                reqs[req.name] = (level, req.ID, subs)
+                self._checkRequirements(getLevel, req, subs)
         return reqs
 
 
@@ -0,0 +1,100 @@
+# =============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of pyfa.
+#
+# pyfa is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pyfa is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with pyfa.  If not, see <http://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""
+Toolkit-independent undoable commands. Interface mirrors wx.Command and
+wx.CommandProcessor, so that calc commands can be used both in GUI and
+without it.
+"""
+
+
+class Command:
+
+    def __init__(self, canUndo=False, name=''):
+        self.__canUndo = canUndo
+        self.__name = name
+
+    def CanUndo(self):
+        return self.__canUndo
+
+    def GetName(self):
+        return self.__name
+
+    def Do(self):
+        raise NotImplementedError
+
+    def Undo(self):
+        raise NotImplementedError
+
+
+class CommandProcessor:
+
+    def __init__(self, maxCommands=-1):
+        self.__maxCommands = maxCommands
+        self.__commands = []
+        # Amount of commands which are done, the rest can be redone
+        self.__done = 0
+
+    @property
+    def Commands(self):
+        return list(self.__commands)
+
+    def GetCommands(self):
+        return self.Commands
+
+    def GetCurrentCommand(self):
+        return self.__commands[self.__done - 1] if self.__done > 0 else None
+
+    def Submit(self, command, storeIt=True):
+        if not command.Do():
+            return False
+        del self.__commands[self.__done:]
+        if storeIt:
+            self.__commands.append(command)
+            if 0 <= self.__maxCommands < len(self.__commands):
+                del self.__commands[0]
+            self.__done = len(self.__commands)
+        return True
+
+    def CanUndo(self):
+        command = self.GetCurrentCommand()
+        return command is not None and command.CanUndo()
+
+    def CanRedo(self):
+        return self.__done < len(self.__commands)
+
+    def Undo(self):
+        if not self.CanUndo():
+            return False
+        if not self.__commands[self.__done - 1].Undo():
+            return False
+        self.__done -= 1
+        return True
+
+    def Redo(self):
+        if not self.CanRedo():
+            return False
+        if not self.__commands[self.__done].Do():
+            return False
+        self.__done += 1
+        return True
+
+    def ClearCommands(self):
+        self.__commands.clear()
+        self.__done = 0
@@ -0,0 +1,117 @@
+# =============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of pyfa.
+#
+# pyfa is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pyfa is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with pyfa.  If not, see <http://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""
+Everything services need from the GUI toolkit, behind a small interface.
+
+Services call callAfter() to deliver results from their worker threads,
+translate() to localize strings and createCommandProcessor() to get undo
+stack for fit. GUI installs WxDispatcher from gui.dispatcher on startup;
+without it, services use ThreadDispatcher, so that they can be imported and
+used without wx, e.g. in scripts, servers and worker processes.
+"""
+
+import functools
+import queue
+import threading
+
+from logbook import Logger
+
+
+pyfalog = Logger(__name__)
+
+
+class Dispatcher:
+
+    def callAfter(self, func, *args, **kwargs):
+        """Call function later, on consumer side, in order of requests"""
+        raise NotImplementedError
+
+    def translate(self, text):
+        return text
+
+    def createCommandProcessor(self, maxCommands=-1):
+        from service.command import CommandProcessor
+        return CommandProcessor(maxCommands=maxCommands)
+
+
+class ThreadDispatcher(Dispatcher):
+    """Calls functions one by one on a separate thread"""
+
+    def __init__(self):
+        self.__queue = queue.Queue()
+        self.__thread = None
+        self.__lock = threading.Lock()
+
+    def callAfter(self, func, *args, **kwargs):
+        self.__queue.put((func, args, kwargs))
+        if self.__thread is None:
+            with self.__lock:
+                if self.__thread is None:
+                    self.__thread = threading.Thread(target=self.__run, name='ThreadDispatcher', daemon=True)
+                    self.__thread.start()
+
+    def __run(self):
+        while True:
+            func, args, kwargs = self.__queue.get()
+            try:
+                func(*args, **kwargs)
+            except (KeyboardInterrupt, SystemExit):
+                raise
+            except Exception as e:
+                pyfalog.error('Dispatched call to {} failed: {}', func, e)
+            finally:
+                self.__queue.task_done()
+
+    def join(self):
+        """Wait until all functions passed so far are called"""
+        self.__queue.join()
+
+
+class AsyncioDispatcher(Dispatcher):
+    """Calls functions on passed asyncio event loop"""
+
+    def __init__(self, loop):
+        self.loop = loop
+
+    def callAfter(self, func, *args, **kwargs):
+        self.loop.call_soon_threadsafe(functools.partial(func, *args, **kwargs))
+
+
+_dispatcher = None
+
+
+def getDispatcher():
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = ThreadDispatcher()
+    return _dispatcher
+
+
+def setDispatcher(dispatcher):
+    global _dispatcher
+    _dispatcher = dispatcher
+
+
+def callAfter(func, *args, **kwargs):
+    getDispatcher().callAfter(func, *args, **kwargs)
+
+
+def translate(text):
+    return getDispatcher().translate(text)
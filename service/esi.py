@@ -1,5 +1,3 @@
-# noinspection PyPackageRequirements
-import wx
 from logbook import Logger
 import threading
 import time
@@ -12,17 +10,15 @@ import eos.db
 from service.const import EsiLoginMethod, EsiSsoMode
 from eos.saveddata.ssocharacter import SsoCharacter
 from service.esiAccess import APIException, GenericSsoError
-import gui.globalEvents as GE
-from gui.ssoLogin import SsoLogin
+from service.dispatcher import translate
 from service.server import StoppableHTTPServer, AuthHandler
 from service.settings import EsiSettings
 from service.esiAccess import EsiAccess
-import gui.mainFrame
 
 from requests import Session
 
 pyfalog = Logger(__name__)
-_t = wx.GetTranslation
+_t = translate
 
 
 class Esi(EsiAccess):
@@ -56,6 +52,9 @@ class Esi(EsiAccess):
         self.mainFrame = gui.mainFrame.MainFrame.getInstance()
 
     def delSsoCharacter(self, id):
+        # noinspection PyPackageRequirements
+        import wx
+        import gui.globalEvents as GE
         char = eos.db.getSsoCharacter(id, config.getClientSecret())
 
         # There is an issue in which the SSO character is not removed from any linked characters - a reference to the
@@ -102,6 +101,9 @@ class Esi(EsiAccess):
         self.fittings_deleted.add(fittingID)
 
     def login(self):
+        # noinspection PyPackageRequirements
+        import wx
+        import gui.ssoLogin  # put this here to avoid loop, main frame imports this service
         start_server = self.settings.get('loginMode') == EsiLoginMethod.SERVER and self.server_base.supports_auto_login
         with gui.ssoLogin.SsoLogin(self.server_base, start_server) as dlg:
             if dlg.ShowModal() == wx.ID_OK:
@@ -157,6 +159,9 @@ class Esi(EsiAccess):
         return 'http://localhost:{}'.format(port)
 
     def handleLogin(self, code):
+        # noinspection PyPackageRequirements
+        import wx
+        import gui.globalEvents as GE
         auth_response, data = self.auth(code)
 
         currentCharacter = self.getSsoCharacter(data['name'], self.server_base.name)
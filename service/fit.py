@@ -22,7 +22,6 @@ import datetime
 from time import time
 from weakref import WeakSet
 
-import wx
 from logbook import Logger
 
 import eos.db
@@ -34,6 +33,7 @@ from eos.saveddata.fit import Fit as FitType
 from eos.saveddata.ship import Ship as es_Ship
 from service.character import Character
 from service.damagePattern import DamagePattern
+from service.dispatcher import getDispatcher
 from service.settings import SettingsProvider
 
 
@@ -94,6 +94,7 @@ class Fit:
             "ammoChangeAll": False,
             "additionsLabels": 1,
             "expandedMutantNames": False,
+            "cacheFitStats": False,
         }
 
         self.serviceFittingOptions = SettingsProvider.getInstance().getSettings(
@@ -221,6 +222,7 @@ class Fit:
             if booster.boosted_fit and booster.boosted_fit != fit and booster.boosted_fit in eos.db.saveddata_session:  # GH issue #359
                 refreshFits.add(booster.boosted_fit)
 
+        eos.db.removeFitStats((fitID,))
         eos.db.remove(fit)
 
         if fitID in Fit.processors:
@@ -235,7 +237,7 @@ class Fit:
     @classmethod
     def getCommandProcessor(cls, fitID):
         if fitID not in cls.processors:
-            cls.processors[fitID] = wx.CommandProcessor(maxCommands=100)
+            cls.processors[fitID] = getDispatcher().createCommandProcessor(maxCommands=100)
         return cls.processors[fitID]
 
     @staticmethod
@@ -0,0 +1,144 @@
+# =============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of pyfa.
+#
+# pyfa is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pyfa is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with pyfa.  If not, see <http://www.gnu.org/licenses/>.
+# =============================================================================
+
+
+from logbook import Logger
+
+import eos.config
+from eos import db
+from eos.saveddata.character import Character
+from eos.saveddata.fitStats import FitStats as es_FitStats
+from service.dispatcher import callAfter
+from service.fit import Fit
+
+
+pyfalog = Logger(__name__)
+
+
+class FitStats:
+    """
+    Service which keeps summary stats of fits stored in saveddata database, so
+    that places which show stats of many fits do not have to load and calculate
+    each of them. Stored stats are invalidated by fit modification timestamp,
+    character skill state and gamedata version.
+    """
+    instance = None
+
+    # How many fits to calculate per idle-time step of background fill
+    BACKGROUND_CHUNK = 5
+
+    @classmethod
+    def getInstance(cls):
+        if cls.instance is None:
+            cls.instance = FitStats()
+
+        return cls.instance
+
+    def __init__(self):
+        self.__pending = []
+        self.__callbacks = []
+
+    @property
+    def enabled(self):
+        return Fit.getInstance().serviceFittingOptions["cacheFitStats"]
+
+    @staticmethod
+    def getGamedataVersion():
+        return str(eos.config.gamedata_version)
+
+    @staticmethod
+    def getCharacterHash(characterID):
+        character = db.getCharacter(characterID) if characterID is not None else None
+        if character is None:
+            character = Character.getAll0()
+        return character.getSkillStateHash()
+
+    def getStats(self, fitIDs, calculate=True):
+        """
+        Return {fitID: stats} map for passed fits. Valid stats are fetched with
+        a single query; when calculate is True, stats for the rest of the fits
+        are calculated and stored right away.
+        """
+        fitIDs = list(fitIDs)
+        stats = {}
+        charHashes = {}
+        for fitStats, characterID in db.getFitStats(fitIDs, self.getGamedataVersion()):
+            if characterID not in charHashes:
+                charHashes[characterID] = self.getCharacterHash(characterID)
+            if fitStats.skillHash == charHashes[characterID]:
+                stats[fitStats.fitID] = fitStats
+        if calculate:
+            stats.update(self.calculate([fitID for fitID in fitIDs if fitID not in stats]))
+        return stats
+
+    def calculate(self, fitIDs):
+        """Calculate fits and store their stats, replacing stale ones"""
+        fitIDs = list(fitIDs)
+        if not fitIDs:
+            return {}
+        sFit = Fit.getInstance()
+        gamedataVersion = self.getGamedataVersion()
+        stats = {}
+        for fitID in fitIDs:
+            fit = sFit.getFit(fitID)
+            if fit is None:
+                continue
+            fitStats = es_FitStats(fitID)
+            fitStats.update(fit, fit.character.getSkillStateHash(), gamedataVersion)
+            stats[fitID] = fitStats
+        pyfalog.debug("Storing stats for {} fits", len(stats))
+        db.removeFitStats(stats.keys())
+        db.saveMany(list(stats.values()))
+        return stats
+
+    def calculateInBackground(self, fitIDs, callback=None):
+        """
+        Calculate and store stats for passed fits in small steps while GUI is
+        idle. Calculation touches the same fit objects GUI works with, thus it
+        is done on the main thread rather than in a worker thread.
+        """
+        wasIdle = not self.__pending
+        known = set(self.__pending)
+        self.__pending.extend(fitID for fitID in fitIDs if fitID not in known)
+        if callback is not None:
+            self.__callbacks.append(callback)
+        if wasIdle and self.__pending:
+            callAfter(self.__processPending)
+
+    def __processPending(self):
+        chunk = self.__pending[:self.BACKGROUND_CHUNK]
+        try:
+            self.calculate(chunk)
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except Exception as e:
+            pyfalog.error("Failed to calculate stats for fits {}: {}", chunk, e)
+        del self.__pending[:len(chunk)]
+        if self.__pending:
+            callAfter(self.__processPending)
+            return
+        callbacks = self.__callbacks
+        self.__callbacks = []
+        for callback in callbacks:
+            callback()
+
+    @staticmethod
+    def clear(fitIDs=None):
+        """Drop stored stats, e.g. when fits are removed"""
+        return db.removeFitStats(fitIDs)
@@ -21,10 +21,9 @@ import queue
 import re
 import threading
 from collections import OrderedDict
+from contextlib import contextmanager
 from itertools import chain
 
-# noinspection PyPackageRequirements
-import wx
 from logbook import Logger
 from sqlalchemy.sql import or_
 
@@ -33,12 +32,13 @@ import eos.db
 from eos.gamedata import Category as types_Category, Group as types_Group, Item as types_Item, MarketGroup as types_MarketGroup, \
     MetaGroup as types_MetaGroup
 from service import conversions
+from service.dispatcher import callAfter, translate
 from service.jargon import JargonLoader
 from service.settings import SettingsProvider
 from utils.cjk import isStringCjk
 
 pyfalog = Logger(__name__)
-_t = wx.GetTranslation
+_t = translate
 
 # Event which tells threads dependent on Market that it's initialized
 mktRdy = threading.Event()
@@ -77,7 +77,7 @@ class ShipBrowserWorkerThread(threading.Thread):
                     set_ = sMkt.getShipList(id_)
                     cache[id_] = set_
 
-                wx.CallAfter(callback, (id_, set_))
+                callAfter(callback, (id_, set_))
             except (KeyboardInterrupt, SystemExit):
                 raise
             except Exception as e:
@@ -170,7 +170,7 @@ class SearchWorkerThread(threading.Thread):
             for item in all_results:
                 if sMkt.getPublicityByItem(item):
                     item_IDs.add(item.ID)
-            wx.CallAfter(callback, sorted(item_IDs))
+            callAfter(callback, sorted(item_IDs))
 
     def scheduleSearch(self, text, callback, filterName=None):
         self.cv.acquire()
@@ -243,6 +243,8 @@ class SearchWorkerThread(threading.Thread):
 
 class Market:
     instance = None
+    # Items resolved in advance by current thread, see prefetchedItems()
+    prefetched = threading.local()
 
     def __init__(self):
 
@@ -465,6 +467,8 @@ class Market:
         self.SHOWN_MARKET_GROUPS = eos.db.getMarketTreeNodeIds(self.ROOT_MARKET_GROUPS)
         self.FIT_CATEGORIES = ['Ship']
         self.FIT_GROUPS = ['Citadel', 'Engineering Complex', 'Refinery']
+        # Preload items which are likely to be needed soon
+        self.warmUpCache()
         # Tell other threads that Market is at their service
         mktRdy.set()
 
@@ -500,16 +504,22 @@ class Market:
             if isinstance(identity, types_Item):
                 item = identity
             elif isinstance(identity, int):
-                item = eos.db.getItem(identity, *args, **kwargs)
+                item = Market.getPrefetchedItem(identity)
+                if item is None:
+                    item = eos.db.getItem(identity, *args, **kwargs)
             elif isinstance(identity, str):
-                # We normally lookup with string when we are using import/export
-                # features. Check against overrides
-                identity = conversions.all.get(identity, identity)
-                item = eos.db.getItem(identity, *args, **kwargs)
+                item = Market.getPrefetchedItem(identity)
+                if item is None:
+                    # We normally lookup with string when we are using import/export
+                    # features. Check against overrides
+                    identity = conversions.all.get(identity, identity)
+                    item = eos.db.getItem(identity, *args, **kwargs)
 
             elif isinstance(identity, float):
                 id_ = int(identity)
-                item = eos.db.getItem(id_, *args, **kwargs)
+                item = Market.getPrefetchedItem(id_)
+                if item is None:
+                    item = eos.db.getItem(id_, *args, **kwargs)
             else:
                 raise TypeError("Need Item object, integer, float or string as argument")
         except (KeyboardInterrupt, SystemExit):
@@ -525,6 +535,57 @@ class Market:
         items = eos.db.getItems(itemIDs, eager=eager)
         return items
 
+    @staticmethod
+    def getItemsByName(names, eager=None):
+        """Get {name: item} map for many names at once, honoring item conversions"""
+        converted = {name: conversions.all.get(name, name) for name in names}
+        items = eos.db.getItemsByName(set(converted.values()), eager=eager)
+        return {name: items[conv] for name, conv in converted.items() if conv in items}
+
+    def warmUpCache(self, limit=1000):
+        """Load recently used modules and items used by saved fits into gamedata cache"""
+        if not eos.db.isCacheEnabled():
+            return 0
+        typeIDs = list(self.serviceMarketRecentlyUsedModules["pyfaMarketRecentlyUsedModules"])
+        typeIDs.extend(eos.db.getHotTypeIDs(limit))
+        count = eos.db.warmUpCache(typeIDs)
+        pyfalog.debug("Warmed up gamedata cache with {} items", count)
+        return count
+
+    @staticmethod
+    def prefetchItems(names=(), itemIDs=(), eager=None):
+        """
+        Load items referenced by names and IDs using batched queries; returns
+        {name: item} and {ID: item} maps.
+        """
+        nameMap = Market.getItemsByName(names, eager=eager) if names else {}
+        idMap = eos.db.getItemsByID(itemIDs, eager=eager) if itemIDs else {}
+        return nameMap, idMap
+
+    @staticmethod
+    @contextmanager
+    def prefetchedItems(names=(), itemIDs=(), eager=None):
+        """
+        Load items referenced by names and IDs using batched queries. Within the
+        block, getItem() calls made by current thread for them return loaded
+        items without going to the database, whether query cache is on or not.
+        """
+        maps = Market.prefetchItems(names=names, itemIDs=itemIDs, eager=eager)
+        previous = getattr(Market.prefetched, "maps", None)
+        Market.prefetched.maps = maps
+        try:
+            yield maps
+        finally:
+            Market.prefetched.maps = previous
+
+    @staticmethod
+    def getPrefetchedItem(identity):
+        maps = getattr(Market.prefetched, "maps", None)
+        if maps is None:
+            return None
+        nameMap, idMap = maps
+        return (nameMap if isinstance(identity, str) else idMap).get(identity)
+
     def getGroup(self, identity, *args, **kwargs):
         """Get group by its ID or name"""
         if isinstance(identity, types_Group):
@@ -0,0 +1,178 @@
+# =============================================================================
+# Copyright (C) 2014 Ryan Holmes
+#
+# This file is part of pyfa.
+#
+# pyfa is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pyfa is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with pyfa.  If not, see <http://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""
+Helpers for importing many fit files at once.
+
+Reading, decoding and scanning files for referenced item names / IDs does not
+need database or GUI access, so it is done here and can be farmed out to
+worker processes. Note that workers still import the whole service.port package
+(and eos with it) to get to this module, which makes their startup expensive;
+see PARALLEL_MIN_FILES.
+"""
+
+
+import html
+import os
+import re
+from codecs import open
+from concurrent.futures import ProcessPoolExecutor
+
+from bs4 import UnicodeDammit
+from logbook import Logger
+
+
+pyfalog = Logger(__name__)
+
+# 2017/04/05 NOTE: simple validation, for xml file
+RE_XML_START = r'<\?xml\s+version="1.0"[^<>]*\?>'
+# Process pool is used only when there are at least this many files, otherwise
+# it takes more time to start workers than to scan files
+PARALLEL_MIN_FILES = 8
+
+_XML_NAME_PATTERN = re.compile(r'\s(?:type|base_type|mutaplasmid)="([^"]*)"')
+_XML_SHIP_PATTERN = re.compile(r'<shipType\s+value="([^"]*)"')
+_XML_LOCALIZED_PATTERN = re.compile(r'<localized hint="([^"]+)">([^\*]+)\*</localized>')
+_JSON_ID_PATTERN = re.compile(r'"(?:ship_)?type_id"\s*:\s*(\d+)')
+_EFT_MUTANT_HEADER_PATTERN = re.compile(r'^\[\d+\](.*)$')
+_EFT_HEADER_PATTERN = re.compile(r'^\[(.*)\]$')
+_EFT_CFG_KEY_PATTERN = re.compile(r'^\w+=')
+_EFT_AMOUNT_PATTERN = re.compile(r'\s+x\d+$')
+_EFT_SUFFIX_PATTERN = re.compile(r'(\s*/(OFFLINE|offline))?(\s*\[\d+\])?$')
+
+
+class ScannedFile:
+
+    def __init__(self, path, text):
+        self.path = path
+        self.text = text
+        self.typeNames = set()
+        self.typeIDs = set()
+
+    def __repr__(self):
+        return 'ScannedFile(path={}, names={}, IDs={})'.format(self.path, len(self.typeNames), len(self.typeIDs))
+
+
+def readFile(path):
+    with open(path, "rb") as file_:
+        srcString = file_.read()
+    return UnicodeDammit(srcString).unicode_markup
+
+
+def _firstLine(text):
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            return line
+    return ''
+
+
+def _scanXml(text, names):
+    for value in _XML_SHIP_PATTERN.findall(text) + _XML_NAME_PATTERN.findall(text):
+        value = html.unescape(value)
+        if not value:
+            continue
+        m = _XML_LOCALIZED_PATTERN.match(value)
+        if m:
+            names.update((m.group(1), m.group(2)))
+        else:
+            names.add(value)
+
+
+def _scanEft(text, names, path):
+    # EFT config files carry ship name only in file name
+    if path is not None:
+        names.add(os.path.split(path)[1].rsplit('.')[0])
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        m = _EFT_MUTANT_HEADER_PATTERN.match(line)
+        if m:
+            names.add(m.group(1).strip())
+            continue
+        m = _EFT_HEADER_PATTERN.match(line)
+        if m:
+            names.add(m.group(1).split(',')[0].strip())
+            continue
+        line = _EFT_CFG_KEY_PATTERN.sub('', line)
+        line = _EFT_AMOUNT_PATTERN.sub('', line)
+        line = _EFT_SUFFIX_PATTERN.sub('', line)
+        for part in line.split(','):
+            part = part.strip()
+            if part and not part.isdigit():
+                names.add(part)
+
+
+def scanText(text, path=None):
+    """
+    Collect names and IDs of items referenced by fit text in any supported
+    format. Result is a superset of what importers will ask for; names which
+    do not correspond to any item are harmless.
+    """
+    scanned = ScannedFile(path, text)
+    firstLine = _firstLine(text)
+    if not firstLine:
+        return scanned
+    if re.search(RE_XML_START, firstLine):
+        _scanXml(text, scanned.typeNames)
+    elif firstLine[0] == '{':
+        scanned.typeIDs.update(int(i) for i in _JSON_ID_PATTERN.findall(text))
+    elif re.match(r"\d+(:\d+(;\d+))*::", firstLine) or 'fitting:' in firstLine or 'DNA:' in firstLine:
+        scanned.typeIDs.update(int(i) for i in re.findall(r'\d+', firstLine))
+    else:
+        _scanEft(text, scanned.typeNames, path)
+    return scanned
+
+
+def scanFile(path):
+    return scanText(readFile(path), path)
+
+
+def scanFiles(paths, progress=None, processes=None):
+    """
+    Read and scan fit files, in parallel worker processes when there are many of
+    them. Yields ScannedFile objects in order of passed paths. Only reading,
+    decoding and the item name / ID pre-scan are done in workers; fits are
+    parsed by caller.
+    """
+    paths = list(paths)
+    done = 0
+    if len(paths) >= PARALLEL_MIN_FILES and processes != 1:
+        try:
+            executor = ProcessPoolExecutor(max_workers=processes)
+            try:
+                for scanned in executor.map(scanFile, paths, chunksize=max(1, len(paths) // 64)):
+                    done += 1
+                    if progress:
+                        progress.message = "Processing file:\n%s" % scanned.path
+                    yield scanned
+            finally:
+                # Do not wait for files nobody is interested in anymore (e.g. import was cancelled)
+                executor.shutdown(wait=False, cancel_futures=True)
+            return
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except (OSError, RuntimeError) as e:
+            # Can't use processes (e.g. when running in restricted environment), do it in-process
+            pyfalog.warning("Unable to scan fit files in worker processes, falling back to serial scan: {}", e)
+    for path in paths[done:]:
+        if progress:
+            progress.message = "Processing file:\n%s" % path
+        yield scanFile(path)
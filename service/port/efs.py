@@ -16,10 +16,8 @@ from eos.effectHandlerHelpers import HandledList
 from eos.db import gamedata_session, getCategory, getAttributeInfo, getGroup
 from eos.gamedata import Attribute, Effect, Group, Item, ItemEffect
 from eos.utils.spoolSupport import SpoolType, SpoolOptions
-from gui.fitCommands.calc.module.localAdd import CalcAddLocalModuleCommand
-from gui.fitCommands.calc.module.localRemove import CalcRemoveLocalModulesCommand
+from eos.utils.whatIf import AddModule, evaluateOnce
 from gui.fitCommands.calc.module.changeCharges import CalcChangeModuleChargesCommand
-from gui.fitCommands.helpers import ModuleInfo
 
 
 pyfalog = Logger(__name__)
@@ -68,19 +66,11 @@ class EfsPort:
 
         if propID is None:
             return None
-        cmd = CalcAddLocalModuleCommand(fitID, ModuleInfo(itemID=propID))
-        cmd.Do()
-        if cmd.needsGuiRecalc:
-            sFit.recalc(fit)
-        fit = eos.db.getFit(fitID)
-        mwdPropSpeed = fit.maxSpeed
-        mwdPosition = list(filter(lambda mod: mod.item and mod.item.ID == propID, fit.modules))[0].position
-        cmd = CalcRemoveLocalModulesCommand(fitID, [mwdPosition])
-        cmd.Do()
-        if cmd.needsGuiRecalc:
-            sFit.recalc(fit)
-        fit = eos.db.getFit(fitID)
-        return mwdPropSpeed
+        # Evaluated on calc copy of the fit, the fit itself is left as it is
+        values = evaluateOnce(fit, (AddModule(eos.db.getItem(propID)),), stats=('maxSpeed',))
+        if values is None:
+            return None
+        return values['maxSpeed']
 
     @staticmethod
     def getPropData(fit, sFit):
@@ -25,12 +25,14 @@ import xml.dom
 import xml.parsers.expat
 from codecs import open
 
-from bs4 import UnicodeDammit
 from logbook import Logger
 
 from eos import db
 from eos.const import ImplantLocation
+from eos.events import batched
 from service.fit import Fit as svcFit
+from service.market import Market
+from service.port.bulk import RE_XML_START, scanFiles
 from service.port.dna import exportDna, importDna, importDnaAlt
 from service.port.eft import (
     exportEft, importEft, importEftCfg,
@@ -45,9 +47,6 @@ from service.port.muta import parseMutant, parseDynamicItemString, fetchDynamicI
 
 pyfalog = Logger(__name__)
 
-# 2017/04/05 NOTE: simple validation, for xml file
-RE_XML_START = r'<\?xml\s+version="1.0"[^<>]*\?>'
-
 
 class Port:
     """Service which houses all import/export format functions"""
@@ -118,48 +117,67 @@ class Port:
         Imports fits from file(s). First processes all provided paths and stores
         assembled fits into a list. This allows us to call back to the GUI as
         fits are processed as well as when fits are being saved.
+
+        Files are read and scanned for referenced items in worker processes,
+        then all referenced items are resolved with batched queries before fits
+        are built, and fits are saved in chunked transactions. Parsing itself
+        (importAuto) still runs serially in this thread: importers build eos
+        objects bound to database sessions of this process, which can't be
+        passed between processes.
         returns
         """
+        # Every attribute set on fits being built would update their
+        # modification time otherwise
+        with batched():
+            return Port.__importFitFromFiles(paths, progress)
 
+    @staticmethod
+    def __importFitFromFiles(paths, progress):
         sFit = svcFit.getInstance()
+        sMkt = Market.getInstance()
 
         fit_list = []
         try:
-            for path in paths:
-                if progress:
-                    if progress and progress.userCancelled:
-                        progress.workerWorking = False
-                        return False, "Cancelled by user"
-                    msg = "Processing file:\n%s" % path
-                    progress.message = msg
-                    pyfalog.debug(msg)
-
-                with open(path, "rb") as file_:
-                    srcString = file_.read()
-                    dammit = UnicodeDammit(srcString)
-                    srcString = dammit.unicode_markup
-
-                if len(srcString) == 0:  # ignore blank files
+            scannedFiles = []
+            for scanned in scanFiles(paths, progress=progress):
+                if progress and progress.userCancelled:
+                    progress.workerWorking = False
+                    return False, "Cancelled by user"
+                if len(scanned.text) == 0:  # ignore blank files
                     pyfalog.debug("File is blank.")
                     continue
+                scannedFiles.append(scanned)
 
-                try:
-                    importType, makesNewFits, fitsImport = Port.importAuto(srcString, path, progress=progress)
-                    fit_list += fitsImport
-                except xml.parsers.expat.ExpatError:
-                    pyfalog.warning("Malformed XML in:\n{0}", path)
-                    msg = "Malformed XML in %s" % path
+            # Resolve everything files refer to at once; importers then get items without queries
+            if progress:
+                progress.message = "Resolving items"
+            with sMkt.prefetchedItems(
+                    names=set().union(*(s.typeNames for s in scannedFiles)),
+                    itemIDs=set().union(*(s.typeIDs for s in scannedFiles)),
+                    eager="group.category"):
+                for scanned in scannedFiles:
                     if progress:
-                        progress.error = msg
-                        progress.workerWorking = False
-                    return False, msg
+                        if progress and progress.userCancelled:
+                            progress.workerWorking = False
+                            return False, "Cancelled by user"
+                        msg = "Processing file:\n%s" % scanned.path
+                        progress.message = msg
+                        pyfalog.debug(msg)
+
+                    try:
+                        importType, makesNewFits, fitsImport = Port.importAuto(scanned.text, scanned.path, progress=progress)
+                        fit_list += fitsImport
+                    except xml.parsers.expat.ExpatError:
+                        pyfalog.warning("Malformed XML in:\n{0}", scanned.path)
+                        msg = "Malformed XML in %s" % scanned.path
+                        if progress:
+                            progress.error = msg
+                            progress.workerWorking = False
+                        return False, msg
 
             numFits = len(fit_list)
-            for idx, fit in enumerate(fit_list):
-                if progress and progress.userCancelled:
-                    progress.workerWorking = False
-                    return False, "Cancelled by user"
-                # Set some more fit attributes and save
+            for fit in fit_list:
+                # Set some more fit attributes
                 fit.character = sFit.character
                 fit.damagePattern = sFit.pattern
                 fit.targetProfile = sFit.targetProfile
@@ -168,11 +186,20 @@ class Port:
                 else:
                     useCharImplants = sFit.serviceFittingOptions["useCharacterImplantsByDefault"]
                     fit.implantLocation = ImplantLocation.CHARACTER if useCharImplants else ImplantLocation.FIT
-                db.save(fit)
-                # IDs.append(fit.ID)
+
+            def saveProgress(saved):
                 if progress:
-                    pyfalog.debug("Processing complete, saving fits to database: {0}/{1}", idx + 1, numFits)
-                    progress.message = "Processing complete, saving fits to database\n(%d/%d) %s" % (idx + 1, numFits, fit.ship.name)
+                    if progress.userCancelled:
+                        return False
+                    pyfalog.debug("Processing complete, saving fits to database: {0}/{1}", saved, numFits)
+                    progress.message = "Processing complete, saving fits to database\n(%d/%d)" % (saved, numFits)
+                return True
+
+            saved = db.saveMany(fit_list, callback=saveProgress)
+            if saved < numFits:
+                # Only progress callback can interrupt saving
+                progress.workerWorking = False
+                return False, "Cancelled by user"
         except (KeyboardInterrupt, SystemExit):
             raise
         except Exception as e:
@@ -195,19 +222,20 @@ class Port:
         # TODO: catch the exception?
         # activeFit is reserved?, bufferStr is unicode? (assume only clipboard string?
         sFit = svcFit.getInstance()
-        importType, makesNewFits, importData = Port.importAuto(bufferStr, activeFit=activeFit)
-
-        if makesNewFits:
-            for fit in importData:
-                fit.character = sFit.character
-                fit.damagePattern = sFit.pattern
-                fit.targetProfile = sFit.targetProfile
-                if len(fit.implants) > 0:
-                    fit.implantLocation = ImplantLocation.FIT
-                else:
-                    useCharImplants = sFit.serviceFittingOptions["useCharacterImplantsByDefault"]
-                    fit.implantLocation = ImplantLocation.CHARACTER if useCharImplants else ImplantLocation.FIT
-                db.save(fit)
+        with batched():
+            importType, makesNewFits, importData = Port.importAuto(bufferStr, activeFit=activeFit)
+
+            if makesNewFits:
+                for fit in importData:
+                    fit.character = sFit.character
+                    fit.damagePattern = sFit.pattern
+                    fit.targetProfile = sFit.targetProfile
+                    if len(fit.implants) > 0:
+                        fit.implantLocation = ImplantLocation.FIT
+                    else:
+                        useCharImplants = sFit.serviceFittingOptions["useCharacterImplantsByDefault"]
+                        fit.implantLocation = ImplantLocation.CHARACTER if useCharImplants else ImplantLocation.FIT
+                    db.save(fit)
         return importType, importData
 
     @classmethod
@@ -24,11 +24,11 @@ import timeit
 from itertools import chain
 
 import math
-import wx
 from logbook import Logger
 
 from eos import db
-from eos.saveddata.price import PriceStatus
+from eos.saveddata.price import Price as EosPrice, PriceStatus
+from service.dispatcher import callAfter
 from service.fit import Fit
 from service.market import Market
 from service.network import TimeoutError
@@ -196,6 +196,7 @@ class Price:
     def clearPriceCache(self):
         pyfalog.debug("Clearing Prices")
         db.clearPrices()
+        EosPrice.generation += 1
 
     def findCheaperReplacements(self, items, callback, fetchTimeout=10):
         sMkt = Market.getInstance()
@@ -253,7 +254,7 @@ class PriceWorkerThread(threading.Thread):
             if len(requests) > 0:
                 Price.fetchPrices(requests, fetchTimeout, validityOverride)
 
-            wx.CallAfter(callback)
+            callAfter(callback)
             queue.task_done()
 
             # After we fetch prices, go through the list of waiting items and call their callbacks
@@ -261,7 +262,7 @@ class PriceWorkerThread(threading.Thread):
                 callbacks = self.wait.pop(price.typeID, None)
                 if callbacks:
                     for callback in callbacks:
-                        wx.CallAfter(callback)
+                        callAfter(callback)
 
     def trigger(self, prices, callbacks, fetchTimeout, validityOverride):
         self.queue.put((callbacks, prices, fetchTimeout, validityOverride))
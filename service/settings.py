@@ -17,28 +17,184 @@
 # along with pyfa.  If not, see <http://www.gnu.org/licenses/>.
 # =============================================================================
 
+import base64
 import pickle
 import os.path
+import threading
 import urllib.request
 import urllib.error
 import urllib.parse
 import json
 from collections import namedtuple
-import wx
 
 from logbook import Logger
 
 import config
 import eos.config
 from service.const import GraphDpsDroneMode
+from service.dispatcher import callAfter
 
 
 pyfalog = Logger(__name__)
 
 
+class SettingsStore:
+    """
+    All settings areas in one JSON file. Changes are written in batches, some
+    time after the first of them, and every write replaces the file
+    atomically, so that a crash leaves either old or new settings on disk.
+
+    Values are stored as JSON where possible; tuples, sets and dicts with
+    non-string keys are tagged to come back with the same types. Anything else
+    is pickled, to not lose settings which were stored before.
+
+    When schema changes, bump VERSION and add function which updates areas
+    dict from previous version to MIGRATIONS.
+    """
+
+    VERSION = 1
+    # Version -> function which takes areas of previous version and updates them in place
+    MIGRATIONS = {}
+    SAVE_DELAY = 2
+
+    def __init__(self, path=None, legacyPath=None):
+        # Without path, settings are kept in memory only
+        self.path = path
+        self.areas = {}
+        self.__lock = threading.RLock()
+        self.__timer = None
+        if path is None:
+            return
+        if os.path.exists(path):
+            self.load()
+        elif legacyPath is not None and os.path.isdir(legacyPath):
+            self.importPickles(legacyPath)
+            self.flush()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            version = data['version']
+            areas = decodeSetting(data['areas'])
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except Exception as e:
+            # Keep broken file for investigation, it'd be overwritten otherwise
+            pyfalog.error("Failed to load settings from {}: {}", self.path, e)
+            try:
+                os.replace(self.path, '{}.broken'.format(self.path))
+            except OSError:
+                pass
+            return
+        if version > self.VERSION:
+            pyfalog.warning("Settings were saved by newer pyfa (schema {} > {})", version, self.VERSION)
+        for migrateVersion in range(version + 1, self.VERSION + 1):
+            migration = self.MIGRATIONS.get(migrateVersion)
+            if migration is not None:
+                pyfalog.info("Migrating settings to schema {}", migrateVersion)
+                migration(areas)
+        self.areas = areas
+
+    def importPickles(self, legacyPath):
+        """Take settings from pickle-per-area files of older pyfa versions"""
+        for area in os.listdir(legacyPath):
+            areaPath = os.path.join(legacyPath, area)
+            if area.startswith('.') or not os.path.isfile(areaPath):
+                continue
+            try:
+                with open(areaPath, 'rb') as f:
+                    info = pickle.load(f)
+            except (KeyboardInterrupt, SystemExit):
+                raise
+            except Exception as e:
+                pyfalog.warning("Failed to import settings from {}: {}", areaPath, e)
+                continue
+            if isinstance(info, dict):
+                self.areas[area] = info
+        pyfalog.info("Imported {} settings areas from {}", len(self.areas), legacyPath)
+
+    def getArea(self, area):
+        with self.__lock:
+            return self.areas.setdefault(area, {})
+
+    def scheduleSave(self):
+        if self.path is None:
+            return
+        with self.__lock:
+            if self.__timer is not None:
+                return
+            self.__timer = threading.Timer(self.SAVE_DELAY, callAfter, args=(self.flush,))
+            self.__timer.daemon = True
+            self.__timer.start()
+
+    def flush(self):
+        if self.path is None:
+            return
+        with self.__lock:
+            if self.__timer is not None:
+                self.__timer.cancel()
+                self.__timer = None
+            data = json.dumps({'version': self.VERSION, 'areas': encodeSetting(self.areas)}, indent=1, sort_keys=True)
+            try:
+                self._write(data)
+            except OSError as e:
+                pyfalog.error("Failed to save settings to {}: {}", self.path, e)
+
+    def _write(self, data):
+        tmpPath = '{}.tmp'.format(self.path)
+        with open(tmpPath, 'w', encoding='utf-8') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmpPath, self.path)
+
+
+SETTING_TAGS = ('__tuple__', '__set__', '__dict__', '__pickle__')
+
+
+def encodeSetting(value):
+    if value is None or isinstance(value, (bool, str, float)):
+        return value
+    if isinstance(value, int):
+        # Plain int out of IntEnums and such
+        return int(value)
+    if isinstance(value, list):
+        return [encodeSetting(v) for v in value]
+    if isinstance(value, tuple):
+        return {'__tuple__': [encodeSetting(v) for v in value]}
+    if isinstance(value, (set, frozenset)):
+        return {'__set__': [encodeSetting(v) for v in value]}
+    if isinstance(value, dict):
+        if all(isinstance(k, str) for k in value) and not (len(value) == 1 and next(iter(value)) in SETTING_TAGS):
+            return {k: encodeSetting(v) for k, v in value.items()}
+        return {'__dict__': [[encodeSetting(k), encodeSetting(v)] for k, v in value.items()]}
+    return {'__pickle__': base64.b64encode(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)).decode('ascii')}
+
+
+def decodeSetting(value):
+    if isinstance(value, list):
+        return [decodeSetting(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if len(value) == 1:
+        tag, tagged = next(iter(value.items()))
+        if tag == '__tuple__':
+            return tuple(decodeSetting(v) for v in tagged)
+        if tag == '__set__':
+            return set(decodeSetting(v) for v in tagged)
+        if tag == '__dict__':
+            return {decodeSetting(k): decodeSetting(v) for k, v in tagged}
+        if tag == '__pickle__':
+            return pickle.loads(base64.b64decode(tagged))
+    return {k: decodeSetting(v) for k, v in value.items()}
+
+
 class SettingsProvider:
     if config.savePath:
+        # Pickle-per-area files of older versions, imported once
         BASE_PATH = os.path.join(config.savePath, 'settings')
+        STORE_PATH = os.path.join(config.savePath, 'settings.json')
     settings = {}
     _instance = None
 
@@ -50,60 +206,35 @@ class SettingsProvider:
         return cls._instance
 
     def __init__(self):
-        if hasattr(self, 'BASE_PATH'):
-            if not os.path.exists(self.BASE_PATH):
-                os.mkdir(self.BASE_PATH)
+        # NOTE: without save path (tests), settings are not persisted
+        if hasattr(self, 'STORE_PATH'):
+            self.store = SettingsStore(self.STORE_PATH, legacyPath=self.BASE_PATH)
+        else:
+            self.store = SettingsStore()
 
     def getSettings(self, area, defaults=None):
         # type: (basestring, dict) -> service.Settings
-        # NOTE: needed to change for tests
-        # TODO: Write to memory with mmap -> https://docs.python.org/2/library/mmap.html
         settings_obj = self.settings.get(area)
-        if settings_obj is None:  # and hasattr(self, 'BASE_PATH'):
-            canonical_path = os.path.join(self.BASE_PATH, area) if hasattr(self, 'BASE_PATH') else ""
-            if not os.path.exists(canonical_path):  # path string or empty string.
-                info = {}
-                if defaults:
-                    info.update(defaults)
-            else:
-                try:
-                    with open(canonical_path, "rb") as f:
-                        info = pickle.load(f)
-                    for item in defaults:
-                        if item not in info:
-                            info[item] = defaults[item]
-                except (KeyboardInterrupt, SystemExit):
-                    raise
-                except:
-                    info = {}
-                    info.update(defaults)
-
-            self.settings[area] = settings_obj = Settings(canonical_path, info)
+        if settings_obj is None:
+            info = self.store.getArea(area)
+            for item in (defaults or ()):
+                if item not in info:
+                    info[item] = defaults[item]
+            self.settings[area] = settings_obj = Settings(self.store, info)
         return settings_obj
 
     def saveAll(self):
-        for settings in self.settings.values():
-            settings.save()
+        self.store.flush()
 
 
 class Settings:
-    def __init__(self, location, info):
-        # type: (basestring, dict) -> None
-        # path string or empty string.
-        self.location = location
+    def __init__(self, store, info):
+        # type: (SettingsStore, dict) -> None
+        self.store = store
         self.info = info
 
-    # def save(self):
-    #     f = open(self.location, "wb")
-    #     cPickle.dump(self.info, f, cPickle.HIGHEST_PROTOCOL)
-
     def save(self):
-        # NOTE: needed to change for tests
-        if self.location is None or not self.location:
-            return
-        # NOTE: with + open -> file handle auto close
-        with open(self.location, "wb") as f:
-            pickle.dump(self.info, f, pickle.HIGHEST_PROTOCOL)
+        self.store.flush()
 
     def __getitem__(self, k):
         try:
@@ -114,6 +245,7 @@ class Settings:
 
     def __setitem__(self, k, v):
         self.info[k] = v
+        self.store.scheduleSave()
 
     def __iter__(self):
         return self.info.__iter__()
@@ -582,6 +714,7 @@ class LocaleSettings:
     @classmethod
     def supported_languages(cls):
         """Requires the application to be initialized, otherwise wx.Translation isn't set."""
+        import wx
         pyfalog.info(f'using "{config.CATALOG}" to fetch languages, relatively base path "{os.getcwd()}"')
         return {x: wx.Locale.FindLanguageInfo(x) for x in wx.Translations.Get().GetAvailableTranslations(config.CATALOG)}
 
@@ -0,0 +1,213 @@
+# =============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of pyfa.
+#
+# pyfa is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pyfa is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with pyfa.  If not, see <http://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""
+Impact of skill training on stats of a set of fits, e.g. to decide which
+skills to train next for doctrine fits.
+
+Every (skill, level) change is evaluated on every fit via eos.utils.whatIf,
+with skill levels changed on a copy of the fit's character, so neither the
+character nor fits are touched. Only skills which actually affect a fit are
+evaluated on it - which ones do is taken from "Affected By" data of already
+calculated fit, other changes are known to have no impact. Evaluations are
+spread over a pool of worker processes, each of which loads a fit once per
+chunk of changes; fits have to be saved for that.
+"""
+
+import multiprocessing
+import threading
+
+import numpy as np
+from logbook import Logger
+
+import config
+import eos.db
+from eos.saveddata.character import Skill
+from service.workers import createWorkerPool, loadFit
+
+
+pyfalog = Logger(__name__)
+
+DEFAULT_STATS = ('dps', 'ehp', 'maxSpeed')
+
+
+# Worker side. Functions below run in worker processes only.
+
+def evaluateSkillChanges(fitID, changes, stats):
+    """
+    Evaluate stats of the fit with each of passed (change index, skill ID,
+    level) changes applied separately.
+    """
+    from eos.utils.whatIf import ChangeSkillLevel, WhatIf
+
+    fit = loadFit(fitID)
+    whatIf = WhatIf(fit, stats=stats, copyCharacter=True)
+    rows = []
+    for index, skillID, level in changes:
+        result = whatIf.evaluate((ChangeSkillLevel(skillID, level),))
+        if result is not None:
+            rows.append((index, result.values))
+    eos.db.saveddata_session.rollback()
+    return whatIf.baseline, rows
+
+
+# Main process side
+
+class SkillImpactMatrix:
+    """
+    Results of skill impact analysis. Arrays are indexed by [change, fit,
+    stat], where changes are (skill item, level) tuples.
+    """
+
+    def __init__(self, changes, fits, stats, baseline, values):
+        self.changes = changes
+        self.fits = fits
+        self.stats = stats
+        self.baseline = baseline
+        self.values = values
+
+    @property
+    def deltas(self):
+        return self.values - self.baseline[None, :, :]
+
+    @property
+    def relativeDeltas(self):
+        """Changes of stats relative to their baseline values"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            relative = self.deltas / self.baseline[None, :, :]
+        return np.nan_to_num(relative, nan=0, posinf=0, neginf=0)
+
+    def rank(self, stat, relative=True):
+        """
+        Get (skill item, level, gain) tuples sorted by gain of passed stat,
+        summed over all fits. Relative gain is sum of per-fit gains as
+        fractions of their baseline, so that fits of all sizes weigh the same.
+        """
+        statIndex = self.stats.index(stat)
+        gains = (self.relativeDeltas if relative else self.deltas)[:, :, statIndex].sum(axis=1)
+        order = np.argsort(-gains, kind='stable')
+        return [(self.changes[i][0], self.changes[i][1], float(gains[i])) for i in order]
+
+
+class SkillImpact:
+    instance = None
+
+    @classmethod
+    def getInstance(cls):
+        if cls.instance is None:
+            cls.instance = SkillImpact()
+        return cls.instance
+
+    def __init__(self):
+        self.__executor = None
+        self.__lock = threading.Lock()
+        self.workers = multiprocessing.cpu_count()
+
+    def __getExecutor(self):
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = createWorkerPool(self.workers, savePath=config.savePath, gameDB=config.gameDB)
+            return self.__executor
+
+    def shutdown(self):
+        with self.__lock:
+            if self.__executor is not None:
+                self.__executor.shutdown(wait=False, cancel_futures=True)
+                self.__executor = None
+
+    @staticmethod
+    def getAffectingSkills(fit):
+        """Get IDs of skills which modify any attribute of calculated fit"""
+        containers = [fit.ship.itemModifiedAttributes]
+        for item in fit.modules:
+            if not item.isEmpty:
+                containers.append(item.itemModifiedAttributes)
+                containers.append(item.chargeModifiedAttributes)
+        for item in fit.drones:
+            containers.append(item.itemModifiedAttributes)
+            containers.append(item.chargeModifiedAttributes)
+        for item in fit.fighters:
+            containers.append(item.itemModifiedAttributes)
+            containers.append(item.chargeModifiedAttributes)
+        for item in fit.appliedImplants:
+            containers.append(item.itemModifiedAttributes)
+        for item in fit.boosters:
+            containers.append(item.itemModifiedAttributes)
+
+        skillIDs = set()
+        for container in containers:
+            for afflictor in container.iterAfflictors():
+                if isinstance(afflictor, Skill):
+                    skillIDs.add(afflictor.itemID)
+        return skillIDs
+
+    @staticmethod
+    def getCandidates(fits):
+        """Get (skill item, level) changes which train every skill affecting any of fits by one level"""
+        changes = set()
+        for fit in fits:
+            character = fit.character
+            for skillID in SkillImpact.getAffectingSkills(fit):
+                skill = character.getSkill(skillID)
+                if skill.level < 5:
+                    changes.add((skill.item, skill.level + 1))
+        return sorted(changes, key=lambda c: (c[0].name, c[1]))
+
+    def analyze(self, fits, changes=None, stats=DEFAULT_STATS):
+        """
+        Evaluate each of (skill item, level) changes on each of calculated
+        fits, and return SkillImpactMatrix. By default, next level of every
+        skill affecting fits is evaluated.
+        """
+        if changes is None:
+            changes = self.getCandidates(fits)
+        stats = tuple(stats)
+        # Changes which do not affect the fit or which the character already
+        # has trained are not evaluated; their values are the baseline ones
+        tasks = []
+        for fit in fits:
+            affecting = self.getAffectingSkills(fit)
+            character = fit.character
+            fitChanges = [
+                (i, skillItem.ID, level) for i, (skillItem, level) in enumerate(changes)
+                if skillItem.ID in affecting and character.getSkill(skillItem.ID).level < level]
+            tasks.append((fit, fitChanges))
+
+        # Spread each fit's changes over several chunks when there are fewer
+        # fits than workers
+        chunksPerFit = max(1, -(-self.workers // max(len(fits), 1)))
+        executor = self.__getExecutor()
+        futures = []
+        for fitIndex, (fit, fitChanges) in enumerate(tasks):
+            chunkCount = max(1, min(chunksPerFit, len(fitChanges)))
+            for chunkIndex in range(chunkCount):
+                futures.append((fitIndex, executor.submit(
+                    evaluateSkillChanges, fit.ID, fitChanges[chunkIndex::chunkCount], stats)))
+
+        baseline = np.zeros((len(fits), len(stats)))
+        results = []
+        for fitIndex, future in futures:
+            fitBaseline, rows = future.result()
+            baseline[fitIndex] = [fitBaseline[s] for s in stats]
+            results.append((fitIndex, rows))
+        values = np.repeat(baseline[None, :, :], len(changes), axis=0)
+        for fitIndex, rows in results:
+            for changeIndex, changeValues in rows:
+                values[changeIndex, fitIndex] = [changeValues[s] for s in stats]
+        return SkillImpactMatrix(list(changes), list(fits), stats, baseline, values)
@@ -0,0 +1,383 @@
+# =============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of pyfa.
+#
+# pyfa is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pyfa is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with pyfa.  If not, see <http://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""
+Headless HTTP service which calculates stats of fits.
+
+Fits are passed in any format supported by import (EFT, DNA, ESI JSON, XML)
+and are calculated in a pool of worker processes. Every worker sets up eos
+once and then serves many requests, keeping gamedata query cache and loaded
+characters hot. HTTP side does not import eos or GUI toolkit at all.
+
+Endpoints:
+    POST /stats    JSON {"fit": ..., "character": ..., "damagePattern": ...,
+                   "targetProfile": ..., "factorReload": ...} or {"fits": [...]}
+                   with the same keys per fit; plain text body is taken as a
+                   single fit
+    GET  /metrics  request counts and timings
+    GET  /health   liveness check
+"""
+
+import http.server
+import json
+import math
+import multiprocessing
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from logbook import Logger
+
+from service.workers import createWorkerPool
+
+
+pyfalog = Logger(__name__)
+
+FIT_KEYS = ('character', 'damagePattern', 'targetProfile', 'factorReload')
+
+
+class StatsRequestError(Exception):
+    """Request cannot be served due to issues with passed data"""
+
+    def __init__(self, message, code=400):
+        super().__init__(message)
+        self.code = code
+
+
+# Worker side. Functions below run in worker processes only.
+
+_characters = {}
+
+
+def evaluateFit(request, submitted):
+    """Import fits from passed request, calculate them and return their stats"""
+    from eos import db
+    from service.port import Port
+
+    started = time.time()
+    fitData = request.get('fit')
+    if isinstance(fitData, (dict, list)):
+        fitData = json.dumps(fitData)
+    if not isinstance(fitData, str) or not fitData.strip():
+        raise StatsRequestError('No fit data passed')
+    character = _getCharacter(request.get('character'))
+    damagePattern = _getDamagePattern(request.get('damagePattern'))
+    targetProfile = _getTargetProfile(request.get('targetProfile'))
+
+    importStart = time.perf_counter()
+    try:
+        imported = Port.importAuto(fitData)
+    except (KeyboardInterrupt, SystemExit):
+        raise
+    except Exception as e:
+        raise StatsRequestError('Failed to parse fit: {}'.format(e))
+    fits = [f for f in imported[2] if f is not None] if imported is not None and imported[1] else []
+    if not fits:
+        raise StatsRequestError('No fits could be parsed')
+    importTime = time.perf_counter() - importStart
+
+    calcStart = time.perf_counter()
+    results = []
+    for fit in fits:
+        try:
+            # Importers fill fits with dummy modules for GUI, we do not need them
+            fit.unfill()
+            fit.character = character
+            fit.damagePattern = damagePattern
+            fit.targetProfile = targetProfile
+            fit.factorReload = bool(request.get('factorReload', False))
+            fit.clear()
+            fit.calculateModifiedAttributes()
+            results.append(getFitStats(fit))
+        finally:
+            # Assigning character puts fit into saveddata session and into
+            # character's fit list, fits we made are not supposed to stay there
+            fit.character = None
+            if fit in db.saveddata_session:
+                db.saveddata_session.expunge(fit)
+    calcTime = time.perf_counter() - calcStart
+    return {
+        'format': imported[0],
+        'fits': results,
+        'timing': {'queue': max(started - submitted, 0), 'import': importTime, 'calc': calcTime}}
+
+
+def getFitStats(fit):
+    """Get JSON-serializable stats of calculated fit"""
+    ship = fit.ship
+
+    def layers(values):
+        return {k: values.get(k) or 0 for k in ('shield', 'armor', 'hull')}
+
+    def resists(prefix):
+        return {
+            dmgType: 1 - ship.getModifiedItemAttr('{}{}DamageResonance'.format(prefix, dmgType.capitalize()), 1)
+            for dmgType in ('em', 'thermal', 'kinetic', 'explosive')}
+
+    sustainableTank = fit.effectiveSustainableTank or {}
+    return {
+        'name': fit.name,
+        'ship': ship.item.name,
+        'shipID': ship.item.ID,
+        'dps': {
+            'total': fit.getTotalDps().total,
+            'weapon': fit.getWeaponDps().total,
+            'drone': fit.getDroneDps().total},
+        'volley': fit.getTotalVolley().total,
+        'hp': layers(fit.hp),
+        'ehp': layers(fit.ehp),
+        'resists': {
+            'shield': resists('shield'),
+            'armor': resists('armor'),
+            'hull': {k: 1 - ship.getModifiedItemAttr('{}DamageResonance'.format(k), 1)
+                     for k in ('em', 'thermal', 'kinetic', 'explosive')}},
+        'sustainableTank': {
+            'shield': (sustainableTank.get('shieldRepair') or 0) + (sustainableTank.get('passiveShield') or 0),
+            'armor': sustainableTank.get('armorRepair') or 0,
+            'hull': sustainableTank.get('hullRepair') or 0},
+        'capacitor': {
+            'capacity': ship.getModifiedItemAttr('capacitorCapacity') or 0,
+            'stable': bool(fit.capStable),
+            'state': fit.capState or 0,
+            'delta': fit.capDelta or 0},
+        'resources': {
+            'cpu': (fit.cpuUsed, ship.getModifiedItemAttr('cpuOutput') or 0),
+            'powergrid': (fit.pgUsed, ship.getModifiedItemAttr('powerOutput') or 0),
+            'calibration': (fit.calibrationUsed, ship.getModifiedItemAttr('upgradeCapacity') or 0),
+            'droneBandwidth': (fit.droneBandwidthUsed, ship.getModifiedItemAttr('droneBandwidth') or 0)},
+        'navigation': {
+            'maxSpeed': fit.maxSpeed or 0,
+            'alignTime': fit.alignTime or 0,
+            'signatureRadius': ship.getModifiedItemAttr('signatureRadius') or 0,
+            'warpSpeed': fit.warpSpeed or 0},
+        'targeting': {
+            'maxTargetRange': fit.maxTargetRange or 0,
+            'maxTargets': fit.maxTargets or 0,
+            'scanResolution': ship.getModifiedItemAttr('scanResolution') or 0,
+            'scanStrength': fit.scanStrength or 0},
+        'mining': {'yield': fit.totalYield or 0, 'drain': fit.totalDrain or 0}}
+
+
+def _getCharacter(name):
+    from eos import db
+    from eos.saveddata.character import Character
+
+    if name is None:
+        name = 'All 5'
+    try:
+        return _characters[name]
+    except KeyError:
+        pass
+    if name == 'All 5':
+        character = Character.getAll5()
+    elif name == 'All 0':
+        character = Character.getAll0()
+    else:
+        character = db.getCharacter(name)
+        if character is None:
+            raise StatsRequestError('Unknown character: {}'.format(name))
+    _characters[name] = character
+    return character
+
+
+def _getDamagePattern(name):
+    from eos import db
+    from eos.saveddata.damagePattern import DamagePattern
+
+    if name is None:
+        return DamagePattern.getDefaultBuiltin()
+    for pattern in DamagePattern.getBuiltinList() + db.getDamagePatternList():
+        if pattern.rawName == name:
+            return pattern
+    raise StatsRequestError('Unknown damage pattern: {}'.format(name))
+
+
+def _getTargetProfile(name):
+    from eos import db
+    from eos.saveddata.targetProfile import TargetProfile
+
+    if name is None:
+        return None
+    for profile in TargetProfile.getBuiltinList() + db.getTargetProfileList():
+        if profile.rawName == name:
+            return profile
+    raise StatsRequestError('Unknown target profile: {}'.format(name))
+
+
+# Server side
+
+class RequestMetrics:
+    """
+    Counts of served requests and timings of their phases. Percentiles are
+    calculated over a window of most recent values.
+    """
+
+    WINDOW = 1000
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__started = time.time()
+        self.__counts = Counter()
+        self.__timings = {}
+
+    def record(self, status, timings=None):
+        with self.__lock:
+            self.__counts[status] += 1
+            for phase, value in (timings or {}).items():
+                self.__timings.setdefault(phase, deque(maxlen=self.WINDOW)).append(value)
+
+    def getSnapshot(self):
+        with self.__lock:
+            counts = dict(self.__counts)
+            timings = {phase: sorted(values) for phase, values in self.__timings.items()}
+        return {
+            'uptime': time.time() - self.__started,
+            'requests': counts,
+            'timings': {phase: self.__summarize(values) for phase, values in timings.items()}}
+
+    @staticmethod
+    def __summarize(values):
+        def percentile(share):
+            return values[min(len(values) - 1, math.ceil(share * len(values)) - 1)]
+
+        return {
+            'count': len(values),
+            'mean': sum(values) / len(values),
+            'p50': percentile(0.5),
+            'p95': percentile(0.95),
+            'max': values[-1]}
+
+
+class StatsRequestHandler(http.server.BaseHTTPRequestHandler):
+
+    # Limit on request body size, in bytes
+    MAX_BODY_SIZE = 4 * 1024 * 1024
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            self.sendJson(200, self.server.metrics.getSnapshot())
+        elif self.path == '/health':
+            self.sendJson(200, {'status': 'ok', 'workers': self.server.workers})
+        else:
+            self.sendJson(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        if self.path != '/stats':
+            self.sendJson(404, {'error': 'Not found'})
+            return
+        start = time.perf_counter()
+        try:
+            requests = self.readRequests()
+        except StatsRequestError as e:
+            self.server.metrics.record('invalid')
+            self.sendJson(e.code, {'error': str(e)})
+            return
+        results = self.server.evaluate(requests)
+        total = time.perf_counter() - start
+        self.server.metrics.record('served', {'request': total})
+        self.sendJson(200, {'results': results, 'timing': {'total': total}})
+
+    def readRequests(self):
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # We cannot tell where body ends, thus cannot serve more requests
+            self.close_connection = True
+            raise StatsRequestError('Malformed Content-Length header')
+        if length > self.MAX_BODY_SIZE:
+            # Body is left unread, thus connection cannot be reused
+            self.close_connection = True
+            raise StatsRequestError('Request body exceeds {} bytes'.format(self.MAX_BODY_SIZE), code=413)
+        body = self.rfile.read(length).decode('utf-8', errors='replace')
+        if not body.strip():
+            raise StatsRequestError('Empty request')
+        if 'json' not in (self.headers.get('Content-Type') or ''):
+            return [{'fit': body}]
+        try:
+            data = json.loads(body)
+        except ValueError as e:
+            raise StatsRequestError('Malformed JSON: {}'.format(e))
+        if not isinstance(data, dict):
+            raise StatsRequestError('Request has to be a JSON object')
+        if 'fits' not in data:
+            return [data]
+        if not isinstance(data['fits'], list):
+            raise StatsRequestError('"fits" has to be a list')
+        # Top level options apply to all fits, unless fit overrides them
+        defaults = {k: data[k] for k in FIT_KEYS if k in data}
+        return [dict(defaults, **(f if isinstance(f, dict) else {'fit': f})) for f in data['fits']]
+
+    def sendJson(self, code, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pyfalog.debug('{} - {}', self.address_string(), format % args)
+
+
+class StatsServer(http.server.ThreadingHTTPServer):
+    """
+    HTTP server which hands fit calculation off to worker processes, so that
+    multiple requests are calculated in parallel.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, workers=None, savePath=None, gameDB=None, timeout=60):
+        self.workers = workers or multiprocessing.cpu_count()
+        self.timeout = timeout
+        self.metrics = RequestMetrics()
+        self.executor = createWorkerPool(self.workers, savePath=savePath, gameDB=gameDB)
+        super().__init__(address, StatsRequestHandler)
+
+    def evaluate(self, requests):
+        """Calculate passed fit requests in parallel, return list of results in the same order"""
+        futures = [self.executor.submit(evaluateFit, request, time.time()) for request in requests]
+        results = []
+        for future in futures:
+            try:
+                result = future.result(timeout=self.timeout)
+            except StatsRequestError as e:
+                self.metrics.record('rejected')
+                results.append({'error': str(e)})
+            except FutureTimeoutError:
+                future.cancel()
+                self.metrics.record('timeout')
+                results.append({'error': 'Calculation timed out'})
+            except (KeyboardInterrupt, SystemExit):
+                raise
+            except Exception as e:
+                pyfalog.error('Failed to calculate fit: {}', e)
+                self.metrics.record('failed')
+                results.append({'error': 'Internal error: {}'.format(e)})
+            else:
+                self.metrics.record('calculated', result['timing'])
+                results.append(result)
+        return results
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
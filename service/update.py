@@ -22,12 +22,11 @@ import threading
 
 # noinspection PyPackageRequirements
 import dateutil.parser
-# noinspection PyPackageRequirements
-import wx
 from logbook import Logger
 from packaging.version import Version
 
 import config
+from service.dispatcher import callAfter
 from service.network import Network
 from service.settings import UpdateSettings
 
@@ -81,7 +80,7 @@ class CheckUpdateThread(threading.Thread):
                     break
 
                 if rVersion > cVersion:
-                    wx.CallAfter(self.callback, release, rVersion)
+                    callAfter(self.callback, release, rVersion)
                     break
 
         except (KeyboardInterrupt, SystemExit):
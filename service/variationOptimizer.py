@@ -0,0 +1,255 @@
+# =============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of pyfa.
+#
+# pyfa is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pyfa is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with pyfa.  If not, see <http://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""
+Ranking of module variations for a slot of a fit, e.g. to find the best or
+the cheapest meta level which still does the job.
+
+Every variation (optionally with every charge it can load) is evaluated via
+eos.utils.whatIf in a pool of worker processes. Candidates are split between
+workers in chunks; each worker loads the fit from saveddata database once per
+chunk and then only recalculates its calc copy per candidate. Because of
+that, fit has to be saved before ranking, which is the case for fits edited
+via GUI commands.
+"""
+
+import math
+import multiprocessing
+import threading
+
+from logbook import Logger
+
+import config
+import eos.db
+from eos.saveddata.module import Module
+from service.dispatcher import callAfter
+from service.market import Market
+from service.price import Price
+from service.workers import createWorkerPool, loadFit
+
+
+pyfalog = Logger(__name__)
+
+
+class Objective:
+
+    def __init__(self, stats, key, pricePerformance=False):
+        # Stats which are needed to get value of objective
+        self.stats = stats
+        self.key = key
+        self.pricePerformance = pricePerformance
+
+
+OBJECTIVES = {
+    'dps': Objective(('dps',), lambda values: values['dps'], pricePerformance=True),
+    'ehp': Objective(('ehp',), lambda values: values['ehp'], pricePerformance=True),
+    # Stable fits go first, ordered by stable level; unstable ones are ordered
+    # by time they last
+    'cap': Objective(('capStable', 'capState'), lambda values: (values['capStable'], values['capState']))}
+# Stats returned for every candidate besides objective ones
+TABLE_STATS = ('dps', 'volley', 'ehp', 'cpuUsed', 'pgUsed')
+
+
+# Worker side. Functions below run in worker processes only.
+
+def evaluateVariations(fitID, position, candidates, stats):
+    """Load saved fit and evaluate candidates on it, see evaluateCandidates()"""
+    fit = loadFit(fitID)
+    try:
+        return evaluateCandidates(fit, position, candidates, stats)
+    finally:
+        eos.db.saveddata_session.rollback()
+
+
+def evaluateCandidates(fit, position, candidates, stats):
+    """
+    Evaluate stats of the fit with module in position replaced by each of
+    candidates, which are (item ID, charge IDs) tuples. Charge ID None means
+    keeping current charge if new module can use it.
+    """
+    from eos.utils.whatIf import ChangeModuleCharge, RemoveModule, ReplaceModule, WhatIf
+
+    whatIf = WhatIf(fit, stats=stats)
+    removed = whatIf.evaluate((RemoveModule(position),))
+    emptyValues = removed.values if removed is not None else whatIf.baseline
+    rows = []
+    for itemID, chargeIDs in candidates:
+        item = eos.db.getItem(itemID)
+        for chargeID in chargeIDs:
+            edits = [ReplaceModule(position, item)]
+            if chargeID is not None:
+                edits.append(ChangeModuleCharge(position, eos.db.getItem(chargeID)))
+            result = whatIf.evaluate(edits)
+            if result is not None:
+                rows.append((itemID, chargeID, result.values))
+    return whatIf.baseline, emptyValues, rows
+
+
+# Main process side
+
+class VariationRow:
+
+    def __init__(self, item, charge, values, baseline, emptyValues):
+        self.item = item
+        self.charge = charge
+        self.values = values
+        # Change of stats compared to currently fitted module
+        self.deltas = {k: values[k] - baseline[k] for k in values}
+        # Change of stats compared to empty slot
+        self.contributions = {k: values[k] - emptyValues[k] for k in values}
+        self.price = None
+        self.score = None
+
+    def __repr__(self):
+        return 'VariationRow(item={}, charge={}, score={})'.format(
+            self.item.name, self.charge.name if self.charge is not None else None, self.score)
+
+
+class VariationOptimizer:
+    instance = None
+
+    @classmethod
+    def getInstance(cls):
+        if cls.instance is None:
+            cls.instance = VariationOptimizer()
+        return cls.instance
+
+    def __init__(self):
+        self.__executor = None
+        self.__lock = threading.Lock()
+        self.workers = multiprocessing.cpu_count()
+
+    def __getExecutor(self):
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = createWorkerPool(self.workers, savePath=config.savePath, gameDB=config.gameDB)
+            return self.__executor
+
+    def shutdown(self):
+        with self.__lock:
+            if self.__executor is not None:
+                self.__executor.shutdown(wait=False, cancel_futures=True)
+                self.__executor = None
+
+    @staticmethod
+    def getCandidates(mod, allCharges=False):
+        """
+        Get (item, charges) tuples of variations of passed module. Without
+        allCharges, current charge is kept where possible.
+        """
+        sMkt = Market.getInstance()
+        candidates = []
+        for item in sorted(sMkt.getVariationsByItems((mod.item,)), key=lambda i: i.ID):
+            if not sMkt.getPublicityByItem(item):
+                continue
+            charges = [None]
+            if allCharges:
+                try:
+                    charges = sorted(Module(item).getValidCharges(), key=lambda i: i.ID) or [None]
+                except ValueError:
+                    continue
+            candidates.append((item, charges))
+        return candidates
+
+    def rankVariations(self, fit, position, objective='dps', allCharges=False, pricePerformance=False, parallel=True):
+        """
+        Evaluate all variations of module in position of the fit and get
+        VariationRow for each of them which can be fit, best first. With
+        pricePerformance, score is objective contribution of module per
+        million ISK of its price, using prices stored in database. Without
+        parallel, variations are evaluated in calling thread on calc copy of
+        passed fit, so nothing else may calculate fits meanwhile.
+        """
+        objectiveInfo = OBJECTIVES[objective]
+        if pricePerformance and not objectiveInfo.pricePerformance:
+            raise ValueError('Objective {} cannot be used for price/performance'.format(objective))
+        mod = fit.modules[position]
+        if mod.isEmpty:
+            return []
+        candidates = self.getCandidates(mod, allCharges=allCharges)
+        stats = tuple(sorted(set(TABLE_STATS) | set(objectiveInfo.stats)))
+        items = {item.ID: item for item, _ in candidates}
+        items.update({c.ID: c for _, charges in candidates for c in charges if c is not None})
+
+        candidateIDs = [(item.ID, tuple(c.ID if c is not None else None for c in charges)) for item, charges in candidates]
+        if parallel:
+            # Interleave candidates, so that heavy and light ones are spread
+            # between chunks evenly
+            chunkCount = min(self.workers, len(candidateIDs))
+            chunks = [candidateIDs[i::chunkCount] for i in range(chunkCount)]
+            executor = self.__getExecutor()
+            futures = [executor.submit(evaluateVariations, fit.ID, position, chunk, stats) for chunk in chunks]
+            chunkResults = (future.result() for future in futures)
+        else:
+            chunkResults = [evaluateCandidates(fit, position, candidateIDs, stats)]
+
+        rows = []
+        for baseline, emptyValues, chunkRows in chunkResults:
+            for itemID, chargeID, values in chunkRows:
+                rows.append(VariationRow(items[itemID], items.get(chargeID), values, baseline, emptyValues))
+        self.__scoreRows(rows, objective, pricePerformance)
+        return rows
+
+    @staticmethod
+    def __scoreRows(rows, objective, pricePerformance):
+        for row in rows:
+            if pricePerformance:
+                row.price = row.item.price.price or None
+                contribution = row.contributions[objective]
+                row.score = contribution / row.price * 1000000 if row.price else None
+            else:
+                row.score = OBJECTIVES[objective].key(row.values)
+        # Rows come from chunks interleaved between workers; order ties the
+        # same way regardless of that
+        rows.sort(key=lambda r: (r.item.ID, r.charge.ID if r.charge is not None else 0))
+        # Rows without score (e.g. without price) go last
+        rows.sort(key=lambda r: (r.score is not None, r.score if r.score is not None else -math.inf), reverse=True)
+
+    def rankVariationsAsync(self, fit, position, callback, objective='dps', allCharges=False, pricePerformance=False):
+        """
+        Same as rankVariations(), but runs in background and passes results
+        to callback via dispatcher. Prices are refreshed before calculating
+        price/performance.
+        """
+        def deliver(rows):
+            callAfter(callback, rows)
+
+        if pricePerformance and not OBJECTIVES[objective].pricePerformance:
+            raise ValueError('Objective {} cannot be used for price/performance'.format(objective))
+
+        def run():
+            try:
+                rows = self.rankVariations(fit, position, objective=objective, allCharges=allCharges)
+            except (KeyboardInterrupt, SystemExit):
+                raise
+            except Exception as e:
+                pyfalog.error('Failed to rank variations: {}', e)
+                deliver(None)
+                return
+            if not pricePerformance:
+                deliver(rows)
+                return
+
+            def pricesFetched(prices):
+                self.__scoreRows(rows, objective, pricePerformance)
+                deliver(rows)
+
+            Price.getInstance().getPrices({row.item for row in rows}, pricesFetched)
+
+        threading.Thread(target=run, name='VariationOptimizer', daemon=True).start()
@@ -0,0 +1,74 @@
+# =============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of pyfa.
+#
+# pyfa is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pyfa is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with pyfa.  If not, see <http://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""
+Pools of worker processes for heavy fit calculations. Every worker sets up eos
+once and then serves many tasks. This module does not import eos itself, so
+that it can be used by processes which do not need it.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+def createWorkerPool(workers, savePath=None, gameDB=None):
+    # Spawn instead of fork: workers should not inherit state of parent
+    # process, and sqlite connections cannot be shared between processes
+    context = multiprocessing.get_context('spawn')
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=context,
+        initializer=initWorker, initargs=(context.Lock(), savePath, gameDB))
+
+
+# Worker side. Functions below run in worker processes only.
+
+def initWorker(lock, savePath=None, gameDB=None):
+    """Set up eos in worker process, once per process"""
+    import config
+    if gameDB is not None:
+        config.gameDB = gameDB
+    # Workers share saveddata database, do not let them create it concurrently
+    with lock:
+        config.defPaths(savePath)
+        import eos.config
+        eos.config.gamedataCache = True
+        import eos.db
+        import eos.events  # noqa: F401
+        import service.prefetch  # noqa: F401
+
+
+def loadFit(fitID):
+    """
+    Load saved fit and calculate it the same way main process does. Module
+    positions match ones seen in GUI, empty slots included.
+    """
+    from eos import db
+    from service.fit import Fit
+
+    # Drop state left from previous task, fit might have been changed by
+    # main process since then
+    db.saveddata_session.rollback()
+    fit = db.getFit(fitID)
+    if fit is None:
+        raise ValueError('Fit {} does not exist'.format(fitID))
+    fit.factorReload = Fit.getInstance().serviceFittingOptions['useGlobalForceReload']
+    fit.clear()
+    fit.calculateModifiedAttributes()
+    fit.fill()
+    return fit
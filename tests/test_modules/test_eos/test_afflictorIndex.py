@@ -0,0 +1,46 @@
+# Add root folder to python paths
+# This must be done on every test in order to pass in Travis
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.realpath(os.path.join(script_dir, '..', '..', '..')))
+
+# This import is here to hack around circular import issues
+import eos.db
+from eos.const import Operator
+from eos.modifiedAttributeDict import ModifiedAttributeDict
+
+
+class Fit:
+
+    def __init__(self):
+        self.modifier = None
+
+    def getOrigin(self):
+        return None
+
+    def getModifier(self):
+        return self.modifier
+
+
+def test_afflictorIndex():
+    fit = Fit()
+    attributes = ModifiedAttributeDict(fit=fit)
+    attributes.original = {}
+    fit.modifier = 'gyro'
+    attributes.multiply('damageMultiplier', 1.1, stackingPenalties=True)
+    attributes.increase('cpu', 0)
+    fit.modifier = 'skill'
+    attributes.multiply('damageMultiplier', 1.05)
+
+    assert set(attributes.iterAfflictors()) == {'gyro', 'skill'}
+    assert attributes.getAfflictorAfflictions('gyro') == [
+        ('damageMultiplier', fit, Operator.MULTIPLY, 'default', 1.1, 1.1, True),
+        ('cpu', fit, Operator.PREINCREASE, None, 0, 0, False)]
+    # Same afflictions are available per attribute
+    assert [a[0] for a in attributes.getAfflictions('damageMultiplier')[fit]] == ['gyro', 'skill']
+    assert attributes.getAfflictorAfflictions('implant') == ()
+
+    attributes.clear()
+    assert list(attributes.iterAfflictors()) == []
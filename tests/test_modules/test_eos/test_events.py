@@ -0,0 +1,71 @@
+# Add root folder to python paths
+# This must be done on every test in order to pass in Travis
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.realpath(os.path.join(script_dir, '..', '..', '..')))
+
+from eos import events
+
+
+class Fit:
+    modified = None
+
+    def __setattr__(self, key, value):
+        if key == 'modified':
+            self.__dict__['updates'] = self.__dict__.get('updates', 0) + 1
+        super().__setattr__(key, value)
+
+
+def test_batched():
+    fit = Fit()
+    other = Fit()
+    with events.batched(fit):
+        for _ in range(10):
+            events.mark_fit_modified(fit)
+            events.mark_fit_modified(other)
+        # Fits outside of batch are updated right away
+        assert other.updates == 10
+        assert fit.modified is None
+    assert fit.updates == 1
+    assert fit.modified is not None
+
+
+def test_batched_nested():
+    fit = Fit()
+    with events.batched():
+        with events.batched(fit):
+            events.mark_fit_modified(fit)
+        # Outer batch still holds the update back
+        assert fit.modified is None
+        # Unless session is flushed
+        events.mark_fit_modified(fit)
+        events.stamp_pending_fits('session', 'context', None)
+        assert fit.updates == 1
+    assert fit.updates == 1
+
+
+class FitInfo:
+
+    def __init__(self, boosted_fit=None, victim_fit=None):
+        self.boosted_fit = boosted_fit
+        self.victim_fit = victim_fit
+
+
+def test_mark_fit_modified_dependents():
+    booster = Fit()
+    boosted = Fit()
+    victim = Fit()
+    booster.boostedOnto = {1: FitInfo(boosted_fit=boosted)}
+    booster.projectedOnto = {2: FitInfo(victim_fit=victim), 3: FitInfo(victim_fit=booster)}
+    with events.batched():
+        events.mark_fit_modified(booster)
+        events.mark_fit_modified(booster)
+    # Stats of boosted and projected onto fits change along with booster
+    assert booster.updates == 1
+    assert boosted.updates == 1
+    assert victim.updates == 1
+    events.mark_fit_modified(boosted)
+    assert booster.updates == 1
+    assert boosted.updates == 2
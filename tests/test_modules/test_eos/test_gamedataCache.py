@@ -0,0 +1,84 @@
+# Add root folder to python paths
+# This must be done on every test in order to pass in Travis
+import os
+import sys
+import threading
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.realpath(os.path.join(script_dir, '..', '..', '..')))
+
+# This import is here to hack around circular import issues
+import eos.db
+from eos.db.gamedata import queries
+from eos.db.gamedata.cache import GamedataCache
+from eos.gamedata import Item
+
+
+def test_aliasesShareEntry():
+    cache = GamedataCache(10)
+    value = object()
+    assert cache.put(("Item", 587), value, aliases=[("Item", "Rifter")]) is value
+    assert cache.get(("Item", "Rifter")) is value
+    assert cache.get(("Item", 587)) is value
+    assert len(cache) == 1
+    # First stored value wins unless replacement is requested
+    assert cache.put(("Item", 587), object()) is value
+
+
+def test_evictionDropsAliases():
+    cache = GamedataCache(2)
+    cache.put(("Item", 1), "a", aliases=[("Item", "A")])
+    cache.put(("Item", 2), "b")
+    # Touch first entry, so that second one is least recently used
+    assert cache.get(("Item", "A")) == "a"
+    cache.put(("Item", 3), "c")
+    assert ("Item", 2) not in cache
+    assert cache.get(("Item", "A")) == "a"
+    cache.put(("query",), [1, 2])
+    assert ("Item", "A") not in cache
+    stats = cache.getStats()
+    assert stats["evictions"] == 3
+    assert stats["aliases"] == 0
+    assert stats["hits"] == 2
+
+
+def test_cachingOff(monkeypatch):
+
+    class FakeItem:
+        ID = 587
+        typeName = "Rifter"
+        name = "Rifter"
+
+    def getItemsByID(typeIDs):
+        raise AssertionError("Cache warm-up queried items with caching off")
+
+    monkeypatch.setattr(queries, "cacheEnabled", False)
+    monkeypatch.setattr(queries, "cache", GamedataCache(10))
+    monkeypatch.setattr(queries, "getItemsByID", getItemsByID)
+    item = FakeItem()
+    assert queries.cacheEntity(Item, item) is item
+    assert len(queries.cache) == 0
+    assert queries.getCachedEntity(Item, 587) is None
+    assert queries.warmUpCache([587]) == 0
+
+
+def test_threadedAccess():
+    cache = GamedataCache(50)
+    gets = 2000
+
+    def work(offset):
+        for i in range(gets):
+            key = ("Item", (i + offset) % 100)
+            if cache.get(key) is None:
+                cache.put(key, i, aliases=[("Item", "name{}".format(key[1]))])
+            assert len(cache) <= 50
+
+    threads = [threading.Thread(target=work, args=(n * 7,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = cache.getStats()
+    # Every lookup got counted exactly once
+    assert stats["hits"] + stats["misses"] == 4 * gets
+    assert stats["weight"] == stats["entries"] <= 50
+    assert stats["aliases"] == stats["entries"]
@@ -0,0 +1,80 @@
+# Add root folder to python paths
+# This must be done on every test in order to pass in Travis
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.realpath(os.path.join(script_dir, '..', '..', '..', '..')))
+
+# noinspection PyPackageRequirements
+from _development.helpers import DBInMemory as DB, Gamedata, Saveddata
+from _development.helpers_fits import RifterFit
+# This import is here to hack around circular import issues
+import eos.db
+from eos.const import FittingModuleState, ImplantLocation
+from eos.saveddata.module import Module
+from service.fit import Fit
+
+
+def getShieldBoosterFit(DB, Saveddata):
+    fit = Saveddata['Fit'](Saveddata['Ship'](DB['db'].getItem('Thorax')), 'Shield Booster')
+    burst = Saveddata['Module'](DB['db'].getItem('Shield Command Burst I'))
+    burst.charge = DB['db'].getItem('Shield Harmonizing Charge')
+    burst.state = FittingModuleState.ACTIVE
+    fit.modules.append(burst)
+    return fit
+
+
+def test_commandFit_noBoosterRecalcs(DB, Saveddata, RifterFit, monkeypatch):
+    booster = getShieldBoosterFit(DB, Saveddata)
+    module = Saveddata['Module'](DB['db'].getItem('Gyrostabilizer II'))
+    RifterFit.modules.append(module)
+    for fit in (RifterFit, booster):
+        fit.implantLocation = ImplantLocation.FIT
+        DB['db'].save(fit)
+    sFit = Fit.getInstance()
+    sFit.recalc(RifterFit)
+    resonance = RifterFit.ship.getModifiedItemAttr('shieldEmDamageResonance')
+
+    RifterFit.commandFitDict[booster.ID] = booster
+    DB['saveddata_session'].flush()
+    DB['saveddata_session'].refresh(booster)
+    sFit.recalc(RifterFit)
+    boostedResonance = RifterFit.ship.getModifiedItemAttr('shieldEmDamageResonance')
+    assert boostedResonance < resonance
+
+    boosterClears = []
+    gangRuns = []
+    originalClear = booster.clear
+    originalCalc = Module.calculateModifiedAttributes
+
+    def clear(*args, **kwargs):
+        boosterClears.append(args)
+        return originalClear(*args, **kwargs)
+
+    def calculateModifiedAttributes(mod, fit, runTime, forceProjected=False, gang=False, *args, **kwargs):
+        if gang:
+            gangRuns.append(mod)
+        return originalCalc(mod, fit, runTime, forceProjected, gang, *args, **kwargs)
+
+    monkeypatch.setattr(booster, 'clear', clear)
+    monkeypatch.setattr(Module, 'calculateModifiedAttributes', calculateModifiedAttributes)
+    for i in range(100):
+        module.state = FittingModuleState.OFFLINE if i % 2 == 0 else FittingModuleState.ONLINE
+        sFit.recalc(RifterFit)
+        # Cached buffs are still applied
+        assert RifterFit.ship.getModifiedItemAttr('shieldEmDamageResonance') == boostedResonance
+    assert boosterClears == []
+    assert gangRuns == []
+
+    # Booster recalc collects its buffs anew, once
+    monkeypatch.undo()
+    sFit.recalc(booster)
+    monkeypatch.setattr(Module, 'calculateModifiedAttributes', calculateModifiedAttributes)
+    sFit.recalc(RifterFit)
+    sFit.recalc(RifterFit)
+    assert len(gangRuns) == 3 * len(booster.modules)
+    assert RifterFit.ship.getModifiedItemAttr('shieldEmDamageResonance') == boostedResonance
+
+    DB['db'].remove(RifterFit)
+    DB['db'].remove(booster)
@@ -0,0 +1,85 @@
+# Add root folder to python paths
+# This must be done on every test in order to pass in Travis
+import gc
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.realpath(os.path.join(script_dir, '..', '..', '..', '..')))
+
+from eos.const import CalcType
+from eos.utils import calcTrace
+from eos.utils.calcTrace import CalcTracer
+
+
+class Effect:
+
+    def __init__(self, effectID, name, runTime='normal'):
+        self.ID = effectID
+        self.name = name
+        self.runTime = runTime
+
+
+class Fit:
+    ship = None
+
+    def __init__(self, name='Test', fitID=1):
+        self.name = name
+        self.ID = fitID
+
+
+def handler(fit, item, context, projectionRange, **kwargs):
+    return item
+
+
+def test_tracerInstalledOnlyInContext():
+    assert calcTrace.tracer is None
+    with CalcTracer() as tracer:
+        assert calcTrace.tracer is tracer
+    assert calcTrace.tracer is None
+
+
+def test_effectTimes():
+    fit = Fit()
+    slow = Effect(1, 'slow', 'late')
+    fast = Effect(2, 'fast')
+    tracer = CalcTracer()
+    with tracer.fitCalculation(fit, None, CalcType.LOCAL):
+        for _ in range(3):
+            assert tracer.wrapEffect(fast, handler)(fit, 'item', ('module',), None, effect=fast) == 'item'
+        tracer.addEffectTime(slow, fit, 0, 1)
+    assert [(r[0], r[2]) for r in tracer.getTopEffects()] == [(1, 1), (2, 3)]
+    assert tracer.runTimeTimes['late'] == 1
+    calcs, total, effects = tracer.fitTimes['None: Test (1)']
+    assert calcs == 1
+    assert effects > 1
+    assert 'slow (1)' in tracer.report(count=1)
+    assert 'fast (2)' not in tracer.report(count=1)
+    trace = tracer.getChromeTrace()
+    assert len(trace['traceEvents']) == 5
+    assert trace['traceEvents'][-1]['cat'] == 'fit'
+
+
+def test_eventLimit():
+    fit = Fit()
+    effect = Effect(1, 'effect')
+    tracer = CalcTracer(maxEvents=2)
+    for _ in range(3):
+        tracer.addEffectTime(effect, fit, 0, 1)
+    assert len(tracer.events) == 2
+    assert tracer.droppedEvents == 1
+    assert tracer.getTopEffects()[0][2] == 3
+
+
+def test_labelsOfCollectedFits():
+    effect = Effect(1, 'effect')
+    tracer = CalcTracer()
+    for i in range(10):
+        fit = Fit('Test {}'.format(i), i)
+        with tracer.fitCalculation(fit, None, CalcType.LOCAL):
+            tracer.addEffectTime(effect, fit, 0, 1)
+        del fit
+        gc.collect()
+    # New fits can get ids of collected ones, they still get their own labels
+    assert sorted(tracer.fitTimes) == ['None: Test {} ({})'.format(i, i) for i in range(10)]
+    assert all(calcs == 1 and effects == 1 for calcs, _, effects in tracer.fitTimes.values())
@@ -0,0 +1,71 @@
+# Add root folder to python paths
+# This must be done on every test in order to pass in Travis
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.realpath(os.path.join(script_dir, '..', '..', '..', '..')))
+
+import pytest
+
+# noinspection PyPackageRequirements
+from _development.helpers import DBInMemory as DB, Gamedata, Saveddata
+from _development.helpers_fits import RifterFit
+# This import is here to hack around circular import issues
+import eos.db
+from eos.const import FittingModuleState, ImplantLocation
+from eos.saveddata.damagePattern import DamagePattern
+from eos.saveddata.targetProfile import TargetProfile
+from eos.utils.fleetStats import aggregateFleet
+from eos.utils.stats import BreacherInfo, DmgTypes
+
+
+def addGuns(DB, Saveddata, fit, amount):
+    for _ in range(amount):
+        gun = Saveddata['Module'](DB['db'].getItem('200mm AutoCannon II'))
+        gun.charge = DB['db'].getItem('Republic Fleet EMP S')
+        gun.state = FittingModuleState.ACTIVE
+        fit.modules.append(gun)
+    # Modules get their owner on save
+    fit.implantLocation = ImplantLocation.FIT
+    DB['db'].save(fit)
+    fit.clear()
+    fit.calculateModifiedAttributes()
+    return fit
+
+
+@pytest.fixture
+def ThoraxFit(DB, Saveddata):
+    ship = Saveddata['Ship'](DB['db'].getItem('Thorax'))
+    return Saveddata['Fit'](ship, 'Thorax')
+
+
+def test_aggregateFleet(DB, Saveddata, RifterFit, ThoraxFit, monkeypatch):
+    rifter = addGuns(DB, Saveddata, RifterFit, 3)
+    thorax = addGuns(DB, Saveddata, ThoraxFit, 2)
+    # Breacher pods deal damage which depends on target HP
+    breacher = DmgTypes(0, 0, 0, 0, breachers={0: (BreacherInfo(absolute=100, relative=0.01),)})
+    rawDps = thorax.getRawWeaponDps()
+    monkeypatch.setattr(thorax, 'getRawWeaponDps', lambda spoolOptions=None: rawDps + breacher)
+    targetProfiles = [
+        None,
+        TargetProfile(0.1, 0.2, 0.3, 0.4, hp=5000),
+        TargetProfile(0.5, 0.5, 0.5, 0.5, hp=50000)]
+    damagePatterns = [DamagePattern(25, 25, 25, 25), DamagePattern(0, 10, 90, 0)]
+    fleetStats = aggregateFleet(((rifter, 2), (thorax, 1)), targetProfiles, damagePatterns)
+
+    for i, fit in enumerate((rifter, thorax)):
+        for j, profile in enumerate(targetProfiles):
+            fit.targetProfile = profile
+            assert fleetStats.fitDps[i, j] == pytest.approx(fit.getTotalDps().total)
+            assert fleetStats.fitVolley[i, j] == pytest.approx(fit.getTotalVolley().total)
+        for j, pattern in enumerate(damagePatterns):
+            fit.damagePattern = pattern
+            assert fleetStats.fitEhp[i, j] == pytest.approx(sum(fit.ehp.values()))
+    # Pure damage of breachers is capped by relative part against targets with little HP
+    assert fleetStats.fitDps[1, 0] == pytest.approx(rawDps.total + 100)
+    assert fleetStats.fitDps[1, 1] == pytest.approx(rawDps.applyProfile(targetProfiles[1]).total + 50)
+    assert fleetStats.totalDps.tolist() == pytest.approx((fleetStats.fitDps[0] * 2 + fleetStats.fitDps[1]).tolist())
+
+    DB['db'].remove(rifter)
+    DB['db'].remove(thorax)
@@ -0,0 +1,27 @@
+# Add root folder to python paths
+# This must be done on every test in order to pass in Travis
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.realpath(os.path.join(script_dir, '..', '..', '..', '..')))
+
+from eos.utils import rahSolver
+
+
+def test_singleDamageType():
+    assert rahSolver.solve((100, 0, 0, 0), (0.85,) * 4, 0.06) == (0.4, 1.0, 1.0, 1.0)
+
+
+def test_twoDamageTypes():
+    assert rahSolver.solve((0, 50, 50, 0), (0.85,) * 4, 0.06) == (1.0, 0.7, 0.7, 1.0)
+
+
+def test_uniformDamageLoop():
+    assert rahSolver.solve((25, 25, 25, 25), (0.85,) * 4, 0.06) == (0.88, 0.82, 0.82, 0.88)
+
+
+def test_solveMany():
+    profiles = [(100, 0, 0, 0), (25, 25, 25, 25), (100, 0, 0, 0)]
+    assert rahSolver.solveMany(profiles, (0.85,) * 4, 0.06) == [
+        rahSolver.solve(p, (0.85,) * 4, 0.06) for p in profiles]
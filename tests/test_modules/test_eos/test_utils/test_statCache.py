@@ -0,0 +1,53 @@
+# Add root folder to python paths
+# This must be done on every test in order to pass in Travis
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.realpath(os.path.join(script_dir, '..', '..', '..', '..')))
+
+from eos.utils.statCache import cachedStat, clearStatCache, getStatCounters, nextGeneration, resetStatCounters
+
+
+class Owner:
+
+    def __init__(self):
+        self.statGeneration = nextGeneration()
+        self.calls = 0
+
+    @cachedStat
+    def stat(self, mult=1):
+        self.calls += 1
+        return self.calls * mult
+
+
+def test_cachedUntilGenerationChanges():
+    owner = Owner()
+    assert owner.stat() == 1
+    assert owner.stat() == 1
+    assert owner.stat(mult=10) == 20
+    assert owner.stat(mult=10) == 20
+    owner.statGeneration = nextGeneration()
+    assert owner.stat() == 3
+    clearStatCache(owner)
+    assert owner.stat() == 4
+
+
+def test_noCacheWithoutGeneration():
+    owner = Owner()
+    owner.statGeneration = None
+    assert owner.stat() == 1
+    assert owner.stat() == 2
+    # Unhashable arguments are not cached either
+    owner.statGeneration = nextGeneration()
+    assert owner.stat([]) == []
+    assert owner.calls == 3
+
+
+def test_counters():
+    resetStatCounters()
+    owner = Owner()
+    owner.stat()
+    owner.stat()
+    owner.stat()
+    assert getStatCounters()['Owner.stat'] == (1, 2)
@@ -51,3 +51,21 @@ def test_rrtypes_names_lambda():
     assert RRTypes.names(postProcessor=lambda v: v.upper(), ehpOnly=False) == ['SHIELD', 'ARMOR', 'HULL', 'CAPACITOR']
 
 
+
+
+class Profile:
+
+    def __init__(self, resist):
+        self.emAmount = self.thermalAmount = self.kineticAmount = self.explosiveAmount = resist
+
+
+def test_dmgtypes_applyProfile(setup_damage_types):
+    profile = Profile(0.5)
+    applied = setup_damage_types.applyProfile(profile)
+    assert applied.total == 50
+    assert applied.profile is profile
+    # Resists are not applied twice
+    assert applied.applyProfile(profile) is applied
+    assert applied.applyProfile(None) is applied
+    with pytest.raises(ValueError):
+        applied.applyProfile(Profile(0.1))
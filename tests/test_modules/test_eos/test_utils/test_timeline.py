@@ -0,0 +1,48 @@
+# Add root folder to python paths
+# This must be done on every test in order to pass in Travis
+import math
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.realpath(os.path.join(script_dir, '..', '..', '..', '..')))
+
+from eos.utils.cycles import CycleInfo, CycleSequence
+from eos.utils.timeline import SpoolValues, Timeline, iterCycleRuns, iterRunValues
+
+
+def test_cycleRunsStopPastMaxTime():
+    runs = list(iterCycleRuns(CycleInfo(2000, 0, math.inf, False), 10))
+    assert len(runs) == 1
+    # Cycles starting at 0, 2, ..., 10 plus one more
+    assert runs[0].quantity == 7
+    assert runs[0].end == 14
+
+
+def test_cycleRunsSequence():
+    cycleParams = CycleSequence((
+        CycleInfo(1000, 0, 3, False),
+        CycleInfo(1000, 5000, 1, True)), math.inf)
+    runs = list(iterCycleRuns(cycleParams, 20))
+    assert [(r.start, r.quantity, r.nonstopCycles, r.reloadCycles) for r in runs] == [
+        (0, 3, 0, 0), (3, 1, 3, 3), (9, 3, 0, 0), (12, 1, 3, 3), (18, 3, 0, 0), (21, 1, 3, 3)]
+
+
+def test_spoolValuesSaturate():
+    calls = []
+
+    def getter(nonstopCycles):
+        calls.append(nonstopCycles)
+        return min(nonstopCycles, 3)
+
+    run = next(iterCycleRuns(CycleInfo(1000, 0, math.inf, False), 100))
+    parts = [(p.quantity, v) for p, v in iterRunValues(run, SpoolValues(getter))]
+    assert parts == [(1, 0), (1, 1), (1, 2), (1, 3), (98, 3)]
+    assert calls == [0, 1, 2, 3, 4]
+
+
+def test_timelineRateGaps():
+    timeline = Timeline(rateZero=0)
+    run = next(iterCycleRuns(CycleInfo(1000, 1000, 2, False), 100))
+    timeline.addRunRate('key', run, 5)
+    assert timeline.rates == {'key': {0: 5, 1: 0, 2: 5}}
@@ -0,0 +1,168 @@
+# Add root folder to python paths
+# This must be done on every test in order to pass in Travis
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.realpath(os.path.join(script_dir, '..', '..', '..', '..')))
+
+import pytest
+
+# noinspection PyPackageRequirements
+from _development.helpers import DBInMemory as DB, Gamedata, Saveddata
+from _development.helpers_fits import RifterFit
+# This import is here to hack around circular import issues
+import eos.db
+from eos.const import FittingModuleState, ImplantLocation
+from eos.utils.whatIf import STATS, AddModule, RemoveModule, ReplaceModule, WhatIf, evaluateOnce
+
+
+TESTED_STATS = ('dps', 'volley', 'ehp', 'maxSpeed', 'cpuUsed', 'pgUsed')
+
+
+def makeFit(DB, Saveddata, lows, ship='Rifter'):
+    """Make saved and calculated fit with a couple of guns and passed low slot modules"""
+    fit = Saveddata['Fit'](Saveddata['Ship'](DB['db'].getItem(ship)), ship)
+    for _ in range(2):
+        gun = Saveddata['Module'](DB['db'].getItem('200mm AutoCannon II'))
+        gun.charge = DB['db'].getItem('Republic Fleet EMP S')
+        gun.state = FittingModuleState.ACTIVE
+        fit.modules.append(gun)
+    for name in lows:
+        mod = Saveddata['Module'](DB['db'].getItem(name))
+        mod.state = FittingModuleState.ONLINE
+        fit.modules.append(mod)
+    fit.implantLocation = ImplantLocation.FIT
+    DB['db'].save(fit)
+    fit.clear()
+    fit.calculateModifiedAttributes()
+    return fit
+
+
+def getStats(fit):
+    return {name: STATS[name](fit) for name in TESTED_STATS}
+
+
+def test_whatIf_deltas(DB, Saveddata):
+    fit = makeFit(DB, Saveddata, ('Gyrostabilizer II',))
+    gyroPosition = fit.modules[2].position
+    whatIf = WhatIf(fit, stats=TESTED_STATS)
+    expectedFits = []
+    cases = (
+        (ReplaceModule(gyroPosition, DB['db'].getItem('Damage Control II')), ('Damage Control II',)),
+        (AddModule(DB['db'].getItem('Gyrostabilizer II')), ('Gyrostabilizer II', 'Gyrostabilizer II')),
+        (RemoveModule(gyroPosition), ()))
+    for edit, lows in cases:
+        expectedFit = makeFit(DB, Saveddata, lows)
+        expectedFits.append(expectedFit)
+        result = whatIf.evaluate((edit,))
+        assert result.values == pytest.approx(getStats(expectedFit))
+        for name in TESTED_STATS:
+            assert result.deltas[name] == pytest.approx(result.values[name] - whatIf.baseline[name])
+        assert evaluateOnce(fit, (edit,), stats=TESTED_STATS) == pytest.approx(getStats(expectedFit))
+    assert whatIf.baseline == pytest.approx(getStats(fit))
+    # Edits which cannot be done are reported as such
+    assert whatIf.evaluate((ReplaceModule(gyroPosition, DB['db'].getItem('5MN Microwarpdrive II')),)) is None
+    assert whatIf.evaluate((RemoveModule(10),)) is None
+
+    for f in [fit] + expectedFits:
+        DB['db'].remove(f)
+
+
+def test_whatIf_revert(DB, Saveddata):
+    fit = makeFit(DB, Saveddata, ('Gyrostabilizer II',))
+    gyroPosition = fit.modules[2].position
+    whatIf = WhatIf(fit, stats=TESTED_STATS)
+    items = [
+        DB['db'].getItem('Damage Control II'),
+        DB['db'].getItem('Gyrostabilizer II'),
+        # Slot of these does not match, they are skipped
+        DB['db'].getItem('5MN Microwarpdrive II'),
+        DB['db'].getItem('200mm AutoCannon II')]
+    results = whatIf.rankModuleReplacements(gyroPosition, items, stat='dps')
+    assert [item.name for item, _ in results] == ['Gyrostabilizer II', 'Damage Control II']
+    assert results[0][1].deltas['dps'] == pytest.approx(0)
+    assert results[1][1].deltas['dps'] < 0
+    # Every candidate is evaluated against unedited fit
+    assert results[0][1].values == pytest.approx(whatIf.baseline)
+    assert [m.item.name for m in whatIf.fit.modules] == [m.item.name for m in fit.modules]
+    assert whatIf.evaluate(()).values == pytest.approx(whatIf.baseline)
+    # Edits are reverted even when one of them turns out to be impossible
+    assert whatIf.evaluate((
+        RemoveModule(gyroPosition),
+        ReplaceModule(gyroPosition, DB['db'].getItem('5MN Microwarpdrive II')))) is None
+    assert whatIf.fit.modules[gyroPosition].item.name == 'Gyrostabilizer II'
+    assert whatIf.evaluate(()).values == pytest.approx(whatIf.baseline)
+
+    DB['db'].remove(fit)
+
+
+def test_whatIf_sourceUntouched(DB, Saveddata):
+    fit = makeFit(DB, Saveddata, ('Gyrostabilizer II',))
+    gyroPosition = fit.modules[2].position
+    session = DB['saveddata_session']
+    modules = list(fit.modules)
+    attrs = [dict(m.itemModifiedAttributes) for m in modules]
+    shipAttrs = dict(fit.ship.itemModifiedAttributes)
+    dps = fit.getTotalDps().total
+    generation = fit.statGeneration
+
+    whatIf = WhatIf(fit, stats=TESTED_STATS)
+    whatIf.rankModuleReplacements(gyroPosition, [DB['db'].getItem('Damage Control II')])
+    whatIf.evaluate((AddModule(DB['db'].getItem('Gyrostabilizer II')), RemoveModule(0)))
+    evaluateOnce(fit, (RemoveModule(gyroPosition),), stats=TESTED_STATS)
+
+    assert fit.statGeneration == generation
+    assert list(fit.modules) == modules
+    assert [dict(m.itemModifiedAttributes) for m in modules] == attrs
+    assert dict(fit.ship.itemModifiedAttributes) == shipAttrs
+    assert fit.getTotalDps().total == dps
+    assert whatIf.fit not in session
+    assert not session.new
+    assert not session.dirty
+
+    DB['db'].remove(fit)
+
+
+def test_whatIf_commandAndProjectedFits(DB, Saveddata):
+    fit = makeFit(DB, Saveddata, ('Gyrostabilizer II',), ship='Thorax')
+    booster = Saveddata['Fit'](Saveddata['Ship'](DB['db'].getItem('Thorax')), 'Booster')
+    burst = Saveddata['Module'](DB['db'].getItem('Shield Command Burst I'))
+    burst.charge = DB['db'].getItem('Shield Harmonizing Charge')
+    burst.state = FittingModuleState.ACTIVE
+    booster.modules.append(burst)
+    projected = makeFit(DB, Saveddata, ())
+    booster.implantLocation = ImplantLocation.FIT
+    DB['db'].save(booster)
+    session = DB['saveddata_session']
+    fit.commandFitDict[booster.ID] = booster
+    fit.projectedFitDict[projected.ID] = projected
+    fit.projectedFitDict[fit.ID] = fit
+    session.flush()
+    session.refresh(booster)
+    session.refresh(projected)
+    session.refresh(fit)
+    fit.clear()
+    fit.calculateModifiedAttributes()
+    resonance = fit.ship.getModifiedItemAttr('shieldEmDamageResonance')
+    unboosted = booster.ship.getModifiedItemAttr('shieldEmDamageResonance')
+    assert resonance < unboosted
+
+    fitCopy = fit.getCalcCopy()
+    assert fitCopy.commandFits == [booster]
+    # Self-projection of the fit becomes self-projection of the copy
+    assert set(fitCopy.projectedFits) == {projected, fitCopy}
+    fitCopy.calculateModifiedAttributes()
+    assert fitCopy.ship.getModifiedItemAttr('shieldEmDamageResonance') == pytest.approx(resonance)
+    assert fitCopy not in session
+    assert not session.new
+
+    # Edits of the copy are calculated with boosts as well
+    whatIf = WhatIf(fit, stats=TESTED_STATS)
+    result = whatIf.evaluate((RemoveModule(fit.modules[2].position),))
+    assert whatIf.fit.ship.getModifiedItemAttr('shieldEmDamageResonance') == pytest.approx(resonance)
+    assert result.deltas['dps'] < 0
+    assert fit.ship.getModifiedItemAttr('shieldEmDamageResonance') == resonance
+
+    for f in (fit, booster, projected):
+        DB['db'].remove(f)
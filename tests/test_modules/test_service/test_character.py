@@ -0,0 +1,96 @@
+# Add root folder to python paths
+# This must be done on every test in order to pass in Travis
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.realpath(os.path.join(script_dir, '..', '..', '..')))
+
+# This import is here to hack around circular import issues
+import eos.db
+from eos.gamedata import Item
+from service.character import Character
+
+
+class FakeItem:
+    # Closure is calculated by the same code as for real items
+    requiredSkillsClosure = Item.requiredSkillsClosure
+
+    def __init__(self, ID, name, requiredSkills=None):
+        self.ID = ID
+        self.name = name
+        self.requiredSkills = requiredSkills or {}
+        self._Item__requiredSkillsClosure = None
+
+
+class FakeChar:
+
+    def __init__(self, levels, defaultLevel=None):
+        self.levels = levels
+        self.defaultLevel = defaultLevel
+
+    def getSkillLevels(self):
+        return self.levels
+
+
+class FakeHolder:
+
+    def __init__(self, item, charge=None):
+        self.item = item
+        self.charge = charge
+
+
+class FakeFit:
+
+    def __init__(self, character, ship, modules):
+        self.character = character
+        self.ship = FakeHolder(ship)
+        self.modules = [FakeHolder(item, charge) for item, charge in modules]
+        self.drones = []
+        self.fighters = []
+        self.appliedImplants = []
+        self.boosters = []
+
+
+spaceshipCommand = FakeItem(1, 'Spaceship Command')
+frigate = FakeItem(2, 'Minmatar Frigate', {spaceshipCommand: 3})
+gunnery = FakeItem(3, 'Gunnery')
+smallProjectile = FakeItem(4, 'Small Projectile Turret', {gunnery: 1})
+ship = FakeItem(10, 'Rifter', {frigate: 1})
+gun = FakeItem(11, '200mm AutoCannon II', {smallProjectile: 5, gunnery: 3})
+ammo = FakeItem(12, 'Republic Fleet EMP S', {smallProjectile: 1})
+
+
+def test_requiredSkillsClosure():
+    assert sorted(ship.requiredSkillsClosure) == [(1, 3), (2, 1)]
+    # Highest level wins for skills required on several levels
+    assert sorted(gun.requiredSkillsClosure) == [(3, 3), (4, 5)]
+    assert spaceshipCommand.requiredSkillsClosure == ()
+
+
+def test_checkRequirements():
+    sChar = Character.getInstance()
+    char = FakeChar({1: 5, 2: 5, 3: 1, 4: 4})
+    fit = FakeFit(char, ship, [(gun, ammo), (gun, ammo)])
+    reqs = sChar.checkRequirements(fit)
+    assert list(reqs) == [gun]
+    assert reqs[gun] == {
+        'Small Projectile Turret': (5, 4, {}),
+        'Gunnery': (3, 3, {})}
+
+    # Without character everything is missing, including prerequisites
+    fit.character = None
+    assert sChar.checkRequirements(fit)[ship] == {
+        'Minmatar Frigate': (1, 2, {'Spaceship Command': (3, 1, {})})}
+
+
+def test_getMissingSkills():
+    sChar = Character.getInstance()
+    fits = [
+        FakeFit(FakeChar({1: 2}, defaultLevel=4), ship, []),
+        FakeFit(FakeChar({}), ship, [(gun, ammo)])]
+    assert sChar.getRequiredSkills(fits) == {1: 3, 2: 1, 3: 3, 4: 5}
+    # Skills without entries are at default level of character
+    assert sChar.getMissingSkills(fits[:1]) == {1: 3}
+    assert sChar.getMissingSkills(fits) == {1: 3, 2: 1, 3: 3, 4: 5}
+    assert sChar.getMissingSkills(fits, char=FakeChar({}, defaultLevel=5)) == {}
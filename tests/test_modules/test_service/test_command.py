@@ -0,0 +1,57 @@
+# Add root folder to python paths
+# This must be done on every test in order to pass in Travis
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.realpath(os.path.join(script_dir, '..', '..', '..')))
+
+from service.command import Command, CommandProcessor
+
+
+class AppendCommand(Command):
+
+    def __init__(self, target, value):
+        Command.__init__(self, True, 'Append')
+        self.target = target
+        self.value = value
+
+    def Do(self):
+        self.target.append(self.value)
+        return True
+
+    def Undo(self):
+        self.target.pop()
+        return True
+
+
+def test_commandProcessor_undoRedo():
+    target = []
+    processor = CommandProcessor()
+    assert not processor.CanUndo()
+    for value in range(3):
+        assert processor.Submit(AppendCommand(target, value))
+    assert target == [0, 1, 2]
+    assert processor.Undo()
+    assert processor.Undo()
+    assert target == [0]
+    assert processor.CanRedo()
+    assert processor.Redo()
+    assert target == [0, 1]
+    # New command drops undone ones
+    processor.Submit(AppendCommand(target, 5))
+    assert not processor.CanRedo()
+    assert target == [0, 1, 5]
+    assert len(processor.GetCommands()) == 3
+
+
+def test_commandProcessor_maxCommands():
+    target = []
+    processor = CommandProcessor(maxCommands=2)
+    for value in range(4):
+        processor.Submit(AppendCommand(target, value))
+    assert len(processor.Commands) == 2
+    assert processor.Undo()
+    assert processor.Undo()
+    assert not processor.Undo()
+    assert target == [0, 1]
@@ -0,0 +1,57 @@
+# Add root folder to python paths
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.realpath(os.path.join(script_dir, '..', '..', '..')))
+
+import pytest
+
+# noinspection PyPackageRequirements
+from _development.helpers import DBInMemory as DB, Gamedata, Saveddata
+from _development.helpers_fits import RifterFit, CurseFit, HeronFit
+# This import is here to hack around circular import issues
+import eos.db
+from eos.const import ImplantLocation
+from eos.utils.whatIf import AddModule, evaluateOnce
+from gui.fitCommands.calc.module.localAdd import CalcAddLocalModuleCommand
+from gui.fitCommands.calc.module.localRemove import CalcRemoveLocalModulesCommand
+from gui.fitCommands.helpers import ModuleInfo
+from service.fit import Fit
+
+
+def getCommandMwdSpeed(fit, item):
+    # How T2 MWD speed used to be calculated for EFS export, by fitting it for real
+    sFit = Fit.getInstance()
+    cmd = CalcAddLocalModuleCommand(fit.ID, ModuleInfo(itemID=item.ID))
+    assert cmd.Do()
+    if cmd.needsGuiRecalc:
+        sFit.recalc(fit)
+    speed = fit.maxSpeed
+    cmd = CalcRemoveLocalModulesCommand(fit.ID, [cmd.savedPosition])
+    assert cmd.Do()
+    if cmd.needsGuiRecalc:
+        sFit.recalc(fit)
+    return speed
+
+
+@pytest.mark.parametrize('fitName', ['RifterFit', 'CurseFit', 'HeronFit'])
+def test_evaluateOnce_mwdSpeed(DB, fitName, request):
+    fit = request.getfixturevalue(fitName)
+    fit.implantLocation = ImplantLocation.FIT
+    DB['db'].save(fit)
+    sFit = Fit.getInstance()
+    sFit.recalc(fit)
+    item = DB['db'].getItem('5MN Microwarpdrive II')
+    speed = fit.maxSpeed
+    moduleCount = len(fit.modules)
+
+    mwdSpeed = evaluateOnce(fit, (AddModule(item),), stats=('maxSpeed',))['maxSpeed']
+    # Fit is left untouched
+    assert fit.maxSpeed == speed
+    assert len(fit.modules) == moduleCount
+    assert not DB['saveddata_session'].dirty
+    assert mwdSpeed > speed
+    assert mwdSpeed == getCommandMwdSpeed(fit, item)
+
+    DB['db'].remove(fit)
@@ -0,0 +1,70 @@
+# Add root folder to python paths
+# This must be done on every test in order to pass in Travis
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.realpath(os.path.join(script_dir, '..', '..', '..')))
+
+# noinspection PyPackageRequirements
+from _development.helpers import DBInMemory as DB, Gamedata, Saveddata
+from _development.helpers_fits import RifterFit
+# This import is here to hack around circular import issues
+import eos.db
+import eos.events  # noqa: F401
+from eos.const import FittingModuleState, ImplantLocation
+from eos.db.saveddata.fit import fits_table
+from service.fitStats import FitStats
+
+
+def saveFit(DB, Saveddata, fit):
+    fit.implantLocation = ImplantLocation.FIT
+    gun = Saveddata['Module'](DB['db'].getItem('200mm AutoCannon II'))
+    gun.charge = DB['db'].getItem('Republic Fleet EMP S')
+    gun.state = FittingModuleState.ACTIVE
+    fit.modules.append(gun)
+    DB['db'].save(fit)
+    # Change listeners are set up for fits loaded from database
+    DB['saveddata_session'].expunge_all()
+    return DB['db'].getFit(fit.ID)
+
+
+def test_fitStats_invalidation(DB, Saveddata, RifterFit, monkeypatch):
+    fit = saveFit(DB, Saveddata, RifterFit)
+    sFitStats = FitStats.getInstance()
+    monkeypatch.setattr(DB['config'], 'gamedata_version', '1')
+
+    stats = sFitStats.calculate([fit.ID])[fit.ID]
+    assert stats.dps > 0
+    DB['saveddata_session'].expunge(stats)
+    stored = sFitStats.getStats([fit.ID], calculate=False)
+    assert stored[fit.ID].dps == stats.dps
+
+    # Editing fit invalidates its stats
+    fit.modules[0].state = FittingModuleState.OFFLINE
+    DB['db'].commit()
+    assert sFitStats.getStats([fit.ID], calculate=False) == {}
+    stats = sFitStats.getStats([fit.ID])[fit.ID]
+    assert sFitStats.getStats([fit.ID], calculate=False)[fit.ID] is stats
+
+    # As does new gamedata
+    monkeypatch.setattr(DB['config'], 'gamedata_version', '2')
+    assert sFitStats.getStats([fit.ID], calculate=False) == {}
+
+    sFitStats.clear([fit.ID])
+    DB['db'].remove(fit)
+
+
+def test_fitStats_noModificationTime(DB, Saveddata, RifterFit):
+    fit = saveFit(DB, Saveddata, RifterFit)
+    # Fits saved by old versions have no modification time
+    DB['saveddata_session'].execute(fits_table.update().where(fits_table.c.ID == fit.ID).values(modified=None))
+    DB['db'].commit()
+    DB['saveddata_session'].expire(fit)
+    assert fit.modified is None
+    sFitStats = FitStats.getInstance()
+    sFitStats.calculate([fit.ID])
+    assert fit.ID in sFitStats.getStats([fit.ID], calculate=False)
+
+    sFitStats.clear([fit.ID])
+    DB['db'].remove(fit)
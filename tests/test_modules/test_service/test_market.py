@@ -0,0 +1,27 @@
+# Add root folder to python paths
+# This must be done on every test in order to pass in Travis
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.realpath(os.path.join(script_dir, '..', '..', '..')))
+
+# This import is here to hack around circular import issues
+import eos.db
+from service.market import Market
+
+
+def test_prefetchedItems(monkeypatch):
+    rifter = object()
+    gyro = object()
+    monkeypatch.setattr(Market, 'prefetchItems', lambda names, itemIDs, eager: ({'Rifter': rifter}, {520: gyro}))
+
+    def getItem(lookfor, eager=None):
+        raise AssertionError('Prefetched item {} was queried'.format(lookfor))
+
+    monkeypatch.setattr(eos.db, 'getItem', getItem)
+    with Market.prefetchedItems(names={'Rifter'}, itemIDs={520}):
+        assert Market.getItem('Rifter') is rifter
+        assert Market.getItem(520) is gyro
+        assert Market.getItem(520.0) is gyro
+    assert Market.getPrefetchedItem('Rifter') is None
@@ -0,0 +1,112 @@
+# Add root folder to python paths
+# This must be done on every test in order to pass in Travis
+import os
+import pickle
+import sys
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.realpath(os.path.join(script_dir, '..', '..', '..')))
+
+import pytest
+
+from service.const import GraphDpsDroneMode
+from service.settings import SettingsStore
+
+
+class CrashError(Exception):
+    pass
+
+
+def crashingWrite(store, data):
+    # Dies halfway through writing new settings
+    tmpPath = '{}.tmp'.format(store.path)
+    with open(tmpPath, 'w', encoding='utf-8') as f:
+        f.write(data[:len(data) // 2])
+    raise CrashError
+
+
+def test_settingsStore_roundTrip(tmp_path):
+    path = str(tmp_path / 'settings.json')
+    store = SettingsStore(path)
+    info = store.getArea('area')
+    info.update({
+        'mode': GraphDpsDroneMode.auto,
+        'size': (1, 2),
+        'ids': {3, 4},
+        'options': {1: {'opt': True}},
+        'fits': [1, 2],
+        'tricky': {'__set__': 'not a set'},
+        'name': None})
+    store.flush()
+    loaded = SettingsStore(path).getArea('area')
+    assert loaded == info
+    assert loaded['mode'] == GraphDpsDroneMode.auto
+    assert isinstance(loaded['size'], tuple)
+
+
+def test_settingsStore_crashMidWrite(tmp_path, monkeypatch):
+    path = str(tmp_path / 'settings.json')
+    store = SettingsStore(path)
+    store.getArea('area')['value'] = 'old'
+    store.flush()
+
+    store.getArea('area')['value'] = 'new'
+    store.getArea('other')['value'] = list(range(1000))
+    monkeypatch.setattr(SettingsStore, '_write', crashingWrite)
+    with pytest.raises(CrashError):
+        store.flush()
+    monkeypatch.undo()
+
+    # Half-written data never replaces settings file
+    assert os.path.exists('{}.tmp'.format(path))
+    loaded = SettingsStore(path)
+    assert loaded.areas == {'area': {'value': 'old'}}
+    # Next save works over leftovers
+    loaded.getArea('area')['value'] = 'new'
+    loaded.flush()
+    assert SettingsStore(path).getArea('area') == {'value': 'new'}
+    assert not os.path.exists('{}.tmp'.format(path))
+
+
+def test_settingsStore_importPickles(tmp_path):
+    legacyPath = tmp_path / 'settings'
+    legacyPath.mkdir()
+    with open(str(legacyPath / 'pyfaExport'), 'wb') as f:
+        pickle.dump({'format': 0, 'options': {0: {1: True}}}, f, pickle.HIGHEST_PROTOCOL)
+    with open(str(legacyPath / 'broken'), 'wb') as f:
+        f.write(b'garbage')
+    path = str(tmp_path / 'settings.json')
+    SettingsStore(path, legacyPath=str(legacyPath))
+    # Imported once, on the first run; store file is used afterwards
+    assert SettingsStore(path).areas == {'pyfaExport': {'format': 0, 'options': {0: {1: True}}}}
+
+
+def test_settingsStore_migrations(tmp_path, monkeypatch):
+    path = str(tmp_path / 'settings.json')
+    store = SettingsStore(path)
+    store.getArea('area')['oldName'] = 5
+    store.flush()
+
+    def migrate(areas):
+        areas['area']['newName'] = areas['area'].pop('oldName')
+
+    monkeypatch.setattr(SettingsStore, 'VERSION', 2)
+    monkeypatch.setattr(SettingsStore, 'MIGRATIONS', {2: migrate})
+    assert SettingsStore(path).getArea('area') == {'newName': 5}
+
+
+def test_settingsStore_batchedSave(tmp_path, monkeypatch):
+    writes = []
+    monkeypatch.setattr(SettingsStore, 'SAVE_DELAY', 0.05)
+    monkeypatch.setattr(SettingsStore, '_write', lambda store, data: writes.append(data))
+    store = SettingsStore(str(tmp_path / 'settings.json'))
+    for i in range(10):
+        store.getArea('area')[i] = i
+        store.scheduleSave()
+    for _ in range(100):
+        if writes:
+            break
+        time.sleep(0.05)
+    time.sleep(0.1)
+    assert len(writes) == 1
@@ -0,0 +1,81 @@
+# Add root folder to python paths
+# This must be done on every test in order to pass in Travis
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.realpath(os.path.join(script_dir, '..', '..', '..')))
+
+import numpy as np
+import pytest
+
+# noinspection PyPackageRequirements
+from _development.helpers import DBInMemory as DB, Gamedata, Saveddata
+from _development.helpers_fits import RifterFit
+# This import is here to hack around circular import issues
+import eos.db
+from eos.const import FittingModuleState, ImplantLocation
+from service.skillImpact import SkillImpact, SkillImpactMatrix, evaluateSkillChanges
+
+
+def test_skillImpactMatrix_rank():
+    changes = [('Gunnery', 1), ('Gunnery', 2), ('Navigation', 1)]
+    # Big and small fit, stats are DPS and speed
+    baseline = np.array([[1000, 100], [100, 1000]], dtype=float)
+    values = np.array([
+        [[1100, 100], [100, 1000]],
+        [[1010, 100], [120, 1000]],
+        [[1000, 110], [100, 1050]]], dtype=float)
+    matrix = SkillImpactMatrix(changes, ['big', 'small'], ('dps', 'speed'), baseline, values)
+    # 10% of big fit loses to 20% of small one
+    assert [(c[0], c[1]) for c in matrix.rank('dps')] == [('Gunnery', 2), ('Gunnery', 1), ('Navigation', 1)]
+    # But wins in absolute numbers
+    ranked = matrix.rank('dps', relative=False)
+    assert [(c[0], c[1]) for c in ranked] == [('Gunnery', 1), ('Gunnery', 2), ('Navigation', 1)]
+    assert ranked[0][2] == 100
+    assert matrix.rank('speed', relative=False)[0][:2] == ('Navigation', 1)
+
+
+def test_skillImpactMatrix_zeroBaseline():
+    baseline = np.array([[0, 100]], dtype=float)
+    values = np.array([[[0, 150]]], dtype=float)
+    matrix = SkillImpactMatrix([('Drones', 1)], ['fit'], ('dps', 'speed'), baseline, values)
+    assert matrix.rank('dps')[0][2] == 0
+    assert matrix.rank('speed')[0][2] == 0.5
+
+
+def test_evaluateSkillChanges(DB, Saveddata, RifterFit):
+    skillItem = DB['db'].getItem('Small Projectile Turret')
+    character = Saveddata['Character']('Skill Impact', 3)
+    DB['db'].save(character)
+    fit = RifterFit
+    for _ in range(2):
+        gun = Saveddata['Module'](DB['db'].getItem('200mm AutoCannon II'))
+        gun.charge = DB['db'].getItem('Republic Fleet EMP S')
+        gun.state = FittingModuleState.ACTIVE
+        fit.modules.append(gun)
+    fit.character = character
+    fit.implantLocation = ImplantLocation.FIT
+    DB['db'].save(fit)
+    fit.clear()
+    fit.calculateModifiedAttributes()
+    assert skillItem.ID in SkillImpact.getAffectingSkills(fit)
+    assert (skillItem, 4) in SkillImpact.getCandidates([fit])
+
+    # Levels are changed on copy of the character
+    baseline, rows = evaluateSkillChanges(fit.ID, [(0, skillItem.ID, 4), (1, skillItem.ID, 5)], ('dps', 'ehp'))
+    skill = character.getSkill(skillItem.ID)
+    assert skill.level == 3
+    assert baseline['dps'] == pytest.approx(fit.getTotalDps().total)
+
+    values = dict(rows)
+    for index, level in ((0, 4), (1, 5)):
+        skill.setLevel(level, ignoreRestrict=True)
+        fit.clear()
+        fit.calculateModifiedAttributes()
+        assert values[index]['dps'] == pytest.approx(fit.getTotalDps().total)
+        assert values[index]['dps'] > baseline['dps']
+        assert values[index]['ehp'] == pytest.approx(baseline['ehp'])
+
+    DB['db'].remove(fit)
+    DB['db'].remove(character)
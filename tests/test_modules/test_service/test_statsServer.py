@@ -0,0 +1,111 @@
+# Add root folder to python paths
+# This must be done on every test in order to pass in Travis
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.realpath(os.path.join(script_dir, '..', '..', '..')))
+
+import http.client
+import http.server
+import json
+import threading
+
+import pytest
+
+from service.statsServer import RequestMetrics, StatsRequestHandler
+
+
+class HandlerServer(http.server.ThreadingHTTPServer):
+    """Serves stats handler without worker pool, echoing requests back as results"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        self.metrics = RequestMetrics()
+        self.evaluated = []
+        super().__init__(('127.0.0.1', 0), StatsRequestHandler)
+
+    def evaluate(self, requests):
+        self.evaluated.append(requests)
+        return requests
+
+
+@pytest.fixture
+def server():
+    server = HandlerServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post(server, body, headers):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=5)
+    try:
+        connection.putrequest('POST', '/stats')
+        for name, value in headers.items():
+            connection.putheader(name, value)
+        connection.endheaders(body)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def test_requestMetrics():
+    metrics = RequestMetrics()
+    metrics.record('invalid')
+    for i in range(1, 101):
+        metrics.record('calculated', {'calc': i / 100})
+    snapshot = metrics.getSnapshot()
+    assert snapshot['requests'] == {'invalid': 1, 'calculated': 100}
+    calc = snapshot['timings']['calc']
+    assert calc['count'] == 100
+    assert calc['p50'] == 0.5
+    assert calc['p95'] == 0.95
+    assert calc['max'] == 1
+
+
+def test_requestMetricsWindow():
+    metrics = RequestMetrics()
+    for i in range(RequestMetrics.WINDOW + 10):
+        metrics.record('calculated', {'calc': i})
+    calc = metrics.getSnapshot()['timings']['calc']
+    assert calc['count'] == RequestMetrics.WINDOW
+    assert calc['max'] == RequestMetrics.WINDOW + 9
+
+
+def test_handlerValidRequest(server):
+    body = json.dumps({'fits': ['[Rifter, Test]', {'fit': '[Thorax, Test]', 'character': 'All 0'}],
+                       'character': 'All 5'}).encode('utf-8')
+    status, data = post(server, body, {'Content-Type': 'application/json', 'Content-Length': str(len(body))})
+    assert status == 200
+    assert data['results'] == [
+        {'fit': '[Rifter, Test]', 'character': 'All 5'},
+        {'fit': '[Thorax, Test]', 'character': 'All 0'}]
+    assert server.metrics.getSnapshot()['requests'] == {'served': 1}
+
+
+def test_handlerOversizedBody(server, monkeypatch):
+    monkeypatch.setattr(StatsRequestHandler, 'MAX_BODY_SIZE', 100)
+    body = b'[Rifter, Test]' + b'\n' * 100
+    status, data = post(server, body, {'Content-Type': 'text/plain', 'Content-Length': str(len(body))})
+    assert status == 413
+    assert 'error' in data
+    assert server.evaluated == []
+    assert server.metrics.getSnapshot()['requests'] == {'invalid': 1}
+
+
+@pytest.mark.parametrize('body, headers', [
+    (b'{"fit": ', {'Content-Type': 'application/json', 'Content-Length': '8'}),
+    (b'[1, 2]', {'Content-Type': 'application/json', 'Content-Length': '6'}),
+    (b'[Rifter, Test]', {'Content-Type': 'text/plain', 'Content-Length': 'many'}),
+    (b'[Rifter, Test]', {'Content-Type': 'text/plain', 'Content-Length': '-14'})])
+def test_handlerMalformedRequest(server, body, headers):
+    status, data = post(server, body, headers)
+    assert status == 400
+    assert 'error' in data
+    assert server.evaluated == []
+    assert server.metrics.getSnapshot()['requests'] == {'invalid': 1}
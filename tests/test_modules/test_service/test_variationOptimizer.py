@@ -0,0 +1,166 @@
+# Add root folder to python paths
+# This must be done on every test in order to pass in Travis
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.realpath(os.path.join(script_dir, '..', '..', '..')))
+
+import sqlite3
+
+import pytest
+
+# noinspection PyPackageRequirements
+from _development.helpers import DBInMemory as DB, Gamedata, Saveddata
+# This import is here to hack around circular import issues
+import eos.db
+import config
+from eos.const import FittingModuleState, ImplantLocation
+from eos.utils.whatIf import STATS
+from service.variationOptimizer import OBJECTIVES, VariationOptimizer
+
+
+LOW_SLOT = 3
+LOW_ITEMS = ('Gyrostabilizer II', 'Damage Control II', 'Reactive Armor Hardener')
+
+
+def makeFit(DB, Saveddata, low, gunCharge=True):
+    """Make saved and calculated fit with guns, MWD and passed low slot module"""
+    fit = Saveddata['Fit'](Saveddata['Ship'](DB['db'].getItem('Rifter')), 'Rifter')
+    for _ in range(2):
+        gun = Saveddata['Module'](DB['db'].getItem('200mm AutoCannon II'))
+        if gunCharge:
+            gun.charge = DB['db'].getItem('Republic Fleet EMP S')
+        gun.state = FittingModuleState.ACTIVE
+        fit.modules.append(gun)
+    mwd = Saveddata['Module'](DB['db'].getItem('5MN Microwarpdrive II'))
+    mwd.state = FittingModuleState.ACTIVE
+    fit.modules.append(mwd)
+    if low is not None:
+        mod = Saveddata['Module'](DB['db'].getItem(low))
+        mod.state = mod.getMaxState(proposedState=FittingModuleState.ACTIVE)
+        fit.modules.append(mod)
+    fit.implantLocation = ImplantLocation.FIT
+    DB['db'].save(fit)
+    fit.clear()
+    fit.calculateModifiedAttributes()
+    return fit
+
+
+@pytest.fixture
+def optimizer(DB, monkeypatch):
+    """Optimizer which ranks low slot modules from the list instead of variations"""
+    items = [DB['db'].getItem(name) for name in LOW_ITEMS]
+    charges = [None, DB['db'].getItem('Republic Fleet EMP S')]
+
+    def getCandidates(mod, allCharges=False):
+        if mod.item.name in LOW_ITEMS:
+            return [(item, [None]) for item in items]
+        return [(mod.item, charges if allCharges else [None])]
+
+    optimizer = VariationOptimizer()
+    monkeypatch.setattr(optimizer, 'getCandidates', getCandidates)
+    yield optimizer
+    optimizer.shutdown()
+
+
+def test_rankVariations_objectives(DB, Saveddata, optimizer):
+    # Replacements keep state of active hardener where they can
+    fit = makeFit(DB, Saveddata, 'Reactive Armor Hardener')
+    assert fit.modules[LOW_SLOT].state == FittingModuleState.ACTIVE
+    fits = {name: makeFit(DB, Saveddata, name) for name in LOW_ITEMS + (None,)}
+    expected = {name: {stat: STATS[stat](f) for stat in STATS} for name, f in fits.items()}
+
+    rows = optimizer.rankVariations(fit, LOW_SLOT, objective='dps', parallel=False)
+    assert [r.item.name for r in rows][0] == 'Gyrostabilizer II'
+    rows = optimizer.rankVariations(fit, LOW_SLOT, objective='ehp', parallel=False)
+    assert [r.item.name for r in rows][0] == 'Damage Control II'
+    # Active hardener uses cap, passive modules do not
+    rows = optimizer.rankVariations(fit, LOW_SLOT, objective='cap', parallel=False)
+    assert [r.item.name for r in rows][-1] == 'Reactive Armor Hardener'
+
+    for objective in OBJECTIVES:
+        rows = optimizer.rankVariations(fit, LOW_SLOT, objective=objective, parallel=False)
+        assert sorted(r.item.name for r in rows) == sorted(LOW_ITEMS)
+        assert [r.score for r in rows] == sorted((r.score for r in rows), reverse=True)
+        for row in rows:
+            assert row.charge is None
+            values = expected[row.item.name]
+            assert row.score == pytest.approx(OBJECTIVES[objective].key(values))
+            for stat, value in row.values.items():
+                assert value == pytest.approx(values[stat])
+                assert row.deltas[stat] == pytest.approx(value - expected['Reactive Armor Hardener'][stat])
+                assert row.contributions[stat] == pytest.approx(value - expected[None][stat])
+
+    for f in [fit] + list(fits.values()):
+        DB['db'].remove(f)
+
+
+def test_rankVariations_pricePerformance(DB, Saveddata, optimizer):
+    fit = makeFit(DB, Saveddata, 'Gyrostabilizer II')
+    prices = {'Gyrostabilizer II': 2000000, 'Damage Control II': 500000, 'Reactive Armor Hardener': 0}
+    for name, price in prices.items():
+        DB['db'].getItem(name).price.price = price
+
+    rows = optimizer.rankVariations(fit, LOW_SLOT, objective='dps', pricePerformance=True, parallel=False)
+    assert [r.item.name for r in rows] == ['Gyrostabilizer II', 'Damage Control II', 'Reactive Armor Hardener']
+    gyro = rows[0]
+    assert gyro.price == 2000000
+    assert gyro.score == pytest.approx(gyro.contributions['dps'] / 2)
+    assert rows[1].score == pytest.approx(0)
+    # Items without price have no score and go last
+    assert rows[2].price is None
+    assert rows[2].score is None
+
+    rows = optimizer.rankVariations(fit, LOW_SLOT, objective='ehp', pricePerformance=True, parallel=False)
+    assert rows[0].item.name == 'Damage Control II'
+    assert rows[0].score == pytest.approx(rows[0].contributions['ehp'] / 0.5)
+    with pytest.raises(ValueError):
+        optimizer.rankVariations(fit, LOW_SLOT, objective='cap', pricePerformance=True, parallel=False)
+
+    DB['db'].remove(fit)
+
+
+def test_rankVariations_charges(DB, Saveddata, optimizer):
+    fit = makeFit(DB, Saveddata, None, gunCharge=False)
+    charged = makeFit(DB, Saveddata, None)
+    rows = optimizer.rankVariations(fit, 0, objective='dps', parallel=False)
+    assert [(r.item.name, r.charge) for r in rows] == [('200mm AutoCannon II', None)]
+    assert rows[0].deltas['dps'] == pytest.approx(0)
+
+    rows = optimizer.rankVariations(fit, 0, objective='dps', allCharges=True, parallel=False)
+    assert [r.charge.name if r.charge is not None else None for r in rows] == ['Republic Fleet EMP S', None]
+    # Only one of two guns gets the charge
+    assert rows[0].values['dps'] == pytest.approx(charged.getTotalDps().total / 2)
+    assert rows[0].contributions['dps'] == pytest.approx(rows[0].values['dps'])
+    assert rows[1].values['dps'] == pytest.approx(0)
+
+    # Current charge is kept where no charge is requested
+    rows = optimizer.rankVariations(charged, 0, objective='dps', parallel=False)
+    assert rows[0].values['dps'] == pytest.approx(charged.getTotalDps().total)
+
+    DB['db'].remove(fit)
+    DB['db'].remove(charged)
+
+
+def test_rankVariations_parallel(DB, Saveddata, optimizer, tmp_path, monkeypatch):
+    fit = makeFit(DB, Saveddata, 'Gyrostabilizer II')
+    DB['saveddata_session'].commit()
+    # Workers load fits from saveddata database file
+    connection = DB['saveddata_session'].connection().connection.connection
+    with sqlite3.connect(str(tmp_path / 'saveddata.db')) as saveddata:
+        connection.backup(saveddata)
+    monkeypatch.setattr(config, 'savePath', str(tmp_path))
+    monkeypatch.setattr(config, 'gameDB', os.path.realpath(os.path.join(script_dir, '..', '..', '..', 'eve.db')))
+    optimizer.workers = 2
+
+    for objective in OBJECTIVES:
+        serial = optimizer.rankVariations(fit, LOW_SLOT, objective=objective, parallel=False)
+        parallel = optimizer.rankVariations(fit, LOW_SLOT, objective=objective)
+        assert [r.item for r in parallel] == [r.item for r in serial]
+        for serialRow, parallelRow in zip(serial, parallel):
+            assert parallelRow.score == pytest.approx(serialRow.score)
+            assert parallelRow.values == pytest.approx(serialRow.values)
+            assert parallelRow.deltas == pytest.approx(serialRow.deltas)
+
+    DB['db'].remove(fit)